@@ -19,6 +19,7 @@ from typing import Optional
 from typing import Set
 from typing import Tuple
 
+from src.analysis.protocol_registry import get_protocol_index
 from src.api.config import settings
 from src.api.database import get_neo4j_session
 from src.api.database import get_redis_connection
@@ -87,6 +88,19 @@ class CrossChainAnalyzer:
         self.dex_contracts = self._get_dex_contracts()
         self.mixer_contracts = self._get_mixer_contracts()
         self.privacy_tools = self._get_privacy_tools()
+        # Lowercased contract addresses per kind and chain
+        self._contract_sets = {
+            kind: {
+                chain: frozenset(addr.lower() for addr in contracts.values())
+                for chain, contracts in table.items()
+            }
+            for kind, table in (
+                ("bridge", self.bridge_contracts),
+                ("dex", self.dex_contracts),
+                ("mixer", self.mixer_contracts),
+                ("privacy", self.privacy_tools),
+            )
+        }
 
         # Process logger for validation warnings
         self._logger = logger
@@ -318,45 +332,32 @@ class CrossChainAnalyzer:
 
         return patterns
 
-    async def _is_bridge_transfer(self, tx: CrossChainTransaction) -> bool:
-        """Check if transaction is a bridge transfer"""
+    def _is_known_contract(self, tx: CrossChainTransaction, kind: str) -> bool:
+        """Check if the recipient is a known ``kind`` contract on the tx's chain"""
         if not tx.to_address:
             return False
 
-        bridge_contracts = self.bridge_contracts.get(tx.blockchain, {})
-        return tx.to_address.lower() in [
-            addr.lower() for addr in bridge_contracts.values()
-        ]
+        address = tx.to_address.lower()
+        if address in self._contract_sets[kind].get(tx.blockchain, ()):
+            return True
+        match = get_protocol_index().classify(address, tx.blockchain)
+        return match is not None and match.protocol_type == kind
+
+    async def _is_bridge_transfer(self, tx: CrossChainTransaction) -> bool:
+        """Check if transaction is a bridge transfer"""
+        return self._is_known_contract(tx, "bridge")
 
     async def _is_dex_swap(self, tx: CrossChainTransaction) -> bool:
         """Check if transaction is a DEX swap"""
-        if not tx.to_address:
-            return False
-
-        dex_contracts = self.dex_contracts.get(tx.blockchain, {})
-        return tx.to_address.lower() in [
-            addr.lower() for addr in dex_contracts.values()
-        ]
+        return self._is_known_contract(tx, "dex")
 
     async def _is_mixer_usage(self, tx: CrossChainTransaction) -> bool:
         """Check if transaction uses a mixer"""
-        if not tx.to_address:
-            return False
-
-        mixer_contracts = self.mixer_contracts.get(tx.blockchain, {})
-        return tx.to_address.lower() in [
-            addr.lower() for addr in mixer_contracts.values()
-        ]
+        return self._is_known_contract(tx, "mixer")
 
     async def _is_privacy_tool_usage(self, tx: CrossChainTransaction) -> bool:
         """Check if transaction uses privacy tools"""
-        if not tx.to_address:
-            return False
-
-        privacy_tools = self.privacy_tools.get(tx.blockchain, {})
-        return tx.to_address.lower() in [
-            addr.lower() for addr in privacy_tools.values()
-        ]
+        return self._is_known_contract(tx, "privacy")
 
     async def _is_large_amount(self, tx: CrossChainTransaction) -> bool:
         """Check if transaction amount is large"""
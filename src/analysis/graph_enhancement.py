@@ -8,7 +8,6 @@ import json
 import logging
 import uuid
 from collections import Counter
-from collections import defaultdict
 from dataclasses import dataclass
 from dataclasses import field
 from datetime import datetime
@@ -24,6 +23,10 @@ from typing import Tuple
 import networkx as nx
 import numpy as np
 
+from src.utils import graph_kernels
+from src.utils.compute_executor import get_compute_executor
+from src.utils.graph_kernels import CompactGraph
+
 logger = logging.getLogger(__name__)
 
 
@@ -349,34 +352,19 @@ class GraphEnhancementTools:
         start_time = datetime.now(timezone.utc)
 
         try:
-            if algorithm == "louvain":
-                import community as community_louvain
-
-                communities = community_louvain.best_partition(graph)
-                modularity = community_louvain.modularity(communities, graph)
-            elif algorithm == "label_propagation":
-                communities_list = nx.community.label_propagation_communities(graph)
-                communities = {
-                    node: i for i, comm in enumerate(communities_list) for node in comm
-                }
-                modularity = nx.community.modularity(graph, communities_list)
-            else:
-                # Default to simple connected components
-                communities = {}
-                for i, component in enumerate(nx.connected_components(graph)):
-                    for node in component:
-                        communities[node] = i
-                modularity = 0.0
-
-            # Group nodes by community
-            community_groups = defaultdict(list)
-            for node, community_id in communities.items():
-                community_groups[community_id].append(node)
+            partition = await get_compute_executor().run(
+                graph_kernels.detect_communities,
+                CompactGraph.from_networkx(graph),
+                algorithm,
+                size=graph.number_of_nodes() + graph.number_of_edges(),
+            )
+            community_groups = partition["communities"]
+            modularity = partition["modularity"]
 
             processing_time = (datetime.now(timezone.utc) - start_time).total_seconds()
 
             result = {
-                "communities": dict(community_groups),
+                "communities": community_groups,
                 "modularity": modularity,
                 "community_count": len(community_groups),
                 "algorithm": algorithm,
@@ -401,22 +389,12 @@ class GraphEnhancementTools:
 
         graph = self.graphs[graph_id]
 
-        centrality_measures = {
-            "degree": nx.degree_centrality(graph),
-            "betweenness": nx.betweenness_centrality(graph),
-            "closeness": nx.closeness_centrality(graph),
-            "pagerank": nx.pagerank(graph),
-        }
-
-        central_nodes = {}
-        for measure_name, centrality_values in centrality_measures.items():
-            # Sort by centrality score and get top k
-            sorted_nodes = sorted(
-                centrality_values.items(), key=lambda x: x[1], reverse=True
-            )
-            central_nodes[measure_name] = [node for node, score in sorted_nodes[:top_k]]
-
-        return central_nodes
+        return await get_compute_executor().run(
+            graph_kernels.central_nodes,
+            CompactGraph.from_networkx(graph),
+            top_k,
+            size=graph.number_of_nodes() + graph.number_of_edges(),
+        )
 
     async def detect_anomalies(
         self, graph_id: str, method: str = "statistical"
@@ -490,25 +468,16 @@ class GraphEnhancementTools:
 
         graph = self.graphs[graph_id]
 
-        layout_functions = {
-            "spring": nx.spring_layout,
-            "circular": nx.circular_layout,
-            "random": nx.random_layout,
-            "shell": nx.shell_layout,
-            "kamada_kawai": nx.kamada_kawai_layout,
-        }
-
-        if layout_algorithm not in layout_functions:
+        if layout_algorithm not in graph_kernels.LAYOUT_FUNCTIONS:
             layout_algorithm = "spring"
 
         try:
-            pos = layout_functions[layout_algorithm](graph)
-
-            # Convert positions to serializable format
-            positions = {
-                node: {"x": float(pos[node][0]), "y": float(pos[node][1])}
-                for node in pos
-            }
+            positions = await get_compute_executor().run(
+                graph_kernels.graph_layout,
+                CompactGraph.from_networkx(graph),
+                layout_algorithm,
+                size=graph.number_of_nodes() + graph.number_of_edges(),
+            )
 
             return {
                 "layout": positions,
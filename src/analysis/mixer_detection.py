@@ -22,6 +22,7 @@ from typing import Tuple
 from src.api.config import settings
 from src.api.database import get_neo4j_session
 from src.api.database import get_redis_connection
+from src.services.transaction_history import get_transaction_history_loader
 
 from .cross_chain import CrossChainAnalyzer
 from .cross_chain import TransactionPattern
@@ -297,32 +298,11 @@ class MixerDetector:
     async def _get_address_transactions(
         self, address: str, blockchain: str, time_range: int
     ) -> List[Dict]:
-        """Get transactions for address within time range"""
-        query = """
-        MATCH (a:Address {address: $address, blockchain: $blockchain})-[r:SENT]->(t:Transaction)
-        WHERE t.timestamp > datetime() - duration({hours: $time_range})
-        RETURN t {
-            .hash,
-            .blockchain,
-            .from_address,
-            .to_address,
-            .value,
-            .timestamp,
-            .block_number,
-            .gas_used,
-            .fee
-        } as tx_data
-        ORDER BY t.timestamp ASC
-        """
-
-        async with get_neo4j_session() as session:
-            result = await session.run(
-                query, address=address, blockchain=blockchain, time_range=time_range
-            )
-            transactions = []
-            async for record in result:
-                transactions.append(record["tx_data"])
-            return transactions
+        """Get transactions sent by address within time range from the shared history"""
+        history = await get_transaction_history_loader().get_history(
+            address, blockchain, time_range
+        )
+        return history.sent()
 
     async def _identify_mixer_transaction(self, tx: Dict) -> Optional[MixerTransaction]:
         """Identify if transaction is to a mixer"""
@@ -22,9 +22,12 @@ from typing import Set
 from typing import Tuple
 from typing import Union
 
+import numpy as np
+
 from src.api.config import settings
 from src.api.database import get_neo4j_session
 from src.api.database import get_redis_connection
+from src.services.transaction_history import get_transaction_history_loader
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +60,40 @@ class RiskLevel(Enum):
     CRITICAL = "critical"
 
 
+# AddressFeatures fields used by the similarity measure, in feature matrix order
+SIMILARITY_FEATURES = (
+    "transaction_count",
+    "avg_transaction_frequency",
+    "total_sent",
+    "avg_transaction_amount",
+    "active_days",
+    "unique_counterparties",
+    "mixer_usage",
+    "privacy_tool_usage",
+    "bridge_usage",
+    "dex_usage",
+)
+
+# Terms of MLClusteringEngine._calculate_similarity as (gate feature, compared
+# feature, denominator floor, weight); a term only counts when both addresses
+# have a positive gate feature.  The floor is a tiny positive number instead of
+# zero where the gate already rules out a zero denominator.
+_RATIO_SIMILARITIES = (
+    ("transaction_count", "avg_transaction_frequency", 1.0, 0.2),
+    ("total_sent", "avg_transaction_amount", 1.0, 0.2),
+    ("active_days", "active_days", np.finfo(np.float32).tiny, 0.15),
+    ("unique_counterparties", "unique_counterparties", np.finfo(np.float32).tiny, 0.15),
+)
+
+# Behavioural flags score 0.25 each when equal, weighted 0.3 overall; indexed
+# by the XOR of two addresses' flag bitmasks
+_BEHAVIOUR_FLAGS = ("mixer_usage", "privacy_tool_usage", "bridge_usage", "dex_usage")
+_BEHAVIOUR_SIMILARITY = np.array(
+    [(len(_BEHAVIOUR_FLAGS) - bin(xor).count("1")) * 0.25 * 0.3 for xor in range(16)],
+    dtype=np.float32,
+)
+
+
 @dataclass
 class AddressFeatures:
     """Address features for ML analysis"""
@@ -152,6 +189,9 @@ class MLClusteringEngine:
         self.min_cluster_size = 3
         self.similarity_threshold = 0.7
         self.max_cluster_size = 1000
+        self.max_cluster_neighbours = 32
+        self.similarity_block_size = 256
+        self.feature_extraction_concurrency = 16
 
         # Cache for analysis results
         self.feature_cache = {}
@@ -350,32 +390,11 @@ class MLClusteringEngine:
     async def _get_address_transactions(
         self, address: str, blockchain: str, time_range: int
     ) -> List[Dict]:
-        """Get transactions for address within time range"""
-        query = """
-        MATCH (a:Address {address: $address, blockchain: $blockchain})-[r:SENT|RECEIVED]->(t:Transaction)
-        WHERE t.timestamp > datetime() - duration({hours: $time_range})
-        RETURN t {
-            .hash,
-            .blockchain,
-            .from_address,
-            .to_address,
-            .value,
-            .timestamp,
-            .block_number,
-            .fee,
-            .token_symbol
-        } as tx_data
-        ORDER BY t.timestamp ASC
-        """
-
-        async with get_neo4j_session() as session:
-            result = await session.run(
-                query, address=address, blockchain=blockchain, time_range=time_range
-            )
-            transactions = []
-            async for record in result:
-                transactions.append(record["tx_data"])
-            return transactions
+        """Get transactions for address within time range from the shared history"""
+        history = await get_transaction_history_loader().get_history(
+            address, blockchain, time_range
+        )
+        return history.all()
 
     async def _check_mixer_usage(self, transactions: List[Dict]) -> bool:
         """Check if address uses mixers"""
@@ -619,17 +638,22 @@ class MLClusteringEngine:
     ) -> List[AddressCluster]:
         """Cluster addresses based on similarity"""
         try:
-            # Extract features for all addresses
-            features_dict = {}
-            for address in addresses:
-                features = await self.extract_address_features(address, blockchain)
-                features_dict[address] = features
+            # Extract features for all addresses concurrently
+            semaphore = asyncio.Semaphore(self.feature_extraction_concurrency)
+
+            async def extract(address: str) -> AddressFeatures:
+                async with semaphore:
+                    return await self.extract_address_features(address, blockchain)
 
-            # Calculate similarity matrix
-            similarity_matrix = await self._calculate_similarity_matrix(features_dict)
+            features_list = await asyncio.gather(
+                *(extract(address) for address in addresses)
+            )
+            features_dict = dict(zip(addresses, features_list))
 
-            # Perform clustering (simplified hierarchical clustering)
-            clusters = await self._perform_clustering(addresses, similarity_matrix)
+            # Cluster on the packed feature matrix off the event loop
+            clusters = await asyncio.to_thread(
+                self._perform_clustering, addresses, features_list
+            )
 
             # Create cluster objects
             cluster_objects = []
@@ -646,26 +670,6 @@ class MLClusteringEngine:
             logger.error(f"Error clustering addresses: {e}")
             return []
 
-    async def _calculate_similarity_matrix(
-        self, features_dict: Dict[str, AddressFeatures]
-    ) -> Dict[str, Dict[str, float]]:
-        """Calculate similarity matrix between addresses"""
-        similarity_matrix = {}
-        addresses = list(features_dict.keys())
-
-        for i, addr1 in enumerate(addresses):
-            similarity_matrix[addr1] = {}
-            for j, addr2 in enumerate(addresses):
-                if i == j:
-                    similarity_matrix[addr1][addr2] = 1.0
-                else:
-                    similarity = await self._calculate_similarity(
-                        features_dict[addr1], features_dict[addr2]
-                    )
-                    similarity_matrix[addr1][addr2] = similarity
-
-        return similarity_matrix
-
     async def _calculate_similarity(
         self, features1: AddressFeatures, features2: AddressFeatures
     ) -> float:
@@ -728,37 +732,135 @@ class MLClusteringEngine:
 
         return similarity / total_weight if total_weight > 0 else 0.0
 
-    async def _perform_clustering(
-        self, addresses: List[str], similarity_matrix: Dict[str, Dict[str, float]]
-    ) -> Dict[str, List[str]]:
-        """Perform hierarchical clustering"""
-        clusters = {}
-        assigned = set()
-        cluster_id = 0
+    @staticmethod
+    def _feature_matrix(features_list: List[AddressFeatures]) -> np.ndarray:
+        """Pack ``SIMILARITY_FEATURES`` of each address into one row"""
+        return np.array(
+            [
+                [float(getattr(features, name)) for name in SIMILARITY_FEATURES]
+                for features in features_list
+            ],
+            dtype=np.float32,
+        ).reshape(len(features_list), len(SIMILARITY_FEATURES))
+
+    def _similarity_block(
+        self, matrix: np.ndarray, start: int, stop: int
+    ) -> np.ndarray:
+        """Similarity of rows ``start:stop`` of a packed feature matrix to all rows.
+
+        Vectorised form of ``_calculate_similarity``; the result has shape
+        ``(stop - start, len(matrix))``.  Works in place on a few block-sized
+        float32 buffers.
+        """
+        column = {name: i for i, name in enumerate(SIMILARITY_FEATURES)}
+        shape = (stop - start, len(matrix))
+        similarity = np.zeros(shape, dtype=np.float32)
+        total_weight = np.full(shape, 0.3, dtype=np.float32)
+        scratch = np.empty(shape, dtype=np.float32)
+        denominator = np.empty(shape, dtype=np.float32)
+
+        mask = np.empty(shape, dtype=np.float32)
+
+        for gate, name, floor, weight in _RATIO_SIMILARITIES:
+            gates = (matrix[:, column[gate]] > 0).astype(np.float32)
+            np.multiply(gates[start:stop, None], gates[None, :], out=mask)
+            values = matrix[:, column[name]]
+            rows, cols = values[start:stop, None], values[None, :]
+
+            # 1 - |a - b| / max(a, b, floor), counted only where both gates hold
+            np.subtract(rows, cols, out=scratch)
+            np.abs(scratch, out=scratch)
+            np.maximum(rows, cols, out=denominator)
+            np.maximum(denominator, floor, out=denominator)
+            np.divide(scratch, denominator, out=scratch)
+            np.subtract(1, scratch, out=scratch)
+            np.multiply(scratch, mask, out=scratch)
+            similarity += weight * scratch
+            total_weight += weight * mask
+
+        # Behavioural flags always count: compare them all at once as bits
+        flags = [column[name] for name in _BEHAVIOUR_FLAGS]
+        bits = ((matrix[:, flags] > 0) @ (1 << np.arange(len(flags)))).astype(np.uint8)
+        similarity += np.take(
+            _BEHAVIOUR_SIMILARITY, bits[start:stop, None] ^ bits[None, :]
+        )
 
-        for address in addresses:
-            if address in assigned:
-                continue
+        np.divide(similarity, total_weight, out=similarity)
+        return similarity
 
-            # Find similar addresses
-            similar_addresses = [address]
-            for other_addr in addresses:
-                if other_addr == address:
-                    continue
-                if (
-                    other_addr not in assigned
-                    and similarity_matrix[address][other_addr]
-                    > self.similarity_threshold
-                ):
-                    similar_addresses.append(other_addr)
-                    assigned.add(other_addr)
+    def _neighbour_pairs(
+        self, matrix: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Strongest neighbours of every address above ``similarity_threshold``.
 
-            if len(similar_addresses) >= self.min_cluster_size:
-                clusters[f"cluster_{cluster_id}"] = similar_addresses
-                cluster_id += 1
+        Similarities are computed ``similarity_block_size`` rows at a time and
+        each row keeps at most ``max_cluster_neighbours`` neighbours, so memory
+        grows linearly with the number of addresses.  Returns parallel arrays
+        ``(similarity, i, j)``.
+        """
+        n = len(matrix)
+        k = min(self.max_cluster_neighbours, n - 1)
+        similarities, sources, targets = [], [], []
+        if k <= 0:
+            return np.array([]), np.array([], dtype=int), np.array([], dtype=int)
+
+        for start in range(0, n, self.similarity_block_size):
+            stop = min(start + self.similarity_block_size, n)
+            block = self._similarity_block(matrix, start, stop)
+            block[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+            nearest = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            rows = np.repeat(np.arange(start, stop), k)
+            cols = nearest.ravel()
+            values = block[rows - start, cols]
+            keep = values > self.similarity_threshold
+            similarities.append(values[keep])
+            sources.append(rows[keep])
+            targets.append(cols[keep])
+
+        return (
+            np.concatenate(similarities),
+            np.concatenate(sources),
+            np.concatenate(targets),
+        )
 
-            assigned.add(address)
+    def _perform_clustering(
+        self, addresses: List[str], features_list: List[AddressFeatures]
+    ) -> Dict[str, List[str]]:
+        """Union-find clustering over thresholded nearest neighbours
 
+        Pairs are merged strongest first; a merge that would exceed
+        ``max_cluster_size`` is skipped so weak chains cannot collapse
+        everything into one cluster.
+        """
+        matrix = self._feature_matrix(features_list)
+        parent = list(range(len(addresses)))
+        size = [1] * len(addresses)
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        similarities, sources, targets = self._neighbour_pairs(matrix)
+        for index in np.argsort(-similarities, kind="stable"):
+            a, b = find(int(sources[index])), find(int(targets[index]))
+            if a == b or size[a] + size[b] > self.max_cluster_size:
+                continue
+            if size[a] < size[b]:
+                a, b = b, a
+            parent[b] = a
+            size[a] += size[b]
+
+        members: Dict[int, List[str]] = {}
+        for i, address in enumerate(addresses):
+            members.setdefault(find(i), []).append(address)
+
+        clusters = {}
+        for group in members.values():
+            if len(group) >= self.min_cluster_size:
+                clusters[f"cluster_{len(clusters)}"] = group
         return clusters
 
     async def _create_cluster(
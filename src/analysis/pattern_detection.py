@@ -13,6 +13,7 @@ from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 from enum import Enum
+from itertools import islice
 from typing import Any
 from typing import Dict
 from typing import List
@@ -23,9 +24,16 @@ from typing import Tuple
 from src.api.config import settings
 from src.api.database import get_neo4j_session
 from src.api.database import get_redis_connection
+from src.services.transaction_history import get_transaction_history_loader
+from src.utils.temporal_cycles import TemporalEdge
+from src.utils.temporal_cycles import iter_temporal_cycles
+from src.utils.temporal_cycles import temporal_components
+from src.utils.temporal_cycles import to_epoch
+from src.utils.time_window import sweep_groups
 
 from .cross_chain import CrossChainAnalyzer
 from .cross_chain import TransactionPattern
+from .protocol_registry import get_protocol_index
 
 logger = logging.getLogger(__name__)
 
@@ -95,6 +103,10 @@ class MLPatternDetector:
         self.off_peak_end = 6  # 6 AM
         self.rapid_switch_threshold = timedelta(minutes=30)
         self.synchronized_tolerance = timedelta(minutes=5)
+        self.circular_max_hops = 6
+        self.circular_time_window = timedelta(hours=72)
+        self.circular_max_paths = 100
+        self.circular_neighbour_limit = 100  # addresses loaded per hop
 
         # Known suspicious addresses
         self.suspicious_addresses = set()
@@ -123,7 +135,9 @@ class MLPatternDetector:
             pattern_matches.extend(await self._detect_structuring(transactions))
             pattern_matches.extend(await self._detect_layering(transactions))
             pattern_matches.extend(await self._detect_integration(transactions))
-            pattern_matches.extend(await self._detect_circular_trading(transactions))
+            pattern_matches.extend(
+                await self._detect_circular_trading(address, blockchain, time_range)
+            )
             pattern_matches.extend(await self._detect_mixer_usage(transactions))
             pattern_matches.extend(await self._detect_privacy_tool_usage(transactions))
             pattern_matches.extend(await self._detect_bridge_hopping(transactions))
@@ -154,33 +168,11 @@ class MLPatternDetector:
     async def _get_address_transactions(
         self, address: str, blockchain: str, time_range: int
     ) -> List[Dict]:
-        """Get transactions for address within time range"""
-        query = """
-        MATCH (a:Address {address: $address, blockchain: $blockchain})-[r:SENT]->(t:Transaction)
-        WHERE t.timestamp > datetime() - duration({hours: $time_range})
-        RETURN t {
-            .hash,
-            .blockchain,
-            .from_address,
-            .to_address,
-            .value,
-            .timestamp,
-            .block_number,
-            .gas_used,
-            .fee,
-            .token_symbol
-        } as tx_data
-        ORDER BY t.timestamp ASC
-        """
-
-        async with get_neo4j_session() as session:
-            result = await session.run(
-                query, address=address, blockchain=blockchain, time_range=time_range
-            )
-            transactions = []
-            async for record in result:
-                transactions.append(record["tx_data"])
-            return transactions
+        """Get transactions sent by address within time range from the shared history"""
+        history = await get_transaction_history_loader().get_history(
+            address, blockchain, time_range
+        )
+        return history.sent()
 
     async def _detect_structuring(self, transactions: List[Dict]) -> List[PatternMatch]:
         """Detect structuring pattern (breaking large amounts into smaller transactions)"""
@@ -325,13 +317,20 @@ class MLPatternDetector:
         return pattern_matches
 
     async def _detect_circular_trading(
-        self, transactions: List[Dict]
+        self, address: str, blockchain: str, time_range: int
     ) -> List[PatternMatch]:
-        """Detect circular trading pattern"""
+        """Detect circular trading pattern
+
+        A round trip runs through other addresses, so the search covers the
+        transfers of the address's multi-hop neighbourhood, not just its own.
+        """
         pattern_matches = []
 
         # Look for circular transaction patterns
-        circular_paths = self._find_circular_paths(transactions)
+        transactions = await self._get_circular_neighbourhood(
+            address, blockchain, time_range
+        )
+        circular_paths = self._find_circular_paths(transactions, through=address)
 
         for path in circular_paths:
             if len(path) >= 3:
@@ -384,10 +383,15 @@ class MLPatternDetector:
         pattern_matches = []
 
         # Check for transactions to known mixers
-        mixer_checks = await asyncio.gather(
-            *(self._is_mixer_transaction(tx) for tx in transactions)
+        matches = get_protocol_index().classify_many(
+            tx.get("to_address") for tx in transactions
         )
-        mixer_txs = [tx for tx, is_mixer in zip(transactions, mixer_checks) if is_mixer]
+        mixer_txs = [
+            tx
+            for tx, match in zip(transactions, matches)
+            if tx.get("to_address") in self.known_mixers
+            or (match is not None and match.protocol_type == "mixer")
+        ]
 
         if mixer_txs:
             total_amount = sum(tx["value"] for tx in mixer_txs)
@@ -674,42 +678,39 @@ class MLPatternDetector:
         """Detect synchronized transfers pattern"""
         pattern_matches = []
 
-        # Look for transfers happening at the same time
-        time_groups = {}
-        for tx in transactions:
-            # Round to nearest 5 minutes
-            time_key = tx["timestamp"].replace(second=0, microsecond=0)
-            time_key = time_key - timedelta(minutes=time_key.minute % 5)
-
-            if time_key not in time_groups:
-                time_groups[time_key] = []
-            time_groups[time_key].append(tx)
-
-        for time_key, time_txs in time_groups.items():
-            if len(time_txs) >= 3:
-                total_amount = sum(tx["value"] for tx in time_txs)
-                confidence = min(len(time_txs) / 5.0, 1.0)
-                risk_score = 0.4 + (len(time_txs) / 20)
+        # Group transfers starting within the tolerance of each other
+        for time_txs in sweep_groups(
+            transactions,
+            timestamp=lambda tx: tx["timestamp"].timestamp(),
+            amount=lambda tx: tx["value"],
+            window=self.synchronized_tolerance,
+            amount_tolerance=None,
+            min_group_size=3,
+        ):
+            time_key = time_txs[0]["timestamp"]
+            total_amount = sum(tx["value"] for tx in time_txs)
+            confidence = min(len(time_txs) / 5.0, 1.0)
+            risk_score = 0.4 + (len(time_txs) / 20)
 
-                pattern_match = PatternMatch(
-                    pattern_type=MLPatternType.SYNCHRONIZED_TRANSFERS,
-                    confidence=confidence,
-                    risk_score=min(risk_score, 1.0),
-                    evidence=[
-                        {
-                            "synchronized_time": time_key,
-                            "transaction_count": len(time_txs),
-                            "total_amount": total_amount,
-                            "transactions": [
-                                {"hash": tx["hash"], "amount": tx["value"]}
-                                for tx in time_txs
-                            ],
-                        }
-                    ],
-                    description=f"Synchronized transfers detected: {len(time_txs)} transactions at {time_key}",
-                    severity="medium",
-                )
-                pattern_matches.append(pattern_match)
+            pattern_match = PatternMatch(
+                pattern_type=MLPatternType.SYNCHRONIZED_TRANSFERS,
+                confidence=confidence,
+                risk_score=min(risk_score, 1.0),
+                evidence=[
+                    {
+                        "synchronized_time": time_key,
+                        "transaction_count": len(time_txs),
+                        "total_amount": total_amount,
+                        "transactions": [
+                            {"hash": tx["hash"], "amount": tx["value"]}
+                            for tx in time_txs
+                        ],
+                    }
+                ],
+                description=f"Synchronized transfers detected: {len(time_txs)} transactions at {time_key}",
+                severity="medium",
+            )
+            pattern_matches.append(pattern_match)
 
         return pattern_matches
 
@@ -841,16 +842,93 @@ class MLPatternDetector:
                 chains.append(chain)
         return chains
 
-    def _find_circular_paths(self, transactions: List[Dict]) -> List[List[Dict]]:
-        """Find circular transaction paths"""
-        paths = []
-        # Simplified implementation - in production, use graph algorithms
-        for i in range(len(transactions) - 2):
-            path = [transactions[i], transactions[i + 1], transactions[i + 2]]
-            # Check if this forms a circular path
-            if path[0]["from_address"] == path[2]["to_address"]:
-                paths.append(path)
-        return paths
+    async def _get_circular_neighbourhood(
+        self, address: str, blockchain: str, time_range: int
+    ) -> List[Dict]:
+        """Transfers of the address and its counterparties, hop by hop.
+
+        A cycle of ``circular_max_hops`` transfers through the address has
+        every transfer touching an address at most ``(circular_max_hops - 1)
+        // 2`` hops away, so that many rings of counterparty histories are
+        loaded, at most ``circular_neighbour_limit`` addresses per ring.
+        """
+        loader = get_transaction_history_loader()
+        root = await loader.get_history(address, blockchain, time_range)
+
+        transactions: Dict[Tuple, Dict] = {}
+        frontier: List[Optional[str]] = []
+        for tx, counterparty in zip(root.transactions, root.columns.counterparties):
+            transactions.setdefault(self._transfer_key(tx), tx)
+            frontier.append(counterparty)
+
+        seen = {address}
+        for _ in range((self.circular_max_hops - 1) // 2):
+            ring = [a for a in dict.fromkeys(frontier) if a and a not in seen]
+            ring = ring[: self.circular_neighbour_limit]
+            if not ring:
+                break
+            seen.update(ring)
+
+            histories = await loader.get_histories(ring, blockchain, time_range)
+            frontier = []
+            for history in histories.values():
+                for tx, counterparty in zip(
+                    history.transactions, history.columns.counterparties
+                ):
+                    transactions.setdefault(self._transfer_key(tx), tx)
+                    frontier.append(counterparty)
+
+        return list(transactions.values())
+
+    @staticmethod
+    def _transfer_key(tx: Dict) -> Tuple:
+        return (tx.get("hash"), tx.get("from_address"), tx.get("to_address"))
+
+    def _find_circular_paths(
+        self, transactions: List[Dict], through: Optional[str] = None
+    ) -> List[List[Dict]]:
+        """Find circular transaction paths
+
+        Real round trips only: funds must return to their origin within
+        ``circular_max_hops`` transfers and ``circular_time_window``, with
+        each transfer no earlier than the one before it.  With ``through``
+        only cycles passing that address are reported.  Enumeration stops
+        after ``circular_max_paths`` cycles.
+        """
+        edges = []
+        for tx in transactions:
+            timestamp = to_epoch(tx.get("timestamp"))
+            if tx.get("from_address") and tx.get("to_address") and timestamp:
+                edges.append(
+                    TemporalEdge(tx["from_address"], tx["to_address"], timestamp, tx)
+                )
+
+        if through is not None:
+            # Only the strongly connected component of ``through`` can hold
+            # cycles passing it
+            components = [
+                component
+                for component in temporal_components(edges)
+                if any(edge.source == through for edge in component)
+            ]
+            edges = components[0] if components else []
+
+        cycles = iter_temporal_cycles(
+            edges,
+            max_length=self.circular_max_hops,
+            max_span=self.circular_time_window,
+            min_length=3,
+        )
+        if through is not None:
+            cycles = (
+                cycle
+                for cycle in cycles
+                if any(edge.source == through for edge in cycle)
+            )
+        return [
+            [edge.payload for edge in cycle]
+            for cycle in islice(cycles, self.circular_max_paths)
+        ]
 
     def _is_round_amount(self, amount: float) -> bool:
         """Check if amount is a round number"""
@@ -875,8 +953,11 @@ class MLPatternDetector:
 
     async def _is_mixer_transaction(self, tx: Dict) -> bool:
         """Check if transaction is to a mixer"""
-        # Check against known mixer addresses
-        return tx["to_address"] in self.known_mixers
+        # Check against known mixer addresses and the protocol registry
+        if tx["to_address"] in self.known_mixers:
+            return True
+        match = get_protocol_index().classify(tx["to_address"])
+        return match is not None and match.protocol_type == "mixer"
 
     async def _is_privacy_tool_transaction(self, tx: Dict) -> bool:
         """Check if transaction is to a privacy tool"""
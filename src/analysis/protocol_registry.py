@@ -19,12 +19,19 @@ Protocol types:
 
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass
 from dataclasses import field
+from types import MappingProxyType
 from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
 from typing import List
+from typing import Mapping
+from typing import NamedTuple
 from typing import Optional
 from typing import Set
+from typing import Tuple
 
 # ---------------------------------------------------------------------------
 # Data model
@@ -740,6 +747,119 @@ for _p in _PROTOCOLS:
             _BY_ADDRESS[_addr.lower()] = _p
 
 
+# ---------------------------------------------------------------------------
+# Compiled address classification index
+# ---------------------------------------------------------------------------
+
+
+class ProtocolMatch(NamedTuple):
+    protocol_type: str
+    risk_level: str
+    protocol: str
+
+
+class ProtocolIndex:
+    """Frozen lowercased-address → ``ProtocolMatch`` lookup, per chain.
+
+    Built from the registry plus any external labels (see
+    ``set_external_labels``); registry entries win over labels.  The index
+    records the registry ``version`` it was compiled from and
+    ``get_protocol_index`` recompiles it once that version moves on.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        protocols: List[Protocol],
+        labels: Dict[Tuple[str, str], ProtocolMatch],
+    ):
+        self.version = version
+        by_chain: Dict[str, Dict[str, ProtocolMatch]] = defaultdict(dict)
+        any_chain: Dict[str, ProtocolMatch] = {}
+
+        for (chain, address), match in labels.items():
+            by_chain[chain.lower()][address.lower()] = match
+            any_chain[address.lower()] = match
+        for p in protocols:
+            match = ProtocolMatch(p.protocol_type, p.risk_level, p.name)
+            for chain, addrs in p.addresses.items():
+                for addr in addrs:
+                    by_chain[chain.lower()][addr.lower()] = match
+                    any_chain[addr.lower()] = match
+
+        self._by_chain: Mapping[str, Mapping[str, ProtocolMatch]] = MappingProxyType(
+            {chain: MappingProxyType(table) for chain, table in by_chain.items()}
+        )
+        self._any_chain: Mapping[str, ProtocolMatch] = MappingProxyType(any_chain)
+        self._by_type: Dict[str, FrozenSet[str]] = {}
+
+    def _table(self, chain: Optional[str]) -> Mapping[str, ProtocolMatch]:
+        if chain is None:
+            return self._any_chain
+        return self._by_chain.get(chain.lower(), _EMPTY_TABLE)
+
+    def classify(
+        self, address: Optional[str], chain: Optional[str] = None
+    ) -> Optional[ProtocolMatch]:
+        """Match for ``address`` on ``chain``, or on any chain if None"""
+        if not address:
+            return None
+        return self._table(chain).get(address.lower())
+
+    def classify_many(
+        self, addresses: Iterable[Optional[str]], chain: Optional[str] = None
+    ) -> List[Optional[ProtocolMatch]]:
+        """``classify`` for each address, in order, with one table lookup"""
+        get = self._table(chain).get
+        return [get(address.lower()) if address else None for address in addresses]
+
+    def addresses_of_type(self, protocol_type: str) -> FrozenSet[str]:
+        """Every address, on any chain, classified as ``protocol_type``"""
+        addresses = self._by_type.get(protocol_type)
+        if addresses is None:
+            addresses = frozenset(
+                address
+                for address, match in self._any_chain.items()
+                if match.protocol_type == protocol_type
+            )
+            self._by_type[protocol_type] = addresses
+        return addresses
+
+
+_EMPTY_TABLE: Mapping[str, ProtocolMatch] = MappingProxyType({})
+_registry_version = 0
+_external_labels: Dict[Tuple[str, str], ProtocolMatch] = {}
+_index: Optional[ProtocolIndex] = None
+
+
+def get_protocol_index() -> ProtocolIndex:
+    """Return the classification index, recompiling it if the registry changed."""
+    global _index
+    index = _index
+    if index is None or index.version != _registry_version:
+        index = ProtocolIndex(_registry_version, _PROTOCOLS, _external_labels)
+        _index = index
+    return index
+
+
+def register_protocol(protocol: Protocol) -> None:
+    """Add a protocol to the registry at runtime."""
+    global _registry_version
+    _PROTOCOLS.append(protocol)
+    _BY_NAME[protocol.name.lower()] = protocol
+    for addrs in protocol.addresses.values():
+        for addr in addrs:
+            _BY_ADDRESS[addr.lower()] = protocol
+    _registry_version += 1
+
+
+def set_external_labels(labels: Dict[Tuple[str, str], ProtocolMatch]) -> None:
+    """Replace the (chain, address) labels loaded from outside the registry."""
+    global _external_labels, _registry_version
+    _external_labels = dict(labels)
+    _registry_version += 1
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -760,37 +880,19 @@ def get_protocols_by_type(protocol_type: str) -> List[Protocol]:
     return [p for p in _PROTOCOLS if p.protocol_type == protocol_type]
 
 
-def get_known_bridge_addresses() -> Set[str]:
+def get_known_bridge_addresses() -> FrozenSet[str]:
     """Return all known bridge contract addresses (lowercase)."""
-    return {
-        addr.lower()
-        for p in _PROTOCOLS
-        if p.protocol_type == "bridge"
-        for addrs in p.addresses.values()
-        for addr in addrs
-    }
+    return get_protocol_index().addresses_of_type("bridge")
 
 
-def get_known_dex_addresses() -> Set[str]:
+def get_known_dex_addresses() -> FrozenSet[str]:
     """Return all known DEX contract addresses (lowercase)."""
-    return {
-        addr.lower()
-        for p in _PROTOCOLS
-        if p.protocol_type == "dex"
-        for addrs in p.addresses.values()
-        for addr in addrs
-    }
+    return get_protocol_index().addresses_of_type("dex")
 
 
-def get_known_mixer_addresses() -> Set[str]:
+def get_known_mixer_addresses() -> FrozenSet[str]:
     """Return all known mixer contract addresses (lowercase)."""
-    return {
-        addr.lower()
-        for p in _PROTOCOLS
-        if p.protocol_type == "mixer"
-        for addrs in p.addresses.values()
-        for addr in addrs
-    }
+    return get_protocol_index().addresses_of_type("mixer")
 
 
 def get_high_risk_addresses() -> Set[str]:
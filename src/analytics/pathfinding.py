@@ -13,6 +13,7 @@ from datetime import timedelta
 from datetime import timezone
 from typing import Any
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Set
@@ -20,7 +21,14 @@ from typing import Tuple
 
 import networkx as nx
 
+from src.api.database import get_neo4j_session
 from src.api.database import get_postgres_connection
+from src.utils import graph_kernels
+from src.utils.compute_executor import get_compute_executor
+from src.utils.graph_kernels import CompactGraph
+from src.utils.temporal_cycles import TemporalEdge
+from src.utils.temporal_cycles import temporal_components
+from src.utils.temporal_cycles import to_epoch
 
 from .models import PathfindingAlgorithm
 from .models import PathfindingRequest
@@ -31,6 +39,44 @@ from .models import TransactionPath
 
 logger = logging.getLogger(__name__)
 
+# One hop of a frontier expansion.  The per-address subquery keeps the
+# largest transfers of each address so high-degree hubs stay bounded.
+_NEIGHBOURS_FILTER = """
+    WHERE t.timestamp >= $since
+      AND ($max_value IS NULL OR toFloat(t.value) <= $max_value)
+    RETURN a.address AS from_address,
+           b.address AS to_address,
+           t.hash AS hash,
+           toFloat(t.value) AS amount,
+           t.timestamp AS timestamp
+    ORDER BY amount DESC
+    LIMIT $per_address
+}
+RETURN from_address, to_address, hash, amount, timestamp
+"""
+
+NEIGHBOURS_OUT_QUERY = (
+    """
+UNWIND $addresses AS addr
+CALL {
+    WITH addr
+    MATCH (a:Address {address: addr, blockchain: $blockchain})
+          -[:SENT]->(t:Transaction)-[:RECEIVED]->(b:Address)
+"""
+    + _NEIGHBOURS_FILTER
+)
+
+NEIGHBOURS_IN_QUERY = (
+    """
+UNWIND $addresses AS addr
+CALL {
+    WITH addr
+    MATCH (a:Address)-[:SENT]->(t:Transaction)
+          -[:RECEIVED]->(b:Address {address: addr, blockchain: $blockchain})
+"""
+    + _NEIGHBOURS_FILTER
+)
+
 
 class MultiRoutePathfinder:
     """Advanced multi-route pathfinding for blockchain transaction analysis"""
@@ -40,6 +86,14 @@ class MultiRoutePathfinder:
         self.max_hops_per_path = 50
         self.cache = {}
         self.cache_ttl = 3600  # 1 hour
+        # Bidirectional search limits
+        self.max_edges_per_address = 100
+        self.max_search_edges = 50000
+        # Funnel analysis stops after this many converging sources
+        self.max_funnel_sources = 10000
+        # Cycle search runs components with at least this many edges in the
+        # compute executor's worker processes
+        self.offloaded_cycle_search_edges = 500
         self._initialized = False
 
     async def initialize(self):
@@ -139,6 +193,7 @@ class MultiRoutePathfinder:
                 request.blockchain,
                 request.max_hops,
                 request.time_window_hours,
+                max_edge_value=request.max_amount,
             )
 
             # Find paths based on algorithm
@@ -178,6 +233,7 @@ class MultiRoutePathfinder:
                     "graph_edges": len(graph.edges()),
                     "cache_hit": False,
                     "algorithm_version": "1.0",
+                    "search": graph.graph.get("search", {}),
                 },
             )
 
@@ -219,49 +275,111 @@ class MultiRoutePathfinder:
         blockchain: str,
         max_hops: int,
         time_window_hours: int,
+        max_edge_value: Optional[float] = None,
     ) -> nx.DiGraph:
-        """Build transaction graph for pathfinding"""
+        """Build the transaction graph between source and target.
+
+        Runs a bidirectional breadth-first search against Neo4j: outgoing
+        transfers are followed from the source and incoming transfers from
+        the target, always expanding the smaller frontier by one hop with a
+        single batched query.  The search stops as soon as the frontiers
+        meet, when ``max_hops`` is used up or when ``max_search_edges`` edges
+        have been fetched.  Transfers outside the time window or above
+        ``max_edge_value`` (they cannot be part of a path whose total stays
+        below it) are pruned in the query.
+
+        Search statistics are stored in ``graph.graph["search"]``.
+        """
 
         graph = nx.DiGraph()
-
-        # Get transactions for source and target addresses
-        source_txs = await self._get_address_transactions(
-            source_address, blockchain, time_window_hours
-        )
-        target_txs = await self._get_address_transactions(
-            target_address, blockchain, time_window_hours
-        )
-
-        # Add source and target nodes
         graph.add_node(source_address, address=source_address, blockchain=blockchain)
         graph.add_node(target_address, address=target_address, blockchain=blockchain)
 
-        # Add transactions from source
-        for tx in source_txs:
-            self._add_transaction_to_graph(graph, tx, blockchain)
-
-        # Add transactions to target
-        for tx in target_txs:
-            self._add_transaction_to_graph(graph, tx, blockchain)
+        since = datetime.now(timezone.utc) - timedelta(hours=time_window_hours)
+        # (frontier, visited, hops expanded) for each side
+        sides = {
+            "out": [{source_address}, {source_address}, 0],
+            "in": [{target_address}, {target_address}, 0],
+        }
+        met = source_address == target_address
+        edges_fetched = 0
+        queries = 0
+
+        while (
+            not met
+            and sides["out"][0]
+            and sides["in"][0]
+            and sides["out"][2] + sides["in"][2] < max_hops
+            and edges_fetched < self.max_search_edges
+        ):
+            direction = "out" if len(sides["out"][0]) <= len(sides["in"][0]) else "in"
+            frontier, visited, _ = sides[direction]
+            other_visited = sides["in" if direction == "out" else "out"][1]
+            next_key = "to_address" if direction == "out" else "from_address"
 
-        # Expand graph with intermediate nodes
-        await self._expand_graph_with_intermediates(
-            graph, blockchain, max_hops, time_window_hours
-        )
+            txs = await self._get_address_transactions(
+                frontier, blockchain, direction, since, max_edge_value
+            )
+            queries += 1
+            edges_fetched += len(txs)
 
+            next_frontier = set()
+            for tx in txs:
+                self._add_transaction_to_graph(graph, tx, blockchain)
+                neighbour = tx[next_key]
+                if neighbour in other_visited:
+                    met = True
+                if neighbour not in visited:
+                    visited.add(neighbour)
+                    next_frontier.add(neighbour)
+
+            sides[direction][0] = next_frontier
+            sides[direction][2] += 1
+
+        graph.graph["search"] = {
+            "frontiers_met": met,
+            "forward_hops": sides["out"][2],
+            "backward_hops": sides["in"][2],
+            "queries": queries,
+            "edges_fetched": edges_fetched,
+            "truncated": edges_fetched >= self.max_search_edges,
+        }
         return graph
 
     async def _get_address_transactions(
-        self, address: str, blockchain: str, time_window_hours: int
+        self,
+        addresses: Set[str],
+        blockchain: str,
+        direction: str,
+        since: datetime,
+        max_edge_value: Optional[float] = None,
     ) -> List[Dict]:
-        """Get transactions for an address within time window"""
+        """Fetch one hop of transfers for a whole frontier in a single query.
 
-        # This would integrate with existing transaction collectors
-        # For now, return empty list as placeholder
-        logger.debug(
-            f"Transaction history not yet implemented for {address} on {blockchain}"
-        )
-        return []
+        ``direction`` is ``"out"`` for transfers sent by ``addresses`` and
+        ``"in"`` for transfers they received.  Each address contributes at
+        most ``max_edges_per_address`` transfers, largest first, so a single
+        exchange hot wallet cannot flood the search.
+        """
+
+        query = NEIGHBOURS_OUT_QUERY if direction == "out" else NEIGHBOURS_IN_QUERY
+
+        async with get_neo4j_session() as session:
+            result = await session.run(
+                query,
+                addresses=list(addresses),
+                blockchain=blockchain,
+                since=since,
+                max_value=max_edge_value,
+                per_address=self.max_edges_per_address,
+            )
+            records = await result.data()
+
+        for record in records:
+            timestamp = record.get("timestamp")
+            if hasattr(timestamp, "to_native"):
+                record["timestamp"] = timestamp.to_native()
+        return records
 
     def _add_transaction_to_graph(self, graph: nx.DiGraph, tx: Dict, blockchain: str):
         """Add a transaction to the graph"""
@@ -292,27 +410,6 @@ class MultiRoutePathfinder:
 
         graph.add_edge(from_addr, to_addr, **edge_data)
 
-    async def _expand_graph_with_intermediates(
-        self, graph: nx.DiGraph, blockchain: str, max_hops: int, time_window_hours: int
-    ):
-        """Expand graph with intermediate nodes for better pathfinding"""
-
-        # Get all unique addresses in current graph
-        current_addresses = set(graph.nodes())
-
-        # For each address, get their transactions to expand the graph
-        for address in current_addresses:
-            # Limit expansion to prevent infinite growth
-            if len(graph.nodes()) > 1000:
-                break
-
-            txs = await self._get_address_transactions(
-                address, blockchain, time_window_hours
-            )
-
-            for tx in txs:
-                self._add_transaction_to_graph(graph, tx, blockchain)
-
     async def _find_shortest_paths(
         self, graph: nx.DiGraph, request: PathfindingRequest
     ) -> List[TransactionPath]:
@@ -322,11 +419,12 @@ class MultiRoutePathfinder:
 
         try:
             # Find shortest path by amount (weighted)
-            shortest_path = nx.shortest_path(
-                graph,
-                source=request.source_address,
-                target=request.target_address,
-                weight="amount",
+            shortest_path = await get_compute_executor().run(
+                graph_kernels.shortest_path,
+                CompactGraph.from_networkx(graph, weight="amount"),
+                request.source_address,
+                request.target_address,
+                size=graph.number_of_nodes() + graph.number_of_edges(),
             )
 
             if shortest_path:
@@ -335,11 +433,11 @@ class MultiRoutePathfinder:
                 )
                 if path:
                     paths.append(path)
+            else:
+                logger.debug(
+                    f"No path found between {request.source_address} and {request.target_address}"
+                )
 
-        except nx.NetworkXNoPath:
-            logger.debug(
-                f"No path found between {request.source_address} and {request.target_address}"
-            )
         except Exception as e:
             logger.error(f"Error finding shortest path: {e}")
 
@@ -353,26 +451,22 @@ class MultiRoutePathfinder:
         paths = []
 
         try:
-            # Find all simple paths (no repeated nodes)
-            all_paths = nx.all_simple_paths(
-                graph,
-                source=request.source_address,
-                target=request.target_address,
-                cutoff=request.max_hops,
+            # Find all simple paths (no repeated nodes), up to max_paths
+            path_list = await get_compute_executor().run(
+                graph_kernels.simple_paths,
+                CompactGraph.from_networkx(graph, weight=None),
+                request.source_address,
+                request.target_address,
+                request.max_hops,
+                request.max_paths,
+                size=graph.number_of_nodes() + graph.number_of_edges(),
             )
 
-            # Convert to list and limit number of paths
-            path_list = list(all_paths)[: request.max_paths]
-
             for path_nodes in path_list:
                 path = await self._create_transaction_path(graph, path_nodes, request)
                 if path:
                     paths.append(path)
 
-        except nx.NetworkXNoPath:
-            logger.debug(
-                f"No path found between {request.source_address} and {request.target_address}"
-            )
         except Exception as e:
             logger.error(f"Error finding all paths: {e}")
 
@@ -415,16 +509,18 @@ class MultiRoutePathfinder:
                 if len(component_graph.nodes()) > 1:
                     # Find internal paths
                     try:
-                        internal_paths = nx.all_simple_paths(
-                            component_graph,
-                            source=list(component_graph.nodes())[0],
-                            target=list(component_graph.nodes())[-1],
-                            cutoff=min(5, request.max_hops),
+                        nodes = list(component_graph.nodes())
+                        internal_paths = await get_compute_executor().run(
+                            graph_kernels.simple_paths,
+                            CompactGraph.from_networkx(component_graph, weight=None),
+                            nodes[0],
+                            nodes[-1],
+                            min(5, request.max_hops),
+                            10,  # Limit internal paths
+                            size=len(nodes) + component_graph.number_of_edges(),
                         )
 
-                        for path_nodes in list(internal_paths)[
-                            :10
-                        ]:  # Limit internal paths
+                        for path_nodes in internal_paths:
                             path = await self._create_transaction_path(
                                 graph, path_nodes, request
                             )
@@ -442,74 +538,142 @@ class MultiRoutePathfinder:
     async def _analyze_funnels(
         self, graph: nx.DiGraph, request: PathfindingRequest
     ) -> List[TransactionPath]:
-        """Analyze funnel patterns (multiple sources converging to target)"""
+        """Analyze funnel patterns (multiple sources converging to target)
 
-        paths = []
+        A single reverse BFS from the target yields every node that can reach
+        it together with its next hop on a shortest path, which is the
+        node's convergence point.  Paths are built as soon as a convergence
+        point has two sources, and the traversal stops after
+        ``max_funnel_sources`` sources.
+        """
 
-        # Find all nodes that can reach the target
-        predecessors = set()
-        for node in graph.nodes():
-            if node != request.target_address and nx.has_path(
-                graph, node, request.target_address
-            ):
-                predecessors.add(node)
+        paths = []
+        target = request.target_address
+        if target not in graph:
+            return paths
 
-        # Group predecessors by convergence points
+        next_hop: Dict[str, str] = {}
         convergence_points = defaultdict(list)
 
-        for predecessor in predecessors:
-            try:
-                path = nx.shortest_path(graph, predecessor, request.target_address)
-                if len(path) > 1:
-                    convergence_point = path[1]  # First hop from predecessor
-                    convergence_points[convergence_point].append(predecessor)
-            except nx.NetworkXNoPath:
+        reachable = self._iter_reverse_bfs(graph, target, request.max_hops, next_hop)
+        for sources_seen, source in enumerate(reachable, 1):
+            if sources_seen > self.max_funnel_sources:
+                break
+
+            convergence_point = next_hop[source]
+            sources = convergence_points[convergence_point]
+            sources.append(source)
+            if len(sources) < 2:  # At least 2 sources converging
                 continue
 
-        # Create funnel paths
-        for convergence_point, sources in convergence_points.items():
-            if len(sources) >= 2:  # At least 2 sources converging
-                for source in sources:
-                    try:
-                        path_nodes = nx.shortest_path(
-                            graph, source, request.target_address
-                        )
-                        path = await self._create_transaction_path(
-                            graph, path_nodes, request
-                        )
-                        if path:
-                            path.path_type = "funnel"
-                            path.metadata["convergence_point"] = convergence_point
-                            path.metadata["funnel_sources"] = len(sources)
-                            paths.append(path)
-                    except nx.NetworkXNoPath:
-                        continue
+            # The first source of a group is only emitted once it has company
+            for funnel_source in sources if len(sources) == 2 else [source]:
+                path = await self._create_transaction_path(
+                    graph, self._follow_next_hops(funnel_source, next_hop), request
+                )
+                if path:
+                    path.path_type = "funnel"
+                    path.metadata["convergence_point"] = convergence_point
+                    paths.append(path)
+
+        for path in paths:
+            path.metadata["funnel_sources"] = len(
+                convergence_points[path.metadata["convergence_point"]]
+            )
 
         return paths
 
+    @staticmethod
+    def _iter_reverse_bfs(
+        graph: nx.DiGraph, target: str, max_depth: int, next_hop: Dict[str, str]
+    ) -> Iterator[str]:
+        """Yield the nodes that can reach ``target``, nearest first.
+
+        Before a node is yielded its successor on a shortest path to
+        ``target`` is recorded in ``next_hop``.
+        """
+
+        frontier = deque([(target, 0)])
+        while frontier:
+            node, depth = frontier.popleft()
+            if depth >= max_depth:
+                continue
+            for predecessor in graph.predecessors(node):
+                if predecessor == target or predecessor in next_hop:
+                    continue
+                next_hop[predecessor] = node
+                yield predecessor
+                frontier.append((predecessor, depth + 1))
+
+    @staticmethod
+    def _follow_next_hops(source: str, next_hop: Dict[str, str]) -> List[str]:
+        path_nodes = [source]
+        while path_nodes[-1] in next_hop:
+            path_nodes.append(next_hop[path_nodes[-1]])
+        return path_nodes
+
     async def _find_circular_paths(
         self, graph: nx.DiGraph, request: PathfindingRequest
     ) -> List[TransactionPath]:
-        """Find circular paths in the transaction graph"""
+        """Find circular paths in the transaction graph
+
+        Only round trips of at most ``max_hops`` transfers whose timestamps
+        never decrease and that complete within the request's time window are
+        reported.  Each strongly connected component is searched on its own;
+        large components run concurrently in worker processes, and every search
+        stops after ``max_paths`` cycles.
+        """
 
         paths = []
 
         try:
-            # Find all cycles in the graph
-            cycles = list(nx.simple_cycles(graph))
+            edges = []
+            for from_node, to_node, data in graph.edges(data=True):
+                timestamp = to_epoch(data.get("timestamp"))
+                if timestamp is not None:
+                    edges.append(TemporalEdge(from_node, to_node, timestamp))
+
+            search_args = (
+                request.max_hops,
+                timedelta(hours=request.time_window_hours).total_seconds(),
+                3,  # Minimum cycle length
+                request.max_paths,
+            )
 
-            for cycle_nodes in cycles[: request.max_paths]:  # Limit number of cycles
-                if len(cycle_nodes) >= 3:  # Minimum cycle length
-                    # Create a circular path by adding the first node at the end
-                    circular_path = cycle_nodes + [cycle_nodes[0]]
+            small, large = [], []
+            for component in temporal_components(edges):
+                if len(component) >= self.offloaded_cycle_search_edges:
+                    large.append(component)
+                else:
+                    small.append(component)
 
-                    path = await self._create_transaction_path(
-                        graph, circular_path, request
+            executor = get_compute_executor()
+            found = await asyncio.gather(
+                *(
+                    executor.run(
+                        graph_kernels.component_cycles, component, *search_args
                     )
-                    if path:
-                        path.path_type = "circular"
-                        path.metadata["cycle_length"] = len(cycle_nodes)
-                        paths.append(path)
+                    for component in large
+                )
+            )
+            cycles = [cycle for component in found for cycle in component]
+            for component in small:
+                if len(cycles) >= request.max_paths:
+                    break
+                cycles.extend(graph_kernels.component_cycles(component, *search_args))
+
+            for cycle in cycles[: request.max_paths]:
+                cycle_nodes = [edge.source for edge in cycle]
+                # Create a circular path by adding the first node at the end
+                circular_path = cycle_nodes + [cycle_nodes[0]]
+
+                path = await self._create_transaction_path(
+                    graph, circular_path, request
+                )
+                if path:
+                    path.path_type = "circular"
+                    path.metadata["cycle_length"] = len(cycle_nodes)
+                    paths.append(path)
 
         except Exception as e:
             logger.error(f"Error finding circular paths: {e}")
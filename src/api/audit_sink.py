@@ -0,0 +1,208 @@
+"""
+Jackdaw Sentry - Audit Log Sink
+
+Takes request audit records off the request path: ``AuditMiddleware``
+queues each record in memory and a background task writes them to Redis
+in pipelined batches, so an API call no longer waits for a Redis round
+trip.  When Redis is unavailable a batch is appended to a local JSON-lines
+file through one persistent handle with a single flush per batch.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import aiofiles
+
+from src.api.database import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+AUDIT_KEY = "audit:{record_id}"
+FALLBACK_FILENAME = "audit_fallback.jsonl"
+
+# (record id, record, ttl seconds)
+AuditRecord = Tuple[str, Dict[str, Any], int]
+
+
+def _json_default(obj):
+    """Fallback serializer for types not natively supported by json.dumps."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    try:
+        return str(obj)
+    except Exception:
+        return None
+
+
+class AuditSink:
+    """Bounded in-process queue of audit records drained in batches.
+
+    ``submit`` never waits: when ``max_queue_size`` records are already
+    pending the new record is dropped and counted, which bounds memory if
+    Redis stalls.  The writer waits ``flush_interval`` seconds after the
+    first record of a batch so that concurrent requests share one
+    pipeline, then writes up to ``batch_size`` records.  ``close`` writes
+    whatever is still queued.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10000,
+        batch_size: int = 200,
+        flush_interval: float = 0.2,
+        log_dir: Optional[str] = None,
+    ):
+        self.max_queue_size = max_queue_size
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.log_dir = log_dir
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: List[AuditRecord] = []
+        self._file = None
+
+        self.metrics = {
+            "enqueued": 0,
+            "dropped": 0,
+            "written": 0,
+            "written_to_file": 0,
+            "lost": 0,
+            "batches": 0,
+            "max_queue_depth": 0,
+        }
+
+    def submit(self, record_id: str, record: Dict[str, Any], ttl: int) -> bool:
+        """Queue ``record`` for storage; False if it was dropped."""
+        queue = self._ensure_worker()
+        try:
+            queue.put_nowait((record_id, record, ttl))
+        except asyncio.QueueFull:
+            self.metrics["dropped"] += 1
+            if self.metrics["dropped"] % 1000 == 1:
+                logger.warning(
+                    f"Audit queue full, {self.metrics['dropped']} records dropped"
+                )
+            return False
+        self.metrics["enqueued"] += 1
+        self.metrics["max_queue_depth"] = max(
+            self.metrics["max_queue_depth"], queue.qsize()
+        )
+        return True
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._loop = loop
+            self._worker = None
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._drain(self._queue))
+        return self._queue
+
+    async def _drain(self, queue: asyncio.Queue):
+        while True:
+            self._inflight = [await queue.get()]
+            if self.flush_interval > 0:
+                await asyncio.sleep(self.flush_interval)  # let a group form
+            while len(self._inflight) < self.batch_size and not queue.empty():
+                self._inflight.append(queue.get_nowait())
+            await self._write(self._inflight)
+            self._inflight = []
+
+    async def _write(self, batch: List[AuditRecord]):
+        self.metrics["batches"] += 1
+        try:
+            async with get_redis_connection() as redis:
+                pipe = redis.pipeline(transaction=False)
+                for record_id, record, ttl in batch:
+                    pipe.setex(
+                        AUDIT_KEY.format(record_id=record_id),
+                        ttl,
+                        json.dumps(record, default=_json_default),
+                    )
+                await pipe.execute()
+            self.metrics["written"] += len(batch)
+        except Exception as e:
+            logger.warning(f"Redis audit write failed, falling back to file: {e}")
+            await self._write_file(batch)
+
+    async def _write_file(self, batch: List[AuditRecord]):
+        """Append a batch to the JSON-lines fallback file with one flush."""
+        lines = "".join(
+            json.dumps(record, default=_json_default) + "\n" for _, record, _ in batch
+        )
+        try:
+            if self._file is None:
+                log_dir = self.log_dir or os.environ.get("AUDIT_LOG_DIR", "/app/logs")
+                os.makedirs(log_dir, exist_ok=True)
+                self._file = await aiofiles.open(
+                    os.path.join(log_dir, FALLBACK_FILENAME), mode="a"
+                )
+            await self._file.write(lines)
+            await self._file.flush()
+            self.metrics["written_to_file"] += len(batch)
+        except Exception as e:
+            self.metrics["lost"] += len(batch)
+            logger.error(f"Audit fallback file write also failed: {e}")
+            await self._close_file()
+
+    async def _close_file(self):
+        if self._file is not None:
+            file, self._file = self._file, None
+            try:
+                await file.close()
+            except Exception:
+                pass
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self.max_queue_size,
+        }
+
+    async def close(self):
+        """Stop the writer and store everything still queued."""
+        pending = []
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._worker = None
+            pending.extend(self._inflight)  # may be written twice; keys are set
+            self._inflight = []
+        if self._queue is not None and self._loop is asyncio.get_running_loop():
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+        for start in range(0, len(pending), self.batch_size):
+            await self._write(pending[start : start + self.batch_size])
+        await self._close_file()
+
+
+_audit_sink: Optional[AuditSink] = None
+
+
+def get_audit_sink() -> AuditSink:
+    """Return the process-wide audit sink."""
+    global _audit_sink
+    if _audit_sink is None:
+        from src.api.config import settings
+
+        _audit_sink = AuditSink(
+            max_queue_size=settings.AUDIT_QUEUE_MAX_SIZE,
+            batch_size=settings.AUDIT_BATCH_SIZE,
+            flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        )
+    return _audit_sink
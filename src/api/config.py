@@ -4,6 +4,7 @@ GDPR-compliant configuration management
 """
 
 from typing import Any
+from typing import Dict
 from typing import List
 from typing import Optional
 
@@ -172,6 +173,10 @@ class Settings(BaseSettings):
     ML_MODEL_UPDATE_FREQUENCY: int = 168  # 1 week
     ML_CONFIDENCE_THRESHOLD: float = 0.75
 
+    # Pattern Detection
+    # Also follow peeling chains across addresses (one graph query per hop)
+    PATTERN_FOLLOW_PEELING_CHAINS: bool = False
+
     # =============================================================================
     # GDPR & Data Retention Configuration
     # =============================================================================
@@ -211,10 +216,31 @@ class Settings(BaseSettings):
     # API Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_REQUESTS_PER_MINUTE: int = 100
+    RATE_LIMIT_BACKEND: str = "redis"  # "local" or "redis" (shared by workers)
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 100000  # clients tracked per worker when local
 
     # RPC Rate Limiting (for public blockchain RPCs)
     RPC_RATE_LIMIT_PER_MINUTE: int = 60
     RPC_REQUEST_TIMEOUT_SECONDS: int = 30
+    RPC_MAX_BATCH_SIZE: int = 100  # max calls per JSON-RPC batch request
+    RPC_RATE_LIMIT_BACKEND: str = "local"  # "local" or "redis" (shared by workers)
+    RPC_RATE_LIMIT_BURST: int = 0  # token bucket capacity, 0 = one minute's budget
+    RPC_METHOD_WEIGHTS: Dict[str, float] = {}  # overrides rate_limiter defaults
+    RPC_BATCH_ITEM_WEIGHT: float = 0.0  # extra cost per additional batch item
+    # Extra HTTP endpoints per chain, pooled with rpc_url/fallback_url
+    RPC_ENDPOINTS: Dict[str, List[str]] = {}
+    RPC_HEDGE_REQUESTS: bool = False  # duplicate slow calls to a second endpoint
+    RPC_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    RPC_CIRCUIT_COOLDOWN_SECONDS: int = 30
+
+    # Read-through cache for final RPC results (confirmed txs, finalized blocks)
+    RPC_CACHE_ENABLED: bool = True
+    RPC_CACHE_BACKEND: str = "redis"  # "redis", "disk" or "memory"
+    RPC_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # in-process LRU budget
+    RPC_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # redis backend only
+    RPC_CACHE_DISK_PATH: str = "data/rpc_cache.sqlite3"
+    RPC_CACHE_DISK_MAX_BYTES: int = 1024 * 1024 * 1024  # disk backend only
+    RPC_FINALITY_DEPTH: Dict[str, int] = {}  # per-chain EVM overrides
 
     # Optional block explorer API keys (for indexed tx history)
     ETHERSCAN_API_KEY: Optional[str] = None
@@ -234,6 +260,16 @@ class Settings(BaseSettings):
     CACHE_TTL_SECONDS: int = 300
     CACHE_MAX_SIZE: int = 1000
 
+    # Process pool for CPU-bound graph analytics
+    COMPUTE_MAX_WORKERS: int = 0  # 0 = one per CPU
+    COMPUTE_JOB_TIMEOUT_SECONDS: float = 60.0
+    COMPUTE_MIN_OFFLOAD_SIZE: int = 2000  # smaller graphs (nodes + edges) run inline
+
+    # Background audit log writer
+    AUDIT_QUEUE_MAX_SIZE: int = 10000  # records beyond this are dropped
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 0.2
+
     # =============================================================================
     # Security Configuration
     # =============================================================================
@@ -205,9 +205,18 @@ async def lifespan(app: FastAPI):
                 exc_info=True,
             )
 
+    from src.api.audit_sink import get_audit_sink
     from src.collectors.rpc.factory import close_all_clients
+    from src.utils.compute_executor import get_compute_executor
+
+    get_compute_executor().shutdown()
 
     errors = []
+    try:
+        await get_audit_sink().close()
+    except Exception as exc:
+        logger.error(f"Error flushing audit log: {exc}", exc_info=True)
+        errors.append(exc)
     try:
         await close_all_clients()
     except Exception as exc:
@@ -309,6 +318,30 @@ async def start_background_tasks():
     except Exception as e:
         logger.error(f"❌ Failed to start sanctions sync scheduler: {e}")
 
+    # Keep the in-memory sanctions screening index in step with Postgres
+    try:
+        from src.services.sanctions import refresh_sanctions_index
+
+        _index_task = asyncio.create_task(
+            _sanctions_index_loop(refresh_sanctions_index)
+        )
+        tasks.append(_index_task)
+        logger.info("Sanctions index refresher started (every 5m)")
+    except Exception as e:
+        logger.error(f"Failed to start sanctions index refresher: {e}")
+
+    # Load bridge and mixer labels into the protocol index, then follow syncs
+    try:
+        from src.services.entity_attribution import refresh_protocol_labels
+
+        _protocol_labels_task = asyncio.create_task(
+            _protocol_labels_loop(refresh_protocol_labels)
+        )
+        tasks.append(_protocol_labels_task)
+        logger.info("Protocol labels refresher started (every 30s)")
+    except Exception as e:
+        logger.error(f"Failed to start protocol labels refresher: {e}")
+
     # Start entity labels sync background loop
     try:
         from src.services.entity_attribution import sync_all_labels as _labels_sync
@@ -319,6 +352,16 @@ async def start_background_tasks():
     except Exception as e:
         logger.error(f"Failed to start labels sync scheduler: {e}")
 
+    # Reload compiled alert rules when any worker changes them
+    try:
+        from src.monitoring.alert_rules import get_rule_engine
+
+        _rules_task = asyncio.create_task(get_rule_engine().listen_for_changes())
+        tasks.append(_rules_task)
+        logger.info("Alert rule change listener started")
+    except Exception as e:
+        logger.error(f"Failed to start alert rule change listener: {e}")
+
     # Start transaction monitoring pipeline (M12)
     try:
         from src.monitoring.tx_monitor import start_monitor
@@ -430,6 +473,30 @@ async def _sanctions_sync_loop(sync_fn, interval_seconds: int = 21600):
         await asyncio.sleep(interval_seconds)
 
 
+async def _sanctions_index_loop(refresh_fn, interval_seconds: int = 300):
+    """Load the sanctions screening index, then refresh it every *interval_seconds*.
+
+    Screens also refresh the index as soon as they see a newer version
+    published in Redis, and query Postgres until it is current.
+    """
+    while True:
+        await refresh_fn()
+        await asyncio.sleep(interval_seconds)
+
+
+async def _protocol_labels_loop(refresh_fn, interval_seconds: int = 30):
+    """Load the protocol labels, then reload them whenever a sync changes them.
+
+    Each check only reads the label version from Redis.
+    """
+    while True:
+        try:
+            await refresh_fn()
+        except Exception as exc:
+            logger.error(f"Protocol labels refresh failed: {exc}")
+        await asyncio.sleep(interval_seconds)
+
+
 async def _labels_sync_loop(sync_fn, interval_seconds: int = 86400):
     """Run entity label sync every *interval_seconds* (default 24 hours).
 
@@ -610,6 +677,8 @@ async def metrics():
     import os
     import time
 
+    from src.api.audit_sink import get_audit_sink
+
     process = None
     try:
         import psutil
@@ -625,6 +694,7 @@ async def metrics():
         "uptime_seconds": time.monotonic(),
         "memory_usage_mb": round(mem_mb, 1) if mem_mb is not None else None,
         "cpu_percent": cpu_pct,
+        "audit_log": get_audit_sink().get_metrics(),
         "version": "1.0.0",
     }
 
@@ -6,12 +6,11 @@ Security, audit, and rate limiting middleware
 import asyncio
 import hashlib
 import ipaddress
-import json
 import logging
+import math
 import os
 import time
 from collections import defaultdict
-from collections import deque
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
@@ -20,7 +19,6 @@ from typing import Dict
 from typing import List
 from typing import Optional
 
-import aiofiles
 from fastapi import HTTPException
 from fastapi import Request
 from fastapi import Response
@@ -29,8 +27,11 @@ from fastapi.middleware import Middleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.base import RequestResponseEndpoint
 
+from src.api.audit_sink import get_audit_sink
 from src.api.config import settings
-from src.api.database import get_redis_connection
+from src.rate_limiting.backends import Limit
+from src.rate_limiting.backends import RateLimitDecision
+from src.rate_limiting.backends import create_rate_limit_backend
 
 
 def _is_valid_ip(value: str) -> bool:
@@ -323,51 +324,27 @@ class AuditMiddleware(BaseHTTPMiddleware):
     def _get_client_ip(request: Request) -> str:
         return get_client_ip(request)
 
-    @staticmethod
-    def _json_default(obj):
-        """Fallback serializer for types not natively supported by json.dumps."""
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        try:
-            return str(obj)
-        except Exception:
-            return None
-
     async def _store_audit_log(
         self, request_log: Dict[str, Any], response_log: Dict[str, Any]
     ):
-        """Store audit log in Redis, falling back to a local JSON-lines file."""
-        audit_data = {
-            "request": request_log,
-            "response": response_log,
-        }
-        try:
-            async with get_redis_connection() as redis:
-                audit_key = f"audit:{request_log['request_id']}"
-                await redis.setex(
-                    audit_key,
-                    self.audit_retention_days * 24 * 3600,
-                    json.dumps(audit_data, default=self._json_default),
-                )
-        except Exception as e:
-            logger.warning(f"Redis audit write failed, falling back to file: {e}")
-            await self._store_audit_log_file(audit_data)
-
-    async def _store_audit_log_file(self, audit_data: Dict[str, Any]):
-        """Append an audit record to a local JSON-lines file (fallback)."""
-        log_dir = os.environ.get("AUDIT_LOG_DIR", "/app/logs")
-        try:
-            os.makedirs(log_dir, exist_ok=True)
-            async with aiofiles.open(
-                os.path.join(log_dir, "audit_fallback.jsonl"), mode="a"
-            ) as f:
-                await f.write(json.dumps(audit_data, default=self._json_default) + "\n")
-        except Exception as e:
-            logger.error(f"Audit fallback file write also failed: {e}")
+        """Queue the audit record; the audit sink writes it in the background."""
+        get_audit_sink().submit(
+            request_log["request_id"],
+            {"request": request_log, "response": response_log},
+            self.audit_retention_days * 24 * 3600,
+        )
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Rate limiting middleware"""
+    """Rate limiting middleware
+
+    Per-minute, per-hour and per-day limits plus a burst limit over 10
+    seconds, all checked in one call to the rate limit backend.  The Redis
+    backend shares the limits between every API worker.
+    """
+
+    KEY_PREFIX = "jackdaw:ratelimit:api:"
+    BURST_WINDOW_SECONDS = 10
 
     def __init__(self, app, **kwargs):
         super().__init__(app)
@@ -375,11 +352,14 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.requests_per_hour = kwargs.get("requests_per_hour", 1000)
         self.requests_per_day = kwargs.get("requests_per_day", 10000)
         self.burst_size = kwargs.get("burst_size", 20)
+        self.backend = kwargs.get("backend") or create_rate_limit_backend()
 
-        # In-memory rate limiting storage (in production, use Redis)
-        self.rate_limits = defaultdict(
-            lambda: {"minute": deque(), "hour": deque(), "day": deque()}
-        )
+        # (header suffix, limit, window seconds)
+        self.windows = [
+            ("Minute", self.requests_per_minute, 60),
+            ("Hour", self.requests_per_hour, 3600),
+            ("Day", self.requests_per_day, 86400),
+        ]
 
     async def dispatch(
         self, request: Request, call_next: RequestResponseEndpoint
@@ -395,20 +375,19 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         # Use user ID for rate limiting if authenticated, otherwise IP
         rate_limit_key = user_info.username if user_info else client_ip
 
-        # Check rate limits
-        if not self._check_rate_limit(rate_limit_key):
+        # Check and record the request against every limit
+        decision = await self.backend.hit(self._limits(rate_limit_key))
+        if not decision.allowed:
             logger.warning(f"Rate limit exceeded for: {rate_limit_key}")
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail="Rate limit exceeded",
+                headers={"Retry-After": str(math.ceil(decision.retry_after))},
             )
 
-        # Record request
-        self._record_request(rate_limit_key)
-
         # Add rate limit headers
         response = await call_next(request)
-        self._add_rate_limit_headers(response, rate_limit_key)
+        self._add_rate_limit_headers(response, decision)
 
         return response
 
@@ -416,98 +395,27 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
     def _get_client_ip(request: Request) -> str:
         return get_client_ip(request)
 
-    def _check_rate_limit(self, key: str) -> bool:
-        """Check if rate limit is exceeded"""
-        now = time.time()
-        limits = self.rate_limits[key]
-
-        # Clean old requests
-        self._cleanup_old_requests(limits, now)
-
-        # Check minute limit
-        if len(limits["minute"]) >= self.requests_per_minute:
-            return False
-
-        # Check hour limit
-        if len(limits["hour"]) >= self.requests_per_hour:
-            return False
-
-        # Check day limit
-        if len(limits["day"]) >= self.requests_per_day:
-            return False
-
-        # Check burst limit
-        recent_requests = [
-            req_time for req_time in limits["minute"] if now - req_time < 10
+    def _limits(self, key: str) -> List[Limit]:
+        prefix = f"{self.KEY_PREFIX}{key}"
+        limits = [
+            Limit(f"{prefix}:{window}", limit, window)
+            for _, limit, window in self.windows
         ]
-        if len(recent_requests) >= self.burst_size:
-            return False
-
-        return True
-
-    def _cleanup_old_requests(self, limits: Dict[str, deque], now: float):
-        """Remove old requests from rate limit tracking"""
-        # Clean minute window (60 seconds)
-        while limits["minute"] and now - limits["minute"][0] > 60:
-            limits["minute"].popleft()
-
-        # Clean hour window (3600 seconds)
-        while limits["hour"] and now - limits["hour"][0] > 3600:
-            limits["hour"].popleft()
-
-        # Clean day window (86400 seconds)
-        while limits["day"] and now - limits["day"][0] > 86400:
-            limits["day"].popleft()
-
-    def _record_request(self, key: str):
-        """Record request for rate limiting"""
-        now = time.time()
-        limits = self.rate_limits[key]
-
-        limits["minute"].append(now)
-        limits["hour"].append(now)
-        limits["day"].append(now)
+        limits.append(
+            Limit(f"{prefix}:burst", self.burst_size, self.BURST_WINDOW_SECONDS)
+        )
+        return limits
 
-    def _add_rate_limit_headers(self, response: Response, key: str):
+    def _add_rate_limit_headers(self, response: Response, decision: RateLimitDecision):
         """Add rate limit headers to response"""
-        limits = self.rate_limits[key]
-        now = time.time()
-
-        # Clean old requests first
-        self._cleanup_old_requests(limits, now)
-
-        # Calculate remaining requests
-        remaining_minute = max(0, self.requests_per_minute - len(limits["minute"]))
-        remaining_hour = max(0, self.requests_per_hour - len(limits["hour"]))
-        remaining_day = max(0, self.requests_per_day - len(limits["day"]))
-
-        # Add headers
-        response.headers["X-RateLimit-Limit-Minute"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining-Minute"] = str(remaining_minute)
-        response.headers["X-RateLimit-Limit-Hour"] = str(self.requests_per_hour)
-        response.headers["X-RateLimit-Remaining-Hour"] = str(remaining_hour)
-        response.headers["X-RateLimit-Limit-Day"] = str(self.requests_per_day)
-        response.headers["X-RateLimit-Remaining-Day"] = str(remaining_day)
-
-        # Calculate reset times
-        if limits["minute"]:
-            reset_minute = int(limits["minute"][0] + 60 - now)
-        else:
-            reset_minute = 60
-
-        if limits["hour"]:
-            reset_hour = int(limits["hour"][0] + 3600 - now)
-        else:
-            reset_hour = 3600
-
-        if limits["day"]:
-            reset_day = int(limits["day"][0] + 86400 - now)
-        else:
-            reset_day = 86400
-
-        response.headers["X-RateLimit-Reset-Minute"] = str(reset_minute)
-        response.headers["X-RateLimit-Reset-Hour"] = str(reset_hour)
-        response.headers["X-RateLimit-Reset-Day"] = str(reset_day)
+        for i, (name, limit, _) in enumerate(self.windows):
+            response.headers[f"X-RateLimit-Limit-{name}"] = str(limit)
+            response.headers[f"X-RateLimit-Remaining-{name}"] = str(
+                decision.remaining[i]
+            )
+            response.headers[f"X-RateLimit-Reset-{name}"] = str(
+                math.ceil(decision.reset_after[i])
+            )
 
 
 # Middleware factory functions
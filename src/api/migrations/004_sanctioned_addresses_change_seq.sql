@@ -0,0 +1,23 @@
+-- Change sequence for sanctioned_addresses: every insert or update takes the
+-- next value, so readers can load "rows changed since N" without relying on
+-- timestamps, which can commit out of order.
+
+CREATE SEQUENCE IF NOT EXISTS sanctioned_addresses_change_seq;
+
+ALTER TABLE sanctioned_addresses
+    ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL
+    DEFAULT nextval('sanctioned_addresses_change_seq');
+
+CREATE INDEX IF NOT EXISTS idx_sanctioned_change_seq ON sanctioned_addresses (change_seq);
+
+CREATE OR REPLACE FUNCTION sanctioned_addresses_bump_change_seq() RETURNS trigger AS $$
+BEGIN
+    NEW.change_seq := nextval('sanctioned_addresses_change_seq');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_sanctioned_addresses_change_seq ON sanctioned_addresses;
+CREATE TRIGGER trg_sanctioned_addresses_change_seq
+    BEFORE UPDATE ON sanctioned_addresses
+    FOR EACH ROW EXECUTE FUNCTION sanctioned_addresses_bump_change_seq();
@@ -43,6 +43,7 @@ from src.monitoring.alert_rules import get_recent_alerts
 from src.monitoring.alert_rules import get_rule
 from src.monitoring.alert_rules import list_rules
 from src.monitoring.alert_rules import update_rule
+from src.monitoring.tx_monitor import get_monitor_status
 
 logger = logging.getLogger(__name__)
 
@@ -165,6 +166,19 @@ async def recent_alerts(
     return {"success": True, "alerts": alerts, "count": len(alerts)}
 
 
+# ---------------------------------------------------------------------------
+# REST — transaction monitor status
+# ---------------------------------------------------------------------------
+
+
+@router.get("/monitor")
+async def monitor_status(
+    current_user: User = Depends(check_permissions([PERMISSIONS["read_analysis"]])),
+):
+    """Tip, cursor and lag (tip minus cursor) of each monitored chain."""
+    return {"success": True, "chains": get_monitor_status()}
+
+
 # ---------------------------------------------------------------------------
 # WebSocket — live alert stream
 # ---------------------------------------------------------------------------
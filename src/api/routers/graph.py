@@ -4,11 +4,14 @@ Returns {nodes, edges} JSON for the frontend Cytoscape.js graph renderer.
 Supports address expansion, transaction tracing, search, and clustering.
 """
 
+import asyncio
 import logging
 import time
 from datetime import datetime
 from datetime import timezone
 from typing import Any
+from typing import Awaitable
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -22,6 +25,7 @@ from pydantic import field_validator
 
 from src.analysis.bridge_tracker import BridgeTracker
 from src.analysis.mixer_detection import MixerDetector
+from src.analysis.protocol_registry import get_protocol_index
 from src.api.auth import PERMISSIONS
 from src.api.auth import User
 from src.api.auth import check_permissions
@@ -29,7 +33,8 @@ from src.api.config import get_supported_blockchains
 from src.api.database import get_neo4j_session
 from src.collectors.rpc.factory import get_rpc_client
 from src.services.entity_attribution import lookup_addresses_bulk as _entity_lookup_bulk
-from src.services.sanctions import screen_address as _sanctions_screen
+from src.services.sanctions import screen_addresses_bulk as _sanctions_screen_bulk
+from src.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -339,8 +344,7 @@ async def expand_address(
                 logger.warning(f"Graph expand RPC fallback failed: {exc}")
 
     # Tag sanctioned addresses and entity attributions
-    await _enrich_sanctions(nodes_map, request.blockchain)
-    await _enrich_entities(nodes_map, request.blockchain)
+    await _enrich_nodes(nodes_map, request.blockchain)
 
     elapsed_ms = int((time.monotonic() - start) * 1000)
     return GraphResponse(
@@ -424,8 +428,7 @@ async def trace_transaction(
         if not nodes_map:
             raise HTTPException(status_code=404, detail="Transaction not found")
 
-        await _enrich_sanctions(nodes_map, request.blockchain)
-        await _enrich_entities(nodes_map, request.blockchain)
+        await _enrich_nodes(nodes_map, request.blockchain)
 
         elapsed_ms = int((time.monotonic() - start) * 1000)
         return GraphResponse(
@@ -511,8 +514,7 @@ async def trace_transaction(
                     }
                 )
 
-    await _enrich_sanctions(nodes_map, request.blockchain)
-    await _enrich_entities(nodes_map, request.blockchain)
+    await _enrich_nodes(nodes_map, request.blockchain)
 
     elapsed_ms = int((time.monotonic() - start) * 1000)
     return GraphResponse(
@@ -664,8 +666,7 @@ async def graph_search(
         raise HTTPException(status_code=404, detail="No results found")
 
     bc = request.blockchain or "ethereum"
-    await _enrich_sanctions(nodes_map, bc)
-    await _enrich_entities(nodes_map, bc)
+    await _enrich_nodes(nodes_map, bc)
 
     elapsed_ms = int((time.monotonic() - start) * 1000)
     return GraphResponse(
@@ -862,8 +863,7 @@ async def cluster_addresses(
             }
         )
 
-    await _enrich_sanctions(nodes_map, request.blockchain)
-    await _enrich_entities(nodes_map, request.blockchain)
+    await _enrich_nodes(nodes_map, request.blockchain)
 
     elapsed_ms = int((time.monotonic() - start) * 1000)
     return GraphResponse(
@@ -905,6 +905,48 @@ def _make_address_node(address: str, blockchain: str) -> Dict[str, Any]:
     }
 
 
+# Short-lived per-process cache for entity lookups, keyed by (blockchain,
+# address).  Negative results are cached too: almost every address on a
+# graph is unattributed.  Sanctions are not cached here: the screening
+# index is versioned, so a list update is seen on the next expand, and it
+# already rules out nearly every address without a database query.
+ENRICHMENT_CACHE_TTL_SECONDS = 60
+_entity_cache = TTLCache(ENRICHMENT_CACHE_TTL_SECONDS, max_entries=50_000)
+
+
+async def _cached_bulk_lookup(
+    cache: TTLCache,
+    addresses: List[str],
+    blockchain: str,
+    fetch: Callable[[List[str]], Awaitable[List[Any]]],
+) -> Dict[str, Any]:
+    """Resolve addresses from *cache*, fetching all misses in one call.
+
+    ``fetch`` receives the uncached addresses and returns one value per
+    address, in order.
+    """
+    hits = cache.get_many((blockchain, addr) for addr in addresses)
+    results = {
+        addr: hits[(blockchain, addr)]
+        for addr in addresses
+        if (blockchain, addr) in hits
+    }
+    missing = [addr for addr in addresses if addr not in results]
+    if missing:
+        for addr, value in zip(missing, await fetch(missing)):
+            cache.set((blockchain, addr), value)
+            results[addr] = value
+    return results
+
+
+async def _enrich_nodes(nodes_map: Dict[str, Dict[str, Any]], blockchain: str) -> None:
+    """Tag nodes with sanctions and entity attribution, querying both at once."""
+    await asyncio.gather(
+        _enrich_sanctions(nodes_map, blockchain),
+        _enrich_entities(nodes_map, blockchain),
+    )
+
+
 async def _enrich_entities(
     nodes_map: Dict[str, Dict[str, Any]], blockchain: str
 ) -> None:
@@ -912,36 +954,51 @@ async def _enrich_entities(
     addresses = list(nodes_map.keys())
     if not addresses:
         return
+
+    async def fetch(missing: List[str]) -> List[Optional[Dict[str, Any]]]:
+        found = await _entity_lookup_bulk(missing, blockchain)
+        # Bulk lookup keys its results by normalised (lower-case) address
+        return [found.get(addr.lower().strip()) for addr in missing]
+
     try:
-        results = await _entity_lookup_bulk(addresses, blockchain)
-        entity_risk = {"low": 0.2, "medium": 0.4, "high": 0.7, "critical": 0.9}
-        for addr, info in results.items():
-            if info and addr in nodes_map:
-                node = nodes_map[addr]
-                node["entity_name"] = info.get("entity_name")
-                node["entity_type"] = info.get("entity_type")
-                node["entity_category"] = info.get("category")
-                if not node.get("label"):
-                    node["label"] = info.get("entity_name")
-                r = entity_risk.get(info.get("risk_level"), 0)
-                if r > node.get("risk", 0):
-                    node["risk"] = r
+        results = await _cached_bulk_lookup(_entity_cache, addresses, blockchain, fetch)
     except Exception:
-        pass  # entity DB may not be initialised yet
+        return  # entity DB may not be initialised yet
+
+    entity_risk = {"low": 0.2, "medium": 0.4, "high": 0.7, "critical": 0.9}
+    for addr, info in results.items():
+        if info:
+            node = nodes_map[addr]
+            node["entity_name"] = info.get("entity_name")
+            node["entity_type"] = info.get("entity_type")
+            node["entity_category"] = info.get("category")
+            if not node.get("label"):
+                node["label"] = info.get("entity_name")
+            r = entity_risk.get(info.get("risk_level"), 0)
+            if r > node.get("risk", 0):
+                node["risk"] = r
 
 
 async def _enrich_sanctions(
     nodes_map: Dict[str, Dict[str, Any]], blockchain: str
 ) -> None:
     """Best-effort: tag nodes that appear in the sanctions database."""
-    for addr, node in nodes_map.items():
-        try:
-            result = await _sanctions_screen(addr, blockchain)
-            if result and result.get("matched"):
-                node["sanctioned"] = True
-                node["label"] = node.get("label") or "sanctioned"
-        except Exception:
-            pass  # sanctions DB may not be initialised yet
+    addresses = list(nodes_map.keys())
+    if not addresses:
+        return
+
+    try:
+        screened = await _sanctions_screen_bulk(addresses, blockchain)
+    except Exception:
+        return  # sanctions DB may not be initialised yet
+
+    for addr, result in zip(addresses, screened):
+        if result.get("matched"):
+            node = nodes_map[addr]
+            node["sanctioned"] = True
+            # The sanctions label wins over an entity label set concurrently
+            if not node.get("label") or node["label"] == node.get("entity_name"):
+                node["label"] = "sanctioned"
 
 
 def _safe_float(val: Any) -> float:
@@ -954,31 +1011,8 @@ def _safe_float(val: Any) -> float:
         return 0.0
 
 
-# Lazily-initialised address sets for edge classification
-_bridge_addresses: Optional[set] = None
-_mixer_addresses: Optional[set] = None
-
-
-def _get_known_bridge_addresses() -> set:
-    global _bridge_addresses
-    if _bridge_addresses is None:
-        from src.analysis.protocol_registry import (
-            get_known_bridge_addresses as _reg_bridges,
-        )
-
-        _bridge_addresses = _reg_bridges()
-    return _bridge_addresses
-
-
-def _get_known_mixer_addresses() -> set:
-    global _mixer_addresses
-    if _mixer_addresses is None:
-        from src.analysis.protocol_registry import (
-            get_known_mixer_addresses as _reg_mixers,
-        )
-
-        _mixer_addresses = _reg_mixers()
-    return _mixer_addresses
+# Edge types in priority order, for when both endpoints are known protocols
+_EDGE_TYPE_PRIORITY = ("bridge", "mixer", "dex")
 
 
 def _classify_edge(source: str, target: str) -> str:
@@ -986,19 +1020,12 @@ def _classify_edge(source: str, target: str) -> str:
 
     Returns one of: 'bridge', 'mixer', 'dex', 'transfer'
     """
-    src = (source or "").lower()
-    tgt = (target or "").lower()
-    bridge_addrs = _get_known_bridge_addresses()
-    mixer_addrs = _get_known_mixer_addresses()
-
-    if src in bridge_addrs or tgt in bridge_addrs:
-        return "bridge"
-    if src in mixer_addrs or tgt in mixer_addrs:
-        return "mixer"
-    # DEX check via protocol registry
-    from src.analysis.protocol_registry import get_known_dex_addresses
-
-    dex_addrs = get_known_dex_addresses()
-    if src in dex_addrs or tgt in dex_addrs:
-        return "dex"
+    types = {
+        match.protocol_type
+        for match in get_protocol_index().classify_many((source, target))
+        if match is not None
+    }
+    for edge_type in _EDGE_TYPE_PRIORITY:
+        if edge_type in types:
+            return edge_type
     return "transfer"
@@ -3,13 +3,17 @@ Jackdaw Sentry - Pattern Detection API Router
 REST endpoints for advanced pattern detection and analysis
 """
 
+import asyncio
+import json
 import logging
 from datetime import datetime
 from datetime import timezone
 from typing import Any
+from typing import AsyncIterator
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Set
 
 from fastapi import APIRouter
 from fastapi import BackgroundTasks
@@ -17,6 +21,7 @@ from fastapi import Depends
 from fastapi import HTTPException
 from fastapi import Query
 from fastapi import status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from pydantic import field_validator
 
@@ -27,6 +32,7 @@ from src.api.auth import get_current_user
 from src.api.database import get_postgres_connection
 from src.patterns import BatchPatternRequest
 from src.patterns import BatchPatternResponse
+from src.patterns import BatchPatternStreamRequest
 from src.patterns import PatternAnalysisResult
 from src.patterns import PatternConfig
 from src.patterns import PatternRequest
@@ -37,6 +43,7 @@ from src.patterns import PatternStatistics
 from src.patterns import PatternType
 from src.patterns import get_pattern_detector
 from src.patterns import get_pattern_library
+from src.patterns.batch_jobs import PatternBatchJobStore
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +52,10 @@ router = APIRouter()
 # Initialize engines
 pattern_detector = get_pattern_detector()
 pattern_library = get_pattern_library()
+_batch_jobs = PatternBatchJobStore()
+
+# Completed addresses are recorded for resumption in groups of this size
+_BATCH_PROGRESS_EVERY = 100
 
 
 # Pydantic models for API requests/responses
@@ -151,19 +162,8 @@ async def batch_analyze_patterns(
 
         start_time = datetime.now(timezone.utc)
 
-        # Convert to single address request for batch processing
-        single_request = PatternRequest(
-            addresses=request.addresses,
-            blockchain=request.blockchain,
-            pattern_types=request.pattern_types,
-            min_severity=request.min_severity,
-            time_range_hours=request.time_range_hours,
-            include_evidence=request.include_evidence,
-            min_confidence=request.min_confidence,
-        )
-
         # Process batch analysis
-        results = await pattern_detector.batch_analyze_patterns(single_request)
+        results = await pattern_detector.batch_analyze_patterns(request)
 
         # Calculate statistics
         successful_count = len(results)
@@ -200,6 +200,175 @@ async def batch_analyze_patterns(
         )
 
 
+def _format_stream_event(
+    event: str, payload: Dict[str, Any], stream_format: str
+) -> str:
+    data = json.dumps({"event": event, **payload}, default=str)
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {data}\n\n"
+    return data + "\n"
+
+
+async def _record_batch_progress(job_id: str, indices: List[int]):
+    try:
+        await _batch_jobs.mark_completed(job_id, indices)
+    except Exception as e:
+        logger.warning(f"Failed to record progress of batch job {job_id}: {e}")
+
+
+async def _stream_batch_job(
+    job_id: str,
+    request: BatchPatternStreamRequest,
+    completed: Set[int],
+    stream_format: str,
+) -> AsyncIterator[str]:
+    """Stream one event per analysed address, then a summary"""
+
+    yield _format_stream_event(
+        "job",
+        {
+            "job_id": job_id,
+            "total_addresses": len(request.addresses),
+            "remaining": len(request.addresses) - len(completed),
+        },
+        stream_format,
+    )
+
+    summary = {
+        "successful_analyses": 0,
+        "failed_addresses": 0,
+        "patterns_detected": 0,
+        "high_risk_findings": 0,
+    }
+    delivered: List[int] = []
+    try:
+        async for index, address, result in pattern_detector.stream_batch_patterns(
+            request.addresses,
+            request.blockchain,
+            pattern_types=request.pattern_types,
+            min_severity=request.min_severity,
+            time_range_hours=request.time_range_hours,
+            include_evidence=request.include_evidence,
+            min_confidence=request.min_confidence,
+            max_concurrent=request.max_concurrent,
+            skip=completed,
+        ):
+            if result is None:
+                # Not recorded as completed, so resuming the job retries it
+                summary["failed_addresses"] += 1
+                yield _format_stream_event(
+                    "error", {"index": index, "address": address}, stream_format
+                )
+                continue
+
+            summary["successful_analyses"] += 1
+            summary["patterns_detected"] += len(result.patterns)
+            if result.overall_risk_score >= 0.7:
+                summary["high_risk_findings"] += 1
+            yield _format_stream_event(
+                "result",
+                {
+                    "index": index,
+                    "address": address,
+                    "result": result.model_dump(mode="json"),
+                },
+                stream_format,
+            )
+            delivered.append(index)
+            if len(delivered) >= _BATCH_PROGRESS_EVERY:
+                # A failed write only costs resumability, never the stream
+                await _record_batch_progress(job_id, delivered)
+                delivered = []
+    finally:
+        # A client disconnect cancels the stream; shielding lets the last
+        # progress write finish so a resumed job does not redo those addresses
+        await asyncio.shield(_record_batch_progress(job_id, delivered))
+
+    yield _format_stream_event("summary", {"job_id": job_id, **summary}, stream_format)
+
+
+def _batch_stream_response(
+    job_id: str,
+    request: BatchPatternStreamRequest,
+    completed: Set[int],
+    stream_format: str,
+) -> StreamingResponse:
+    return StreamingResponse(
+        _stream_batch_job(job_id, request, completed, stream_format),
+        media_type=(
+            "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+        ),
+        headers={"X-Batch-Job-Id": job_id},
+    )
+
+
+@router.post("/batch-analyze/stream")
+async def stream_batch_analyze_patterns(
+    request: BatchPatternStreamRequest,
+    stream_format: str = Query("ndjson", alias="format", regex="^(ndjson|sse)$"),
+    current_user: User = Depends(check_permissions(PERMISSIONS["bulk_screening"])),
+):
+    """
+    Analyze patterns for up to 50,000 addresses, streaming results as they finish
+
+    Takes the same fields as /batch-analyze.  The response is NDJSON (or
+    server-sent events with ``format=sse``): a ``job`` event carrying the
+    job id, one ``result`` or ``error`` event per address, then a
+    ``summary``.  An interrupted job can be resumed with
+    ``GET /batch-analyze/stream/{job_id}``, which skips the addresses whose
+    results were already delivered.
+
+    *Requires bulk screening permission*
+    """
+
+    try:
+        await pattern_detector.initialize()
+        job_id = await _batch_jobs.create(request.model_dump(mode="json"))
+    except Exception as e:
+        logger.error(f"Error starting batch pattern job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to start batch pattern analysis",
+        )
+
+    return _batch_stream_response(job_id, request, set(), stream_format)
+
+
+@router.get("/batch-analyze/stream/{job_id}")
+async def resume_batch_analyze_patterns(
+    job_id: str,
+    stream_format: str = Query("ndjson", alias="format", regex="^(ndjson|sse)$"),
+    current_user: User = Depends(check_permissions(PERMISSIONS["bulk_screening"])),
+):
+    """
+    Resume a streamed batch analysis, skipping already delivered addresses
+
+    *Requires bulk screening permission*
+    """
+
+    try:
+        stored = await _batch_jobs.load(job_id)
+        if stored is not None:
+            await pattern_detector.initialize()
+            completed = await _batch_jobs.completed(job_id)
+    except Exception as e:
+        logger.error(f"Error resuming batch pattern job {job_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to resume batch pattern analysis",
+        )
+
+    if stored is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch job not found or expired",
+        )
+
+    return _batch_stream_response(
+        job_id, BatchPatternStreamRequest(**stored), completed, stream_format
+    )
+
+
 @router.get("/patterns", response_model=List[PatternSignature])
 async def list_patterns(
     pattern_types: Optional[List[PatternType]] = Query(
@@ -13,6 +13,7 @@ import hashlib
 import json
 import logging
 import pickle
+import time
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
@@ -49,6 +50,20 @@ class ComplianceCacheManager:
             "workflows": 3600,  # 1 hour
         }
 
+        # cleanup_expired_cache: SCAN batch size, time budget per run, and
+        # where the SCAN cursor is kept between runs (outside cache_prefix so
+        # the scan never visits it)
+        self.cleanup_batch_size = 500
+        self.cleanup_time_budget = 5.0  # seconds
+        self.cleanup_cursor_key = "compliance_maintenance:cleanup_cursor"
+        self.cleanup_cursor_ttl = 86400
+        self._cleanup_counters = {
+            "risk_assessment": "risk_assessments",
+            "regulatory_report": "regulatory_reports",
+            "case": "cases",
+            "audit_event": "audit_events",
+        }
+
     async def cache_risk_assessment(
         self, assessment_id: str, assessment_data: Dict[str, Any]
     ) -> bool:
@@ -502,8 +517,21 @@ class ComplianceCacheManager:
             logger.error(f"Failed to get cache statistics: {e}")
             return {"error": str(e), "redis_connected": False}
 
-    async def cleanup_expired_cache(self) -> Dict[str, int]:
-        """Clean up expired cache entries"""
+    async def cleanup_expired_cache(
+        self, batch_size: Optional[int] = None, time_budget: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Incremental maintenance pass over the compliance keyspace.
+
+        Keys are streamed with ``SCAN`` in batches of ``batch_size`` and each
+        batch's TTLs are read in one pipeline; keys without an expiry get their
+        category TTL in a second pipeline.  The pass stops once ``time_budget``
+        seconds have elapsed and saves the SCAN cursor, so the next run resumes
+        where this one stopped and no single run keeps Redis busy for long.
+        """
+        batch_size = batch_size or self.cleanup_batch_size
+        if time_budget is None:
+            time_budget = self.cleanup_time_budget
+
         try:
             cleanup_stats = {
                 "risk_assessments": 0,
@@ -512,44 +540,40 @@ class ComplianceCacheManager:
                 "audit_events": 0,
                 "other": 0,
                 "total_cleaned": 0,
+                "keys_scanned": 0,
+                "ttl_applied": 0,
+                "batches": 0,
+                "by_category": {},
+                "complete": False,
+                "memory_reclaimed_bytes": 0,
             }
 
-            # Get all compliance cache keys
+            started = time.monotonic()
+            memory_before = await self._used_memory()
             pattern = f"{self.cache_prefix}*"
-            cursor = 0
-            keys_to_check = []
+            cursor = await self._load_cleanup_cursor()
 
-            while cursor != 0:
+            while True:
                 cursor, keys = await self.redis_client.scan(
-                    cursor=cursor, match=pattern, count=1000
+                    cursor=cursor, match=pattern, count=batch_size
                 )
-                keys_to_check.extend(keys)
-
-            # Check TTL for each key and clean up expired ones
-            for key in keys_to_check:
-                try:
-                    ttl = await self.redis_client.ttl(key)
-                    if ttl == -1:  # No expiration set, set default
-                        await self.redis_client.expire(key, self.default_ttl)
-                    elif ttl == -2:  # Key expired but not yet cleaned
-                        await self.redis_client.delete(key)
-
-                        # Categorize cleanup
-                        if "risk_assessment:" in key:
-                            cleanup_stats["risk_assessments"] += 1
-                        elif "regulatory_report:" in key:
-                            cleanup_stats["regulatory_reports"] += 1
-                        elif "case:" in key:
-                            cleanup_stats["cases"] += 1
-                        elif "audit_event:" in key:
-                            cleanup_stats["audit_events"] += 1
-                        else:
-                            cleanup_stats["other"] += 1
-
-                        cleanup_stats["total_cleaned"] += 1
-
-                except Exception as e:
-                    logger.warning(f"Failed to check TTL for key {key}: {e}")
+                if keys:
+                    await self._cleanup_batch(keys, cleanup_stats)
+                    cleanup_stats["batches"] += 1
+
+                if cursor == 0:
+                    cleanup_stats["complete"] = True
+                    break
+                if time.monotonic() - started >= time_budget:
+                    break
+
+            await self._save_cleanup_cursor(cursor)
+
+            memory_after = await self._used_memory()
+            cleanup_stats["memory_reclaimed_bytes"] = max(
+                0, memory_before - memory_after
+            )
+            cleanup_stats["elapsed_seconds"] = round(time.monotonic() - started, 3)
 
             logger.info(f"Cache cleanup completed: {cleanup_stats}")
             return cleanup_stats
@@ -558,6 +582,61 @@ class ComplianceCacheManager:
             logger.error(f"Cache cleanup failed: {e}")
             return {"error": str(e), "total_cleaned": 0}
 
+    async def _cleanup_batch(self, keys: List[Any], cleanup_stats: Dict[str, Any]):
+        """Check one SCAN batch and apply missing expiries, pipelined"""
+        keys = [key.decode() if isinstance(key, bytes) else key for key in keys]
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.ttl(key)
+        ttls = await pipe.execute()
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key, ttl in zip(keys, ttls):
+            category = self._key_category(key)
+            counters = cleanup_stats["by_category"].setdefault(
+                category, {"scanned": 0, "expired": 0, "ttl_applied": 0}
+            )
+            counters["scanned"] += 1
+            cleanup_stats["keys_scanned"] += 1
+
+            if ttl == -1:  # No expiration set, apply the category TTL
+                pipe.expire(key, self.ttl_config.get(category, self.default_ttl))
+                counters["ttl_applied"] += 1
+                cleanup_stats["ttl_applied"] += 1
+            elif ttl == -2:
+                # Logically expired: the TTL lookup itself made Redis delete it
+                counters["expired"] += 1
+                legacy_counter = self._cleanup_counters.get(category, "other")
+                cleanup_stats[legacy_counter] += 1
+                cleanup_stats["total_cleaned"] += 1
+
+        if len(pipe):
+            await pipe.execute()
+
+    def _key_category(self, key: str) -> str:
+        return key[len(self.cache_prefix) :].split(":", 1)[0]
+
+    async def _used_memory(self) -> int:
+        try:
+            info = await self.redis_client.info("memory")
+            return int(info.get("used_memory", 0))
+        except Exception as e:
+            logger.debug(f"Could not read Redis memory usage: {e}")
+            return 0
+
+    async def _load_cleanup_cursor(self) -> int:
+        cursor = await self.redis_client.get(self.cleanup_cursor_key)
+        return int(cursor) if cursor else 0
+
+    async def _save_cleanup_cursor(self, cursor: int):
+        if cursor:
+            await self.redis_client.set(
+                self.cleanup_cursor_key, cursor, ex=self.cleanup_cursor_ttl
+            )
+        else:
+            await self.redis_client.delete(self.cleanup_cursor_key)
+
     async def warm_up_cache(self, data_provider) -> Dict[str, int]:
         """Warm up cache with frequently accessed data"""
         warmup_stats = {
@@ -6,6 +6,7 @@ Multi-chain blockchain data collection modules
 from .base import Address
 from .base import BaseCollector
 from .base import Block
+from .base import FetchedBlock
 from .base import Transaction
 from .bitcoin import BitcoinCollector
 from .ethereum import EthereumCollector
@@ -22,6 +23,7 @@ __all__ = [
     "BaseCollector",
     "Transaction",
     "Block",
+    "FetchedBlock",
     "Address",
     "BitcoinCollector",
     "EthereumCollector",
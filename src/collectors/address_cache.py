@@ -0,0 +1,280 @@
+"""
+Jackdaw Sentry - Address Info Cache
+Per-block batched updates of the Redis address-info hashes, plus a
+low-priority background refresher for address balances
+"""
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Union
+
+from src.api.database import get_redis_connection
+
+if TYPE_CHECKING:
+    from .base import Transaction
+
+logger = logging.getLogger(__name__)
+
+ADDRESS_INFO_TTL_SECONDS = 3600
+
+# Merges one block's activity into an address hash.  Fills the static fields
+# on first sight, keeps the earliest first_seen and the latest last_seen (so
+# out-of-order writers never move last_seen backwards), bumps the counter and
+# refreshes the TTL.  Returns 1 while the hash has no balance yet.  Keys left
+# over from the old JSON-string format are replaced.
+_MERGE_ADDRESS_SCRIPT = """
+local key = KEYS[1]
+if redis.call('TYPE', key).ok ~= 'hash' then
+    redis.call('DEL', key)
+end
+if redis.call('HSETNX', key, 'address', ARGV[1]) == 1 then
+    redis.call('HSET', key, 'blockchain', ARGV[2], 'type', 'unknown',
+               'risk_score', '0.0', 'labels', '[]')
+end
+local first = tonumber(redis.call('HGET', key, 'first_seen_ts'))
+if not first or tonumber(ARGV[4]) < first then
+    redis.call('HSET', key, 'first_seen_ts', ARGV[4], 'first_seen', ARGV[5])
+end
+local last = tonumber(redis.call('HGET', key, 'last_seen_ts'))
+if not last or tonumber(ARGV[6]) > last then
+    redis.call('HSET', key, 'last_seen_ts', ARGV[6], 'last_seen', ARGV[7])
+end
+redis.call('HINCRBY', key, 'transaction_count', ARGV[3])
+redis.call('EXPIRE', key, ARGV[8])
+if redis.call('HEXISTS', key, 'balance') == 1 then
+    return 0
+end
+return 1
+"""
+
+
+def address_info_key(blockchain: str, address: str) -> str:
+    return f"address:{blockchain}:{address}"
+
+
+class AddressInfoBuffer:
+    """Aggregates address activity in memory and writes it once per block.
+
+    ``record`` is synchronous and only updates a dict.  ``flush`` sends one
+    pipelined round trip containing a merge script call per distinct address,
+    so an address that appears in many transactions of a block costs a
+    single Redis command.  Like ``GraphWriteBuffer``, rows stay buffered if
+    the flush fails.
+
+    The round trip is a MULTI/EXEC transaction, so a connection dropped
+    before EXEC applies none of the merges.  If EXEC was applied but its
+    reply was lost the whole batch is still re-buffered, and its counts are
+    added again by the next flush: ``transaction_count`` is at-least-once.
+    Redis does not roll back a transaction in which a single command failed;
+    only the entries whose merge failed are kept for the next flush.
+    """
+
+    def __init__(self, blockchain: str, ttl_seconds: int = ADDRESS_INFO_TTL_SECONDS):
+        self.blockchain = blockchain
+        self.ttl_seconds = ttl_seconds
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flush_lock = asyncio.Lock()
+
+        self.metrics = {
+            "flushes": 0,
+            "addresses_written": 0,
+            "failed_flushes": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, address: str, tx: "Transaction"):
+        """Count one transaction of ``tx`` against ``address``"""
+        ts = tx.timestamp.timestamp()
+        entry = self._pending.get(address)
+        if entry is None:
+            self._pending[address] = {
+                "count": 1,
+                "first_ts": ts,
+                "first_seen": tx.timestamp,
+                "last_ts": ts,
+                "last_seen": tx.timestamp,
+            }
+            return
+
+        entry["count"] += 1
+        if ts < entry["first_ts"]:
+            entry["first_ts"] = ts
+            entry["first_seen"] = tx.timestamp
+        if ts > entry["last_ts"]:
+            entry["last_ts"] = ts
+            entry["last_seen"] = tx.timestamp
+
+    async def flush(self) -> List[str]:
+        """Write all buffered activity; returns the addresses without a balance"""
+        async with self._flush_lock:
+            if not self._pending:
+                return []
+
+            pending, self._pending = self._pending, {}
+            addresses = list(pending)
+            try:
+                async with get_redis_connection() as redis:
+                    script = redis.register_script(_MERGE_ADDRESS_SCRIPT)
+                    pipe = redis.pipeline(transaction=True)
+                    for address in addresses:
+                        entry = pending[address]
+                        await script(
+                            keys=[address_info_key(self.blockchain, address)],
+                            args=[
+                                address,
+                                self.blockchain,
+                                entry["count"],
+                                repr(entry["first_ts"]),
+                                entry["first_seen"].isoformat(),
+                                repr(entry["last_ts"]),
+                                entry["last_seen"].isoformat(),
+                                self.ttl_seconds,
+                            ],
+                            client=pipe,
+                        )
+                    results = await pipe.execute(raise_on_error=False)
+            except Exception:
+                self._restore(pending)
+                self.metrics["failed_flushes"] += 1
+                raise
+
+            failed = {
+                address: pending[address]
+                for address, result in zip(addresses, results)
+                if isinstance(result, Exception)
+            }
+            if failed:
+                logger.warning(
+                    f"Address info merge failed for {len(failed)} "
+                    f"{self.blockchain} addresses, retrying next flush: "
+                    f"{next(r for r in results if isinstance(r, Exception))}"
+                )
+                self._restore(failed)
+                self.metrics["failed_flushes"] += 1
+
+            self.metrics["flushes"] += 1
+            self.metrics["addresses_written"] += len(addresses) - len(failed)
+            return [
+                address
+                for address, result in zip(addresses, results)
+                if address not in failed and int(result)
+            ]
+
+    def _restore(self, entries: Dict[str, Dict[str, Any]]):
+        """Put unwritten entries back, merging anything recorded meanwhile"""
+        for address, entry in self._pending.items():
+            if address in entries:
+                self._merge(entries[address], entry)
+            else:
+                entries[address] = entry
+        self._pending = entries
+
+    @staticmethod
+    def _merge(into: Dict[str, Any], entry: Dict[str, Any]):
+        into["count"] += entry["count"]
+        if entry["first_ts"] < into["first_ts"]:
+            into["first_ts"] = entry["first_ts"]
+            into["first_seen"] = entry["first_seen"]
+        if entry["last_ts"] > into["last_ts"]:
+            into["last_ts"] = entry["last_ts"]
+            into["last_seen"] = entry["last_seen"]
+
+    def discard(self) -> int:
+        """Drop buffered activity without writing it; returns addresses dropped"""
+        dropped = len(self._pending)
+        self._pending = {}
+        return dropped
+
+
+class BalanceRefresher:
+    """Fills in address balances off the ingestion path.
+
+    Addresses are queued by ``enqueue`` (never blocking; duplicates and
+    overflow are dropped) and fetched one at a time by a background task
+    with ``interval`` seconds between RPC calls, so balance lookups only use
+    spare node capacity.
+    """
+
+    def __init__(
+        self,
+        blockchain: str,
+        fetch_balance: Callable[[str], Awaitable[Union[float, str]]],
+        max_queue_size: int = 10000,
+        interval: float = 0.1,
+    ):
+        self.blockchain = blockchain
+        self.fetch_balance = fetch_balance
+        self.interval = interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_queue_size))
+        self._queued: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+        self.metrics = {
+            "balances_refreshed": 0,
+            "balance_errors": 0,
+            "balances_dropped": 0,
+        }
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def enqueue(self, addresses: List[str]):
+        for address in addresses:
+            if address in self._queued:
+                continue
+            try:
+                self._queue.put_nowait(address)
+            except asyncio.QueueFull:
+                # Retried the next time the address shows up without a balance
+                self.metrics["balances_dropped"] += 1
+                continue
+            self._queued.add(address)
+
+    async def refresh(self, address: str):
+        """Fetch and store the balance of one address"""
+        key = address_info_key(self.blockchain, address)
+        async with get_redis_connection() as redis:
+            # Expired hashes are rebuilt, and re-queued, the next time the
+            # address is seen, so skip the RPC call for them
+            if not await redis.exists(key):
+                return
+            balance = await self.fetch_balance(address)
+            await redis.hset(key, "balance", str(balance))
+        self.metrics["balances_refreshed"] += 1
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self):
+        while True:
+            address = await self._queue.get()
+            self._queued.discard(address)
+            try:
+                await self.refresh(address)
+            except Exception as e:
+                self.metrics["balance_errors"] += 1
+                logger.debug(
+                    f"Balance refresh failed for {self.blockchain}:{address}: {e}"
+                )
+            await asyncio.sleep(self.interval)
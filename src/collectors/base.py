@@ -5,10 +5,10 @@ Abstract base class for all blockchain collectors
 
 import asyncio
 import hashlib
-import json
 import logging
 from abc import ABC
 from abc import abstractmethod
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from datetime import timedelta
@@ -20,9 +20,12 @@ from typing import Optional
 from typing import Union
 
 from src.api.config import settings
-from src.api.database import get_neo4j_session
 from src.api.database import get_redis_connection
 
+from .address_cache import AddressInfoBuffer
+from .address_cache import BalanceRefresher
+from .graph_writer import GraphWriteBuffer
+
 logger = logging.getLogger(__name__)
 
 
@@ -86,6 +89,20 @@ class Address:
             self.labels = []
 
 
+@dataclass
+class FetchedBlock:
+    """A block and its transactions as produced by the pipeline fetch stage"""
+
+    number: int
+    block: Optional[Block] = None
+    transactions: List[Optional[Transaction]] = None
+    error: Optional[BaseException] = None
+
+    def __post_init__(self):
+        if self.transactions is None:
+            self.transactions = []
+
+
 class BaseCollector(ABC):
     """Abstract base class for blockchain collectors"""
 
@@ -96,11 +113,40 @@ class BaseCollector(ABC):
         self.last_block_processed = 0
         self.collection_interval = config.get("collection_interval", 60)  # seconds
 
+        # Pipelined ingestion: fetch -> parse -> write stages joined by queues
+        self.pipeline_enabled = config.get("pipeline_enabled", False)
+        self.fetch_concurrency = max(1, int(config.get("fetch_concurrency", 8)))
+        self.pipeline_queue_size = max(
+            1, int(config.get("pipeline_queue_size", self.fetch_concurrency * 2))
+        )
+        # Fetch attempts before a block is written without the transactions
+        # that keep failing; those are recorded in ``skipped_transactions``
+        self.tx_fetch_attempts = max(1, int(config.get("tx_fetch_attempts", 3)))
+        self._unresolved_attempts: Dict[int, int] = {}
+        self.skipped_transactions: deque = deque(maxlen=1000)
+
+        # Batched Neo4j writes (one UNWIND transaction per block)
+        self.graph_writer = GraphWriteBuffer(
+            max_batch_size=config.get("graph_batch_size", 1000),
+            flush_interval=config.get("graph_flush_interval", 2.0),
+        )
+
+        # Address-info hashes in Redis, written once per block; balances are
+        # filled in lazily by a background refresher
+        self.address_cache = AddressInfoBuffer(blockchain)
+        self.balance_refresher = BalanceRefresher(
+            blockchain,
+            self.get_address_balance,
+            max_queue_size=config.get("balance_refresh_queue_size", 10000),
+            interval=config.get("balance_refresh_interval", 0.1),
+        )
+
         # Performance metrics
         self.metrics = {
             "transactions_collected": 0,
             "blocks_processed": 0,
             "errors": 0,
+            "transactions_skipped": 0,
             "last_collection": None,
             "collection_rate": 0.0,
         }
@@ -151,6 +197,8 @@ class BaseCollector(ABC):
             return
 
         self.is_running = True
+        self.graph_writer.start()
+        self.balance_refresher.start()
 
         try:
             # Load last processed block
@@ -168,6 +216,12 @@ class BaseCollector(ABC):
         """Stop the collector"""
         logger.info(f"Stopping {self.blockchain} collector...")
         self.is_running = False
+        await self.balance_refresher.close()
+        try:
+            await self.graph_writer.close()
+            await self.flush_address_info()
+        except Exception as e:
+            logger.error(f"Error flushing graph writes for {self.blockchain}: {e}")
         await self.disconnect()
 
     async def collection_loop(self):
@@ -194,19 +248,26 @@ class BaseCollector(ABC):
             start_block = self.last_block_processed + 1
             end_block = min(latest_block, start_block + batch_size - 1)
 
-            for block_num in range(start_block, end_block + 1):
-                await self.process_block(block_num)
-                self.last_block_processed = block_num
+            if self.pipeline_enabled:
+                blocks_written = await self.run_ingestion_pipeline(
+                    start_block, end_block
+                )
+            else:
+                for block_num in range(start_block, end_block + 1):
+                    await self.process_block(block_num)
+                    self.last_block_processed = block_num
+                blocks_written = end_block - start_block + 1
 
             # Save progress
             await self.save_last_processed_block()
 
             # Update metrics
-            self.metrics["blocks_processed"] += end_block - start_block + 1
+            self.metrics["blocks_processed"] += blocks_written
             self.metrics["last_collection"] = datetime.now(timezone.utc)
 
             logger.info(
-                f"Processed blocks {start_block}-{end_block} for {self.blockchain}"
+                f"Processed blocks {start_block}-{self.last_block_processed} "
+                f"for {self.blockchain}"
             )
 
         except Exception as e:
@@ -220,215 +281,302 @@ class BaseCollector(ABC):
             if not block:
                 return
 
-            # Store block in Neo4j
-            await self.store_block(block)
+            await self.graph_writer.add_block(block)
 
             # Process transactions
             for tx_hash in await self.get_block_transactions(block_number):
-                await self.process_transaction(tx_hash)
+                await self.process_transaction(tx_hash, flush=False)
+
+            # Write the whole block in one batched transaction
+            await self.graph_writer.flush()
+            await self.flush_address_info()
 
         except Exception as e:
             logger.error(
                 f"Error processing block {block_number} for {self.blockchain}: {e}"
             )
 
-    async def process_transaction(self, tx_hash: str):
-        """Process a single transaction"""
+    async def process_transaction(self, tx_hash: str, flush: bool = True):
+        """Process a single transaction
+
+        With ``flush=False`` the graph writes stay buffered for the caller to
+        flush, e.g. once per block.
+        """
         try:
             tx = await self.get_transaction(tx_hash)
             if not tx:
                 return
 
-            # Store transaction in Neo4j
-            await self.store_transaction(tx)
-
-            # Update address information
-            await self.update_address_info(tx.from_address, tx)
-            if tx.to_address:
-                await self.update_address_info(tx.to_address, tx)
-
-            # Check for stablecoin transfers
-            await self.process_stablecoin_transfers(tx)
-
-            # Update metrics
-            self.metrics["transactions_collected"] += 1
+            await self.ingest_transaction(tx)
+            if flush:
+                await self.graph_writer.flush()
+                await self.flush_address_info()
 
         except Exception as e:
             logger.error(
                 f"Error processing transaction {tx_hash} for {self.blockchain}: {e}"
             )
 
-    async def store_block(self, block: Block):
-        """Store block in Neo4j"""
-        query = """
-        MERGE (b:Block {hash: $hash, blockchain: $blockchain})
-        SET b.number = $number,
-            b.timestamp = $timestamp,
-            b.transaction_count = $transaction_count,
-            b.parent_hash = $parent_hash,
-            b.miner = $miner,
-            b.difficulty = $difficulty,
-            b.size = $size,
-            b.processed_at = timestamp()
+    async def ingest_transaction(self, tx: Transaction):
+        """Buffer a fetched transaction for the graph and update the address cache.
+
+        Unlike ``process_transaction`` errors are propagated so callers can
+        decide whether the enclosing block counts as written.
         """
+        await self.graph_writer.add_transaction(tx)
+
+        # Update address information
+        await self.update_address_info(tx.from_address, tx)
+        if tx.to_address:
+            await self.update_address_info(tx.to_address, tx)
+
+        # Check for stablecoin transfers
+        await self.process_stablecoin_transfers(tx)
 
-        async with get_neo4j_session() as session:
-            await session.run(
-                query,
-                hash=block.hash,
-                blockchain=block.blockchain,
-                number=block.number,
-                timestamp=block.timestamp,
-                transaction_count=block.transaction_count,
-                parent_hash=block.parent_hash,
-                miner=block.miner,
-                difficulty=block.difficulty,
-                size=block.size,
+        # Update metrics
+        self.metrics["transactions_collected"] += 1
+
+    # =========================================================================
+    # Pipelined ingestion
+    # =========================================================================
+
+    async def run_ingestion_pipeline(self, start_block: int, end_block: int) -> int:
+        """Ingest ``start_block..end_block`` through a fetch/parse/write pipeline.
+
+        Up to ``fetch_concurrency`` block and transaction RPC calls are in
+        flight at once.  Fetched blocks are re-sequenced by the parse stage so
+        the write stage always sees them in block order, and
+        ``last_block_processed`` only advances past blocks that were fully
+        written.  The first block that fails to fetch or write stops the
+        pipeline; it is retried on the next collection cycle.
+
+        Returns the number of blocks written.
+        """
+        block_queue: asyncio.Queue = asyncio.Queue()
+        for block_number in range(start_block, end_block + 1):
+            block_queue.put_nowait(block_number)
+
+        parse_queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_queue_size)
+        rpc_semaphore = asyncio.Semaphore(self.fetch_concurrency)
+
+        worker_count = min(self.fetch_concurrency, end_block - start_block + 1)
+        stage_tasks = [
+            asyncio.create_task(
+                self._pipeline_fetch_worker(block_queue, parse_queue, rpc_semaphore)
+            )
+            for _ in range(worker_count)
+        ]
+        stage_tasks.append(
+            asyncio.create_task(
+                self._pipeline_parse_stage(
+                    start_block, end_block, parse_queue, write_queue
+                )
             )
+        )
 
-    async def store_transaction(self, tx: Transaction):
-        """Store transaction in Neo4j"""
-        query = """
-        MERGE (t:Transaction {hash: $hash, blockchain: $blockchain})
-        SET t.from_address = $from_address,
-            t.to_address = $to_address,
-            t.value = $value,
-            t.timestamp = $timestamp,
-            t.block_number = $block_number,
-            t.block_hash = $block_hash,
-            t.gas_used = $gas_used,
-            t.gas_price = $gas_price,
-            t.fee = $fee,
-            t.status = $status,
-            t.confirmations = $confirmations,
-            t.memo = $memo,
-            t.contract_address = $contract_address,
-            t.processed_at = timestamp()
-        
-        // Create or update from address
-        MERGE (from_addr:Address {address: $from_address, blockchain: $blockchain})
-        ON CREATE SET from_addr.first_seen = $timestamp
-        ON MATCH SET from_addr.last_seen = $timestamp,
-                     from_addr.transaction_count = from_addr.transaction_count + 1
-        
-        // Create or update to address if exists
+        try:
+            return await self._pipeline_write_stage(write_queue)
+        finally:
+            for task in stage_tasks:
+                task.cancel()
+            await asyncio.gather(*stage_tasks, return_exceptions=True)
+
+    async def _pipeline_fetch_worker(
+        self,
+        block_queue: asyncio.Queue,
+        parse_queue: asyncio.Queue,
+        rpc_semaphore: asyncio.Semaphore,
+    ):
+        """Fetch stage: pull block numbers and fetch blocks with their transactions"""
+        while True:
+            try:
+                block_number = block_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            try:
+                fetched = await self.fetch_block(block_number, rpc_semaphore)
+            except Exception as e:
+                fetched = FetchedBlock(number=block_number, error=e)
+
+            await parse_queue.put(fetched)
+
+    async def fetch_block(
+        self, block_number: int, rpc_semaphore: asyncio.Semaphore
+    ) -> FetchedBlock:
+        """Fetch a block and all of its transactions, bounded by ``rpc_semaphore``
+
+        A block the node does not return, or a transaction of it that cannot
+        be fetched, counts as a failed fetch, so the checkpoint stops before
+        the block instead of skipping it or writing it incomplete.  After
+        ``tx_fetch_attempts`` failed attempts the block is written without
+        the unresolved transactions, which are logged and recorded in
+        ``skipped_transactions`` so one bad transaction cannot stall the
+        chain forever.
         """
 
-        if tx.to_address:
-            query += """
-        MERGE (to_addr:Address {address: $to_address, blockchain: $blockchain})
-        ON CREATE SET to_addr.first_seen = $timestamp
-        ON MATCH SET to_addr.last_seen = $timestamp,
-                     to_addr.transaction_count = to_addr.transaction_count + 1
-        
-        // Create relationships
-        MERGE (from_addr)-[r:SENT]->(to_addr)
-        SET r.transaction_hash = $hash,
-            r.value = $value,
-            r.timestamp = $timestamp,
-            r.blockchain = $blockchain,
-            r.gas_used = $gas_used,
-            r.fee = $fee,
-            r.status = $status
-            """
-        else:
-            query += """
-        // Create self-loop for contract creation or mining rewards
-        MERGE (from_addr)-[r:SENT]->(from_addr)
-        SET r.transaction_hash = $hash,
-            r.value = $value,
-            r.timestamp = $timestamp,
-            r.blockchain = $blockchain,
-            r.gas_used = $gas_used,
-            r.fee = $fee,
-            r.status = $status
-            """
-
-        async with get_neo4j_session() as session:
-            await session.run(
-                query,
-                hash=tx.hash,
-                blockchain=tx.blockchain,
-                from_address=tx.from_address,
-                to_address=tx.to_address,
-                value=tx.value,
-                timestamp=tx.timestamp,
-                block_number=tx.block_number,
-                block_hash=tx.block_hash,
-                gas_used=tx.gas_used,
-                gas_price=tx.gas_price,
-                fee=tx.fee,
-                status=tx.status,
-                confirmations=tx.confirmations,
-                memo=tx.memo,
-                contract_address=tx.contract_address,
+        async def _bounded(fetch, *args):
+            # The coroutine is only created once a slot is free, so calls
+            # still queued when the pipeline is cancelled are never started
+            async with rpc_semaphore:
+                return await fetch(*args)
+
+        block, tx_hashes = await asyncio.gather(
+            _bounded(self.get_block, block_number),
+            _bounded(self.get_block_transactions, block_number),
+        )
+        if not block:
+            return FetchedBlock(
+                number=block_number,
+                error=LookupError(f"block {block_number} not returned by node"),
             )
 
+        transactions = await asyncio.gather(
+            *(_bounded(self.get_transaction, tx_hash) for tx_hash in tx_hashes)
+        )
+        unresolved = [tx_hash for tx_hash, tx in zip(tx_hashes, transactions) if not tx]
+        if not unresolved:
+            self._unresolved_attempts.pop(block_number, None)
+            return FetchedBlock(
+                number=block_number, block=block, transactions=list(transactions)
+            )
+
+        attempts = self._unresolved_attempts.get(block_number, 0) + 1
+        if attempts < self.tx_fetch_attempts:
+            self._unresolved_attempts[block_number] = attempts
+            return FetchedBlock(
+                number=block_number,
+                error=LookupError(
+                    f"{len(unresolved)} transaction(s) of block {block_number} "
+                    f"not returned by node, first {unresolved[0]}"
+                ),
+            )
+
+        self._unresolved_attempts.pop(block_number, None)
+        logger.warning(
+            f"Skipping {len(unresolved)} {self.blockchain} transaction(s) of block "
+            f"{block_number} after {attempts} attempts: {', '.join(unresolved)}"
+        )
+        self.metrics["transactions_skipped"] += len(unresolved)
+        self.skipped_transactions.extend(
+            (block_number, tx_hash) for tx_hash in unresolved
+        )
+        return FetchedBlock(
+            number=block_number,
+            block=block,
+            transactions=[tx for tx in transactions if tx],
+        )
+
+    async def _pipeline_parse_stage(
+        self,
+        start_block: int,
+        end_block: int,
+        parse_queue: asyncio.Queue,
+        write_queue: asyncio.Queue,
+    ):
+        """Parse stage: restore block order and stop at the first failed fetch.
+
+        A ``None`` on the write queue tells the write stage to stop.
+        """
+        pending: Dict[int, FetchedBlock] = {}
+        next_block = start_block
+
+        while next_block <= end_block:
+            fetched = await parse_queue.get()
+            pending[fetched.number] = fetched
+
+            while next_block in pending:
+                ready = pending.pop(next_block)
+                if ready.error is not None:
+                    logger.error(
+                        f"Error fetching block {ready.number} for "
+                        f"{self.blockchain}: {ready.error}"
+                    )
+                    self.metrics["errors"] += 1
+                    await write_queue.put(None)
+                    return
+
+                await write_queue.put(ready)
+                next_block += 1
+
+        await write_queue.put(None)
+
+    async def _pipeline_write_stage(self, write_queue: asyncio.Queue) -> int:
+        """Write stage: persist blocks in order and advance the checkpoint"""
+        blocks_written = 0
+
+        while True:
+            fetched = await write_queue.get()
+            if fetched is None:
+                return blocks_written
+
+            try:
+                await self.write_block(fetched)
+            except Exception as e:
+                logger.error(
+                    f"Error writing block {fetched.number} for {self.blockchain}: {e}"
+                )
+                self.metrics["errors"] += 1
+                # The block is re-ingested from the checkpoint next cycle
+                self.graph_writer.discard()
+                self.address_cache.discard()
+                return blocks_written
+
+            self.last_block_processed = fetched.number
+            blocks_written += 1
+
+    async def write_block(self, fetched: FetchedBlock):
+        """Persist a fetched block and its transactions"""
+        if not fetched.block:
+            return
+
+        await self.graph_writer.add_block(fetched.block)
+        for tx in fetched.transactions:
+            await self.ingest_transaction(tx)
+        await self.graph_writer.flush()
+        await self.flush_address_info()
+
+    async def store_block(self, block: Block):
+        """Store block in Neo4j"""
+        await self.graph_writer.add_block(block)
+        await self.graph_writer.flush()
+
+    async def store_transaction(self, tx: Transaction):
+        """Store transaction in Neo4j"""
+        await self.graph_writer.add_transaction(tx)
+        await self.graph_writer.flush()
+
     async def update_address_info(self, address: str, tx: Transaction):
-        """Update address information"""
-        # Cache address info in Redis for performance
-        cache_key = f"address:{self.blockchain}:{address}"
+        """Record address activity for the next ``flush_address_info``"""
+        self.address_cache.record(address, tx)
 
-        async with get_redis_connection() as redis:
-            cached_info = await redis.get(cache_key)
+    async def flush_address_info(self):
+        """Write buffered address activity to Redis in one pipelined round trip.
 
-            if cached_info:
-                info = json.loads(cached_info)
-                info["last_seen"] = tx.timestamp.isoformat()
-                info["transaction_count"] += 1
-            else:
-                balance = await self.get_address_balance(address)
-                info = {
-                    "address": address,
-                    "blockchain": self.blockchain,
-                    "balance": str(balance),
-                    "transaction_count": 1,
-                    "first_seen": tx.timestamp.isoformat(),
-                    "last_seen": tx.timestamp.isoformat(),
-                    "type": "unknown",
-                    "risk_score": 0.0,
-                    "labels": [],
-                }
-
-            await redis.setex(cache_key, 3600, json.dumps(info))  # Cache for 1 hour
+        Addresses whose cached info has no balance yet are handed to the
+        background balance refresher instead of being fetched inline.
+        """
+        missing_balances = await self.address_cache.flush()
+        if missing_balances:
+            self.balance_refresher.enqueue(missing_balances)
 
     async def process_stablecoin_transfers(self, tx: Transaction):
-        """Process stablecoin transfers and create cross-chain relationships"""
+        """Buffer stablecoin transfer relationships for the next graph flush"""
         if not tx.token_transfers:
             return
 
+        supported_stablecoins = get_supported_stablecoins()
         for transfer in tx.token_transfers:
             stablecoin_symbol = transfer.get("symbol")
             if not stablecoin_symbol:
                 continue
 
             # Check if this is a supported stablecoin
-            supported_stablecoins = get_supported_stablecoins()
             if stablecoin_symbol not in supported_stablecoins:
                 continue
 
-            # Create stablecoin transfer relationship
-            query = """
-            MATCH (t:Transaction {hash: $tx_hash})
-            MATCH (s:Stablecoin {symbol: $symbol, blockchain: $blockchain})
-            MERGE (t)-[r:STABLECOIN_TRANSFER]->(s)
-            SET r.amount = $amount,
-                r.from_address = $from_address,
-                r.to_address = $to_address,
-                r.decimals = $decimals
-            """
-
-            async with get_neo4j_session() as session:
-                await session.run(
-                    query,
-                    tx_hash=tx.hash,
-                    symbol=stablecoin_symbol,
-                    blockchain=self.blockchain,
-                    amount=transfer.get("amount"),
-                    from_address=transfer.get("from_address"),
-                    to_address=transfer.get("to_address"),
-                    decimals=transfer.get("decimals", 18),
-                )
+            await self.graph_writer.add_stablecoin_transfer(tx, transfer)
 
     async def load_last_processed_block(self):
         """Load last processed block from Redis"""
@@ -456,6 +604,12 @@ class BaseCollector(ABC):
             "is_running": self.is_running,
             "last_block_processed": self.last_block_processed,
             "collection_interval": self.collection_interval,
+            "graph_writer": dict(self.graph_writer.metrics),
+            "address_cache": {
+                **self.address_cache.metrics,
+                **self.balance_refresher.metrics,
+                "balance_refresh_pending": self.balance_refresher.pending,
+            },
             **self.metrics,
         }
 
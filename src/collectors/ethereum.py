@@ -48,6 +48,15 @@ from .base import Transaction
 logger = logging.getLogger(__name__)
 
 
+def _hex(value: Any) -> Optional[str]:
+    """Hex string of a web3 value, which is HexBytes or already a string"""
+    if not value:
+        return None
+    if isinstance(value, str):
+        return value
+    return value.hex()
+
+
 class EthereumCollector(BaseCollector):
     """Ethereum and EVM-compatible blockchain collector"""
 
@@ -151,7 +160,10 @@ class EthereumCollector(BaseCollector):
         """Get latest block number"""
         try:
             if self.w3:
-                return self.w3.eth.block_number
+                self.latest_block_cache = await asyncio.to_thread(
+                    lambda: self.w3.eth.block_number
+                )
+                return self.latest_block_cache
         except Exception as e:
             logger.error(f"Error getting latest block for {self.blockchain}: {e}")
         return 0
@@ -162,7 +174,9 @@ class EthereumCollector(BaseCollector):
             if not self.w3:
                 return None
 
-            block_data = self.w3.eth.get_block(block_number, full_transactions=True)
+            block_data = await asyncio.to_thread(
+                self.w3.eth.get_block, block_number, full_transactions=True
+            )
             if not block_data:
                 return None
 
@@ -189,18 +203,22 @@ class EthereumCollector(BaseCollector):
             if not self.w3:
                 return None
 
-            tx_data = self.w3.eth.get_transaction(tx_hash)
+            tx_data = await asyncio.to_thread(self.w3.eth.get_transaction, tx_hash)
             if not tx_data:
                 return None
 
             # Get receipt for status and gas info
-            receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+            receipt = await asyncio.to_thread(
+                self.w3.eth.get_transaction_receipt, tx_hash
+            )
 
             # Get block info
             block_number = tx_data["blockNumber"]
             block_timestamp = None
             if block_number:
-                block_data = self.w3.eth.get_block(block_number)
+                block_data = await asyncio.to_thread(
+                    self.w3.eth.get_block, block_number
+                )
                 if block_data:
                     block_timestamp = datetime.fromtimestamp(block_data["timestamp"])
 
@@ -215,9 +233,11 @@ class EthereumCollector(BaseCollector):
             # Convert value from wei
             value = from_wei(tx_data["value"], "ether")
 
-            # Calculate fee
+            # Calculate fee; type-2 transactions pay the effective price
             gas_used = receipt["gasUsed"] if receipt else 0
-            gas_price = tx_data["gasPrice"]
+            gas_price = tx_data.get("gasPrice")
+            if receipt and receipt.get("effectiveGasPrice"):
+                gas_price = receipt["effectiveGasPrice"]
             fee = (
                 from_wei(gas_used * gas_price, "ether") if gas_used and gas_price else 0
             )
@@ -235,16 +255,14 @@ class EthereumCollector(BaseCollector):
                 value=value,
                 timestamp=block_timestamp or datetime.now(timezone.utc),
                 block_number=block_number,
-                block_hash=tx_data["blockHash"].hex() if tx_data["blockHash"] else None,
+                block_hash=_hex(tx_data.get("blockHash")),
                 gas_used=gas_used,
                 gas_price=gas_price,
                 fee=fee,
                 status="confirmed" if receipt and receipt["status"] == 1 else "failed",
-                confirmations=receipt["confirmations"] if receipt else 0,
+                confirmations=self._confirmations(block_number),
                 contract_address=(
-                    receipt["contractAddress"].hex()
-                    if receipt and receipt["contractAddress"]
-                    else None
+                    _hex(receipt.get("contractAddress")) if receipt else None
                 ),
                 token_transfers=token_transfers,
             )
@@ -254,6 +272,12 @@ class EthereumCollector(BaseCollector):
 
         return None
 
+    def _confirmations(self, block_number: Optional[int]) -> int:
+        """Confirmations of a block against the last tip seen, 0 if unknown"""
+        if not block_number or not self.latest_block_cache:
+            return 0
+        return max(0, self.latest_block_cache - block_number + 1)
+
     async def get_address_balance(self, address: str) -> float:
         """Get address balance in ETH"""
         try:
@@ -261,7 +285,9 @@ class EthereumCollector(BaseCollector):
                 return 0.0
 
             checksum_address = to_checksum_address(address)
-            balance_wei = self.w3.eth.get_balance(checksum_address)
+            balance_wei = await asyncio.to_thread(
+                self.w3.eth.get_balance, checksum_address
+            )
             return from_wei(balance_wei, "ether")
 
         except Exception as e:
@@ -319,7 +345,7 @@ class EthereumCollector(BaseCollector):
             if not self.w3:
                 return []
 
-            block = self.w3.eth.get_block(block_number)
+            block = await asyncio.to_thread(self.w3.eth.get_block, block_number)
             if not block:
                 return []
 
@@ -352,7 +378,7 @@ class EthereumCollector(BaseCollector):
                     amount = int(log["data"].hex(), 16)
 
                     # Check if this is a stablecoin
-                    contract_address = log["address"].hex()
+                    contract_address = _hex(log["address"])
                     stablecoin_symbol = self.get_stablecoin_symbol(contract_address)
 
                     if stablecoin_symbol:
@@ -392,8 +418,8 @@ class EthereumCollector(BaseCollector):
             # ERC20 decimals function signature
             decimals_function = self.w3.sha3(text="decimals()").hex()[:10]
 
-            result = self.w3.eth.call(
-                {"to": contract_address, "data": decimals_function}
+            result = await asyncio.to_thread(
+                self.w3.eth.call, {"to": contract_address, "data": decimals_function}
             )
 
             if result:
@@ -0,0 +1,332 @@
+"""
+Jackdaw Sentry - Graph Write Buffer
+Batches collector writes to Neo4j as parameterised UNWIND queries
+"""
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from neo4j.exceptions import ServiceUnavailable
+from neo4j.exceptions import SessionExpired
+from neo4j.exceptions import TransientError
+
+from src.api.database import get_neo4j_session
+
+if TYPE_CHECKING:
+    from .base import Block
+    from .base import Transaction
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: deadlocks, leader switches, dropped connections
+TRANSIENT_NEO4J_ERRORS = (TransientError, ServiceUnavailable, SessionExpired)
+
+BLOCKS_QUERY = """
+UNWIND $rows AS row
+MERGE (b:Block {hash: row.hash, blockchain: row.blockchain})
+SET b += row.props,
+    b.processed_at = timestamp()
+"""
+
+# Shared by both transaction queries: the Transaction node and its sender.
+# Address counters only move for transactions not yet in the graph, so a
+# block that is partly flushed, discarded and re-ingested counts once.
+_TRANSACTION_HEAD = """
+UNWIND $rows AS row
+OPTIONAL MATCH (seen:Transaction {hash: row.hash, blockchain: row.blockchain})
+WITH row, CASE WHEN seen IS NULL THEN 1 ELSE 0 END AS new_tx
+MERGE (t:Transaction {hash: row.hash, blockchain: row.blockchain})
+SET t += row.props,
+    t.processed_at = timestamp()
+MERGE (from_addr:Address {address: row.props.from_address, blockchain: row.blockchain})
+ON CREATE SET from_addr.first_seen = row.props.timestamp
+ON MATCH SET from_addr.last_seen = row.props.timestamp,
+             from_addr.transaction_count = from_addr.transaction_count + new_tx
+"""
+
+_SENT_PROPS = """
+SET r.transaction_hash = row.hash,
+    r.value = row.props.value,
+    r.timestamp = row.props.timestamp,
+    r.blockchain = row.blockchain,
+    r.gas_used = row.props.gas_used,
+    r.fee = row.props.fee,
+    r.status = row.props.status
+"""
+
+TRANSFERS_QUERY = (
+    _TRANSACTION_HEAD
+    + """
+MERGE (to_addr:Address {address: row.props.to_address, blockchain: row.blockchain})
+ON CREATE SET to_addr.first_seen = row.props.timestamp
+ON MATCH SET to_addr.last_seen = row.props.timestamp,
+             to_addr.transaction_count = to_addr.transaction_count + new_tx
+MERGE (from_addr)-[r:SENT]->(to_addr)
+"""
+    + _SENT_PROPS
+)
+
+# Contract creations and mining rewards have no recipient: record a self-loop
+SELF_TRANSFERS_QUERY = (
+    _TRANSACTION_HEAD
+    + """
+MERGE (from_addr)-[r:SENT]->(from_addr)
+"""
+    + _SENT_PROPS
+)
+
+STABLECOIN_TRANSFERS_QUERY = """
+UNWIND $rows AS row
+MATCH (t:Transaction {hash: row.tx_hash})
+MATCH (s:Stablecoin {symbol: row.symbol, blockchain: row.blockchain})
+MERGE (t)-[r:STABLECOIN_TRANSFER]->(s)
+SET r.amount = row.amount,
+    r.from_address = row.from_address,
+    r.to_address = row.to_address,
+    r.decimals = row.decimals
+"""
+
+
+def block_row(block: "Block") -> Dict[str, Any]:
+    """Convert a Block into an UNWIND row"""
+    return {
+        "hash": block.hash,
+        "blockchain": block.blockchain,
+        "props": {
+            "number": block.number,
+            "timestamp": block.timestamp,
+            "transaction_count": block.transaction_count,
+            "parent_hash": block.parent_hash,
+            "miner": block.miner,
+            "difficulty": block.difficulty,
+            "size": block.size,
+        },
+    }
+
+
+def transaction_row(tx: "Transaction") -> Dict[str, Any]:
+    """Convert a Transaction into an UNWIND row"""
+    return {
+        "hash": tx.hash,
+        "blockchain": tx.blockchain,
+        "props": {
+            "from_address": tx.from_address,
+            "to_address": tx.to_address,
+            "value": tx.value,
+            "timestamp": tx.timestamp,
+            "block_number": tx.block_number,
+            "block_hash": tx.block_hash,
+            "gas_used": tx.gas_used,
+            "gas_price": tx.gas_price,
+            "fee": tx.fee,
+            "status": tx.status,
+            "confirmations": tx.confirmations,
+            "memo": tx.memo,
+            "contract_address": tx.contract_address,
+        },
+    }
+
+
+class GraphWriteBuffer:
+    """Collects Block/Transaction/Address/SENT records and flushes them in batches.
+
+    Records are written with one ``UNWIND $rows`` query per record type inside
+    a single Neo4j transaction.  A flush is triggered when ``max_batch_size``
+    rows are pending, when the oldest pending row is older than
+    ``flush_interval`` seconds (see ``start``), or explicitly via ``flush``.
+
+    Producers that push the buffer over ``max_batch_size`` wait for the flush
+    to complete, so ingestion cannot outrun Neo4j.  Transient Neo4j errors are
+    retried with exponential backoff; on final failure the rows stay buffered
+    and the error is raised to the caller.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 1000,
+        flush_interval: float = 2.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+    ):
+        self.max_batch_size = max(1, max_batch_size)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._blocks: List[Dict[str, Any]] = []
+        self._transactions: List[Dict[str, Any]] = []
+        self._stablecoin_transfers: List[Dict[str, Any]] = []
+        self._oldest_pending: Optional[float] = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self.metrics = {
+            "flushes": 0,
+            "rows_written": 0,
+            "retries": 0,
+            "failed_flushes": 0,
+            "last_flush_seconds": 0.0,
+        }
+
+    @property
+    def pending_rows(self) -> int:
+        return (
+            len(self._blocks)
+            + len(self._transactions)
+            + len(self._stablecoin_transfers)
+        )
+
+    async def add_block(self, block: "Block"):
+        """Buffer a block"""
+        self._append(self._blocks, block_row(block))
+        await self._maybe_flush()
+
+    async def add_transaction(self, tx: "Transaction"):
+        """Buffer a transaction with its addresses and SENT relationship"""
+        self._append(self._transactions, transaction_row(tx))
+        await self._maybe_flush()
+
+    async def add_stablecoin_transfer(
+        self, tx: "Transaction", transfer: Dict[str, Any]
+    ):
+        """Buffer a STABLECOIN_TRANSFER relationship for ``tx``"""
+        self._append(
+            self._stablecoin_transfers,
+            {
+                "tx_hash": tx.hash,
+                "symbol": transfer.get("symbol"),
+                "blockchain": tx.blockchain,
+                "amount": transfer.get("amount"),
+                "from_address": transfer.get("from_address"),
+                "to_address": transfer.get("to_address"),
+                "decimals": transfer.get("decimals", 18),
+            },
+        )
+        await self._maybe_flush()
+
+    def _append(self, rows: List[Dict[str, Any]], row: Dict[str, Any]):
+        if self._oldest_pending is None:
+            self._oldest_pending = time.monotonic()
+        rows.append(row)
+
+    async def _maybe_flush(self):
+        if self.pending_rows >= self.max_batch_size:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write all buffered rows in one transaction; returns rows written"""
+        async with self._flush_lock:
+            if not self.pending_rows:
+                return 0
+
+            blocks, self._blocks = self._blocks, []
+            transactions, self._transactions = self._transactions, []
+            transfers, self._stablecoin_transfers = self._stablecoin_transfers, []
+            oldest_pending, self._oldest_pending = self._oldest_pending, None
+            row_count = len(blocks) + len(transactions) + len(transfers)
+
+            started = time.monotonic()
+            try:
+                await self._write_with_retry(blocks, transactions, transfers)
+            except Exception:
+                # Keep the rows so the next flush retries them
+                self._blocks = blocks + self._blocks
+                self._transactions = transactions + self._transactions
+                self._stablecoin_transfers = transfers + self._stablecoin_transfers
+                self._oldest_pending = oldest_pending
+                self.metrics["failed_flushes"] += 1
+                raise
+
+            self.metrics["flushes"] += 1
+            self.metrics["rows_written"] += row_count
+            self.metrics["last_flush_seconds"] = time.monotonic() - started
+            return row_count
+
+    async def _write_with_retry(
+        self,
+        blocks: List[Dict[str, Any]],
+        transactions: List[Dict[str, Any]],
+        transfers: List[Dict[str, Any]],
+    ):
+        statements = [
+            (BLOCKS_QUERY, blocks),
+            (
+                TRANSFERS_QUERY,
+                [row for row in transactions if row["props"]["to_address"]],
+            ),
+            (
+                SELF_TRANSFERS_QUERY,
+                [row for row in transactions if not row["props"]["to_address"]],
+            ),
+            # Must run after the transactions so the MATCH finds them
+            (STABLECOIN_TRANSFERS_QUERY, transfers),
+        ]
+        statements = [(query, rows) for query, rows in statements if rows]
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with get_neo4j_session() as session:
+                    async with session.begin_transaction() as tx:
+                        for query, rows in statements:
+                            result = await tx.run(query, rows=rows)
+                            await result.consume()
+                        await tx.commit()
+                return
+            except TRANSIENT_NEO4J_ERRORS as e:
+                if attempt == self.max_retries:
+                    raise
+                self.metrics["retries"] += 1
+                delay = self.retry_backoff * (2**attempt)
+                logger.warning(
+                    f"Transient Neo4j error on batch write "
+                    f"(attempt {attempt + 1}/{self.max_retries + 1}), "
+                    f"retrying in {delay:.1f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+
+    def discard(self) -> int:
+        """Drop all buffered rows without writing them; returns rows dropped"""
+        dropped = self.pending_rows
+        self._blocks = []
+        self._transactions = []
+        self._stablecoin_transfers = []
+        self._oldest_pending = None
+        return dropped
+
+    # =========================================================================
+    # Time-based flushing
+    # =========================================================================
+
+    def start(self):
+        """Start the background task that enforces ``flush_interval``"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        """Stop the background task and flush whatever is left"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval / 2)
+            if (
+                self._oldest_pending is not None
+                and time.monotonic() - self._oldest_pending >= self.flush_interval
+            ):
+                try:
+                    await self.flush()
+                except Exception as e:
+                    logger.error(f"Timed graph buffer flush failed: {e}")
@@ -68,6 +68,8 @@ class CollectorManager:
                 "event_tracking": True,
                 "collection_interval": 30,
                 "batch_size": 20,
+                "pipeline_enabled": True,
+                "fetch_concurrency": 16,
             }
             self.collectors["ethereum"] = EthereumCollector("ethereum", ethereum_config)
 
@@ -11,9 +11,15 @@ from abc import abstractmethod
 from datetime import datetime
 from datetime import timezone
 from typing import Any
+from typing import Awaitable
+from typing import Callable
 from typing import Dict
+from typing import FrozenSet
 from typing import List
 from typing import Optional
+from typing import Sequence
+from typing import Set
+from typing import Tuple
 from typing import Union
 
 import aiohttp
@@ -22,6 +28,15 @@ from src.api.config import settings
 from src.collectors.base import Address
 from src.collectors.base import Block
 from src.collectors.base import Transaction
+from src.collectors.rpc.endpoint_pool import Endpoint
+from src.collectors.rpc.endpoint_pool import EndpointPool
+from src.collectors.rpc.rate_limiter import RateLimiter
+from src.collectors.rpc.rate_limiter import create_rate_limiter
+from src.collectors.rpc.rate_limiter import get_method_weight
+from src.collectors.rpc.response_cache import MISS
+from src.collectors.rpc.response_cache import ResponseCache
+from src.collectors.rpc.response_cache import cache_key
+from src.collectors.rpc.response_cache import get_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +60,16 @@ class BaseRPCClient(ABC):
     logic defined here.
     """
 
+    # Value of the ``jsonrpc`` member in request payloads
+    JSONRPC_VERSION = "2.0"
+
+    # Methods whose results may be final and are looked up in the response
+    # cache; ``_is_final`` decides per result whether it is stored
+    CACHEABLE_METHODS: FrozenSet[str] = frozenset()
+
+    # Whether ``get_block_transactions`` is implemented for this chain family
+    supports_block_transactions = False
+
     def __init__(
         self,
         rpc_url: str,
@@ -52,24 +77,45 @@ class BaseRPCClient(ABC):
         *,
         timeout: int = 0,
         rate_limit_rpm: int = 0,
+        max_batch_size: int = 0,
+        fallback_urls: Sequence[str] = (),
+        hedge: Optional[bool] = None,
     ):
         self.rpc_url = rpc_url.rstrip("/")
         self.blockchain = blockchain
         self.timeout = timeout or settings.RPC_REQUEST_TIMEOUT_SECONDS
         self.rate_limit_rpm = rate_limit_rpm or settings.RPC_RATE_LIMIT_PER_MINUTE
+        self.max_batch_size = max_batch_size or settings.RPC_MAX_BATCH_SIZE
+
+        # Primary endpoint first; JSON-RPC calls route across all of them
+        self.endpoints = EndpointPool(
+            [self.rpc_url, *fallback_urls],
+            failure_threshold=settings.RPC_CIRCUIT_FAILURE_THRESHOLD,
+            cooldown_seconds=settings.RPC_CIRCUIT_COOLDOWN_SECONDS,
+            hedge=settings.RPC_HEDGE_REQUESTS if hedge is None else hedge,
+        )
+
+        # Shared read-through cache for immutable results (None = disabled)
+        self.cache: Optional[ResponseCache] = get_response_cache()
 
         self._session: Optional[aiohttp.ClientSession] = None
         self._session_lock = asyncio.Lock()
         self._request_id = 0
 
-        # Simple sliding-window rate limiter
-        self._request_timestamps: List[float] = []
-        self._rate_limit_lock = asyncio.Lock()
+        # Token bucket (in-process, or shared per provider via Redis)
+        self._rate_limiter: Optional[RateLimiter] = create_rate_limiter(
+            self.rpc_url, self.rate_limit_rpm
+        )
 
         # Metrics
         self.metrics = {
             "requests_sent": 0,
             "requests_failed": 0,
+            "batch_requests_sent": 0,
+            "batch_items_sent": 0,
+            "failovers": 0,
+            "hedged_requests": 0,
+            "hedge_wins": 0,
             "last_request": None,
             "avg_latency_ms": 0.0,
         }
@@ -98,25 +144,32 @@ class BaseRPCClient(ABC):
     # Rate limiting
     # ------------------------------------------------------------------
 
-    async def _wait_for_rate_limit(self) -> None:
-        """Block until we are within the per-minute request budget."""
-        if self.rate_limit_rpm <= 0:
+    async def _wait_for_rate_limit(self, weight: float = 1.0) -> None:
+        """Block until *weight* tokens are available in the request budget."""
+        if self._rate_limiter is None:
             return
-        sleep_for = 0.0
-        async with self._rate_limit_lock:
-            now = time.monotonic()
-            window = 60.0
-            self._request_timestamps = [
-                ts for ts in self._request_timestamps if now - ts < window
-            ]
-            if len(self._request_timestamps) >= self.rate_limit_rpm:
-                sleep_for = window - (now - self._request_timestamps[0]) + 0.05
-            self._request_timestamps.append(time.monotonic())
-        if sleep_for > 0:
+        waited = await self._rate_limiter.acquire(weight)
+        if waited > 0:
             logger.debug(
-                f"[{self.blockchain}] RPC rate limit hit, sleeping {sleep_for:.1f}s"
+                f"[{self.blockchain}] RPC rate limit hit, waited {waited:.1f}s"
             )
-            await asyncio.sleep(sleep_for)
+
+    def _payload_weight(
+        self, payload: Union[Dict[str, Any], List[Dict[str, Any]]]
+    ) -> float:
+        """Rate-limit cost of a request.
+
+        Providers meter HTTP requests, so a batch costs its heaviest item plus
+        ``RPC_BATCH_ITEM_WEIGHT`` times the weight of every other item (0 by
+        default: one batch is charged like one call).
+        """
+        if not isinstance(payload, list):
+            return get_method_weight(payload.get("method", ""))
+        weights = [get_method_weight(item.get("method", "")) for item in payload]
+        if not weights:
+            return 0.0
+        heaviest = max(weights)
+        return heaviest + settings.RPC_BATCH_ITEM_WEIGHT * (sum(weights) - heaviest)
 
     # ------------------------------------------------------------------
     # JSON-RPC transport
@@ -134,13 +187,172 @@ class BaseRPCClient(ABC):
         retries: int = 2,
     ) -> Any:
         """Send a JSON-RPC 2.0 request and return the ``result`` field."""
-        payload = {
-            "jsonrpc": "2.0",
+        return await self._cached(
+            method,
+            params,
+            lambda: self._post(self._build_request(method, params), retries=retries),
+        )
+
+    # ------------------------------------------------------------------
+    # Response cache
+    # ------------------------------------------------------------------
+
+    async def _cached(
+        self,
+        method: str,
+        params: Any,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Serve *method* from the response cache, or ``fetch`` it and cache
+        the result if it is final."""
+        key = None
+        if self.cache is not None and method in self.CACHEABLE_METHODS:
+            key = cache_key(self.blockchain, method, params)
+            cached = await self.cache.get(key)
+            if cached is not MISS:
+                return cached
+
+        result = await fetch()
+        self._observe(method, result)
+        if key is not None and result is not None:
+            if self._is_final(method, params, result):
+                await self.cache.set(key, result)
+        return result
+
+    def _observe(self, method: str, result: Any) -> None:
+        """Hook called with every successful result (e.g. to track the tip)."""
+
+    def _is_final(self, method: str, params: Any, result: Any) -> bool:
+        """Whether *result* can never change and may be cached.
+
+        Subclasses opt in for ``CACHEABLE_METHODS``; pending, unconfirmed or
+        not-yet-final data must return ``False``.
+        """
+        return False
+
+    def _build_request(self, method: str, params: Any = None) -> Dict[str, Any]:
+        return {
+            "jsonrpc": self.JSONRPC_VERSION,
             "id": self._next_id(),
             "method": method,
             "params": params if params is not None else [],
         }
-        return await self._post(payload, retries=retries)
+
+    async def batch_call(
+        self,
+        calls: Sequence[Tuple[str, Any]],
+        *,
+        retries: int = 2,
+    ) -> List[Any]:
+        """Send ``(method, params)`` calls as JSON-RPC batch requests.
+
+        Calls are split into array payloads of at most ``max_batch_size``
+        items, each costing a single HTTP request.  A batch is charged like a
+        single call of its heaviest method (see ``_payload_weight``).
+        Responses are matched back by ``id`` and returned in input order.
+
+        Items already in the response cache are served from it and left out
+        of the request.  Per-item failures do not fail the batch: the corresponding slot holds
+        an ``RPCError`` instead of a result.  Transport failures (HTTP errors,
+        timeouts, a provider rejecting the whole batch) are raised.
+        """
+        if not calls:
+            return []
+
+        results: List[Any] = [MISS] * len(calls)
+        keys: List[Optional[str]] = [None] * len(calls)
+        if self.cache is not None:
+            lookup = [
+                i
+                for i, (method, _) in enumerate(calls)
+                if method in self.CACHEABLE_METHODS
+            ]
+            for i in lookup:
+                keys[i] = cache_key(self.blockchain, *calls[i])
+            if lookup:
+                cached = await self.cache.get_many([keys[i] for i in lookup])
+                for i, value in zip(lookup, cached):
+                    results[i] = value
+
+        pending = [i for i, result in enumerate(results) if result is MISS]
+        chunks = [
+            [calls[i] for i in pending[start : start + self.max_batch_size]]
+            for start in range(0, len(pending), self.max_batch_size)
+        ]
+        chunk_results = await asyncio.gather(
+            *(self._send_batch(chunk, retries=retries) for chunk in chunks)
+        )
+        fetched = [result for chunk in chunk_results for result in chunk]
+
+        for i, result in zip(pending, fetched):
+            results[i] = result
+            if not isinstance(result, RPCError):
+                self._observe(calls[i][0], result)
+        # Judge finality only after the whole batch was observed, so a tip
+        # fetched alongside the items counts
+        for i, result in zip(pending, fetched):
+            if keys[i] is None or result is None or isinstance(result, RPCError):
+                continue
+            method, params = calls[i]
+            if self._is_final(method, params, result):
+                await self.cache.set(keys[i], result)
+        return results
+
+    async def _send_batch(
+        self, calls: List[Tuple[str, Any]], *, retries: int
+    ) -> List[Any]:
+        payload = [self._build_request(method, params) for method, params in calls]
+        index_by_id = {request["id"]: i for i, request in enumerate(payload)}
+
+        body = await self._send(payload, self._unwrap_batch, retries=retries)
+        self.metrics["batch_requests_sent"] += 1
+        self.metrics["batch_items_sent"] += len(payload)
+
+        missing = RPCError("No response for batch item", blockchain=self.blockchain)
+        results: List[Any] = [missing] * len(payload)
+        for item in body:
+            if not isinstance(item, dict):
+                continue
+            index = index_by_id.get(item.get("id"))
+            if index is None:
+                continue
+            err = item.get("error")
+            if err:
+                results[index] = RPCError(
+                    err.get("message", str(err)) if isinstance(err, dict) else str(err),
+                    code=err.get("code", -1) if isinstance(err, dict) else -1,
+                    blockchain=self.blockchain,
+                )
+            else:
+                results[index] = item.get("result")
+        return results
+
+    def _unwrap_result(self, body: Any) -> Any:
+        """Return the ``result`` of a single JSON-RPC response, raising on error."""
+        if "error" in body and body["error"]:
+            err = body["error"]
+            raise RPCError(
+                err.get("message", str(err)),
+                code=err.get("code", -1),
+                blockchain=self.blockchain,
+            )
+        return body.get("result")
+
+    def _unwrap_batch(self, body: Any) -> List[Any]:
+        """Validate a batch response body, which must be a JSON array."""
+        if isinstance(body, list):
+            return body
+        # Providers reject a whole batch (too large, unsupported) with one object
+        if isinstance(body, dict):
+            self._unwrap_result(body)
+        raise RPCError(
+            f"Expected a JSON array in batch response, got {type(body).__name__}",
+            blockchain=self.blockchain,
+        )
+
+    def _request_kwargs(self) -> Dict[str, Any]:
+        """Extra keyword arguments for ``session.post`` (e.g. auth)."""
+        return {}
 
     async def _post(
         self,
@@ -149,67 +361,52 @@ class BaseRPCClient(ABC):
         retries: int = 2,
     ) -> Any:
         """POST *payload* to the RPC endpoint with retries."""
-        await self._wait_for_rate_limit()
+        return await self._send(payload, self._unwrap_result, retries=retries)
+
+    async def _send(
+        self,
+        payload: Union[Dict[str, Any], List[Dict[str, Any]]],
+        unwrap: Callable[[Any], Any],
+        *,
+        retries: int = 2,
+    ) -> Any:
+        """POST *payload* with retries and return ``unwrap(response_body)``.
+
+        Each attempt goes to the healthiest endpoint in ``self.endpoints``;
+        retries prefer endpoints that have not already failed this call.
+        """
+        await self._wait_for_rate_limit(self._payload_weight(payload))
         session = await self._ensure_session()
         last_exc: Optional[Exception] = None
+        failed_urls: Set[str] = set()
 
         for attempt in range(1, retries + 2):
-            start = time.monotonic()
             try:
-                async with session.post(self.rpc_url, json=payload) as resp:
-                    elapsed_ms = (time.monotonic() - start) * 1000
-                    self._record_latency(elapsed_ms)
-                    body = await resp.json(content_type=None)
-
-                    if resp.status != 200:
-                        raise RPCError(
-                            f"HTTP {resp.status}: {body}",
-                            code=resp.status,
-                            blockchain=self.blockchain,
-                        )
-
-                    if "error" in body and body["error"]:
-                        err = body["error"]
-                        raise RPCError(
-                            err.get("message", str(err)),
-                            code=err.get("code", -1),
-                            blockchain=self.blockchain,
-                        )
-
-                    self.metrics["requests_sent"] += 1
-                    self.metrics["last_request"] = datetime.now(
-                        timezone.utc
-                    ).isoformat()
-                    return body.get("result")
+                result = await self._dispatch(session, payload, unwrap, failed_urls)
+                self.metrics["requests_sent"] += 1
+                self.metrics["last_request"] = datetime.now(timezone.utc).isoformat()
+                return result
 
             except RPCError as rpc_exc:
                 # Retry transient 5xx server errors and rate-limit responses.
                 # Count logical failed request only once on final failure.
-                if rpc_exc.code and 500 <= rpc_exc.code <= 599 or rpc_exc.code == 429:
+                if self._is_transient(rpc_exc):
                     last_exc = rpc_exc
                     if attempt <= retries:
-                        wait = 0.5 * (2 ** (attempt - 1))
-                        logger.warning(
-                            f"[{self.blockchain}] RPC transient error (HTTP {rpc_exc.code}) "
-                            f"attempt {attempt}, retrying in {wait:.1f}s"
+                        await self._before_retry(
+                            attempt,
+                            failed_urls,
+                            f"transient error (HTTP {rpc_exc.code})",
                         )
-                        await asyncio.sleep(wait)
                         continue
                 self.metrics["requests_failed"] += 1
                 raise
             except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
                 # Count logical failed request only once on final failure,
                 # not on every retry attempt.
-                elapsed_ms = (time.monotonic() - start) * 1000
-                self._record_latency(elapsed_ms)
                 last_exc = exc
                 if attempt <= retries:
-                    wait = 0.5 * (2 ** (attempt - 1))
-                    logger.warning(
-                        f"[{self.blockchain}] RPC attempt {attempt} failed: {exc}, "
-                        f"retrying in {wait:.1f}s"
-                    )
-                    await asyncio.sleep(wait)
+                    await self._before_retry(attempt, failed_urls, f"failed: {exc}")
                 else:
                     self.metrics["requests_failed"] += 1
 
@@ -218,6 +415,128 @@ class BaseRPCClient(ABC):
             blockchain=self.blockchain,
         )
 
+    async def _before_retry(
+        self, attempt: int, failed_urls: Set[str], reason: str
+    ) -> None:
+        """Fail over immediately if a healthy endpoint is left, else back off."""
+        if self.endpoints.candidates(exclude=failed_urls):
+            self.metrics["failovers"] += 1
+            logger.warning(
+                f"[{self.blockchain}] RPC attempt {attempt} {reason}, "
+                f"failing over to another endpoint"
+            )
+            return
+        wait = 0.5 * (2 ** (attempt - 1))
+        logger.warning(
+            f"[{self.blockchain}] RPC attempt {attempt} {reason}, "
+            f"retrying in {wait:.1f}s"
+        )
+        await asyncio.sleep(wait)
+
+    @staticmethod
+    def _is_transient(exc: BaseException) -> bool:
+        """Whether *exc* says the endpoint, not the request, is at fault."""
+        if isinstance(exc, RPCError):
+            return bool(exc.code and 500 <= exc.code <= 599 or exc.code == 429)
+        return isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError))
+
+    async def _dispatch(
+        self,
+        session: aiohttp.ClientSession,
+        payload: Union[Dict[str, Any], List[Dict[str, Any]]],
+        unwrap: Callable[[Any], Any],
+        failed_urls: Set[str],
+    ) -> Any:
+        """Send one attempt, hedging to a second endpoint if the first is slow."""
+        primary = self.endpoints.select(exclude=failed_urls)
+        delay = self.endpoints.hedge_delay(primary)
+        if delay is None:
+            return await self._post_endpoint(
+                session, primary, payload, unwrap, failed_urls
+            )
+
+        tasks = [
+            asyncio.create_task(
+                self._post_endpoint(session, primary, payload, unwrap, failed_urls)
+            )
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            backups = self.endpoints.candidates(exclude=failed_urls | {primary.url})
+            if not done and backups:
+                self.metrics["hedged_requests"] += 1
+                tasks.append(
+                    asyncio.create_task(
+                        self._post_endpoint(
+                            session, backups[0], payload, unwrap, failed_urls
+                        )
+                    )
+                )
+
+            # First success wins; fail only once every request has failed
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not tasks[0]:
+                            self.metrics["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _post_endpoint(
+        self,
+        session: aiohttp.ClientSession,
+        endpoint: Endpoint,
+        payload: Union[Dict[str, Any], List[Dict[str, Any]]],
+        unwrap: Callable[[Any], Any],
+        failed_urls: Set[str],
+    ) -> Any:
+        """POST to a single endpoint and feed the outcome back to the pool."""
+        start = time.monotonic()
+        try:
+            async with session.post(
+                endpoint.url, json=payload, **self._request_kwargs()
+            ) as resp:
+                elapsed_ms = (time.monotonic() - start) * 1000
+                self._record_latency(elapsed_ms)
+                body = await resp.json(content_type=None)
+
+                if resp.status != 200:
+                    raise RPCError(
+                        f"HTTP {resp.status}: {body}",
+                        code=resp.status,
+                        blockchain=self.blockchain,
+                    )
+
+                result = unwrap(body)
+        except asyncio.CancelledError:
+            # Lost a hedge race: its latency was at least this long
+            self.endpoints.record_cancelled(endpoint, (time.monotonic() - start) * 1000)
+            raise
+        except Exception as exc:
+            elapsed_ms = (time.monotonic() - start) * 1000
+            if self._is_transient(exc):
+                if not isinstance(exc, RPCError):
+                    self._record_latency(elapsed_ms)
+                self.endpoints.record_failure(endpoint)
+                failed_urls.add(endpoint.url)
+            else:
+                # The endpoint answered; the request itself was bad
+                self.endpoints.record_success(endpoint, elapsed_ms)
+            raise
+
+        self.endpoints.record_success(endpoint, (time.monotonic() - start) * 1000)
+        return result
+
     def _record_latency(self, ms: float) -> None:
         total = self.metrics["requests_sent"] + self.metrics["requests_failed"]
         self._latency_sum += ms
@@ -251,6 +570,34 @@ class BaseRPCClient(ABC):
     async def get_block(self, block_id: Union[int, str]) -> Optional[Block]:
         """Fetch a block by number or hash."""
 
+    async def get_transactions(
+        self, tx_hashes: Sequence[str]
+    ) -> List[Optional[Transaction]]:
+        """Fetch several transactions, in input order.
+
+        The default issues one ``get_transaction`` per hash; clients whose
+        node supports JSON-RPC batching override this with ``batch_call``.
+        Transactions that are missing or fail to fetch are returned as ``None``.
+        """
+        results = await asyncio.gather(
+            *(self.get_transaction(tx_hash) for tx_hash in tx_hashes),
+            return_exceptions=True,
+        )
+        return [None if isinstance(r, Exception) else r for r in results]
+
+    async def get_block_transactions(
+        self, block_id: Union[int, str]
+    ) -> List[Transaction]:
+        """Fetch every transaction in a block.
+
+        Only implemented for chain families with an efficient block-wide
+        fetch, which set ``supports_block_transactions``; others raise
+        ``NotImplementedError``.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support block-wide transaction fetches"
+        )
+
     async def health_check(self) -> bool:
         """Quick liveness probe against the RPC endpoint."""
         try:
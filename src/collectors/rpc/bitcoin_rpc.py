@@ -4,6 +4,7 @@ Lightweight async client for Bitcoin Core RPC and Blockstream API fallback.
 Uses only aiohttp — no python-bitcoinlib dependency.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from datetime import timezone
@@ -11,6 +12,7 @@ from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Union
 
 import aiohttp
@@ -27,6 +29,9 @@ logger = logging.getLogger(__name__)
 # Satoshi conversion
 SATS_PER_BTC = 100_000_000
 
+# Confirmations after which a transaction or block is cached as final
+FINALITY_CONFIRMATIONS = 6
+
 
 class BitcoinRpcClient(BaseRPCClient):
     """Bitcoin JSON-RPC client with Blockstream API fallback.
@@ -37,6 +42,10 @@ class BitcoinRpcClient(BaseRPCClient):
     back to the public Blockstream REST API for read-only lookups.
     """
 
+    JSONRPC_VERSION = "1.0"
+    CACHEABLE_METHODS = frozenset({"getrawtransaction", "getblock"})
+    supports_block_transactions = True
+
     def __init__(
         self,
         rpc_url: str,
@@ -63,24 +72,32 @@ class BitcoinRpcClient(BaseRPCClient):
         self, method: str, params: Any = None, *, retries: int = 2
     ) -> Any:
         """Bitcoin Core JSON-RPC with basic auth."""
+        return await self._cached(
+            method, params, lambda: self._core_rpc(method, params, retries=retries)
+        )
+
+    def _is_final(self, method: str, params: Any, result: Any) -> bool:
+        # Verbose tx/block results report their own depth.  The cached copy's
+        # "confirmations" then only grows stale upwards of the threshold.
+        return (
+            isinstance(result, dict)
+            and result.get("confirmations", 0) >= FINALITY_CONFIRMATIONS
+        )
+
+    async def _core_rpc(
+        self, method: str, params: Any = None, *, retries: int = 2
+    ) -> Any:
         if self._use_blockstream:
             raise RPCError(
                 "Blockstream mode — use REST helpers instead",
                 blockchain=self.blockchain,
             )
 
-        payload = {
-            "jsonrpc": "1.0",
-            "id": self._next_id(),
-            "method": method,
-            "params": params if params is not None else [],
-        }
+        payload = self._build_request(method, params)
 
-        await self._wait_for_rate_limit()
+        await self._wait_for_rate_limit(self._payload_weight(payload))
         session = await self._ensure_session()
-        auth = None
-        if self.rpc_user and self.rpc_password:
-            auth = aiohttp.BasicAuth(self.rpc_user, self.rpc_password)
+        auth = self._request_kwargs().get("auth")
 
         last_exc: Optional[Exception] = None
         for attempt in range(1, retries + 2):
@@ -134,6 +151,12 @@ class BitcoinRpcClient(BaseRPCClient):
             blockchain=self.blockchain,
         )
 
+    def _request_kwargs(self) -> Dict[str, Any]:
+        """Basic auth for Bitcoin Core, also used by ``batch_call``."""
+        if self.rpc_user and self.rpc_password:
+            return {"auth": aiohttp.BasicAuth(self.rpc_user, self.rpc_password)}
+        return {}
+
     # ------------------------------------------------------------------
     # Blockstream REST helpers
     # ------------------------------------------------------------------
@@ -215,8 +238,17 @@ class BitcoinRpcClient(BaseRPCClient):
             return None
         return await self._parse_blockstream_tx(data)
 
-    async def _parse_core_tx(self, raw: Dict[str, Any]) -> Transaction:
-        """Parse Bitcoin Core ``getrawtransaction`` verbose output."""
+    async def _parse_core_tx(
+        self,
+        raw: Dict[str, Any],
+        prev_txs: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> Transaction:
+        """Parse Bitcoin Core ``getrawtransaction`` verbose output.
+
+        *prev_txs* maps txid -> verbose tx for already fetched previous
+        outputs (see ``_fetch_prev_txs``); without it the sender is resolved
+        with one extra RPC call.
+        """
         timestamp = datetime.now(timezone.utc)
         if raw.get("time"):
             timestamp = datetime.fromtimestamp(raw["time"], tz=timezone.utc)
@@ -232,9 +264,12 @@ class BitcoinRpcClient(BaseRPCClient):
         elif vin and "txid" in vin[0] and "vout" in vin[0]:
             # Fallback: fetch the previous output to resolve the sender
             try:
-                prev_tx = await self._json_rpc(
-                    "getrawtransaction", [vin[0]["txid"], True]
-                )
+                if prev_txs is not None:
+                    prev_tx = prev_txs.get(vin[0]["txid"])
+                else:
+                    prev_tx = await self._json_rpc(
+                        "getrawtransaction", [vin[0]["txid"], True]
+                    )
                 if prev_tx:
                     prev_vout = prev_tx.get("vout", [])
                     idx = vin[0]["vout"]
@@ -275,8 +310,14 @@ class BitcoinRpcClient(BaseRPCClient):
             confirmations=confirmations,
         )
 
-    async def _parse_blockstream_tx(self, data: Dict[str, Any]) -> Transaction:
-        """Parse Blockstream ``/tx/{txid}`` response."""
+    async def _parse_blockstream_tx(
+        self, data: Dict[str, Any], tip: Optional[int] = None
+    ) -> Transaction:
+        """Parse Blockstream ``/tx/{txid}`` response.
+
+        Pass the chain *tip* height when parsing many transactions to avoid
+        fetching it once per transaction.
+        """
         status_obj = data.get("status", {})
         confirmed = status_obj.get("confirmed", False)
 
@@ -309,7 +350,8 @@ class BitcoinRpcClient(BaseRPCClient):
         block_height = status_obj.get("block_height")
         confirmations = None
         if confirmed and block_height is not None:
-            tip = await self._get_current_block_height()
+            if tip is None:
+                tip = await self._get_current_block_height()
             if tip is not None:
                 confirmations = max(tip - block_height + 1, 0)
 
@@ -327,6 +369,139 @@ class BitcoinRpcClient(BaseRPCClient):
             confirmations=confirmations,
         )
 
+    async def get_transactions(
+        self, tx_hashes: Sequence[str]
+    ) -> List[Optional[Transaction]]:
+        """Fetch many transactions with batched ``getrawtransaction`` calls.
+
+        Sender resolution for all of them shares a second batch.  Items Core
+        cannot serve (e.g. no ``txindex``) fall back to ``get_transaction``,
+        which uses the Blockstream API.
+        """
+        if not tx_hashes:
+            return []
+        if self._use_blockstream:
+            return await super().get_transactions(tx_hashes)
+
+        try:
+            raws = await self.batch_call(
+                [("getrawtransaction", [txid, True]) for txid in tx_hashes]
+            )
+        except RPCError:
+            return await super().get_transactions(tx_hashes)
+
+        prev_txs = await self._fetch_prev_txs([r for r in raws if isinstance(r, dict)])
+
+        async def _resolve(txid: str, raw: Any) -> Optional[Transaction]:
+            try:
+                if isinstance(raw, dict):
+                    return await self._parse_core_tx(raw, prev_txs)
+                return await self.get_transaction(txid)
+            except Exception as exc:
+                logger.debug(f"[bitcoin] Failed to fetch tx {txid}: {exc}")
+                return None
+
+        return list(
+            await asyncio.gather(
+                *(_resolve(txid, raw) for txid, raw in zip(tx_hashes, raws))
+            )
+        )
+
+    async def _fetch_prev_txs(
+        self, raws: List[Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Batch-fetch the transactions funding each tx's first input."""
+        prev_txids = []
+        for raw in raws:
+            vin = raw.get("vin", [])
+            if (
+                vin
+                and not vin[0].get("prevout", {}).get("scriptpubkey_address")
+                and "txid" in vin[0]
+                and "vout" in vin[0]
+            ):
+                prev_txids.append(vin[0]["txid"])
+        prev_txids = list(dict.fromkeys(prev_txids))
+        if not prev_txids:
+            return {}
+
+        try:
+            results = await self.batch_call(
+                [("getrawtransaction", [txid, True]) for txid in prev_txids]
+            )
+        except RPCError as exc:
+            logger.debug(f"[bitcoin] prevout batch failed: {exc}")
+            return {}
+        return {
+            txid: result
+            for txid, result in zip(prev_txids, results)
+            if isinstance(result, dict)
+        }
+
+    async def get_block_transactions(
+        self, block_id: Union[int, str]
+    ) -> List[Transaction]:
+        """Fetch every transaction in a block.
+
+        Bitcoin Core returns the whole block in one ``getblock`` (verbosity 2)
+        call, and senders are resolved with one batch.  In Blockstream mode
+        the block's transaction pages (25 per page) are fetched concurrently.
+        """
+        if not self._use_blockstream:
+            try:
+                return await self._get_core_block_transactions(block_id)
+            except RPCError as exc:
+                logger.debug(f"[bitcoin] Core block fetch failed: {exc}")
+
+        block_hash = block_id
+        if isinstance(block_id, int):
+            block_hash = await self._blockstream_get_text(f"/block-height/{block_id}")
+            if block_hash is None:
+                return []
+            block_hash = block_hash.strip()
+
+        block = await self._blockstream_get(f"/block/{block_hash}")
+        if not block:
+            return []
+
+        pages = await asyncio.gather(
+            *(
+                self._blockstream_get(f"/block/{block_hash}/txs/{start}")
+                for start in range(0, block.get("tx_count", 0), 25)
+            )
+        )
+        tip = await self._get_current_block_height()
+        return [
+            await self._parse_blockstream_tx(item, tip=tip)
+            for page in pages
+            for item in (page or [])
+        ]
+
+    async def _get_core_block_transactions(
+        self, block_id: Union[int, str]
+    ) -> List[Transaction]:
+        block_hash = block_id
+        if isinstance(block_id, int):
+            block_hash = await self._json_rpc("getblockhash", [block_id])
+        block = await self._json_rpc("getblock", [block_hash, 2])
+        if not block:
+            return []
+
+        raws = block.get("tx", [])
+        for raw in raws:
+            # Verbose block txs omit the per-tx block fields
+            raw.setdefault("blockhash", block.get("hash"))
+            raw.setdefault("time", block.get("time"))
+            raw.setdefault("confirmations", block.get("confirmations", 0))
+
+        prev_txs = await self._fetch_prev_txs(raws)
+        transactions = []
+        for raw in raws:
+            tx = await self._parse_core_tx(raw, prev_txs)
+            tx.block_number = block.get("height")
+            transactions.append(tx)
+        return transactions
+
     async def _get_current_block_height(self) -> Optional[int]:
         """Get current blockchain tip height via Blockstream API.
 
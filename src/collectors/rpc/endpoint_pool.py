@@ -0,0 +1,182 @@
+"""
+Jackdaw Sentry - RPC Endpoint Pool
+Latency-aware endpoint selection with per-endpoint circuit breakers.
+"""
+
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Deque
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Endpoint:
+    """Health statistics for one RPC endpoint."""
+
+    url: str
+    latency_ewma_ms: Optional[float] = None
+    error_ewma: float = 0.0
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None
+    trial_in_flight: bool = False
+    requests: int = 0
+    failures: int = 0
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=100))
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+
+class EndpointPool:
+    """Routes requests to the healthiest of several equivalent endpoints.
+
+    Every endpoint keeps an exponentially weighted moving average of its
+    latency and error rate; ``select`` returns the endpoint with the lowest
+    latency penalised by its error rate.  After ``failure_threshold``
+    consecutive transport failures an endpoint's circuit opens and it is
+    skipped for ``cooldown_seconds``, after which a single trial request is
+    let through (half-open) to decide whether to close it again.
+
+    When ``hedge`` is enabled, ``hedge_delay`` reports the p95 latency of an
+    endpoint so the caller can fire a duplicate request at a second endpoint
+    if the first has not answered by then.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        *,
+        alpha: float = 0.2,
+        failure_threshold: int = 5,
+        cooldown_seconds: float = 30.0,
+        hedge: bool = False,
+        min_hedge_samples: int = 20,
+    ):
+        if not urls:
+            raise ValueError("EndpointPool needs at least one URL")
+        self.endpoints: List[Endpoint] = []
+        for url in urls:
+            url = url.rstrip("/")
+            if all(ep.url != url for ep in self.endpoints):
+                self.endpoints.append(Endpoint(url))
+        self.alpha = alpha
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.hedge = hedge
+        self.min_hedge_samples = min_hedge_samples
+
+    def __len__(self) -> int:
+        return len(self.endpoints)
+
+    # ------------------------------------------------------------------
+    # Selection
+    # ------------------------------------------------------------------
+
+    def _available(self, endpoint: Endpoint, now: float) -> bool:
+        if not endpoint.is_open:
+            return True
+        # Half-open: one trial request after the cooldown
+        return (
+            now - endpoint.opened_at >= self.cooldown_seconds
+            and not endpoint.trial_in_flight
+        )
+
+    def _score(self, endpoint: Endpoint, default_latency: float) -> float:
+        latency = endpoint.latency_ewma_ms
+        if latency is None:
+            latency = default_latency
+        return latency * (1.0 + 10.0 * endpoint.error_ewma)
+
+    def candidates(self, exclude: Iterable[str] = ()) -> List[Endpoint]:
+        """Available endpoints not in *exclude*, best first."""
+        now = time.monotonic()
+        excluded = set(exclude)
+        known = [
+            ep.latency_ewma_ms
+            for ep in self.endpoints
+            if ep.latency_ewma_ms is not None
+        ]
+        # Untried endpoints look as good as the best known one; ties keep
+        # configuration order so the primary is preferred.
+        default_latency = min(known) if known else 0.0
+        ranked = [
+            (self._score(ep, default_latency), index, ep)
+            for index, ep in enumerate(self.endpoints)
+            if ep.url not in excluded and self._available(ep, now)
+        ]
+        ranked.sort(key=lambda item: (item[0], item[1]))
+        return [ep for _, _, ep in ranked]
+
+    def select(self, exclude: Iterable[str] = ()) -> Endpoint:
+        """Return the best endpoint, never failing even if all are ejected."""
+        candidates = self.candidates(exclude)
+        if not candidates:
+            candidates = self.candidates()
+        if candidates:
+            endpoint = candidates[0]
+        else:
+            # Every circuit is open: try the one ejected longest ago
+            endpoint = min(self.endpoints, key=lambda ep: ep.opened_at)
+        if endpoint.is_open:
+            endpoint.trial_in_flight = True
+        return endpoint
+
+    def hedge_delay(self, endpoint: Endpoint) -> Optional[float]:
+        """Seconds to wait on *endpoint* before hedging, or ``None`` to not hedge."""
+        if not self.hedge or len(self.endpoints) < 2:
+            return None
+        if len(endpoint.samples) < self.min_hedge_samples:
+            return None
+        ordered = sorted(endpoint.samples)
+        return ordered[int(0.95 * (len(ordered) - 1))] / 1000.0
+
+    # ------------------------------------------------------------------
+    # Feedback
+    # ------------------------------------------------------------------
+
+    def record_latency(self, endpoint: Endpoint, latency_ms: float) -> None:
+        endpoint.samples.append(latency_ms)
+        if endpoint.latency_ewma_ms is None:
+            endpoint.latency_ewma_ms = latency_ms
+        else:
+            endpoint.latency_ewma_ms += self.alpha * (
+                latency_ms - endpoint.latency_ewma_ms
+            )
+
+    def record_success(self, endpoint: Endpoint, latency_ms: float) -> None:
+        endpoint.requests += 1
+        self.record_latency(endpoint, latency_ms)
+        endpoint.error_ewma -= self.alpha * endpoint.error_ewma
+        endpoint.consecutive_failures = 0
+        endpoint.trial_in_flight = False
+        if endpoint.is_open:
+            logger.info(f"RPC endpoint {endpoint.url} recovered, closing circuit")
+            endpoint.opened_at = None
+
+    def record_cancelled(self, endpoint: Endpoint, latency_ms: float) -> None:
+        """Record a request abandoned after *latency_ms* (e.g. a lost hedge)."""
+        endpoint.trial_in_flight = False
+        self.record_latency(endpoint, latency_ms)
+
+    def record_failure(self, endpoint: Endpoint) -> None:
+        endpoint.requests += 1
+        endpoint.failures += 1
+        endpoint.error_ewma += self.alpha * (1.0 - endpoint.error_ewma)
+        endpoint.consecutive_failures += 1
+        endpoint.trial_in_flight = False
+        if endpoint.is_open or endpoint.consecutive_failures >= self.failure_threshold:
+            if not endpoint.is_open:
+                logger.warning(
+                    f"RPC endpoint {endpoint.url} failed "
+                    f"{endpoint.consecutive_failures} times, opening circuit"
+                )
+            endpoint.opened_at = time.monotonic()
@@ -11,8 +11,10 @@ from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Union
 
+from src.api.config import settings
 from src.collectors.base import Address
 from src.collectors.base import Block
 from src.collectors.base import Transaction
@@ -38,6 +40,16 @@ NATIVE_SYMBOL: Dict[str, str] = {
     "plasma": "PLASMA",
 }
 
+# Blocks behind the tip after which a block (and its transactions) is treated
+# as final and safe to cache.  Overridable via settings.RPC_FINALITY_DEPTH.
+FINALITY_DEPTH: Dict[str, int] = {
+    "ethereum": 64,
+    "bsc": 15,
+    "polygon": 256,
+    "avalanche": 1,
+}
+DEFAULT_FINALITY_DEPTH = 64
+
 
 def _hex_to_int(val: Optional[str]) -> int:
     """Convert a hex string (``0x...``) to int. Returns 0 on None/empty."""
@@ -54,9 +66,47 @@ def _wei_to_native(wei_hex: Optional[str]) -> float:
 class EvmRpcClient(BaseRPCClient):
     """EVM JSON-RPC client for Ethereum, BSC, Polygon, Arbitrum, Base, Avalanche, etc."""
 
+    CACHEABLE_METHODS = frozenset(
+        {
+            "eth_getTransactionByHash",
+            "eth_getTransactionReceipt",
+            "eth_getBlockByHash",
+            "eth_getBlockByNumber",
+        }
+    )
+    supports_block_transactions = True
+
     def __init__(self, rpc_url: str, blockchain: str, **kwargs):
         super().__init__(rpc_url, blockchain, **kwargs)
         self.native_symbol = NATIVE_SYMBOL.get(blockchain, "ETH")
+        self.finality_depth = settings.RPC_FINALITY_DEPTH.get(
+            blockchain, FINALITY_DEPTH.get(blockchain, DEFAULT_FINALITY_DEPTH)
+        )
+        # Highest block number seen from eth_blockNumber; 0 until known, so
+        # nothing is cached before the client has seen the tip
+        self._chain_tip = 0
+
+    # ------------------------------------------------------------------
+    # Response cache finality
+    # ------------------------------------------------------------------
+
+    def _observe(self, method: str, result: Any) -> None:
+        if method == "eth_blockNumber" and result:
+            try:
+                tip = _hex_to_int(result)
+            except (TypeError, ValueError):
+                # A malformed tip must not fail the call; keep the last one
+                logger.debug(f"Ignoring malformed eth_blockNumber result: {result!r}")
+                return
+            self._chain_tip = max(self._chain_tip, tip)
+
+    def _is_final(self, method: str, params: Any, result: Any) -> bool:
+        if not isinstance(result, dict):
+            return False
+        # Transactions and receipts carry blockNumber, blocks carry number;
+        # pending ones have neither yet
+        block_number = _hex_to_int(result.get("blockNumber") or result.get("number"))
+        return 0 < block_number <= self._chain_tip - self.finality_depth
 
     # ------------------------------------------------------------------
     # Transaction
@@ -90,6 +140,27 @@ class EvmRpcClient(BaseRPCClient):
             except RPCError:
                 pass
 
+        # Current block for confirmations
+        latest = 0
+        if block_number > 0:
+            try:
+                latest = await self.get_latest_block_number()
+            except RPCError:
+                pass
+
+        return self._build_transaction(tx_hash, tx_data, receipt, timestamp, latest)
+
+    def _build_transaction(
+        self,
+        tx_hash: str,
+        tx_data: Dict[str, Any],
+        receipt: Optional[Dict[str, Any]],
+        timestamp: Optional[datetime],
+        latest_block: int,
+    ) -> Transaction:
+        """Assemble a Transaction from a tx object, its receipt and block time."""
+        block_number = _hex_to_int(tx_data.get("blockNumber"))
+
         gas_used = _hex_to_int(receipt.get("gasUsed")) if receipt else None
         gas_price = _hex_to_int(tx_data.get("gasPrice"))
         fee = (gas_used * gas_price / WEI_PER_ETH) if gas_used and gas_price else None
@@ -102,14 +173,9 @@ class EvmRpcClient(BaseRPCClient):
         elif block_number == 0:
             status = "pending"
 
-        # Current block for confirmations
         confirmations = 0
-        if block_number > 0:
-            try:
-                latest = await self.get_latest_block_number()
-                confirmations = max(0, latest - block_number)
-            except RPCError:
-                pass
+        if block_number > 0 and latest_block:
+            confirmations = max(0, latest_block - block_number)
 
         # Parse token transfers from receipt logs (ERC-20 Transfer topic)
         token_transfers = []
@@ -122,9 +188,9 @@ class EvmRpcClient(BaseRPCClient):
             from_address=(tx_data.get("from") or "").lower(),
             to_address=(tx_data.get("to") or "").lower() if tx_data.get("to") else None,
             value=_wei_to_native(tx_data.get("value")),
-            timestamp=timestamp,
+            timestamp=timestamp or datetime.now(timezone.utc),
             block_number=block_number if block_number > 0 else None,
-            block_hash=block_hash,
+            block_hash=tx_data.get("blockHash"),
             gas_used=gas_used,
             gas_price=gas_price,
             fee=fee,
@@ -138,6 +204,124 @@ class EvmRpcClient(BaseRPCClient):
             token_transfers=token_transfers,
         )
 
+    async def get_transactions(
+        self, tx_hashes: Sequence[str]
+    ) -> List[Optional[Transaction]]:
+        """Fetch many transactions using JSON-RPC batches.
+
+        Transactions, receipts and the chain tip go out in one batch and the
+        distinct block headers in a second, instead of four requests per hash.
+        Hashes the node does not know (or errors on) come back as ``None``.
+        """
+        hashes = [h if h.startswith("0x") else "0x" + h for h in tx_hashes]
+        if not hashes:
+            return []
+
+        count = len(hashes)
+        results = await self.batch_call(
+            [("eth_getTransactionByHash", [h]) for h in hashes]
+            + [("eth_getTransactionReceipt", [h]) for h in hashes]
+            + [("eth_blockNumber", [])]
+        )
+        tx_results, receipts, latest = (
+            results[:count],
+            results[count : 2 * count],
+            results[-1],
+        )
+        latest_block = 0 if isinstance(latest, RPCError) else _hex_to_int(latest)
+
+        block_hashes = list(
+            {
+                tx_data["blockHash"]
+                for tx_data in tx_results
+                if isinstance(tx_data, dict)
+                and tx_data.get("blockHash")
+                and tx_data["blockHash"] != "0x" + "0" * 64
+            }
+        )
+        timestamps = await self._get_block_timestamps(block_hashes)
+
+        transactions: List[Optional[Transaction]] = []
+        for tx_hash, tx_data, receipt in zip(hashes, tx_results, receipts):
+            if not isinstance(tx_data, dict):
+                transactions.append(None)
+                continue
+            transactions.append(
+                self._build_transaction(
+                    tx_hash,
+                    tx_data,
+                    receipt if isinstance(receipt, dict) else None,
+                    timestamps.get(tx_data.get("blockHash")),
+                    latest_block,
+                )
+            )
+        return transactions
+
+    async def _get_block_timestamps(
+        self, block_hashes: List[str]
+    ) -> Dict[str, datetime]:
+        """Resolve block hash -> timestamp with one batched header fetch."""
+        headers = await self.batch_call(
+            [("eth_getBlockByHash", [block_hash, False]) for block_hash in block_hashes]
+        )
+        timestamps: Dict[str, datetime] = {}
+        for block_hash, header in zip(block_hashes, headers):
+            if isinstance(header, dict) and header.get("timestamp"):
+                timestamps[block_hash] = datetime.fromtimestamp(
+                    _hex_to_int(header["timestamp"]), tz=timezone.utc
+                )
+        return timestamps
+
+    async def get_block_transactions(
+        self, block_id: Union[int, str]
+    ) -> List[Transaction]:
+        """Fetch every transaction in a block with its receipt.
+
+        One request for the block with full transaction objects, then one
+        batch (split at ``max_batch_size``) for all receipts and the tip.
+        """
+        if isinstance(block_id, int):
+            block_data = await self._json_rpc(
+                "eth_getBlockByNumber", [hex(block_id), True]
+            )
+        else:
+            if not str(block_id).startswith("0x"):
+                block_id = "0x" + str(block_id)
+            block_data = await self._json_rpc("eth_getBlockByHash", [block_id, True])
+
+        if not block_data:
+            return []
+
+        tx_objects = [
+            tx for tx in block_data.get("transactions", []) if isinstance(tx, dict)
+        ]
+        if not tx_objects:
+            return []
+
+        results = await self.batch_call(
+            [("eth_getTransactionReceipt", [tx["hash"]]) for tx in tx_objects]
+            + [("eth_blockNumber", [])]
+        )
+        receipts, latest = results[:-1], results[-1]
+        latest_block = 0 if isinstance(latest, RPCError) else _hex_to_int(latest)
+
+        timestamp = None
+        if block_data.get("timestamp"):
+            timestamp = datetime.fromtimestamp(
+                _hex_to_int(block_data["timestamp"]), tz=timezone.utc
+            )
+
+        return [
+            self._build_transaction(
+                tx["hash"],
+                tx,
+                receipt if isinstance(receipt, dict) else None,
+                timestamp,
+                latest_block,
+            )
+            for tx, receipt in zip(tx_objects, receipts)
+        ]
+
     @staticmethod
     def _parse_erc20_transfers(logs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Extract ERC-20 Transfer events from receipt logs.
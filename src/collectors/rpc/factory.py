@@ -5,10 +5,13 @@ Instantiates the correct RPC client for a given blockchain.
 
 import logging
 import threading
+from typing import Any
 from typing import Dict
+from typing import List
 from typing import Optional
 
 from src.api.config import get_blockchain_config
+from src.api.config import settings
 from src.collectors.rpc.base_rpc import BaseRPCClient
 from src.collectors.rpc.bitcoin_rpc import BitcoinRpcClient
 from src.collectors.rpc.evm_rpc import EvmRpcClient
@@ -23,6 +26,27 @@ _clients: Dict[str, BaseRPCClient] = {}
 _clients_lock = threading.Lock()
 
 
+def _http_endpoints(blockchain: str, config: Dict[str, Any]) -> List[str]:
+    """Ordered, de-duplicated HTTP(S) endpoints for a chain.
+
+    aiohttp clients use plain HTTP/S POST — WebSocket URLs won't work, so the
+    primary ``rpc_url`` is skipped when it is a WebSocket endpoint.  Extra
+    endpoints from ``settings.RPC_ENDPOINTS`` join the pool after the
+    configured primary and fallback.
+    """
+    urls = [
+        config.get("rpc_url", ""),
+        config.get("fallback_url", ""),
+        *settings.RPC_ENDPOINTS.get(blockchain, []),
+    ]
+    endpoints: List[str] = []
+    for url in urls:
+        url = (url or "").rstrip("/")
+        if url.startswith(("http://", "https://")) and url not in endpoints:
+            endpoints.append(url)
+    return endpoints
+
+
 def get_rpc_client(blockchain: str) -> Optional[BaseRPCClient]:
     """Return a cached RPC client for the given blockchain.
 
@@ -45,25 +69,18 @@ def get_rpc_client(blockchain: str) -> Optional[BaseRPCClient]:
             return None
 
         family = config.get("family", "")
-        rpc_url = config["rpc_url"]
-        fallback_url = config.get("fallback_url", "")
-
-        # aiohttp clients use plain HTTP/S POST — WebSocket URLs won't work.
-        # Prefer the fallback HTTP URL when the primary is a WebSocket endpoint.
-        if rpc_url.startswith("wss://") or rpc_url.startswith("ws://"):
-            if fallback_url and (
-                fallback_url.startswith("http://")
-                or fallback_url.startswith("https://")
-            ):
-                logger.debug(
-                    f"Primary URL for {blockchain} is WSS; using HTTP fallback for RPC client"
-                )
-                rpc_url = fallback_url
+        endpoints = _http_endpoints(blockchain, config)
+        if not endpoints:
+            logger.debug(f"No HTTP RPC endpoint configured for {blockchain}")
+            return None
+        rpc_url, fallback_urls = endpoints[0], endpoints[1:]
 
+        # Bitcoin Core (basic auth) and Tron REST stay on a single endpoint;
+        # JSON-RPC families route across the whole pool.
         client: Optional[BaseRPCClient] = None
 
         if family == "evm":
-            client = EvmRpcClient(rpc_url, blockchain)
+            client = EvmRpcClient(rpc_url, blockchain, fallback_urls=fallback_urls)
         elif family == "bitcoin":
             client = BitcoinRpcClient(
                 rpc_url,
@@ -72,11 +89,11 @@ def get_rpc_client(blockchain: str) -> Optional[BaseRPCClient]:
                 rpc_password=config.get("password"),
             )
         elif family == "solana":
-            client = SolanaRpcClient(rpc_url, blockchain)
+            client = SolanaRpcClient(rpc_url, blockchain, fallback_urls=fallback_urls)
         elif family == "tron":
             client = TronRpcClient(rpc_url, blockchain)
         elif family == "xrpl":
-            client = XrplRpcClient(rpc_url, blockchain)
+            client = XrplRpcClient(rpc_url, blockchain, fallback_urls=fallback_urls)
         else:
             logger.debug(f"RPC family '{family}' for {blockchain} not yet implemented")
             return None
@@ -0,0 +1,185 @@
+"""
+Jackdaw Sentry - RPC Rate Limiters
+Token-bucket limiters for outbound RPC traffic, in-process or shared via Redis.
+"""
+
+import asyncio
+import logging
+import time
+from abc import ABC
+from abc import abstractmethod
+from typing import Dict
+from typing import Optional
+from urllib.parse import urlparse
+
+from src.api.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Relative cost of RPC methods; anything not listed costs 1.  Tracing and log
+# scans are far more expensive for providers than simple reads.
+DEFAULT_METHOD_WEIGHTS: Dict[str, float] = {
+    "debug_traceTransaction": 10,
+    "debug_traceBlockByNumber": 20,
+    "debug_traceBlockByHash": 20,
+    "trace_transaction": 10,
+    "trace_block": 20,
+    "trace_replayTransaction": 10,
+    "eth_getLogs": 5,
+    "eth_getBlockReceipts": 5,
+    "getblock": 2,
+    "getBlock": 5,
+    "getSignaturesForAddress": 2,
+}
+
+
+class RateLimiter(ABC):
+    """Interface for outbound request rate limiters."""
+
+    @abstractmethod
+    async def acquire(self, weight: float = 1.0) -> float:
+        """Take *weight* tokens, sleeping until they are available.
+
+        Weights above the bucket capacity are clamped to it, so a single
+        expensive request waits at most one full refill.  Returns the number
+        of seconds waited.
+        """
+
+
+class TokenBucket(RateLimiter):
+    """In-process token bucket with O(1) accounting.
+
+    Tokens refill continuously at ``rate_per_minute / 60`` per second up to
+    ``capacity``.  A caller that cannot be served immediately reserves its
+    tokens by driving the balance negative and sleeps for the deficit, so
+    concurrent callers queue up fairly without holding a lock while waiting.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float = 0):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _reserve(self, weight: float) -> float:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        self._tokens -= weight
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    async def acquire(self, weight: float = 1.0) -> float:
+        wait = self._reserve(min(weight, self.capacity))
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+# Atomic refill-and-take.  Uses the Redis server clock so every worker agrees
+# on elapsed time.  Returns the wait in seconds as a string (Lua numbers are
+# truncated to integers when returned directly).
+_REDIS_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local weight = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - weight
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+if tokens < 0 then
+    return tostring(-tokens / rate)
+end
+return '0'
+"""
+
+
+class RedisTokenBucket(RateLimiter):
+    """Token bucket stored in Redis so all workers share one provider quota.
+
+    Each acquire is a single ``EVALSHA`` round trip.  If Redis is unavailable
+    the limiter degrades to an in-process ``TokenBucket`` with the same
+    settings rather than failing the RPC call.
+    """
+
+    KEY_PREFIX = "jackdaw:ratelimit:rpc:"
+
+    def __init__(self, name: str, rate_per_minute: float, capacity: float = 0):
+        self.key = f"{self.KEY_PREFIX}{name}"
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self._fallback = TokenBucket(rate_per_minute, self.capacity)
+        self._script = None
+        self._degraded = False
+
+    async def _take(self, weight: float) -> float:
+        if self._script is None:
+            from src.api.database import get_redis_client
+
+            self._script = get_redis_client().register_script(
+                _REDIS_TOKEN_BUCKET_SCRIPT
+            )
+        result = await self._script(
+            keys=[self.key], args=[self.rate, self.capacity, weight]
+        )
+        return float(result.decode() if isinstance(result, bytes) else result)
+
+    async def acquire(self, weight: float = 1.0) -> float:
+        weight = min(weight, self.capacity)
+        try:
+            wait = await self._take(weight)
+            if self._degraded:
+                logger.info(f"Shared RPC rate limiter {self.key} recovered")
+                self._degraded = False
+        except Exception as exc:
+            if not self._degraded:
+                logger.warning(
+                    f"Shared RPC rate limiter {self.key} unavailable, "
+                    f"using in-process bucket: {exc}"
+                )
+                self._degraded = True
+            self._script = None
+            return await self._fallback.acquire(weight)
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+def get_method_weight(method: str) -> float:
+    """Return the rate-limit cost of an RPC method (settings override defaults)."""
+    weight = settings.RPC_METHOD_WEIGHTS.get(method)
+    if weight is None:
+        weight = DEFAULT_METHOD_WEIGHTS.get(method, 1.0)
+    return weight
+
+
+def create_rate_limiter(
+    rpc_url: str,
+    rate_per_minute: float,
+    *,
+    capacity: float = 0,
+    backend: Optional[str] = None,
+) -> Optional[RateLimiter]:
+    """Build the limiter configured by ``RPC_RATE_LIMIT_BACKEND``.
+
+    The shared Redis bucket is keyed by the provider host, so every client
+    pointing at the same provider draws from the same budget.  Returns
+    ``None`` when rate limiting is disabled (``rate_per_minute <= 0``).
+    """
+    if rate_per_minute <= 0:
+        return None
+
+    capacity = capacity or settings.RPC_RATE_LIMIT_BURST
+    backend = (backend or settings.RPC_RATE_LIMIT_BACKEND).lower()
+    if backend == "redis":
+        name = urlparse(rpc_url).netloc or rpc_url
+        return RedisTokenBucket(name, rate_per_minute, capacity)
+    if backend != "local":
+        logger.warning(f"Unknown RPC rate limit backend '{backend}', using local")
+    return TokenBucket(rate_per_minute, capacity)
@@ -0,0 +1,308 @@
+"""
+Jackdaw Sentry - RPC Response Cache
+Two-tier read-through cache for immutable RPC results (finalized data only).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from src.api.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Returned by ResponseCache.get_many for keys that are not cached (a cached
+# value may legitimately be falsy, so None cannot mark a miss)
+MISS = object()
+
+
+def cache_key(blockchain: str, method: str, params: Any) -> str:
+    """Stable cache key for a ``(chain, method, params)`` call."""
+    encoded = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha1(encoded.encode()).hexdigest()
+    return f"{blockchain}:{method}:{digest}"
+
+
+class LRUByteCache:
+    """In-process LRU bounded by the total size of its serialized values."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= len(old)
+        self._entries[key] = data
+        self.size += len(data)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+
+class CacheStore(ABC):
+    """Shared second tier behind the in-process LRU."""
+
+    @abstractmethod
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        """Return the stored value for each key, or ``None``."""
+
+    @abstractmethod
+    async def set(self, key: str, data: bytes) -> None:
+        """Store *data* under *key*."""
+
+
+class RedisCacheStore(CacheStore):
+    """Second tier in Redis, shared by every worker."""
+
+    KEY_PREFIX = "jackdaw:rpc_cache:"
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        from src.api.database import get_redis_client
+
+        return await get_redis_client().mget([self.KEY_PREFIX + k for k in keys])
+
+    async def set(self, key: str, data: bytes) -> None:
+        from src.api.database import get_redis_client
+
+        await get_redis_client().setex(self.KEY_PREFIX + key, self.ttl_seconds, data)
+
+
+class DiskCacheStore(CacheStore):
+    """Second tier in a local SQLite file, for single-host deployments.
+
+    The file is bounded by the total size of its values: once ``max_bytes``
+    is exceeded the least recently used entries are deleted until the store
+    is back under ``EVICT_TO`` of its budget, so eviction runs in batches
+    rather than on every write.
+    """
+
+    EVICT_TO = 0.9
+
+    def __init__(self, path: str, max_bytes: int = 1024 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rpc_cache "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS rpc_cache_accessed "
+                "ON rpc_cache (accessed)"
+            )
+            self.size = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM rpc_cache"
+            ).fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def _get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        with self._lock:
+            conn = self._connection()
+            placeholders = ",".join("?" * len(keys))
+            rows = conn.execute(
+                f"SELECT key, value FROM rpc_cache WHERE key IN ({placeholders})",
+                list(keys),
+            )
+            found = dict(rows.fetchall())
+            if found:
+                conn.execute(
+                    f"UPDATE rpc_cache SET accessed = ? "
+                    f"WHERE key IN ({','.join('?' * len(found))})",
+                    [time.time(), *found],
+                )
+                conn.commit()
+        return [found.get(key) for key in keys]
+
+    def _set(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            conn = self._connection()
+            old = conn.execute(
+                "SELECT size FROM rpc_cache WHERE key = ?", (key,)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO rpc_cache (key, value, size, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+            self.size += len(data) - (old[0] if old else 0)
+            if self.size > self.max_bytes:
+                self._evict(conn, int(self.max_bytes * self.EVICT_TO))
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, target: int) -> None:
+        """Delete least recently used entries until ``size <= target``."""
+        victims = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM rpc_cache ORDER BY accessed"
+        ):
+            if self.size <= target:
+                break
+            victims.append((key,))
+            self.size -= size
+        conn.executemany("DELETE FROM rpc_cache WHERE key = ?", victims)
+        self.evictions += len(victims)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return await asyncio.to_thread(self._get_many, keys)
+
+    async def set(self, key: str, data: bytes) -> None:
+        await asyncio.to_thread(self._set, key, data)
+
+
+class ResponseCache:
+    """Read-through cache for RPC results that can never change.
+
+    Values are stored as compact JSON, so every hit returns a fresh copy that
+    callers may mutate.  Lookups try the in-process LRU first, then the
+    optional shared ``store``; store hits are promoted into the LRU.  Store
+    errors are logged and counted but never fail the RPC call.
+
+    The cache itself does not judge finality: clients only ``set`` results
+    they have established to be final (see ``BaseRPCClient._is_final``).
+    """
+
+    def __init__(self, max_bytes: int, store: Optional[CacheStore] = None):
+        self.memory = LRUByteCache(max_bytes)
+        self.store = store
+        self.metrics = {
+            "hits": 0,
+            "store_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "store_errors": 0,
+        }
+
+    async def get(self, key: str) -> Any:
+        return (await self.get_many([key]))[0]
+
+    async def get_many(self, keys: Sequence[str]) -> List[Any]:
+        """Cached value for each key, or ``MISS``."""
+        results: List[Any] = [MISS] * len(keys)
+        missing: List[int] = []
+        for i, key in enumerate(keys):
+            data = self.memory.get(key)
+            if data is None:
+                missing.append(i)
+            else:
+                results[i] = json.loads(data)
+                self.metrics["hits"] += 1
+
+        if missing and self.store is not None:
+            try:
+                stored = await self.store.get_many([keys[i] for i in missing])
+            except Exception as exc:
+                self.metrics["store_errors"] += 1
+                logger.debug(f"RPC cache store read failed: {exc}")
+                stored = [None] * len(missing)
+            for i, data in zip(missing, stored):
+                if data is not None:
+                    self.memory.set(keys[i], data)
+                    results[i] = json.loads(data)
+                    self.metrics["store_hits"] += 1
+
+        self.metrics["misses"] += sum(1 for result in results if result is MISS)
+        return results
+
+    async def set(self, key: str, value: Any) -> None:
+        data = json.dumps(value, separators=(",", ":")).encode()
+        self.memory.set(key, data)
+        self.metrics["sets"] += 1
+        if self.store is not None:
+            try:
+                await self.store.set(key, data)
+            except Exception as exc:
+                self.metrics["store_errors"] += 1
+                logger.debug(f"RPC cache store write failed: {exc}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        lookups = (
+            self.metrics["hits"] + self.metrics["store_hits"] + self.metrics["misses"]
+        )
+        return {
+            **self.metrics,
+            "hit_rate": (
+                (self.metrics["hits"] + self.metrics["store_hits"]) / lookups
+                if lookups
+                else 0.0
+            ),
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.size,
+            "memory_evictions": self.memory.evictions,
+        }
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide response cache configured by ``RPC_CACHE_*`` settings.
+
+    Returns ``None`` when caching is disabled.  Keys include the chain, so all
+    RPC clients share one instance and one memory budget.
+    """
+    global _response_cache
+    if not settings.RPC_CACHE_ENABLED:
+        return None
+    with _response_cache_lock:
+        if _response_cache is None:
+            backend = settings.RPC_CACHE_BACKEND.lower()
+            store: Optional[CacheStore] = None
+            if backend == "redis":
+                store = RedisCacheStore(settings.RPC_CACHE_TTL_SECONDS)
+            elif backend == "disk":
+                store = DiskCacheStore(
+                    settings.RPC_CACHE_DISK_PATH, settings.RPC_CACHE_DISK_MAX_BYTES
+                )
+            elif backend != "memory":
+                logger.warning(
+                    f"Unknown RPC cache backend '{backend}', using memory only"
+                )
+            _response_cache = ResponseCache(settings.RPC_CACHE_MAX_BYTES, store)
+        return _response_cache
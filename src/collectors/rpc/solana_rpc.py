@@ -10,6 +10,7 @@ from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Sequence
 from typing import Union
 
 from src.collectors.base import Address
@@ -23,12 +24,33 @@ logger = logging.getLogger(__name__)
 # Lamport conversion: 1 SOL = 1e9 lamports
 LAMPORTS_PER_SOL = 1_000_000_000
 
+_TX_OPTIONS = {"encoding": "json", "maxSupportedTransactionVersion": 0}
+
+# getBlock errors for slots that have no block and never will: skipped by
+# the leader, or missing from long-term storage
+_NO_BLOCK_ERROR_CODES = frozenset({-32007, -32009})
+
+# BLOCK_NOT_AVAILABLE is usually transient (the node has not caught up with
+# the slot yet), so the slot is retried a few times before it is skipped
+_BLOCK_NOT_AVAILABLE = -32004
+_BLOCK_NOT_AVAILABLE_ATTEMPTS = 5
+
 
 class SolanaRpcClient(BaseRPCClient):
     """Solana JSON-RPC 2.0 client using only aiohttp."""
 
+    CACHEABLE_METHODS = frozenset({"getTransaction", "getBlock"})
+    supports_block_transactions = True
+
     def __init__(self, rpc_url: str, blockchain: str = "solana", **kwargs):
         super().__init__(rpc_url, blockchain, **kwargs)
+        self._unavailable_attempts: Dict[int, int] = {}
+        self.metrics["slots_skipped"] = 0
+
+    def _is_final(self, method: str, params: Any, result: Any) -> bool:
+        # Without an explicit commitment the node answers at "finalized"
+        options = params[1] if len(params) > 1 and isinstance(params[1], dict) else {}
+        return options.get("commitment", "finalized") == "finalized"
 
     # ------------------------------------------------------------------
     # Transaction
@@ -36,13 +58,23 @@ class SolanaRpcClient(BaseRPCClient):
 
     async def get_transaction(self, tx_hash: str) -> Optional[Transaction]:
         """Fetch a transaction by signature."""
-        result = await self._json_rpc(
-            "getTransaction",
-            [tx_hash, {"encoding": "json", "maxSupportedTransactionVersion": 0}],
-        )
+        result = await self._json_rpc("getTransaction", [tx_hash, _TX_OPTIONS])
         if result is None:
             return None
+        return self._parse_transaction(tx_hash, result)
+
+    def _parse_transaction(
+        self,
+        tx_hash: str,
+        result: Dict[str, Any],
+        slot: Optional[int] = None,
+        block_time: Optional[int] = None,
+    ) -> Transaction:
+        """Build a Transaction from a ``getTransaction``-shaped result.
 
+        Entries of a full ``getBlock`` response lack ``slot``/``blockTime``;
+        pass them from the enclosing block.
+        """
         meta = result.get("meta") or {}
         tx = result.get("transaction") or {}
         message = tx.get("message") or {}
@@ -59,7 +91,7 @@ class SolanaRpcClient(BaseRPCClient):
         if pre_balances and post_balances and len(pre_balances) > 1:
             value_lamports = max(0, pre_balances[0] - post_balances[0])
 
-        block_time = result.get("blockTime")
+        block_time = result.get("blockTime", block_time)
         timestamp = (
             datetime.fromtimestamp(block_time, tz=timezone.utc)
             if block_time
@@ -67,7 +99,7 @@ class SolanaRpcClient(BaseRPCClient):
         )
 
         fee_lamports = meta.get("fee", 0)
-        slot = result.get("slot", 0)
+        slot = result.get("slot", slot or 0)
         err = meta.get("err")
 
         return Transaction(
@@ -82,6 +114,79 @@ class SolanaRpcClient(BaseRPCClient):
             status="failed" if err else "confirmed",
         )
 
+    async def get_transactions(
+        self, tx_hashes: Sequence[str]
+    ) -> List[Optional[Transaction]]:
+        """Fetch many transactions by signature in JSON-RPC batches."""
+        if not tx_hashes:
+            return []
+        results = await self.batch_call(
+            [("getTransaction", [sig, _TX_OPTIONS]) for sig in tx_hashes]
+        )
+        transactions: List[Optional[Transaction]] = []
+        for sig, result in zip(tx_hashes, results):
+            if isinstance(result, RPCError):
+                logger.debug(f"[solana] Failed to fetch tx {sig}: {result}")
+            transactions.append(
+                self._parse_transaction(sig, result)
+                if isinstance(result, dict)
+                else None
+            )
+        return transactions
+
+    async def get_block_transactions(
+        self, block_id: Union[int, str]
+    ) -> List[Transaction]:
+        """Fetch every transaction in a slot.
+
+        ``getBlock`` with full transaction details already returns each
+        transaction's message and meta, so one request covers the block.
+        Slots without a block are returned as empty rather than raising; a
+        slot the node reports as not yet available raises until it has done
+        so ``_BLOCK_NOT_AVAILABLE_ATTEMPTS`` times, then is skipped too.
+        """
+        slot = int(block_id)
+        try:
+            result = await self._json_rpc(
+                "getBlock",
+                [slot, {**_TX_OPTIONS, "transactionDetails": "full", "rewards": False}],
+            )
+        except RPCError as e:
+            if e.code == _BLOCK_NOT_AVAILABLE:
+                attempts = self._unavailable_attempts.get(slot, 0) + 1
+                if attempts < _BLOCK_NOT_AVAILABLE_ATTEMPTS:
+                    self._unavailable_attempts[slot] = attempts
+                    raise
+                logger.warning(
+                    f"[solana] Slot {slot} still not available after "
+                    f"{attempts} attempts; skipping it: {e.message}"
+                )
+            elif e.code not in _NO_BLOCK_ERROR_CODES:
+                raise
+            else:
+                logger.debug(f"[solana] No block in slot {slot}: {e.message}")
+            self._unavailable_attempts.pop(slot, None)
+            self.metrics["slots_skipped"] += 1
+            return []
+        self._unavailable_attempts.pop(slot, None)
+        if not result:
+            return []
+
+        transactions = []
+        for entry in result.get("transactions") or []:
+            signatures = (entry.get("transaction") or {}).get("signatures") or []
+            if not signatures:
+                continue
+            transactions.append(
+                self._parse_transaction(
+                    signatures[0],
+                    entry,
+                    slot=slot,
+                    block_time=result.get("blockTime"),
+                )
+            )
+        return transactions
+
     # ------------------------------------------------------------------
     # Address
     # ------------------------------------------------------------------
@@ -132,16 +237,13 @@ class SolanaRpcClient(BaseRPCClient):
         sigs = [item["signature"] for item in sigs_result if item.get("signature")]
         sigs = sigs[offset : offset + limit]
 
-        transactions = []
-        for sig in sigs:
-            try:
-                tx = await self.get_transaction(sig)
-                if tx:
-                    transactions.append(tx)
-            except Exception as exc:
-                logger.debug(f"[solana] Failed to fetch tx {sig}: {exc}")
+        try:
+            transactions = await self.get_transactions(sigs)
+        except RPCError as exc:
+            logger.debug(f"[solana] Batch tx fetch failed for {address}: {exc}")
+            return []
 
-        return transactions
+        return [tx for tx in transactions if tx]
 
     # ------------------------------------------------------------------
     # Block
@@ -37,6 +37,8 @@ def _xrpl_ts_to_datetime(xrpl_ts: Optional[int]) -> datetime:
 class XrplRpcClient(BaseRPCClient):
     """XRPL JSON-RPC client using only aiohttp."""
 
+    CACHEABLE_METHODS = frozenset({"tx", "ledger"})
+
     def __init__(self, rpc_url: str, blockchain: str = "xrpl", **kwargs):
         super().__init__(rpc_url, blockchain, **kwargs)
 
@@ -46,6 +48,11 @@ class XrplRpcClient(BaseRPCClient):
 
     async def _xrpl_rpc(self, method: str, params: Dict[str, Any]) -> Any:
         """Send an XRPL JSON-RPC request and return the result field."""
+        return await self._cached(
+            method, [params], lambda: self._xrpl_post(method, params)
+        )
+
+    async def _xrpl_post(self, method: str, params: Dict[str, Any]) -> Any:
         payload = {"method": method, "params": [params]}
         raw = await self._post(payload)
         # XRPL wraps result in {"result": {"status": "success", ...}}
@@ -59,6 +66,13 @@ class XrplRpcClient(BaseRPCClient):
             return result
         return raw
 
+    def _is_final(self, method: str, params: Any, result: Any) -> bool:
+        # Only validated ledgers are immutable; "validated"/"current" as a
+        # ledger_index names a moving target
+        if not isinstance(result, dict) or result.get("validated") is not True:
+            return False
+        return method == "tx" or isinstance(params[0].get("ledger_index"), int)
+
     # Override _post to not expect JSON-RPC 2.0 "result" field extraction
     async def _json_rpc(
         self, method: str, params: Any = None, *, retries: int = 2
@@ -6,6 +6,10 @@ transaction against all active rules.  When a rule matches, the engine
 publishes a structured alert to a Redis pub/sub channel so all connected
 WebSocket clients receive it within milliseconds.
 
+Enabled rules are kept in memory, indexed by watched address, chain and
+value threshold, and reloaded when any process announces a rule change on
+RULES_CHANGED_CHANNEL.
+
 Rule conditions (combinable with AND logic):
   - address_match  : tx sender or receiver equals a watched address
   - value_gte      : native token value >= threshold
@@ -15,13 +19,20 @@ Rule conditions (combinable with AND logic):
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import math
+import time
 import uuid
+from bisect import bisect_right
+from collections import Counter
+from collections import defaultdict
 from datetime import datetime
 from datetime import timezone
 from typing import Any
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
 
@@ -31,6 +42,7 @@ from src.api.database import get_redis_client
 logger = logging.getLogger(__name__)
 
 ALERT_CHANNEL = "jackdaw:alerts"
+RULES_CHANGED_CHANNEL = "jackdaw:alert_rules:changed"
 
 
 # ---------------------------------------------------------------------------
@@ -149,6 +161,7 @@ async def create_rule(
             rule["severity"],
             rule["created_by"],
         )
+    await _rules_changed()
     return rule
 
 
@@ -195,6 +208,7 @@ async def update_rule(rule_id: str, **kwargs) -> Optional[Dict[str, Any]]:
 
     async with pool.acquire() as conn:
         row = await conn.fetchrow(sql, *values)
+    await _rules_changed()
     return _row_to_rule(row) if row else None
 
 
@@ -205,9 +219,20 @@ async def delete_rule(rule_id: str) -> bool:
         result = await conn.execute(
             "DELETE FROM alert_rules WHERE id = $1", uuid.UUID(rule_id)
         )
+    await _rules_changed()
     return result.endswith("1")
 
 
+async def _rules_changed() -> None:
+    """Drop this process's compiled rules and tell the other processes to."""
+    get_rule_engine().invalidate()
+    try:
+        redis = get_redis_client()
+        await redis.publish(RULES_CHANGED_CHANNEL, "1")
+    except Exception as exc:
+        logger.error(f"Failed to publish alert rule change: {exc}")
+
+
 def _row_to_rule(row) -> Dict[str, Any]:
     d = dict(row)
     d["id"] = str(d["id"])
@@ -265,6 +290,178 @@ def _matches(
     return True
 
 
+def _value_threshold(rule: Dict[str, Any]) -> Optional[float]:
+    """The rule's value_gte as a float, -inf without one, None if invalid"""
+    min_val = rule.get("conditions", {}).get("value_gte")
+    if min_val is None:
+        return -math.inf
+    try:
+        return float(min_val)
+    except (TypeError, ValueError):
+        return None
+
+
+def _tx_value(tx: Dict[str, Any]) -> float:
+    try:
+        return float(tx.get("value", 0) or 0)
+    except (TypeError, ValueError):
+        return -math.inf  # only rules without a value threshold can match
+
+
+class _ThresholdIndex:
+    """Rules sorted by value threshold; ``candidates`` is a bisect and a slice"""
+
+    def __init__(self):
+        self._thresholds: List[float] = []
+        self._rules: List[Dict[str, Any]] = []
+
+    def add(self, threshold: float, rule: Dict[str, Any]):
+        self._thresholds.append(threshold)
+        self._rules.append(rule)
+
+    def freeze(self):
+        """Sort by threshold once all rules are added, ties in insertion order"""
+        order = sorted(range(len(self._rules)), key=self._thresholds.__getitem__)
+        self._thresholds = [self._thresholds[i] for i in order]
+        self._rules = [self._rules[i] for i in order]
+
+    def candidates(self, value: float) -> List[Dict[str, Any]]:
+        return self._rules[: bisect_right(self._thresholds, value)]
+
+
+class CompiledRules:
+    """Enabled rules indexed for evaluation.
+
+    A rule that watches an address is only looked up through that address;
+    other rules are grouped by chain, or kept chain-independent, and sorted
+    by value threshold.  Candidates still go through ``_matches`` so the
+    outcome is exactly that of testing every rule; alerts keep the order of
+    the rule list they were compiled from.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]]):
+        self.size = 0
+        self._rank: Dict[str, int] = {}
+        self._by_address: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._by_chain: Dict[str, _ThresholdIndex] = defaultdict(_ThresholdIndex)
+        self._any_chain = _ThresholdIndex()
+
+        for rank, rule in enumerate(rules):
+            threshold = _value_threshold(rule)
+            if threshold is None:
+                continue  # an unparseable threshold never matches
+            cond = rule.get("conditions", {})
+            self._rank[rule["id"]] = rank
+            self.size += 1
+            if cond.get("address_match"):
+                self._by_address[cond["address_match"].lower()].append(rule)
+            elif cond.get("chain"):
+                self._by_chain[cond["chain"].lower()].add(threshold, rule)
+            else:
+                self._any_chain.add(threshold, rule)
+
+        self._any_chain.freeze()
+        for index in self._by_chain.values():
+            index.freeze()
+
+    def match(
+        self, tx: Dict[str, Any], patterns: List[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Every rule *tx* satisfies, in rule-list order."""
+        value = _tx_value(tx)
+        candidates = self._any_chain.candidates(value)
+        chain_rules = self._by_chain.get((tx.get("blockchain") or "").lower())
+        if chain_rules is not None:
+            candidates = candidates + chain_rules.candidates(value)
+
+        sender = (tx.get("from") or "").lower()
+        receiver = (tx.get("to") or "").lower()
+        for address in {sender, receiver}:
+            candidates = candidates + self._by_address.get(address, [])
+
+        matched = [rule for rule in candidates if _matches(rule, tx, patterns)]
+        if len(matched) > 1:
+            matched.sort(key=lambda rule: self._rank[rule["id"]])
+        return matched
+
+
+class AlertRuleEngine:
+    """Holds the compiled enabled rules of this process.
+
+    Rules are loaded from Postgres on first use and again after
+    ``invalidate``, which the CRUD functions call directly and which
+    ``listen_for_changes`` calls for changes made by other processes.  As a
+    safety net against missed notifications, rules older than
+    ``max_age_seconds`` are reloaded too.
+    """
+
+    def __init__(self, max_age_seconds: float = 60.0):
+        self.max_age_seconds = max_age_seconds
+        self._compiled: Optional[CompiledRules] = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._loading: Optional[asyncio.Future] = None
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._compiled = None
+
+    async def rules(self) -> CompiledRules:
+        compiled = self._compiled
+        if (
+            compiled is not None
+            and time.monotonic() - self._loaded_at < self.max_age_seconds
+        ):
+            return compiled
+
+        if self._loading is None or self._loading.done():
+            self._loading = asyncio.ensure_future(self._load())
+        return await asyncio.shield(self._loading)
+
+    async def _load(self) -> CompiledRules:
+        generation = self._generation
+        compiled = CompiledRules(await list_rules(enabled_only=True))
+        if generation == self._generation:
+            self._compiled = compiled
+            self._loaded_at = time.monotonic()
+        return compiled
+
+    async def listen_for_changes(self) -> None:
+        """Invalidate on every rule change announced on RULES_CHANGED_CHANNEL."""
+        while True:
+            pubsub = None
+            try:
+                pubsub = get_redis_client().pubsub()
+                await pubsub.subscribe(RULES_CHANGED_CHANNEL)
+                # Changes made while not subscribed were missed
+                self.invalidate()
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message and message.get("type") == "message":
+                        self.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Alert rule change listener error: {exc}")
+                await asyncio.sleep(5)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:
+                        pass
+
+
+_rule_engine = AlertRuleEngine()
+
+
+def get_rule_engine() -> AlertRuleEngine:
+    """Return the process-wide alert rule engine."""
+    return _rule_engine
+
+
 async def evaluate_transaction(
     tx: Dict[str, Any], patterns: List[str] = None
 ) -> List[Dict[str, Any]]:
@@ -274,56 +471,99 @@ async def evaluate_transaction(
     Returns a list of alert dicts for each rule that fired.
     Each alert is also persisted to alert_events and published to Redis.
     """
-    rules = await list_rules(enabled_only=True)
-    fired: List[Dict[str, Any]] = []
+    patterns_by_hash = {tx.get("hash"): patterns} if patterns else None
+    return await evaluate_transactions([tx], patterns_by_hash)
 
-    for rule in rules:
-        if not _matches(rule, tx, patterns):
-            continue
 
-        detail = f"Rule '{rule['name']}' matched tx {tx.get('hash', 'unknown')}"
-        alert = _new_alert(rule, tx, detail)
-        fired.append(alert)
+async def evaluate_transactions(
+    txs: Iterable[Dict[str, Any]],
+    patterns_by_hash: Optional[Dict[str, List[str]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Evaluate a batch of transactions against all enabled rules.
+
+    *patterns_by_hash* maps a transaction hash to the AML patterns found in
+    it.  The alerts of the whole batch are persisted with one
+    ``executemany`` and published through one Redis pipeline.
+    """
+    compiled = await get_rule_engine().rules()
+    patterns_by_hash = patterns_by_hash or {}
+    fired: List[Dict[str, Any]] = []
 
-        # Persist alert event
-        try:
-            pool = get_postgres_pool()
-            async with pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    INSERT INTO alert_events
-                        (id, rule_id, rule_name, severity, detail,
-                         transaction_hash, blockchain, from_address, to_address, value, fired_at)
-                    VALUES ($1,$2,$3,$4,$5,$6,$7,$8,$9,$10,NOW())
-                    """,
-                    uuid.UUID(alert["id"]),
-                    uuid.UUID(rule["id"]),
-                    alert["rule_name"],
-                    alert["severity"],
-                    alert["detail"],
-                    alert["transaction_hash"],
-                    alert["blockchain"],
-                    alert["from_address"],
-                    alert["to_address"],
-                    float(alert["value"]) if alert["value"] is not None else None,
-                )
-                await conn.execute(
-                    "UPDATE alert_rules SET trigger_count = trigger_count + 1, updated_at = NOW() WHERE id = $1",
-                    uuid.UUID(rule["id"]),
-                )
-        except Exception as exc:
-            logger.error(f"Failed to persist alert: {exc}")
-
-        # Publish to Redis pub/sub
-        try:
-            redis = get_redis_client()
-            await redis.publish(ALERT_CHANNEL, json.dumps(alert))
-        except Exception as exc:
-            logger.error(f"Failed to publish alert to Redis: {exc}")
+    for tx in txs:
+        patterns = patterns_by_hash.get(tx.get("hash"))
+        for rule in compiled.match(tx, patterns):
+            detail = f"Rule '{rule['name']}' matched tx {tx.get('hash', 'unknown')}"
+            fired.append(_new_alert(rule, tx, detail))
 
+    if fired:
+        await _persist_alerts(fired)
+        await _publish_alerts(fired)
     return fired
 
 
+async def _persist_alerts(alerts: List[Dict[str, Any]]) -> None:
+    """Insert alert_events rows and bump trigger counts, one statement each
+
+    Compiled rules can be up to a refresh interval stale, so alerts of a
+    rule deleted meanwhile are skipped instead of failing the whole batch
+    on the ``rule_id`` foreign key.
+    """
+    try:
+        trigger_counts = Counter(alert["rule_id"] for alert in alerts)
+        pool = get_postgres_pool()
+        async with pool.acquire() as conn:
+            await conn.executemany(
+                """
+                INSERT INTO alert_events
+                    (id, rule_id, rule_name, severity, detail,
+                     transaction_hash, blockchain, from_address, to_address, value, fired_at)
+                SELECT $1::uuid, $2::uuid, $3::text, $4::text, $5::text,
+                       $6::text, $7::text, $8::text, $9::text, $10::numeric, NOW()
+                WHERE EXISTS (SELECT 1 FROM alert_rules WHERE id = $2::uuid)
+                """,
+                [
+                    (
+                        uuid.UUID(alert["id"]),
+                        uuid.UUID(alert["rule_id"]),
+                        alert["rule_name"],
+                        alert["severity"],
+                        alert["detail"],
+                        alert["transaction_hash"],
+                        alert["blockchain"],
+                        alert["from_address"],
+                        alert["to_address"],
+                        float(alert["value"]) if alert["value"] is not None else None,
+                    )
+                    for alert in alerts
+                ],
+            )
+            await conn.execute(
+                """
+                UPDATE alert_rules
+                SET trigger_count = alert_rules.trigger_count + fired.n, updated_at = NOW()
+                FROM unnest($1::uuid[], $2::bigint[]) AS fired(id, n)
+                WHERE alert_rules.id = fired.id
+                """,
+                [uuid.UUID(rule_id) for rule_id in trigger_counts],
+                list(trigger_counts.values()),
+            )
+    except Exception as exc:
+        logger.error(f"Failed to persist alerts: {exc}")
+
+
+async def _publish_alerts(alerts: List[Dict[str, Any]]) -> None:
+    """Publish every alert to ALERT_CHANNEL in one round trip"""
+    try:
+        redis = get_redis_client()
+        pipe = redis.pipeline(transaction=False)
+        for alert in alerts:
+            pipe.publish(ALERT_CHANNEL, json.dumps(alert))
+        await pipe.execute()
+    except Exception as exc:
+        logger.error(f"Failed to publish alerts to Redis: {exc}")
+
+
 # ---------------------------------------------------------------------------
 # Recent alerts query
 # ---------------------------------------------------------------------------
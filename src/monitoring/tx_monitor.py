@@ -1,18 +1,29 @@
 """
 Jackdaw Sentry — Transaction Monitoring Pipeline (M12)
 
-Polls each configured RPC client for new blocks/transactions and feeds
-them through the alert rules engine.  Designed to run as a background
-asyncio task started from the app lifespan.
-
-Each chain is polled independently at its own cadence.  The last-seen
-block number is stored in Redis so restarts don't re-evaluate old blocks.
+Follows each configured chain block by block and feeds every transaction
+through the alert rules engine.  Designed to run as a background asyncio
+task started from the app lifespan.
+
+Each chain keeps a cursor — the last block whose transactions were all
+evaluated — in Redis, so restarts resume where they stopped instead of
+skipping or re-evaluating blocks.  Blocks produced between polls are
+caught up a few at a time, and the poll interval follows the observed
+block time.  ``get_monitor_status`` reports the tip, cursor and lag of
+every chain.
+
+Every API worker runs these loops, so a chain is only followed by the
+worker holding its Redis lease; the others stand by and take over when
+the lease expires.  The cursor is only ever raised, and only by the lease
+holder, so alerts fire once per block rather than once per worker.
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import time
+import uuid
 from datetime import datetime
 from datetime import timezone
 from typing import Any
@@ -20,11 +31,13 @@ from typing import Dict
 from typing import List
 from typing import Optional
 
-from src.monitoring.alert_rules import evaluate_transaction
+from src.api.database import get_redis_client
+from src.monitoring.alert_rules import evaluate_transactions
 
 logger = logging.getLogger(__name__)
 
-# Polling intervals (seconds) per chain family
+# Initial polling intervals (seconds) per chain family, refined from the
+# observed block time once the monitor has seen the tip advance
 _POLL_INTERVALS: Dict[str, int] = {
     "evm": 12,  # ~ETH block time
     "bitcoin": 60,
@@ -33,11 +46,58 @@ _POLL_INTERVALS: Dict[str, int] = {
     "xrpl": 4,
 }
 
+_MIN_POLL_INTERVAL = 1.0
+_MAX_POLL_INTERVAL = 120.0
+# Weight of the newest sample in the block time moving average
+_BLOCK_TIME_SMOOTHING = 0.2
+
+# Blocks fetched concurrently while catching up
+_CATCHUP_CONCURRENCY = 4
+# Beyond this many blocks behind the tip the oldest blocks are skipped,
+# so an outage does not turn into hours of catch-up
+_MAX_BACKLOG_BLOCKS = 2000
+
 _LAST_BLOCK_KEY = "jackdaw:monitor:last_block:{chain}"
+_LEASE_KEY = "jackdaw:monitor:lease:{chain}"
+# Lease lifetime; at least a few poll intervals so idle polls keep it
+_LEASE_TTL_SECONDS = 30.0
+
+# Take or renew the lease: 1 if renewed, 2 if newly acquired, 0 if another
+# worker holds it.  KEYS: lease.  ARGV: token, ttl ms.
+_ACQUIRE_LEASE_SCRIPT = """
+local owner = redis.call('GET', KEYS[1])
+if owner == ARGV[1] then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+if not owner then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+    return 2
+end
+return 0
+"""
+
+# Raise the cursor if the caller still holds the lease, renewing it.
+# Returns the stored cursor, or -1 when the lease was lost.
+# KEYS: cursor, lease.  ARGV: token, block, ttl ms.
+_ADVANCE_CURSOR_SCRIPT = """
+if redis.call('GET', KEYS[2]) ~= ARGV[1] then
+    return -1
+end
+redis.call('PEXPIRE', KEYS[2], ARGV[3])
+local block = tonumber(ARGV[2])
+local current = tonumber(redis.call('GET', KEYS[1]))
+if current and current >= block then
+    return current
+end
+redis.call('SET', KEYS[1], ARGV[2])
+return block
+"""
 
 # Running flag — set to False to stop all loops cleanly
 _running = False
 _tasks: List[asyncio.Task] = []
+_monitors: Dict[str, "ChainMonitor"] = {}
 
 
 # ---------------------------------------------------------------------------
@@ -71,23 +131,220 @@ def stop_monitor() -> None:
     logger.info("Transaction monitor stopped")
 
 
+def get_monitor_status() -> Dict[str, Dict[str, Any]]:
+    """Tip, cursor, lag and counters of every monitored chain."""
+    return {chain: monitor.status() for chain, monitor in _monitors.items()}
+
+
 # ---------------------------------------------------------------------------
-# Per-chain polling loop
+# Per-chain block follower
 # ---------------------------------------------------------------------------
 
 
+class ChainMonitor:
+    """Evaluates every block of one chain, in order, from a persisted cursor.
+
+    ``poll`` reads the tip and works through ``cursor + 1 .. tip`` in
+    windows of ``concurrency`` blocks: a window is fetched concurrently,
+    then evaluated and committed in block order.  The cursor only moves
+    past a block once all of its transactions were evaluated, so a failed
+    fetch or evaluation is retried from that block on the next poll.
+    Without a stored cursor the monitor starts at the current tip.
+
+    A poll does nothing unless this monitor holds the chain's lease.  Each
+    committed window renews it; if it was lost in the meantime the poll
+    stops and the cursor is reloaded once the lease is regained.  When
+    Redis is unreachable the monitor keeps following from its in-memory
+    cursor rather than stop raising alerts.
+    """
+
+    def __init__(
+        self,
+        chain: str,
+        client: Any,
+        concurrency: int = _CATCHUP_CONCURRENCY,
+        max_backlog: int = _MAX_BACKLOG_BLOCKS,
+    ):
+        self.chain = chain
+        self.client = client
+        self.concurrency = max(1, concurrency)
+        self.max_backlog = max_backlog
+        self.token = uuid.uuid4().hex
+        self.is_leader = False
+
+        self.cursor: Optional[int] = None
+        self.tip: Optional[int] = None
+        self.block_time = float(_POLL_INTERVALS.get(_get_family(chain), 30))
+        self._last_tip: Optional[int] = None
+        self._last_tip_at: Optional[float] = None
+
+        self.metrics = {
+            "blocks_processed": 0,
+            "transactions_evaluated": 0,
+            "alerts_fired": 0,
+            "blocks_skipped": 0,
+            "lease_lost": 0,
+            "errors": 0,
+            "last_poll_at": None,
+        }
+
+    @property
+    def lag(self) -> Optional[int]:
+        if self.tip is None or self.cursor is None:
+            return None
+        return max(0, self.tip - self.cursor)
+
+    def poll_interval(self) -> float:
+        """Seconds to wait before the next poll: about one block time."""
+        return min(max(self.block_time, _MIN_POLL_INTERVAL), _MAX_POLL_INTERVAL)
+
+    def lease_ttl(self) -> float:
+        return max(_LEASE_TTL_SECONDS, 3 * self.poll_interval())
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "leader": self.is_leader,
+            "tip": self.tip,
+            "cursor": self.cursor,
+            "lag": self.lag,
+            "block_time": round(self.block_time, 3),
+            "poll_interval": round(self.poll_interval(), 3),
+            **self.metrics,
+        }
+
+    async def poll(self) -> int:
+        """Evaluate every block up to the current tip; return blocks done."""
+        tip = await self.client.get_latest_block_number()
+        self.metrics["last_poll_at"] = datetime.now(timezone.utc).isoformat()
+        if not tip or tip < 0:
+            return 0
+        self._observe_tip(tip)
+
+        if not await self._hold_lease():
+            self.cursor = None  # reload once the lease comes back
+            return 0
+
+        if self.cursor is None:
+            stored = await _load_cursor(self.chain)
+            self.cursor = stored if stored is not None else tip - 1
+            logger.info(f"[monitor] {self.chain} resuming after block {self.cursor}")
+
+        if tip - self.cursor > self.max_backlog:
+            skipped = tip - self.cursor - self.max_backlog
+            logger.warning(
+                f"[monitor] {self.chain} is {tip - self.cursor} blocks behind; "
+                f"skipping {skipped} blocks after {self.cursor}"
+            )
+            self.metrics["blocks_skipped"] += skipped
+            self.cursor += skipped
+            if not await self._save_cursor():
+                return 0
+
+        processed = 0
+        while self.cursor < tip:
+            start = self.cursor + 1
+            numbers = range(start, min(tip, self.cursor + self.concurrency) + 1)
+            fetched = await asyncio.gather(
+                *(self.client.get_block_transactions(n) for n in numbers),
+                return_exceptions=True,
+            )
+            try:
+                for number, txs in zip(numbers, fetched):
+                    if isinstance(txs, BaseException):
+                        raise RuntimeError(f"block {number}: {txs}") from txs
+                    await self._evaluate_block(txs or [])
+                    self.cursor = number
+                    processed += 1
+            finally:
+                held = self.cursor < start or await self._save_cursor()
+            if not held:
+                break
+        return processed
+
+    async def _hold_lease(self) -> bool:
+        """Take or renew this chain's lease; False while another worker has it."""
+        try:
+            result = await get_redis_client().eval(
+                _ACQUIRE_LEASE_SCRIPT,
+                1,
+                _LEASE_KEY.format(chain=self.chain),
+                self.token,
+                int(self.lease_ttl() * 1000),
+            )
+        except Exception as exc:
+            logger.warning(f"[monitor] could not check lease for {self.chain}: {exc}")
+            return True
+        self.is_leader = int(result) > 0
+        if int(result) == 2:
+            logger.info(f"[monitor] {self.chain} lease acquired")
+            self.cursor = None  # another worker may have advanced it
+        return self.is_leader
+
+    async def _save_cursor(self) -> bool:
+        """Persist the cursor; False if the lease was lost since the poll began."""
+        try:
+            stored = await get_redis_client().eval(
+                _ADVANCE_CURSOR_SCRIPT,
+                2,
+                _LAST_BLOCK_KEY.format(chain=self.chain),
+                _LEASE_KEY.format(chain=self.chain),
+                self.token,
+                self.cursor,
+                int(self.lease_ttl() * 1000),
+            )
+        except Exception as exc:
+            logger.warning(f"[monitor] could not save cursor for {self.chain}: {exc}")
+            return True
+        if int(stored) < 0:
+            logger.warning(f"[monitor] {self.chain} lease lost; standing by")
+            self.metrics["lease_lost"] += 1
+            self.is_leader = False
+            self.cursor = None
+            return False
+        self.cursor = max(self.cursor, int(stored))
+        return True
+
+    async def _evaluate_block(self, txs: List[Any]) -> None:
+        batch = [_normalise_tx(tx, self.chain) for tx in txs]
+        fired = await evaluate_transactions(batch) if batch else []
+        self.metrics["blocks_processed"] += 1
+        self.metrics["transactions_evaluated"] += len(batch)
+        self.metrics["alerts_fired"] += len(fired)
+
+    def _observe_tip(self, tip: int) -> None:
+        """Fold the time the tip took to advance into the block time average."""
+        now = time.monotonic()
+        self.tip = tip
+        if self._last_tip is None or tip < self._last_tip:
+            self._last_tip, self._last_tip_at = tip, now
+            return
+        if tip > self._last_tip:
+            sample = (now - self._last_tip_at) / (tip - self._last_tip)
+            self.block_time += _BLOCK_TIME_SMOOTHING * (sample - self.block_time)
+            self._last_tip, self._last_tip_at = tip, now
+
+
+async def _load_cursor(chain: str) -> Optional[int]:
+    try:
+        value = await get_redis_client().get(_LAST_BLOCK_KEY.format(chain=chain))
+    except Exception as exc:
+        logger.warning(f"[monitor] could not load cursor for {chain}: {exc}")
+        return None
+    return int(value) if value is not None else None
+
+
 async def _chain_loop(chain: str) -> None:
-    """Poll *chain* for new transactions and evaluate alert rules."""
+    """Follow *chain* block by block and evaluate alert rules."""
     try:
         from src.collectors.rpc.factory import get_rpc_client
     except ImportError:
         logger.warning("RPC factory not available — monitor loop exiting for %s", chain)
         return
 
-    family = _get_family(chain)
-    interval = _POLL_INTERVALS.get(family, 30)
+    monitor: Optional[ChainMonitor] = None
+    interval = float(_POLL_INTERVALS.get(_get_family(chain), 30))
 
-    logger.info(f"[monitor] Starting loop for {chain} (poll every {interval}s)")
+    logger.info(f"[monitor] Starting loop for {chain} (poll every ~{interval}s)")
 
     while _running:
         try:
@@ -95,45 +352,29 @@ async def _chain_loop(chain: str) -> None:
             if client is None:
                 await asyncio.sleep(interval)
                 continue
-
-            txs = await _fetch_latest_txs(client, chain)
-            for tx in txs:
-                tx["blockchain"] = chain
-                try:
-                    await evaluate_transaction(tx)
-                except Exception as exc:
-                    logger.debug(f"[monitor] eval error for {tx.get('hash')}: {exc}")
+            if not client.supports_block_transactions:
+                logger.warning(
+                    f"[monitor] {chain} client cannot list block transactions; "
+                    "monitor loop exiting"
+                )
+                return
+
+            if monitor is None:
+                monitor = _monitors[chain] = ChainMonitor(chain, client)
+            monitor.client = client
+            await monitor.poll()
+            interval = monitor.poll_interval()
 
         except asyncio.CancelledError:
             break
         except Exception as exc:
+            if monitor is not None:
+                monitor.metrics["errors"] += 1
             logger.warning(f"[monitor] {chain} loop error: {exc}")
 
         await asyncio.sleep(interval)
 
 
-async def _fetch_latest_txs(client: Any, chain: str) -> List[Dict[str, Any]]:
-    """
-    Fetch transactions from the latest block via *client*.
-
-    Returns a normalised list of tx dicts with at minimum:
-      hash, from, to, value (native token, float), blockchain
-    """
-    try:
-        block = await client.get_latest_block()
-        if not block:
-            return []
-
-        txs = getattr(block, "transactions", None) or []
-        result = []
-        for tx in txs[:50]:  # cap at 50 per poll cycle to avoid spikes
-            result.append(_normalise_tx(tx, chain))
-        return result
-    except Exception as exc:
-        logger.debug(f"[monitor] fetch error for {chain}: {exc}")
-        return []
-
-
 def _normalise_tx(tx: Any, chain: str) -> Dict[str, Any]:
     """Convert a Transaction dataclass or dict into a flat alert-engine dict."""
     if isinstance(tx, dict):
@@ -15,6 +15,7 @@ from .detection_engine import PatternResult
 from .detection_engine import get_pattern_detector
 from .models import BatchPatternRequest
 from .models import BatchPatternResponse
+from .models import BatchPatternStreamRequest
 from .models import PatternConfig
 from .models import PatternMetrics
 from .models import PatternRequest
@@ -48,6 +49,7 @@ __all__ = [
     "PatternMetrics",
     "BatchPatternRequest",
     "BatchPatternResponse",
+    "BatchPatternStreamRequest",
     "PatternStatistics",
     "PatternType",
     "PatternSeverity",
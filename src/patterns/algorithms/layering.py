@@ -3,7 +3,11 @@ Advanced Layering Detection Algorithm
 Identifies complex multi-hop layering across different services
 """
 
+import heapq
 import logging
+from bisect import bisect_left
+from collections import defaultdict
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from datetime import timedelta
@@ -12,7 +16,7 @@ from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
-from typing import Set
+from typing import Tuple
 
 from ..models import PatternEvidence
 from ..models import PatternResult
@@ -47,6 +51,8 @@ class LayeringDetector:
         self.min_unique_counterparties = 3
         self.confidence_boost_per_hop = 0.05
         self.max_confidence = 0.95
+        self.max_layering_paths = 100
+        self.max_path_expansions = 20000
 
         # Known mixing/privacy services
         self.known_mixing_services = {
@@ -160,14 +166,18 @@ class LayeringDetector:
     ) -> Dict[str, List[Transaction]]:
         """Build a graph of transactions starting from the address"""
 
+        outgoing_by_sender: Dict[str, List[Transaction]] = defaultdict(list)
+        for tx in transactions:
+            outgoing_by_sender[tx.sender.lower()].append(tx)
+
         graph = {address: []}
         visited = set()
 
         # Simple BFS to build transaction graph
-        queue = [address]
+        queue = deque([address])
 
         while queue and len(visited) < 100:  # Limit to prevent infinite loops
-            current_addr = queue.pop(0)
+            current_addr = queue.popleft()
 
             if current_addr in visited:
                 continue
@@ -175,9 +185,7 @@ class LayeringDetector:
             visited.add(current_addr)
 
             # Find transactions from current address
-            outgoing_txs = [
-                tx for tx in transactions if tx.sender.lower() == current_addr.lower()
-            ]
+            outgoing_txs = outgoing_by_sender.get(current_addr.lower(), [])
 
             graph[current_addr] = outgoing_txs
 
@@ -193,36 +201,120 @@ class LayeringDetector:
     def _find_layering_paths(
         self, graph: Dict[str, List[Transaction]], start_address: str
     ) -> List[List[Transaction]]:
-        """Find potential layering paths in the transaction graph"""
-
-        paths = []
+        """Find the most confident layering paths in the transaction graph.
+
+        Paths are extended iteratively, only along transfers no earlier than
+        the previous hop and within ``max_time_gap_hours`` of the first one.
+        Branches that cannot reach ``min_hops`` are pruned using a per-address
+        bound shared by all branches.  At most ``max_path_expansions`` hops
+        are explored, and the ``max_layering_paths`` best paths by confidence
+        are returned, best first.
+        """
 
-        def dfs(current_addr: str, path: List[Transaction], visited: Set[str]):
-            # Check if path meets minimum requirements
-            if len(path) >= self.min_hops:
-                # Check if path is within time window
-                if self._is_within_time_window(path):
-                    paths.append(path.copy())
+        window = timedelta(hours=self.max_time_gap_hours)
+
+        # Outgoing transfers per address sorted by time, so the transfers that
+        # may follow a hop are a contiguous slice found by bisection
+        adjacency: Dict[str, List[Transaction]] = {}
+        for addr, txs in graph.items():
+            outgoing = adjacency.setdefault(addr.lower(), [])
+            outgoing.extend(txs)
+        for outgoing in adjacency.values():
+            outgoing.sort(key=lambda tx: tx.timestamp)
+        times = {
+            addr: [tx.timestamp for tx in outgoing]
+            for addr, outgoing in adjacency.items()
+        }
+        reach = self._max_remaining_hops(adjacency)
+
+        best: List[Tuple[float, int, List[Transaction]]] = []
+        expansions = 0
+
+        start = start_address.lower()
+        path: List[Transaction] = []
+        on_path = {start}
+        # Iterative DFS: a stack of (outgoing transfers, next index) per hop
+        stack = [(adjacency.get(start, []), 0)]
+
+        while stack:
+            candidates, index = stack[-1]
+            if index >= len(candidates) or expansions >= self.max_path_expansions:
+                stack.pop()
+                if path:
+                    on_path.discard(path.pop().recipient.lower())
+                continue
+            tx = candidates[index]
+            stack[-1] = (candidates, index + 1)
 
-            # Stop if path too long or visited too many nodes
-            if len(path) >= self.max_hops or len(visited) >= 20:
-                return
+            if path and tx.timestamp - path[0].timestamp > window:
+                # Candidates are time-sorted: the rest are later still
+                stack[-1] = (candidates, len(candidates))
+                continue
 
-            # Explore outgoing transactions
-            for tx in graph.get(current_addr, []):
-                next_addr = tx.recipient.lower()
+            next_addr = tx.recipient.lower()
+            hops = len(path) + 1
+            if next_addr in on_path or hops + reach.get(next_addr, 0) < self.min_hops:
+                continue
 
-                if next_addr not in visited:
-                    visited.add(next_addr)
-                    path.append(tx)
-                    dfs(next_addr, path, visited)
-                    path.pop()
-                    visited.remove(next_addr)
+            expansions += 1
+            path.append(tx)
+            on_path.add(next_addr)
+            if hops >= self.min_hops:
+                self._keep_best_path(best, path, expansions)
+
+            if hops < self.max_hops:
+                first = bisect_left(times.get(next_addr, []), tx.timestamp)
+                stack.append((adjacency.get(next_addr, []), first))
+            else:
+                path.pop()
+                on_path.discard(next_addr)
+
+        if expansions >= self.max_path_expansions:
+            logger.debug(
+                f"Layering search from {start_address} stopped after "
+                f"{expansions} expansions"
+            )
 
-        # Start DFS from start address
-        dfs(start_address.lower(), [], set())
+        return [path for _, _, path in sorted(best, reverse=True)]
+
+    def _keep_best_path(
+        self,
+        best: List[Tuple[float, int, List[Transaction]]],
+        path: List[Transaction],
+        order: int,
+    ):
+        """Offer ``path`` to a min-heap holding the top ``max_layering_paths``"""
+
+        # Ties go to the path found first
+        entry = (self._calculate_path_confidence(path), -order, path.copy())
+        if len(best) < self.max_layering_paths:
+            heapq.heappush(best, entry)
+        elif entry[:2] > best[0][:2]:
+            heapq.heapreplace(best, entry)
+
+    def _max_remaining_hops(
+        self, adjacency: Dict[str, List[Transaction]]
+    ) -> Dict[str, int]:
+        """Upper bound on the hops a path can still take from each address.
+
+        Longest walk of at most ``max_hops`` transfers, ignoring timestamps
+        and repeated addresses; addresses without outgoing transfers are 0.
+        """
 
-        return paths
+        reach: Dict[str, int] = {}
+        for _ in range(self.max_hops):
+            updated = {
+                addr: min(
+                    self.max_hops,
+                    1 + max(reach.get(tx.recipient.lower(), 0) for tx in outgoing),
+                )
+                for addr, outgoing in adjacency.items()
+                if outgoing
+            }
+            if updated == reach:
+                break
+            reach = updated
+        return reach
 
     def _is_within_time_window(self, path: List[Transaction]) -> bool:
         """Check if path is within the maximum time window"""
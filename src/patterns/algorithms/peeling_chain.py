@@ -12,6 +12,9 @@ from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
+
+from src.api.database import get_neo4j_session
 
 from ..models import PatternEvidence
 from ..models import PatternResult
@@ -19,6 +22,32 @@ from ..models import PatternSeverity
 
 logger = logging.getLogger(__name__)
 
+# Outgoing transfers of one address: the newest ones for the first hop, then
+# the earliest ones inside each later hop's time window
+_OUTGOING_NEWEST_QUERY = """
+MATCH (a:Address {address: $address, blockchain: $blockchain})-[:SENT]->(t:Transaction)
+OPTIONAL MATCH (t)-[:RECEIVED]->(to_a:Address)
+WITH t, coalesce(to_a.address, t.to_address) AS recipient
+WHERE recipient IS NOT NULL
+RETURN t.hash AS hash, recipient, t.value AS amount, t.timestamp AS timestamp,
+       t.block_number AS block_number
+ORDER BY t.timestamp DESC
+LIMIT $limit
+"""
+
+_OUTGOING_WINDOW_QUERY = """
+MATCH (a:Address {address: $address, blockchain: $blockchain})-[:SENT]->(t:Transaction)
+WHERE t.timestamp >= datetime($since)
+  AND t.timestamp <= datetime($since) + duration({hours: $max_gap_hours})
+OPTIONAL MATCH (t)-[:RECEIVED]->(to_a:Address)
+WITH t, coalesce(to_a.address, t.to_address) AS recipient
+WHERE recipient IS NOT NULL
+RETURN t.hash AS hash, recipient, t.value AS amount, t.timestamp AS timestamp,
+       t.block_number AS block_number
+ORDER BY t.timestamp ASC
+LIMIT $limit
+"""
+
 
 @dataclass
 class Transaction:
@@ -45,6 +74,8 @@ class PeelingChainDetector:
         self.max_time_gap_hours = 24
         self.confidence_boost_per_extra_tx = 0.05
         self.max_confidence = 0.95
+        self.max_chain_hops = 50
+        self.max_chain_fanout = 100
 
     async def detect_peeling_chain(
         self, transactions: List[Transaction], address: str, min_confidence: float = 0.5
@@ -67,17 +98,52 @@ class PeelingChainDetector:
         # Sort transactions by timestamp
         sorted_txs = sorted(transactions, key=lambda x: x.timestamp)
 
-        # Find peeling sequences
-        peeling_sequences = self._find_peeling_sequences(sorted_txs, address)
+        # Find maximal peeling runs, scored as they are found
+        peeling_runs = self._find_peeling_runs(sorted_txs)
 
-        if not peeling_sequences:
+        if not peeling_runs:
             return self._create_empty_result("No peeling sequences found")
 
-        # Calculate confidence based on best sequence
-        best_sequence = max(
-            peeling_sequences, key=lambda seq: self._calculate_sequence_confidence(seq)
+        best_sequence, confidence = max(peeling_runs, key=lambda run: run[1])
+        return self._create_result(best_sequence, confidence, address, min_confidence)
+
+    async def detect_peeling_chain_walk(
+        self,
+        address: str,
+        blockchain: str,
+        since: Optional[datetime] = None,
+        min_confidence: float = 0.5,
+    ) -> PatternResult:
+        """
+        Detect a peeling chain that moves across addresses
+
+        Follows the change output hop by hop from ``address`` through the
+        graph store (see ``follow_peeling_chain``) and scores the walk like a
+        single-address sequence.
+        """
+
+        chain = await self.follow_peeling_chain(address, blockchain, since)
+
+        if len(chain) < self.min_sequence_length:
+            return self._create_empty_result("No peeling chain found")
+
+        result = self._create_result(
+            chain, self._calculate_sequence_confidence(chain), address, min_confidence
         )
-        confidence = self._calculate_sequence_confidence(best_sequence)
+        if result.detected:
+            result.metadata["chain_addresses"] = [address] + [
+                tx.recipient for tx in chain
+            ]
+        return result
+
+    def _create_result(
+        self,
+        best_sequence: List[Transaction],
+        confidence: float,
+        address: str,
+        min_confidence: float,
+    ) -> PatternResult:
+        """Build the detection result for the best peeling sequence"""
 
         # Apply minimum confidence threshold
         if confidence < min_confidence:
@@ -126,34 +192,124 @@ class PeelingChainDetector:
             },
         )
 
+    async def follow_peeling_chain(
+        self, address: str, blockchain: str, since: Optional[datetime] = None
+    ) -> List[Transaction]:
+        """
+        Walk a peeling chain across addresses by following the change output
+
+        At each hop the change output is the largest transfer out of the
+        current address within ``max_time_gap_hours`` of the previous hop that
+        continues the peeling pattern; the walk moves on to its recipient.
+        Without ``since`` the first hop considers the most recent transfers
+        out of ``address``.  Stops after ``max_chain_hops`` hops or at an
+        address already visited.
+        """
+
+        chain: List[Transaction] = []
+        visited = {address}
+        current = address
+
+        for _ in range(self.max_chain_hops):
+            outgoing = await self._get_outgoing_transfers(current, blockchain, since)
+            candidates = [
+                tx
+                for tx in outgoing
+                if tx.recipient not in visited
+                and (not chain or self._is_peeling_step(chain[-1], tx))
+            ]
+            if not candidates:
+                break
+
+            change = max(
+                candidates, key=lambda tx: (tx.amount, -tx.timestamp.timestamp())
+            )
+            chain.append(change)
+            visited.add(change.recipient)
+            current, since = change.recipient, change.timestamp
+
+        return chain
+
+    async def _get_outgoing_transfers(
+        self, address: str, blockchain: str, since: Optional[datetime]
+    ) -> List[Transaction]:
+        """Transfers out of ``address`` in the time window of one peeling hop
+
+        Without ``since`` (the first hop) the newest ``max_chain_fanout``
+        transfers are returned, so busy addresses are judged on their recent
+        activity rather than their oldest.
+        """
+        query = _OUTGOING_WINDOW_QUERY if since else _OUTGOING_NEWEST_QUERY
+
+        async with get_neo4j_session() as session:
+            result = await session.run(
+                query,
+                address=address,
+                blockchain=blockchain,
+                since=since.isoformat() if since else None,
+                max_gap_hours=self.max_time_gap_hours,
+                limit=self.max_chain_fanout,
+            )
+            transfers = []
+            async for record in result:
+                timestamp = record["timestamp"]
+                if hasattr(timestamp, "to_native"):
+                    timestamp = timestamp.to_native()
+                transfers.append(
+                    Transaction(
+                        hash=record["hash"],
+                        address=address,
+                        amount=float(record["amount"] or 0.0),
+                        timestamp=timestamp,
+                        recipient=record["recipient"],
+                        sender=address,
+                        blockchain=blockchain,
+                        block_number=record["block_number"],
+                    )
+                )
+            return transfers
+
     def _find_peeling_sequences(
         self, transactions: List[Transaction], address: str
     ) -> List[List[Transaction]]:
-        """Find all potential peeling sequences in transactions"""
-
-        sequences = []
-        n = len(transactions)
+        """Find the maximal peeling sequences in time-sorted transactions"""
 
-        # Look for sequences starting at each transaction
-        for i in range(n - self.min_sequence_length + 1):
-            current_sequence = [transactions[i]]
+        return [sequence for sequence, _ in self._find_peeling_runs(transactions)]
 
-            # Try to extend sequence
-            for j in range(i + 1, n):
-                current_tx = transactions[j]
-                prev_tx = current_sequence[-1]
+    def _find_peeling_runs(
+        self, transactions: List[Transaction]
+    ) -> List[Tuple[List[Transaction], float]]:
+        """Maximal peeling runs of time-sorted transactions with their confidence.
 
-                # Check if this continues the peeling pattern
-                if self._is_peeling_step(prev_tx, current_tx):
-                    current_sequence.append(current_tx)
-                else:
-                    break
+        One pass: a run grows while each transaction continues the peeling
+        pattern from the previous one, and its amount consistency is summed as
+        it grows, so each run is scored once without rescanning it.
+        """
 
-            # Check if sequence meets minimum length
-            if len(current_sequence) >= self.min_sequence_length:
-                sequences.append(current_sequence)
+        runs = []
+        run: List[Transaction] = []
+        consistency_sum = 0.0
+        consistency_steps = 0
+
+        for tx in transactions + [None]:
+            if tx is not None and run and self._is_peeling_step(run[-1], tx):
+                score = self._step_consistency(run[-1].amount, tx.amount)
+                if score is not None:
+                    consistency_sum += score
+                    consistency_steps += 1
+                run.append(tx)
+                continue
+
+            if len(run) >= self.min_sequence_length:
+                consistency = (
+                    consistency_sum / consistency_steps if consistency_steps else 0.0
+                )
+                runs.append((run, self._combine_confidence(run, consistency)))
+            run = [tx]
+            consistency_sum = 0.0
+            consistency_steps = 0
 
-        return sequences
+        return runs
 
     def _is_peeling_step(self, prev_tx: Transaction, current_tx: Transaction) -> bool:
         """Check if current transaction continues peeling pattern from previous"""
@@ -177,13 +333,21 @@ class PeelingChainDetector:
     def _calculate_sequence_confidence(self, sequence: List[Transaction]) -> float:
         """Calculate confidence score for a peeling sequence"""
 
+        return self._combine_confidence(
+            sequence, self._calculate_amount_consistency(sequence)
+        )
+
+    def _combine_confidence(
+        self, sequence: List[Transaction], amount_consistency: float
+    ) -> float:
+        """Confidence of a sequence given its amount consistency"""
+
         base_confidence = 0.5
 
         # Length bonus (longer sequences = higher confidence)
         length_bonus = min(0.3, (len(sequence) - self.min_sequence_length) * 0.1)
 
         # Amount consistency bonus
-        amount_consistency = self._calculate_amount_consistency(sequence)
         consistency_bonus = amount_consistency * 0.2
 
         # Time compression bonus (faster peeling = higher confidence)
@@ -206,18 +370,9 @@ class PeelingChainDetector:
         consistency_scores = []
 
         for i in range(1, len(sequence)):
-            prev_amount = sequence[i - 1].amount
-            curr_amount = sequence[i].amount
-
-            if prev_amount > 0:
-                decrease_ratio = (prev_amount - curr_amount) / prev_amount
-
-                # Ideal peeling has consistent decrease ratios
-                # Score based on how close to ideal (0.5 = 50% decrease)
-                ideal_ratio = 0.5
-                ratio_diff = abs(decrease_ratio - ideal_ratio)
-                consistency_score = max(0, 1 - ratio_diff * 2)  # Normalize to 0-1
-                consistency_scores.append(consistency_score)
+            score = self._step_consistency(sequence[i - 1].amount, sequence[i].amount)
+            if score is not None:
+                consistency_scores.append(score)
 
         return (
             sum(consistency_scores) / len(consistency_scores)
@@ -225,6 +380,21 @@ class PeelingChainDetector:
             else 0.0
         )
 
+    @staticmethod
+    def _step_consistency(prev_amount: float, curr_amount: float) -> Optional[float]:
+        """Score one amount decrease; None when the previous amount is not positive"""
+
+        if prev_amount <= 0:
+            return None
+
+        decrease_ratio = (prev_amount - curr_amount) / prev_amount
+
+        # Ideal peeling has consistent decrease ratios
+        # Score based on how close to ideal (0.5 = 50% decrease)
+        ideal_ratio = 0.5
+        ratio_diff = abs(decrease_ratio - ideal_ratio)
+        return max(0, 1 - ratio_diff * 2)  # Normalize to 0-1
+
     def _calculate_time_compression(self, sequence: List[Transaction]) -> float:
         """Calculate time compression score (faster = higher confidence)"""
 
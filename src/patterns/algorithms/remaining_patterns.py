@@ -13,6 +13,8 @@ from typing import Dict
 from typing import List
 from typing import Optional
 
+from src.utils.time_window import sweep_groups
+
 from ..models import PatternEvidence
 from ..models import PatternResult
 from ..models import PatternSeverity
@@ -367,48 +369,16 @@ class SynchronizedTransferDetector:
     def _find_synchronized_groups(
         self, transactions: List[Transaction]
     ) -> List[List[Transaction]]:
-        """Find groups of synchronized transfers"""
-
-        groups = []
-        used_transactions = set()
-
-        for i, tx1 in enumerate(transactions):
-            if tx1.hash in used_transactions:
-                continue
-
-            current_group = [tx1]
-
-            for j, tx2 in enumerate(transactions):
-                if i == j or tx2.hash in used_transactions:
-                    continue
-
-                if self._is_synchronized(tx1, tx2):
-                    current_group.append(tx2)
-                    used_transactions.add(tx2.hash)
-
-            if len(current_group) >= self.min_transfers:
-                groups.append(current_group)
-                used_transactions.add(tx1.hash)
-
-        return groups
-
-    def _is_synchronized(self, tx1: Transaction, tx2: Transaction) -> bool:
-        """Check if two transactions are synchronized"""
-
-        # Check time window
-        time_diff = abs((tx1.timestamp - tx2.timestamp).total_seconds())
-        if time_diff > self.sync_window_seconds:
-            return False
-
-        # Check amount similarity
-        if tx1.amount == 0 or tx2.amount == 0:
-            return False
-
-        amount_diff = abs(tx1.amount - tx2.amount) / max(tx1.amount, tx2.amount)
-        if amount_diff > self.amount_tolerance:
-            return False
-
-        return True
+        """Find groups of synchronized transfers with one time-ordered sweep"""
+
+        return sweep_groups(
+            transactions,
+            timestamp=lambda tx: tx.timestamp.timestamp(),
+            amount=lambda tx: tx.amount,
+            window=self.sync_window_seconds,
+            amount_tolerance=self.amount_tolerance,
+            min_group_size=self.min_transfers,
+        )
 
     def _calculate_group_confidence(self, group: List[Transaction]) -> float:
         """Calculate confidence score for synchronized group"""
@@ -0,0 +1,64 @@
+"""
+Jackdaw Sentry - Pattern Batch Jobs
+Redis-backed state that lets a streamed batch analysis be resumed by job id
+"""
+
+import json
+import uuid
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Set
+
+from src.api.database import get_redis_connection
+
+JOB_TTL_SECONDS = 24 * 3600
+
+
+class PatternBatchJobStore:
+    """Stores each job's request and the indices of the addresses completed.
+
+    A resumed job re-runs only the addresses whose results were not yet
+    delivered.  Keys expire ``ttl_seconds`` after the job's last progress.
+    """
+
+    def __init__(self, ttl_seconds: int = JOB_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _request_key(job_id: str) -> str:
+        return f"pattern_batch:{job_id}:request"
+
+    @staticmethod
+    def _completed_key(job_id: str) -> str:
+        return f"pattern_batch:{job_id}:completed"
+
+    async def create(self, request: Dict[str, Any]) -> str:
+        job_id = str(uuid.uuid4())
+        async with get_redis_connection() as redis:
+            await redis.set(
+                self._request_key(job_id), json.dumps(request), ex=self.ttl_seconds
+            )
+        return job_id
+
+    async def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        async with get_redis_connection() as redis:
+            raw = await redis.get(self._request_key(job_id))
+        return json.loads(raw) if raw else None
+
+    async def completed(self, job_id: str) -> Set[int]:
+        async with get_redis_connection() as redis:
+            members = await redis.smembers(self._completed_key(job_id))
+        return {int(member) for member in members}
+
+    async def mark_completed(self, job_id: str, indices: Iterable[int]):
+        indices = list(indices)
+        if not indices:
+            return
+        async with get_redis_connection() as redis:
+            pipe = redis.pipeline(transaction=False)
+            pipe.sadd(self._completed_key(job_id), *indices)
+            pipe.expire(self._completed_key(job_id), self.ttl_seconds)
+            pipe.expire(self._request_key(job_id), self.ttl_seconds)
+            await pipe.execute()
@@ -10,12 +10,17 @@ from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 from typing import Any
+from typing import AsyncIterator
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Set
 from typing import Tuple
+from typing import Union
 
+from src.api.config import settings
 from src.api.database import get_postgres_connection
+from src.services.transaction_history import get_transaction_history_loader
 
 from .algorithms import CustodyChangeDetector
 from .algorithms import LayeringDetector
@@ -23,6 +28,8 @@ from .algorithms import OffPeakActivityDetector
 from .algorithms import PeelingChainDetector
 from .algorithms import RoundAmountDetector
 from .algorithms import SynchronizedTransferDetector
+from .algorithms.peeling_chain import Transaction
+from .models import BatchPatternRequest
 from .models import PatternAnalysisResult
 from .models import PatternEvidence
 from .models import PatternRequest
@@ -51,6 +58,9 @@ class AdvancedPatternDetector:
         }
         self.cache = {}
         self.cache_ttl = 1800  # 30 minutes
+        self.batch_max_concurrent = 10
+        self.batch_chunk_size = 50
+        self.follow_peeling_chains = settings.PATTERN_FOLLOW_PEELING_CHAINS
         self._initialized = False
         self.metrics = {
             "total_detections": 0,
@@ -169,6 +179,7 @@ class AdvancedPatternDetector:
         time_range_hours: int = 24,
         include_evidence: bool = True,
         min_confidence: float = 0.5,
+        cache_result: bool = True,
     ) -> PatternAnalysisResult:
         """Comprehensive pattern analysis for an address"""
 
@@ -200,11 +211,11 @@ class AdvancedPatternDetector:
                     address, blockchain, "No transactions found"
                 )
 
-            # Run pattern detection algorithms
-            pattern_results = []
+            # Run pattern detection algorithms concurrently on the shared history
+            selected = []
             enabled_patterns = self.pattern_library.get_enabled_patterns()
 
-            for pattern_type, detector in self.detectors.items():
+            for pattern_type in self.detectors:
                 # Skip if pattern type not requested
                 if pattern_types and pattern_type not in pattern_types:
                     continue
@@ -218,42 +229,26 @@ class AdvancedPatternDetector:
                 if min_severity and pattern.severity.value < min_severity.value:
                     continue
 
-                # Run detection
-                try:
-                    if pattern_type == PatternType.PEELING_CHAIN:
-                        result = await detector.detect_peeling_chain(
-                            transactions, address, min_confidence
-                        )
-                    elif pattern_type == PatternType.LAYERING:
-                        result = await detector.detect_layering(
-                            transactions, address, min_confidence
-                        )
-                    elif pattern_type == PatternType.CUSTODY_CHANGE:
-                        result = await detector.detect_custody_change(
-                            transactions, address, min_confidence
-                        )
-                    elif pattern_type == PatternType.SYNCHRONIZED_TRANSFERS:
-                        result = await detector.detect_synchronized_transfers(
-                            transactions, address, min_confidence
-                        )
-                    elif pattern_type == PatternType.OFF_PEAK_ACTIVITY:
-                        result = await detector.detect_off_peak_activity(
-                            transactions, address, min_confidence
-                        )
-                    elif pattern_type == PatternType.ROUND_AMOUNTS:
-                        result = await detector.detect_round_amounts(
-                            transactions, address, min_confidence
-                        )
-                    else:
-                        continue
-
-                    if result.detected:
-                        pattern_results.append(result)
-                        self._update_pattern_metrics(pattern.pattern_id, result)
+                selected.append((pattern_type, pattern))
 
-                except Exception as e:
-                    logger.error(f"Error in {pattern_type.value} detection: {e}")
+            detection_results = await asyncio.gather(
+                *(
+                    self._run_detector(
+                        pattern_type, transactions, address, min_confidence, blockchain
+                    )
+                    for pattern_type, _ in selected
+                ),
+                return_exceptions=True,
+            )
+
+            pattern_results = []
+            for (pattern_type, pattern), result in zip(selected, detection_results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error in {pattern_type.value} detection: {result}")
                     continue
+                if result is not None and result.detected:
+                    pattern_results.append(result)
+                    self._update_pattern_metrics(pattern.pattern_id, result)
 
             # Calculate overall risk score
             overall_risk_score = self._calculate_overall_risk_score(pattern_results)
@@ -278,10 +273,11 @@ class AdvancedPatternDetector:
             )
 
             # Cache result
-            self.cache[cache_key] = {
-                "result": result,
-                "timestamp": datetime.now(timezone.utc),
-            }
+            if cache_result:
+                self.cache[cache_key] = {
+                    "result": result,
+                    "timestamp": datetime.now(timezone.utc),
+                }
 
             logger.info(
                 f"Pattern analysis complete for {address}: {len(pattern_results)} patterns detected"
@@ -305,7 +301,7 @@ class AdvancedPatternDetector:
             )
 
     async def batch_analyze_patterns(
-        self, request: PatternRequest
+        self, request: Union[PatternRequest, BatchPatternRequest]
     ) -> Dict[str, PatternAnalysisResult]:
         """Batch pattern analysis for multiple addresses"""
 
@@ -313,74 +309,199 @@ class AdvancedPatternDetector:
 
         start_time = _time.time()
 
-        # Process addresses concurrently with limit
-        max_concurrent = 10
-        semaphore = asyncio.Semaphore(max_concurrent)
-
-        async def analyze_single_address(
-            address: str,
-        ) -> Tuple[str, Optional[PatternAnalysisResult]]:
-            async with semaphore:
-                try:
-                    result = await self.analyze_address_patterns(
-                        address=address,
-                        blockchain=request.blockchain,
-                        pattern_types=request.pattern_types,
-                        min_severity=request.min_severity,
-                        time_range_hours=request.time_range_hours,
-                        include_evidence=request.include_evidence,
-                        min_confidence=request.min_confidence,
-                    )
-                    return address, result
-                except Exception as e:
-                    logger.error(f"Error analyzing patterns for {address}: {e}")
-                    return address, None
-
-        # Execute all analyses concurrently
-        tasks = [analyze_single_address(address) for address in request.addresses]
-
-        results = await asyncio.gather(*tasks)
-
-        # Build results dictionary
         analysis_results = {}
         failed_addresses = []
 
-        for address, result in results:
-            if isinstance(result, Exception):
-                logger.error(f"Error analyzing patterns for {address}: {result}")
+        async for _, address, result in self.stream_batch_patterns(
+            request.addresses,
+            request.blockchain,
+            pattern_types=request.pattern_types,
+            min_severity=request.min_severity,
+            time_range_hours=request.time_range_hours,
+            include_evidence=request.include_evidence,
+            min_confidence=request.min_confidence,
+            max_concurrent=getattr(request, "max_concurrent", None),
+        ):
+            if result is None:
                 failed_addresses.append(address)
-            elif result is not None:
+            else:
                 analysis_results[address] = result
 
         processing_time = (_time.time() - start_time) * 1000
 
-        # Update metrics
-        total_patterns = sum(
-            len(result.patterns) for result in analysis_results.values() if result
-        )
-        high_risk_findings = sum(
-            1
-            for result in analysis_results.values()
-            if result and result.overall_risk_score >= 0.7
-        )
-
         logger.info(
-            f"Batch pattern analysis complete: {len(analysis_results)} successful, {len(failed_addresses)} failed"
+            f"Batch pattern analysis complete: {len(analysis_results)} successful, "
+            f"{len(failed_addresses)} failed in {processing_time:.0f}ms"
         )
 
         return analysis_results
 
+    async def stream_batch_patterns(
+        self,
+        addresses: List[str],
+        blockchain: str,
+        pattern_types: Optional[List[PatternType]] = None,
+        min_severity: Optional[PatternSeverity] = None,
+        time_range_hours: int = 24,
+        include_evidence: bool = False,
+        min_confidence: float = 0.5,
+        max_concurrent: Optional[int] = None,
+        skip: Optional[Set[int]] = None,
+    ) -> AsyncIterator[Tuple[int, str, Optional[PatternAnalysisResult]]]:
+        """Analyse many addresses, yielding ``(index, address, result)`` as each ends.
+
+        A pool of ``max_concurrent`` workers takes the addresses in chunks of
+        ``batch_chunk_size``, loads each chunk's histories with one query and
+        then analyses its addresses one at a time, so no more than
+        ``max_concurrent`` graph sessions are used.  Finished results wait in
+        a small queue: a slow consumer pauses the workers rather than letting
+        results pile up.  ``result`` is None when the analysis failed.
+        Indices in ``skip`` (already delivered, e.g. when resuming) are not
+        analysed again.
+        """
+
+        workers = max(1, max_concurrent or self.batch_max_concurrent)
+        pending = [
+            (index, address)
+            for index, address in enumerate(addresses)
+            if not skip or index not in skip
+        ]
+        chunks: asyncio.Queue = asyncio.Queue()
+        for start in range(0, len(pending), self.batch_chunk_size):
+            chunks.put_nowait(pending[start : start + self.batch_chunk_size])
+
+        finished = object()
+        results: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        loader = get_transaction_history_loader()
+
+        async def analyse(index: int, address: str):
+            try:
+                result = await self.analyze_address_patterns(
+                    address=address,
+                    blockchain=blockchain,
+                    pattern_types=pattern_types,
+                    min_severity=min_severity,
+                    time_range_hours=time_range_hours,
+                    include_evidence=include_evidence,
+                    min_confidence=min_confidence,
+                    cache_result=False,
+                )
+            except Exception as e:
+                logger.error(f"Error analyzing patterns for {address}: {e}")
+                result = None
+            await results.put((index, address, result))
+
+        async def worker():
+            while not chunks.empty():
+                chunk = chunks.get_nowait()
+                try:
+                    # Warm the shared history cache for the whole chunk
+                    await loader.get_histories(
+                        [address for _, address in chunk],
+                        blockchain,
+                        time_range_hours,
+                    )
+                except Exception as e:
+                    logger.warning(f"Batch history prefetch failed: {e}")
+                for index, address in chunk:
+                    await analyse(index, address)
+
+        async def run_workers():
+            outcomes = await asyncio.gather(
+                *(worker() for _ in range(workers)), return_exceptions=True
+            )
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logger.error(f"Batch pattern analysis worker failed: {outcome}")
+            await results.put(finished)
+
+        pool = asyncio.create_task(run_workers())
+        try:
+            while True:
+                item = await results.get()
+                if item is finished:
+                    break
+                yield item
+        finally:
+            # Also reached when the consumer stops early, e.g. a client
+            # disconnecting from a streamed response
+            pool.cancel()
+            await asyncio.gather(pool, return_exceptions=True)
+
+    async def _run_detector(
+        self,
+        pattern_type: PatternType,
+        transactions: List[Transaction],
+        address: str,
+        min_confidence: float,
+        blockchain: Optional[str] = None,
+    ) -> Optional[PatternResult]:
+        """Run one detector on the shared transaction snapshot
+
+        With ``follow_peeling_chains`` the peeling chain detector also walks
+        the change outputs across addresses, and the stronger of the two
+        results is reported.
+        """
+
+        detector = self.detectors[pattern_type]
+        if pattern_type == PatternType.PEELING_CHAIN:
+            result = await detector.detect_peeling_chain(
+                transactions, address, min_confidence
+            )
+            if self.follow_peeling_chains and blockchain:
+                walk = await detector.detect_peeling_chain_walk(
+                    address, blockchain, min_confidence=min_confidence
+                )
+                if walk.detected and (
+                    not result.detected
+                    or walk.confidence_score > result.confidence_score
+                ):
+                    return walk
+            return result
+        elif pattern_type == PatternType.LAYERING:
+            return await detector.detect_layering(transactions, address, min_confidence)
+        elif pattern_type == PatternType.CUSTODY_CHANGE:
+            return await detector.detect_custody_change(
+                transactions, address, min_confidence
+            )
+        elif pattern_type == PatternType.SYNCHRONIZED_TRANSFERS:
+            return await detector.detect_synchronized_transfers(
+                transactions, address, min_confidence
+            )
+        elif pattern_type == PatternType.OFF_PEAK_ACTIVITY:
+            return await detector.detect_off_peak_activity(
+                transactions, address, min_confidence
+            )
+        elif pattern_type == PatternType.ROUND_AMOUNTS:
+            return await detector.detect_round_amounts(
+                transactions, address, min_confidence
+            )
+        return None
+
     async def _get_transaction_history(
         self, address: str, blockchain: str, time_range_hours: int
-    ) -> List:
-        """Get transaction history for address (placeholder implementation)"""
+    ) -> List[Transaction]:
+        """Get transaction history for address from the shared history loader"""
 
-        # This would integrate with the existing blockchain collectors
-        # For now, return empty list as placeholder
-        logger.debug(
-            f"Transaction history not yet implemented for {address} on {blockchain}"
+        history = await get_transaction_history_loader().get_history(
+            address, blockchain, time_range_hours
         )
-        return []
+        return [
+            Transaction(
+                hash=tx.get("hash"),
+                address=address,
+                amount=float(tx.get("value") or 0.0),
+                timestamp=tx.get("timestamp"),
+                recipient=tx.get("to_address") or "",
+                sender=tx.get("from_address") or "",
+                blockchain=tx.get("blockchain") or blockchain,
+                block_number=tx.get("block_number"),
+                gas_used=tx.get("gas_used"),
+                gas_price=tx.get("gas_price"),
+            )
+            for tx in history.transactions
+            if tx.get("timestamp") is not None
+        ]
 
     def _calculate_overall_risk_score(
         self, pattern_results: List[PatternResult]
@@ -254,6 +254,12 @@ class BatchPatternRequest(BaseModel):
     max_concurrent: int = Field(default=10, ge=1, le=50)
 
 
+class BatchPatternStreamRequest(BatchPatternRequest):
+    """Request for a streamed, resumable batch pattern analysis"""
+
+    addresses: List[str] = Field(..., min_items=1, max_items=50000)
+
+
 class BatchPatternResponse(BaseModel):
     """Response for batch pattern analysis"""
 
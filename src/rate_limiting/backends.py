@@ -0,0 +1,212 @@
+"""
+Jackdaw Sentry - Rate Limit Backends
+GCRA admission control for inbound API requests, in-process or shared via Redis.
+"""
+
+import logging
+import time
+from abc import ABC
+from abc import abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from dataclasses import field
+from typing import List
+from typing import Optional
+from typing import Sequence
+
+from src.api.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Limit:
+    """At most ``limit`` requests per ``window`` seconds on ``key``."""
+
+    key: str
+    limit: int
+    window: float
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of one request against a list of limits.
+
+    ``remaining`` and ``reset_after`` follow the order of the limits:
+    requests still allowed right now, and seconds until the full allowance
+    is back.  ``retry_after`` is the wait before a denied request would fit.
+    """
+
+    allowed: bool
+    remaining: List[int] = field(default_factory=list)
+    reset_after: List[float] = field(default_factory=list)
+    retry_after: float = 0.0
+
+
+class RateLimitBackend(ABC):
+    """Interface for inbound request rate limit stores."""
+
+    @abstractmethod
+    async def hit(self, limits: Sequence[Limit], cost: int = 1) -> RateLimitDecision:
+        """Count a request of *cost* against every limit, atomically.
+
+        The request is admitted only if all limits allow it; a denied
+        request consumes nothing.  ``cost=0`` reports the state without
+        counting anything.
+        """
+
+
+class LocalRateLimitBackend(RateLimitBackend):
+    """GCRA state in process memory, O(1) per request and per key.
+
+    Each key stores only its theoretical arrival time: the request rate is
+    ``limit / window`` and up to ``limit`` requests may arrive at once,
+    which behaves like a sliding window without keeping timestamps.  Keys
+    are held in LRU order and the least recently used beyond ``max_keys``
+    are evicted (restarting with a full allowance), so many distinct
+    client IPs cannot grow memory without bound.  Limits are per process.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._tats: "OrderedDict[str, float]" = OrderedDict()
+
+    async def hit(self, limits: Sequence[Limit], cost: int = 1) -> RateLimitDecision:
+        return self._hit(limits, cost, time.time())
+
+    def _hit(self, limits: Sequence[Limit], cost: int, now: float):
+        states = []
+        retry_after = 0.0
+        for limit in limits:
+            tat = max(self._tats.get(limit.key, now), now)
+            new_tat = tat + limit.window / limit.limit * cost
+            retry_after = max(retry_after, new_tat - limit.window - now)
+            states.append((tat, new_tat))
+
+        allowed = retry_after <= 0
+        decision = RateLimitDecision(allowed=allowed, retry_after=retry_after)
+        for limit, (tat, new_tat) in zip(limits, states):
+            if allowed:
+                tat = new_tat
+                if cost:
+                    self._store(limit.key, tat)
+            elif limit.key in self._tats:
+                # Keep throttled clients from aging out into a fresh allowance
+                self._tats.move_to_end(limit.key)
+            decision.remaining.append(_remaining(limit, tat - now))
+            decision.reset_after.append(tat - now)
+        return decision
+
+    def _store(self, key: str, tat: float):
+        self._tats[key] = tat
+        self._tats.move_to_end(key)
+        if len(self._tats) > self.max_keys:
+            self._tats.popitem(last=False)
+
+
+def _remaining(limit: Limit, backlog: float) -> int:
+    """Requests that fit before ``backlog`` seconds of quota exceed the window"""
+    interval = limit.window / limit.limit
+    return max(0, int((limit.window - backlog) / interval + 1e-9))
+
+
+# Atomic check-and-count over several limits.  Uses the Redis server clock so
+# every worker agrees on the time.  Returns strings (Lua numbers are truncated
+# to integers when returned directly): allowed, retry_after, then
+# remaining and reset_after per key.
+_REDIS_GCRA_SCRIPT = """
+local cost = tonumber(ARGV[1])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tats = {}
+local retry = 0
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[2 * i])
+    local window = tonumber(ARGV[2 * i + 1])
+    local tat = math.max(tonumber(redis.call('GET', KEYS[i])) or now, now)
+    local new_tat = tat + window / limit * cost
+    retry = math.max(retry, new_tat - window - now)
+    tats[i] = {tat, new_tat}
+end
+local allowed = retry <= 0
+local result = {allowed and '1' or '0', tostring(math.max(retry, 0))}
+for i = 1, #KEYS do
+    local limit = tonumber(ARGV[2 * i])
+    local window = tonumber(ARGV[2 * i + 1])
+    local tat = tats[i][1]
+    if allowed then
+        tat = tats[i][2]
+        if cost > 0 then
+            local ttl = math.ceil((tat - now) * 1000) + 1000
+            redis.call('SET', KEYS[i], tostring(tat), 'PX', ttl)
+        end
+    end
+    local remaining = math.floor((window - (tat - now)) * limit / window + 1e-9)
+    table.insert(result, tostring(math.max(remaining, 0)))
+    table.insert(result, tostring(tat - now))
+end
+return result
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """GCRA state in Redis so all API workers share one set of limits.
+
+    Each hit is a single ``EVALSHA`` round trip covering every limit of the
+    request.  If Redis is unavailable the backend degrades to a
+    ``LocalRateLimitBackend`` rather than failing or blocking requests.
+    """
+
+    def __init__(self, client=None, max_local_keys: int = 100000):
+        self._client = client
+        self._fallback = LocalRateLimitBackend(max_local_keys)
+        self._script = None
+        self._degraded = False
+
+    async def _hit(self, limits: Sequence[Limit], cost: int) -> RateLimitDecision:
+        if self._script is None:
+            client = self._client
+            if client is None:
+                from src.api.database import get_redis_client
+
+                client = get_redis_client()
+            self._script = client.register_script(_REDIS_GCRA_SCRIPT)
+
+        args = [cost]
+        for limit in limits:
+            args.extend((limit.limit, limit.window))
+        result = await self._script(keys=[limit.key for limit in limits], args=args)
+        values = [v.decode() if isinstance(v, bytes) else str(v) for v in result]
+        return RateLimitDecision(
+            allowed=values[0] == "1",
+            retry_after=float(values[1]),
+            remaining=[int(float(v)) for v in values[2::2]],
+            reset_after=[float(v) for v in values[3::2]],
+        )
+
+    async def hit(self, limits: Sequence[Limit], cost: int = 1) -> RateLimitDecision:
+        try:
+            decision = await self._hit(limits, cost)
+            if self._degraded:
+                logger.info("Shared API rate limiter recovered")
+                self._degraded = False
+            return decision
+        except Exception as exc:
+            if not self._degraded:
+                logger.warning(
+                    f"Shared API rate limiter unavailable, using in-process "
+                    f"limits: {exc}"
+                )
+                self._degraded = True
+            self._script = None
+            return await self._fallback.hit(limits, cost)
+
+
+def create_rate_limit_backend(backend: Optional[str] = None) -> RateLimitBackend:
+    """Build the backend configured by ``RATE_LIMIT_BACKEND``."""
+    backend = (backend or settings.RATE_LIMIT_BACKEND).lower()
+    if backend == "redis":
+        return RedisRateLimitBackend(max_local_keys=settings.RATE_LIMIT_LOCAL_MAX_KEYS)
+    if backend != "local":
+        logger.warning(f"Unknown API rate limit backend '{backend}', using local")
+    return LocalRateLimitBackend(settings.RATE_LIMIT_LOCAL_MAX_KEYS)
@@ -15,7 +15,6 @@ import json
 import logging
 import time
 from collections import defaultdict
-from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 from datetime import timedelta
@@ -29,6 +28,11 @@ from typing import Union
 
 import redis.asyncio as redis
 
+from src.rate_limiting.backends import Limit
+from src.rate_limiting.backends import LocalRateLimitBackend
+from src.rate_limiting.backends import RateLimitBackend
+from src.rate_limiting.backends import RedisRateLimitBackend
+
 logger = logging.getLogger(__name__)
 
 
@@ -115,9 +119,10 @@ class ComplianceRateLimitingEngine:
     def __init__(self, redis_url: str = "redis://localhost:6379"):
         self.rules = {}
         self.violations = []
-        self.request_history = defaultdict(lambda: deque(maxlen=1000))
         self.redis_client = None
         self.redis_url = redis_url
+        # Counts requests per rule; shared between workers once Redis is up
+        self.backend: RateLimitBackend = LocalRateLimitBackend()
         self.default_limits = {
             "global": {"requests": 1000, "window": 3600},  # 1000 requests per hour
             "user": {"requests": 100, "window": 300},  # 100 requests per 5 minutes
@@ -137,6 +142,7 @@ class ComplianceRateLimitingEngine:
             # Initialize Redis client
             self.redis_client = redis.from_url(self.redis_url)
             await self.redis_client.ping()
+            self.backend = RedisRateLimitBackend(client=self.redis_client)
 
             logger.info("Rate limiting engine initialized successfully")
 
@@ -400,38 +406,37 @@ class ComplianceRateLimitingEngine:
             # Get key for rate limiting
             key = await self._get_rate_limit_key(request, rule)
 
-            # Get current count
-            current_count = await self._get_request_count(key, rule.window_seconds)
+            # Check and count the request in one atomic step
+            limit = Limit(key, rule.requests_per_window, rule.window_seconds)
+            decision = await self.backend.hit([limit])
+            remaining = decision.remaining[0]
 
             # Check if limit exceeded
-            if current_count >= rule.requests_per_window:
+            if not decision.allowed:
                 return RateLimitResult(
                     allowed=False,
                     rule_id=rule.rule_id,
                     action=rule.action,
                     remaining_requests=0,
                     reset_time=datetime.now(timezone.utc)
-                    + timedelta(seconds=rule.window_seconds),
+                    + timedelta(seconds=decision.retry_after),
                     violation=True,
                     metadata={
-                        "current_count": current_count,
+                        "current_count": rule.requests_per_window - remaining,
                         "limit": rule.requests_per_window,
                     },
                 )
 
-            # Increment count
-            await self._increment_request_count(key)
-
             return RateLimitResult(
                 allowed=True,
                 rule_id=rule.rule_id,
                 action=rule.action,
-                remaining_requests=rule.requests_per_window - current_count - 1,
+                remaining_requests=remaining,
                 reset_time=datetime.now(timezone.utc)
-                + timedelta(seconds=rule.window_seconds),
+                + timedelta(seconds=decision.reset_after[0]),
                 violation=False,
                 metadata={
-                    "current_count": current_count + 1,
+                    "current_count": rule.requests_per_window - remaining,
                     "limit": rule.requests_per_window,
                 },
             )
@@ -476,51 +481,17 @@ class ComplianceRateLimitingEngine:
             logger.error(f"Failed to get rate limit key: {e}")
             return f"rate_limit:error:{rule.rule_id}"
 
-    async def _get_request_count(self, key: str, window_seconds: int) -> int:
-        """Get current request count for key"""
+    async def _get_request_count(self, key: str, rule: RateLimitRule) -> int:
+        """Requests counted against ``rule`` on ``key``, without adding one"""
         try:
-            if self.redis_client:
-                # Use Redis for distributed rate limiting
-                count = await self.redis_client.get(key)
-                return int(count) if count else 0
-            else:
-                # Fallback to in-memory storage
-                current_time = time.time()
-                window_start = current_time - window_seconds
-
-                # Clean old entries
-                if key in self.request_history:
-                    while (
-                        self.request_history[key]
-                        and self.request_history[key][0] < window_start
-                    ):
-                        self.request_history[key].popleft()
-
-                return len(self.request_history[key])
+            limit = Limit(key, rule.requests_per_window, rule.window_seconds)
+            decision = await self.backend.hit([limit], cost=0)
+            return rule.requests_per_window - decision.remaining[0]
 
         except Exception as e:
             logger.error(f"Failed to get request count: {e}")
             return 0
 
-    async def _increment_request_count(self, key: str):
-        """Increment request count for key"""
-        try:
-            if self.redis_client:
-                # Use Redis with expiration
-                pipe = self.redis_client.pipeline()
-                pipe.incr(key)
-                pipe.expire(key, 3600)  # 1 hour expiration
-                await pipe.execute()
-            else:
-                # Fallback to in-memory storage
-                current_time = time.time()
-                if key not in self.request_history:
-                    self.request_history[key] = deque()
-                self.request_history[key].append(current_time)
-
-        except Exception as e:
-            logger.error(f"Failed to increment request count: {e}")
-
     async def _log_violation(
         self, request: RateLimitRequest, rule: RateLimitRule, result: RateLimitResult
     ):
@@ -668,9 +639,7 @@ class ComplianceRateLimitingEngine:
                         and rule.rate_limit_type == RateLimitType.USER_BASED
                     ):
                         key = f"rate_limit:user:{user_id}:{rule.rule_id}"
-                        current_count = await self._get_request_count(
-                            key, rule.window_seconds
-                        )
+                        current_count = await self._get_request_count(key, rule)
                         user_status[rule.rule_id] = {
                             "current_count": current_count,
                             "limit": rule.requests_per_window,
@@ -688,9 +657,7 @@ class ComplianceRateLimitingEngine:
                 for rule in self.rules.values():
                     if rule.enabled and rule.rate_limit_type == RateLimitType.IP_BASED:
                         key = f"rate_limit:ip:{ip_address}:{rule.rule_id}"
-                        current_count = await self._get_request_count(
-                            key, rule.window_seconds
-                        )
+                        current_count = await self._get_request_count(key, rule)
                         ip_status[rule.rule_id] = {
                             "current_count": current_count,
                             "limit": rule.requests_per_window,
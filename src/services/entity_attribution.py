@@ -17,7 +17,10 @@ from typing import Optional
 
 import aiohttp
 
+from src.analysis.protocol_registry import ProtocolMatch
+from src.analysis.protocol_registry import set_external_labels
 from src.api.database import get_postgres_pool
+from src.api.database import get_redis_client
 
 logger = logging.getLogger(__name__)
 
@@ -459,6 +462,12 @@ async def sync_all_labels(requested_by: str = "system") -> Dict[str, Any]:
                 )
             results[source_key] = {"status": "error", "error": str(exc)[:200]}
 
+    await _publish_labels_version()
+    try:
+        await refresh_protocol_labels(force=True)
+    except Exception as exc:
+        logger.error(f"Error loading protocol labels: {exc}")
+
     return results
 
 
@@ -669,3 +678,78 @@ async def get_entity_counts() -> Dict[str, int]:
             GROUP BY source
             """)
     return {r["source"]: r["cnt"] for r in rows}
+
+
+# Entity types that classify an address like a protocol registry entry
+_PROTOCOL_ENTITY_TYPES = ("bridge", "mixer")
+
+
+async def load_protocol_labels() -> int:
+    """Feed bridge and mixer entity labels into the protocol classification index.
+
+    Returns the number of labelled addresses loaded.
+    """
+    pool = get_postgres_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT DISTINCT ON (ea.address, ea.blockchain)
+                   ea.address, ea.blockchain, e.name, e.entity_type, e.risk_level
+            FROM entity_addresses ea
+            JOIN entities e ON e.id = ea.entity_id
+            WHERE e.entity_type = ANY($1) AND ea.removed_at IS NULL
+            ORDER BY ea.address, ea.blockchain, ea.confidence DESC
+            """,
+            list(_PROTOCOL_ENTITY_TYPES),
+        )
+
+    set_external_labels(
+        {
+            (row["blockchain"], row["address"]): ProtocolMatch(
+                row["entity_type"], row["risk_level"], row["name"]
+            )
+            for row in rows
+        }
+    )
+    return len(rows)
+
+
+# Bumped after every label sync so each worker reloads its protocol labels
+# instead of keeping the ones it loaded at startup
+_LABELS_VERSION_KEY = "jackdaw:entity_labels:version"
+_labels_version: Optional[int] = None
+_labels_loaded = False
+
+
+async def _publish_labels_version() -> None:
+    try:
+        await get_redis_client().incr(_LABELS_VERSION_KEY)
+    except Exception as exc:
+        logger.warning(f"Could not publish entity label version: {exc}")
+
+
+async def refresh_protocol_labels(force: bool = False) -> bool:
+    """Load the protocol labels if they are missing or a newer version exists.
+
+    Between changes this costs one Redis GET.  Returns True if the labels
+    were reloaded.
+    """
+    global _labels_version, _labels_loaded
+    try:
+        raw = await get_redis_client().get(_LABELS_VERSION_KEY)
+        version = int(raw) if raw is not None else 0
+    except Exception as exc:
+        logger.debug(f"Entity label version check failed: {exc}")
+        version = None
+        if _labels_loaded and not force:
+            return False
+
+    if _labels_loaded and not force and version == _labels_version:
+        return False
+    # The version is read first, so a change made during the load is
+    # picked up by the next refresh
+    count = await load_protocol_labels()
+    _labels_version = version
+    _labels_loaded = True
+    logger.info(f"Loaded {count} protocol labels (version {version})")
+    return True
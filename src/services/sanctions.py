@@ -7,12 +7,15 @@ crypto addresses in PostgreSQL, and provides screening functions.
 import asyncio
 import logging
 import re
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 from datetime import timezone
 from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Set
 from typing import Tuple
 
 import aiohttp
@@ -22,6 +25,7 @@ import defusedxml.ElementTree as ET
 from src.api.config import settings
 from src.api.database import get_postgres_connection
 from src.api.database import get_postgres_pool
+from src.api.database import get_redis_client
 
 logger = logging.getLogger(__name__)
 
@@ -292,6 +296,239 @@ def _looks_like_crypto_address(text: str) -> bool:
     return False
 
 
+# ---------------------------------------------------------------------------
+# In-memory screening index
+# ---------------------------------------------------------------------------
+
+
+_VERSION_KEY = "jackdaw:sanctions:version"
+_WRITERS_KEY = "jackdaw:sanctions:writers"
+# Lets a crashed sync stop disabling the indexes eventually
+_WRITERS_TTL_SECONDS = 4 * 3600
+# A periodic full reload bounds what a late-committing change can hide
+_FULL_RELOAD_SECONDS = 3600
+_MIN_REFRESH_GAP_SECONDS = 1.0
+# How long a successful version check is trusted before asking Redis again
+_VERSION_CHECK_SECONDS = 1.0
+
+# Raise the shared version, never lower it
+_PUBLISH_VERSION_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1])) or -1
+if tonumber(ARGV[1]) > current then
+    redis.call('SET', KEYS[1], ARGV[1])
+end
+return 1
+"""
+
+
+class SanctionsIndex:
+    """Process-local set of sanctioned address fingerprints.
+
+    Screening consults the index first: an address whose fingerprint is not
+    in the set is certainly not sanctioned, so the vast majority of lookups
+    never touch Postgres.  Fingerprint hits (real matches, or rare hash
+    collisions) fall through to the database for match details.
+
+    The index is versioned by ``change_seq``, which every insert or update
+    of ``sanctioned_addresses`` takes from a sequence.  ``refresh`` loads
+    only rows with a higher ``change_seq`` than the last version; a removal,
+    or an hour since the last full load, forces a full reload.
+
+    Each worker holds its own index, so the newest version and any sync in
+    progress are published in Redis.  ``is_current`` checks them before
+    the index answers a screen; a stale index (or no Redis) sends the
+    screen to Postgres as before and schedules a refresh.  A successful
+    check is trusted for ``_VERSION_CHECK_SECONDS``, so most screens are
+    pure memory lookups and a change published meanwhile is picked up at
+    most that much later.
+    """
+
+    def __init__(self):
+        self._fingerprints: Set[int] = set()
+        self.version: Optional[int] = None
+        self.ready = False
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._last_full_load = 0.0
+        self._last_refresh_request = 0.0
+        self._current_until = 0.0
+        self.metrics = {
+            "lookups": 0,
+            "index_misses": 0,
+            "stale_checks": 0,
+            "refreshes": 0,
+            "full_reloads": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    @staticmethod
+    def _fingerprint(address: str) -> int:
+        return hash(address)
+
+    def might_contain(self, address: str) -> bool:
+        """False only if *address* is certainly not sanctioned."""
+        self.metrics["lookups"] += 1
+        if not self.ready:
+            return True
+        if self._fingerprint(address) in self._fingerprints:
+            return True
+        self.metrics["index_misses"] += 1
+        return False
+
+    async def is_current(self) -> bool:
+        """True if the index holds every change published by any worker."""
+        if self.ready and time.monotonic() < self._current_until:
+            return True
+
+        current = False
+        if self.ready:
+            try:
+                version, writers = await get_redis_client().mget(
+                    _VERSION_KEY, _WRITERS_KEY
+                )
+                current = (
+                    version is not None
+                    and int(writers or 0) <= 0
+                    and int(version) <= self.version
+                )
+            except Exception as exc:
+                logger.debug(f"Sanctions index version check failed: {exc}")
+        if current:
+            self._current_until = time.monotonic() + _VERSION_CHECK_SECONDS
+        else:
+            self.metrics["stale_checks"] += 1
+            self._schedule_refresh()
+        return current
+
+    def _schedule_refresh(self):
+        now = time.monotonic()
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        if now - self._last_refresh_request < _MIN_REFRESH_GAP_SECONDS:
+            return
+        self._last_refresh_request = now
+        self._refresh_task = asyncio.ensure_future(refresh_sanctions_index())
+
+    async def refresh(self) -> bool:
+        """Bring the index up to date; returns True if it changed."""
+        async with self._refresh_lock:
+            changed = await self._refresh()
+        try:
+            await _publish_version(self.version)
+        except Exception as exc:
+            logger.debug(f"Sanctions index version publish failed: {exc}")
+        return changed
+
+    async def _refresh(self) -> bool:
+        pool = get_postgres_pool()
+        async with pool.acquire() as conn:
+            version = await conn.fetchval(
+                "SELECT COALESCE(MAX(change_seq), 0) FROM sanctioned_addresses"
+            )
+            full_reload = (
+                not self.ready
+                or self.version is None
+                or time.monotonic() - self._last_full_load > _FULL_RELOAD_SECONDS
+            )
+            if not full_reload and version == self.version:
+                return False
+
+            rows = []
+            if not full_reload:
+                rows = await conn.fetch(
+                    """
+                    SELECT address, removed_at
+                    FROM sanctioned_addresses
+                    WHERE change_seq > $1
+                    """,
+                    self.version,
+                )
+                full_reload = any(r["removed_at"] for r in rows)
+            if full_reload:
+                rows = await conn.fetch("""
+                    SELECT address, removed_at
+                    FROM sanctioned_addresses
+                    WHERE removed_at IS NULL
+                    """)
+
+        fingerprints = {
+            self._fingerprint(r["address"]) for r in rows if not r["removed_at"]
+        }
+        if full_reload:
+            # Swap in the new set so concurrent screens never see it empty
+            self._fingerprints = fingerprints
+            self._last_full_load = time.monotonic()
+            self.metrics["full_reloads"] += 1
+        else:
+            self._fingerprints |= fingerprints
+        self.version = version
+        self.ready = True
+        self.metrics["refreshes"] += 1
+        logger.info(
+            f"Sanctions index refreshed: {len(self._fingerprints)} addresses "
+            f"({len(rows)} rows loaded)"
+        )
+        return True
+
+
+async def _publish_version(version: Optional[int]) -> None:
+    if version is not None:
+        await get_redis_client().eval(_PUBLISH_VERSION_SCRIPT, 1, _VERSION_KEY, version)
+
+
+@asynccontextmanager
+async def _sanctions_write_guard():
+    """Mark a sync in progress so that no worker's index answers meanwhile.
+
+    On exit the newest ``change_seq`` is published before the mark is
+    cleared, so every index that has not loaded it is seen as stale.
+    """
+    marked = False
+    try:
+        pipe = get_redis_client().pipeline(transaction=True)
+        pipe.incr(_WRITERS_KEY)
+        pipe.expire(_WRITERS_KEY, _WRITERS_TTL_SECONDS)
+        await pipe.execute()
+        marked = True
+    except Exception as exc:
+        logger.warning(f"Could not mark sanctions sync in Redis: {exc}")
+    try:
+        yield
+    finally:
+        try:
+            async with get_postgres_pool().acquire() as conn:
+                version = await conn.fetchval(
+                    "SELECT COALESCE(MAX(change_seq), 0) FROM sanctioned_addresses"
+                )
+            await _publish_version(version)
+        except Exception as exc:
+            logger.warning(f"Could not publish sanctions version: {exc}")
+        if marked:
+            try:
+                await get_redis_client().decr(_WRITERS_KEY)
+            except Exception as exc:
+                logger.warning(f"Could not clear sanctions sync mark: {exc}")
+
+
+_sanctions_index = SanctionsIndex()
+
+
+def get_sanctions_index() -> SanctionsIndex:
+    """Return the process-wide sanctions screening index."""
+    return _sanctions_index
+
+
+async def refresh_sanctions_index() -> bool:
+    """Best-effort index refresh; screening keeps working on failure."""
+    try:
+        return await _sanctions_index.refresh()
+    except Exception as exc:
+        logger.warning(f"Sanctions index refresh failed: {exc}")
+        return False
+
+
 # ---------------------------------------------------------------------------
 # Screening functions
 # ---------------------------------------------------------------------------
@@ -303,8 +540,21 @@ async def screen_address(
     """Screen a single address against the sanctioned_addresses table.
 
     Returns a dict with 'matched', 'matches' (list of match details),
-    and 'screened_at'.
+    and 'screened_at'.  Addresses the in-memory index rules out are answered
+    without a database query.
     """
+    if await _sanctions_index.is_current() and not _sanctions_index.might_contain(
+        address.strip()
+    ):
+        return {
+            "address": address,
+            "blockchain": blockchain,
+            "matched": False,
+            "match_count": 0,
+            "matches": [],
+            "screened_at": datetime.now(timezone.utc).isoformat(),
+        }
+
     pool = get_postgres_pool()
     async with pool.acquire() as conn:
         if blockchain:
@@ -348,33 +598,44 @@ async def screen_addresses_bulk(
     """Screen multiple addresses with a single DB query.
 
     Returns a list of screen results in the same order as the input addresses.
+    Only addresses the in-memory index cannot rule out are queried.
     """
     cleaned = [a.strip() for a in addresses]
-    pool = get_postgres_pool()
+    use_index = await _sanctions_index.is_current()
+    candidates = list(
+        {
+            addr
+            for addr in cleaned
+            if not use_index or _sanctions_index.might_contain(addr)
+        }
+    )
     now = datetime.now(timezone.utc).isoformat()
 
-    async with pool.acquire() as conn:
-        if blockchain:
-            rows = await conn.fetch(
-                """
-                SELECT address, blockchain, source, list_name,
-                       entity_name, entity_id, program, added_at
-                FROM sanctioned_addresses
-                WHERE address = ANY($1) AND blockchain = $2 AND removed_at IS NULL
-                """,
-                cleaned,
-                blockchain.lower(),
-            )
-        else:
-            rows = await conn.fetch(
-                """
-                SELECT address, blockchain, source, list_name,
-                       entity_name, entity_id, program, added_at
-                FROM sanctioned_addresses
-                WHERE address = ANY($1) AND removed_at IS NULL
-                """,
-                cleaned,
-            )
+    rows = []
+    if candidates:
+        pool = get_postgres_pool()
+        async with pool.acquire() as conn:
+            if blockchain:
+                rows = await conn.fetch(
+                    """
+                    SELECT address, blockchain, source, list_name,
+                           entity_name, entity_id, program, added_at
+                    FROM sanctioned_addresses
+                    WHERE address = ANY($1) AND blockchain = $2 AND removed_at IS NULL
+                    """,
+                    candidates,
+                    blockchain.lower(),
+                )
+            else:
+                rows = await conn.fetch(
+                    """
+                    SELECT address, blockchain, source, list_name,
+                           entity_name, entity_id, program, added_at
+                    FROM sanctioned_addresses
+                    WHERE address = ANY($1) AND removed_at IS NULL
+                    """,
+                    candidates,
+                )
 
     # Group matches by address
     matches_by_addr: Dict[str, List[Dict[str, Any]]] = {}
@@ -442,40 +703,42 @@ async def sync_all(requested_by: str = "system") -> Dict[str, Any]:
         ("ofac_sdn", _sync_ofac),
         ("eu_consolidated", _sync_eu),
     ]
-    for source, fn in sync_fns:
-        try:
-            async with pool.acquire() as conn:
-                await conn.execute(
-                    "UPDATE sanctions_sync_status SET status='running' WHERE source=$1",
-                    source,
-                )
-            count = await fn()
-            async with pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    UPDATE sanctions_sync_status
-                    SET status='success', last_sync_at=NOW(),
-                        records_synced=$2, error_message=NULL
-                    WHERE source=$1
-                    """,
-                    source,
-                    count,
-                )
-            results[source] = {"status": "success", "records": count}
-        except Exception as exc:
-            logger.error(f"Sanctions sync failed for {source}: {exc}")
-            async with pool.acquire() as conn:
-                await conn.execute(
-                    """
-                    UPDATE sanctions_sync_status
-                    SET status='error', error_message=$2
-                    WHERE source=$1
-                    """,
-                    source,
-                    str(exc)[:500],
-                )
-            results[source] = {"status": "error", "error": str(exc)[:200]}
+    async with _sanctions_write_guard():
+        for source, fn in sync_fns:
+            try:
+                async with pool.acquire() as conn:
+                    await conn.execute(
+                        "UPDATE sanctions_sync_status SET status='running' WHERE source=$1",
+                        source,
+                    )
+                count = await fn()
+                async with pool.acquire() as conn:
+                    await conn.execute(
+                        """
+                        UPDATE sanctions_sync_status
+                        SET status='success', last_sync_at=NOW(),
+                            records_synced=$2, error_message=NULL
+                        WHERE source=$1
+                        """,
+                        source,
+                        count,
+                    )
+                results[source] = {"status": "success", "records": count}
+            except Exception as exc:
+                logger.error(f"Sanctions sync failed for {source}: {exc}")
+                async with pool.acquire() as conn:
+                    await conn.execute(
+                        """
+                        UPDATE sanctions_sync_status
+                        SET status='error', error_message=$2
+                        WHERE source=$1
+                        """,
+                        source,
+                        str(exc)[:500],
+                    )
+                results[source] = {"status": "error", "error": str(exc)[:200]}
 
+    await refresh_sanctions_index()
     return results
 
 
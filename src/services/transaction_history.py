@@ -0,0 +1,297 @@
+"""
+Jackdaw Sentry - Shared Transaction History
+
+Loads an address's transaction history from Neo4j once and shares the
+snapshot, for a short TTL, between every detector that analyses the address.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from functools import cached_property
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
+
+from src.api.database import get_neo4j_session
+from src.utils.temporal_cycles import to_epoch
+from src.utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Both directions, newest first so truncation keeps the most recent activity;
+# DISTINCT collapses self-transfers
+HISTORY_QUERY = """
+MATCH (a:Address {address: $address, blockchain: $blockchain})-[:SENT|RECEIVED]-(t:Transaction)
+WHERE t.timestamp > datetime() - duration({hours: $time_range})
+RETURN DISTINCT t {
+    .hash,
+    .blockchain,
+    .from_address,
+    .to_address,
+    .value,
+    .timestamp,
+    .block_number,
+    .gas_used,
+    .gas_price,
+    .fee,
+    .token_symbol
+} AS tx_data
+ORDER BY tx_data.timestamp DESC
+LIMIT $limit
+"""
+
+
+# Same as HISTORY_QUERY for many addresses at once, one row per address found
+BATCH_HISTORY_QUERY = """
+UNWIND $addresses AS address
+MATCH (a:Address {address: address, blockchain: $blockchain})
+CALL {
+    WITH a
+    MATCH (a)-[:SENT|RECEIVED]-(t:Transaction)
+    WHERE t.timestamp > datetime() - duration({hours: $time_range})
+    WITH DISTINCT t
+    ORDER BY t.timestamp DESC
+    LIMIT $limit
+    RETURN collect(t {
+        .hash,
+        .blockchain,
+        .from_address,
+        .to_address,
+        .value,
+        .timestamp,
+        .block_number,
+        .gas_used,
+        .gas_price,
+        .fee,
+        .token_symbol
+    }) AS transactions
+}
+RETURN a.address AS address, transactions
+"""
+
+
+@dataclass
+class HistoryColumns:
+    """Columnar view of a history, one entry per transaction"""
+
+    timestamps: np.ndarray  # seconds since the epoch, float64
+    amounts: np.ndarray  # float64
+    outgoing: np.ndarray  # bool, sent by the address
+    counterparties: List[Optional[str]]
+
+
+class TransactionHistory:
+    """Read-only snapshot of the transactions of one address.
+
+    ``transactions`` are the Neo4j transaction maps, oldest first, with
+    native ``datetime`` timestamps.  Callers share the same dicts and must
+    not modify them; the list accessors return fresh lists.
+    """
+
+    def __init__(
+        self,
+        address: str,
+        blockchain: str,
+        time_range_hours: int,
+        transactions: List[Dict[str, Any]],
+        fetched_at: Optional[datetime] = None,
+    ):
+        self.address = address
+        self.blockchain = blockchain
+        self.time_range_hours = time_range_hours
+        self.transactions = tuple(transactions)
+        self.fetched_at = fetched_at or datetime.now(timezone.utc)
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    def all(self) -> List[Dict[str, Any]]:
+        return list(self.transactions)
+
+    def sent(self) -> List[Dict[str, Any]]:
+        return [
+            tx for tx in self.transactions if tx.get("from_address") == self.address
+        ]
+
+    @cached_property
+    def columns(self) -> HistoryColumns:
+        return HistoryColumns(
+            timestamps=np.array(
+                [to_epoch(tx.get("timestamp")) or 0.0 for tx in self.transactions],
+                dtype=np.float64,
+            ),
+            amounts=np.array(
+                [float(tx.get("value") or 0.0) for tx in self.transactions],
+                dtype=np.float64,
+            ),
+            outgoing=np.array(
+                [tx.get("from_address") == self.address for tx in self.transactions],
+                dtype=bool,
+            ),
+            counterparties=[
+                (
+                    tx.get("to_address")
+                    if tx.get("from_address") == self.address
+                    else tx.get("from_address")
+                )
+                for tx in self.transactions
+            ],
+        )
+
+    def window(self, time_range_hours: int) -> "TransactionHistory":
+        """The part of this snapshot within ``time_range_hours`` of its fetch"""
+        if time_range_hours >= self.time_range_hours:
+            return self
+        cutoff = (self.fetched_at - timedelta(hours=time_range_hours)).timestamp()
+        keep = np.flatnonzero(self.columns.timestamps > cutoff)
+        return TransactionHistory(
+            self.address,
+            self.blockchain,
+            time_range_hours,
+            [self.transactions[i] for i in keep],
+            self.fetched_at,
+        )
+
+
+class TransactionHistoryLoader:
+    """Fetches each address's history once and caches it with a TTL.
+
+    A cached snapshot serves any request for the same or a shorter time
+    range.  Concurrent requests for an address that is already being loaded
+    wait for that load instead of starting their own query.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300,
+        max_entries: int = 1000,
+        max_transactions: int = 10000,
+    ):
+        self.cache = TTLCache(ttl_seconds, max_entries)
+        self.max_transactions = max_transactions
+        self._inflight: Dict[Tuple[str, str], Tuple[int, asyncio.Future]] = {}
+
+        self.metrics = {
+            "cache_hits": 0,
+            "shared_loads": 0,
+            "loads": 0,
+        }
+
+    async def get_history(
+        self, address: str, blockchain: str, time_range_hours: int = 24
+    ) -> TransactionHistory:
+        key = (blockchain, address)
+
+        cached = self.cache.get(key)
+        if cached is not None and cached.time_range_hours >= time_range_hours:
+            self.metrics["cache_hits"] += 1
+            return cached.window(time_range_hours)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] >= time_range_hours:
+            self.metrics["shared_loads"] += 1
+            history = await asyncio.shield(inflight[1])
+            return history.window(time_range_hours)
+
+        self.metrics["loads"] += 1
+        load = asyncio.ensure_future(self._load(address, blockchain, time_range_hours))
+        self._inflight[key] = (time_range_hours, load)
+        try:
+            history = await asyncio.shield(load)
+        finally:
+            if self._inflight.get(key, (None, None))[1] is load:
+                del self._inflight[key]
+
+        cached = self.cache.get(key)
+        if cached is None or cached.time_range_hours <= time_range_hours:
+            self.cache.set(key, history)
+        return history
+
+    async def get_histories(
+        self, addresses: List[str], blockchain: str, time_range_hours: int = 24
+    ) -> Dict[str, TransactionHistory]:
+        """Histories of many addresses, loading every uncached one in one query"""
+        histories = {}
+        missing = []
+        for address in dict.fromkeys(addresses):
+            cached = self.cache.get((blockchain, address))
+            if cached is not None and cached.time_range_hours >= time_range_hours:
+                self.metrics["cache_hits"] += 1
+                histories[address] = cached.window(time_range_hours)
+            else:
+                missing.append(address)
+
+        if missing:
+            self.metrics["loads"] += len(missing)
+            rows = {address: [] for address in missing}
+            async with get_neo4j_session() as session:
+                result = await session.run(
+                    BATCH_HISTORY_QUERY,
+                    addresses=missing,
+                    blockchain=blockchain,
+                    time_range=time_range_hours,
+                    limit=self.max_transactions,
+                )
+                async for record in result:
+                    rows[record["address"]] = record["transactions"]
+
+            for address in missing:
+                history = self._history(
+                    address, blockchain, time_range_hours, rows[address]
+                )
+                self.cache.set((blockchain, address), history)
+                histories[address] = history
+
+        return histories
+
+    async def _load(
+        self, address: str, blockchain: str, time_range_hours: int
+    ) -> TransactionHistory:
+        async with get_neo4j_session() as session:
+            result = await session.run(
+                HISTORY_QUERY,
+                address=address,
+                blockchain=blockchain,
+                time_range=time_range_hours,
+                limit=self.max_transactions,
+            )
+            rows = [record["tx_data"] async for record in result]
+        return self._history(address, blockchain, time_range_hours, rows)
+
+    def _history(
+        self,
+        address: str,
+        blockchain: str,
+        time_range_hours: int,
+        rows: List[Dict[str, Any]],
+    ) -> TransactionHistory:
+        """Snapshot from query rows, which come newest first"""
+        transactions = []
+        for row in reversed(rows):
+            tx = dict(row)
+            if hasattr(tx.get("timestamp"), "to_native"):
+                tx["timestamp"] = tx["timestamp"].to_native()
+            transactions.append(tx)
+
+        if len(transactions) >= self.max_transactions:
+            logger.debug(
+                f"History of {blockchain}:{address} truncated to "
+                f"{self.max_transactions} transactions"
+            )
+        return TransactionHistory(address, blockchain, time_range_hours, transactions)
+
+
+_history_loader = TransactionHistoryLoader()
+
+
+def get_transaction_history_loader() -> TransactionHistoryLoader:
+    """Return the process-wide transaction history loader."""
+    return _history_loader
@@ -11,6 +11,7 @@ from .encryption import generate_secure_key
 from .encryption import hash_data
 from .encryption import mask_sensitive_data
 from .encryption import verify_data_integrity
+from .ttl_cache import TTLCache
 
 __all__ = [
     "EncryptionManager",
@@ -20,4 +21,5 @@ __all__ = [
     "generate_secure_key",
     "mask_sensitive_data",
     "verify_data_integrity",
+    "TTLCache",
 ]
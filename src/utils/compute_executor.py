@@ -0,0 +1,224 @@
+"""
+Jackdaw Sentry - Compute Executor
+
+Runs CPU-bound work such as networkx graph algorithms in a pool of worker
+processes, so that a large community detection or layout does not block
+the event loop, with per-job timeouts, cancellation and queue metrics.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ComputeTimeout(TimeoutError):
+    """A compute job ran past its timeout and was terminated"""
+
+
+class ComputeExecutor:
+    """Process pool for CPU-bound jobs, shared by the whole API process.
+
+    At most ``max_workers`` jobs run at once; further callers wait in a
+    queue.  ``run`` awaits the job with a timeout.  A job that times out or
+    whose caller is cancelled cannot be interrupted inside its worker, so
+    the pool is recycled: its processes are terminated and a fresh pool is
+    started.  Jobs that were running alongside it on the old pool are
+    resubmitted once.
+
+    Jobs and their arguments must be picklable; functions must be defined
+    at module level in a module the workers can import without side
+    effects.  Jobs smaller than ``min_offload_size`` are not worth the
+    inter-process round trip and run inline.  If no process pool can be
+    started, jobs run in threads instead, which keeps the loop responsive
+    but cannot stop a timed-out job.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        default_timeout: Optional[float] = 60.0,
+        min_offload_size: int = 2000,
+        mp_context: str = "spawn",
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.default_timeout = default_timeout
+        self.min_offload_size = min_offload_size
+        self.mp_context = mp_context
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._generation = 0
+        self._use_threads = False
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.metrics = {
+            "queued": 0,
+            "running": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+            "inline": 0,
+            "pool_restarts": 0,
+            "max_queue_depth": 0,
+            "busy_seconds": 0.0,
+        }
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        size: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Run ``fn(*args)`` off the event loop and return its result.
+
+        ``size`` is a rough measure of the work, such as nodes plus edges;
+        ``timeout`` defaults to ``default_timeout`` and covers queueing and
+        execution.  Raises ``ComputeTimeout`` when it expires.
+        """
+        if size is not None and size < self.min_offload_size:
+            self.metrics["inline"] += 1
+            return fn(*args)
+
+        timeout = self.default_timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(self._run(fn, args), timeout)
+        except asyncio.TimeoutError:
+            self.metrics["timeouts"] += 1
+            raise ComputeTimeout(
+                f"{getattr(fn, '__name__', fn)} did not finish within {timeout}s"
+            ) from None
+
+    async def _run(self, fn: Callable[..., Any], args: tuple) -> Any:
+        slots = self._get_slots()
+        if slots.locked():
+            self.metrics["queued"] += 1
+            self.metrics["max_queue_depth"] = max(
+                self.metrics["max_queue_depth"], self.metrics["queued"]
+            )
+            try:
+                await slots.acquire()
+            finally:
+                self.metrics["queued"] -= 1
+        else:
+            await slots.acquire()
+
+        self.metrics["running"] += 1
+        started = time.monotonic()
+        try:
+            result = await self._execute(fn, args)
+        except asyncio.CancelledError:
+            self.metrics["cancelled"] += 1
+            raise
+        except Exception:
+            self.metrics["failed"] += 1
+            raise
+        finally:
+            self.metrics["running"] -= 1
+            self.metrics["busy_seconds"] += time.monotonic() - started
+            slots.release()
+
+        self.metrics["completed"] += 1
+        return result
+
+    async def _execute(self, fn: Callable[..., Any], args: tuple) -> Any:
+        for attempt in range(2):
+            pool = self._get_pool()
+            if pool is None:
+                return await asyncio.to_thread(fn, *args)
+
+            generation = self._generation
+            future = None
+            try:
+                future = pool.submit(fn, *args)
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                if future is not None and not future.cancel():
+                    # Already running in a worker, which only a restart stops
+                    self._restart_pool(generation)
+                raise
+            except BrokenProcessPool:
+                if generation != self._generation and attempt == 0:
+                    continue  # another job's cancellation restarted the pool
+                self._restart_pool(generation)
+                raise
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_workers)
+            self._slots_loop = loop
+        return self._slots
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self._pool is None and not self._use_threads:
+            try:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.mp_context),
+                )
+            except (OSError, NotImplementedError, ValueError) as e:
+                logger.warning(f"Process pool unavailable, computing in threads: {e}")
+                self._use_threads = True
+        return self._pool
+
+    def _restart_pool(self, generation: int):
+        """Terminate the pool of ``generation`` unless it was already replaced"""
+        if generation != self._generation or self._pool is None:
+            return
+        pool, self._pool = self._pool, None
+        self._generation += 1
+        self.metrics["pool_restarts"] += 1
+        self._terminate(pool)
+        logger.warning("Compute pool restarted to stop an abandoned job")
+
+    @staticmethod
+    def _terminate(pool: ProcessPoolExecutor):
+        # ProcessPoolExecutor has no public way to kill busy workers
+        processes = list((getattr(pool, "_processes", None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            **self.metrics,
+            "max_workers": self.max_workers,
+            "backend": "threads" if self._use_threads else "processes",
+        }
+
+    def shutdown(self):
+        """Stop the worker processes; the pool restarts on the next job"""
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            self._generation += 1
+            self._terminate(pool)
+
+
+_compute_executor: Optional[ComputeExecutor] = None
+
+
+def get_compute_executor() -> ComputeExecutor:
+    """Return the process-wide compute executor."""
+    global _compute_executor
+    if _compute_executor is None:
+        from src.api.config import settings
+
+        _compute_executor = ComputeExecutor(
+            max_workers=settings.COMPUTE_MAX_WORKERS or None,
+            default_timeout=settings.COMPUTE_JOB_TIMEOUT_SECONDS,
+            min_offload_size=settings.COMPUTE_MIN_OFFLOAD_SIZE,
+        )
+    return _compute_executor
@@ -0,0 +1,188 @@
+"""
+Jackdaw Sentry - Graph Kernels
+
+Compact, picklable graph snapshots and the CPU-bound networkx algorithms
+that run on them in compute executor worker processes.  Kernels take and
+return plain data only, so this module must stay free of application
+imports (settings, databases) that a worker process cannot initialise.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import networkx as nx
+
+from src.utils.temporal_cycles import TemporalEdge
+from src.utils.temporal_cycles import iter_component_cycles
+
+
+@dataclass
+class CompactGraph:
+    """Node list plus edges as node-index pairs, with one optional weight.
+
+    Node and edge attributes other than ``weight_attr`` are dropped, which
+    keeps the pickled payload close to the size of the edge list.
+    """
+
+    nodes: List[Hashable]
+    edges: List[Tuple[int, int]]
+    directed: bool = False
+    weights: Optional[List[float]] = None
+    weight_attr: str = "weight"
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph, weight: Optional[str] = "weight"):
+        nodes = list(graph.nodes())
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = []
+        weights = []
+        for source, target, data in graph.edges(data=True):
+            edges.append((index[source], index[target]))
+            if weight is not None and weights is not None:
+                value = data.get(weight)
+                if value is None:
+                    weights = None  # only keep weights every edge has
+                else:
+                    weights.append(float(value))
+        return cls(
+            nodes=nodes,
+            edges=edges,
+            directed=graph.is_directed(),
+            weights=weights or None,
+            weight_attr=weight or "weight",
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self.nodes) + len(self.edges)
+
+    def to_networkx(self) -> nx.Graph:
+        graph = nx.DiGraph() if self.directed else nx.Graph()
+        graph.add_nodes_from(self.nodes)
+        nodes = self.nodes
+        if self.weights is None:
+            graph.add_edges_from((nodes[s], nodes[t]) for s, t in self.edges)
+        else:
+            graph.add_weighted_edges_from(
+                (
+                    (nodes[s], nodes[t], w)
+                    for (s, t), w in zip(self.edges, self.weights)
+                ),
+                weight=self.weight_attr,
+            )
+        return graph
+
+
+def detect_communities(compact: CompactGraph, algorithm: str) -> Dict[str, Any]:
+    """Community id to member list, and the partition's modularity"""
+    graph = compact.to_networkx()
+
+    if algorithm == "louvain":
+        import community as community_louvain
+
+        communities = community_louvain.best_partition(graph)
+        modularity = community_louvain.modularity(communities, graph)
+    elif algorithm == "label_propagation":
+        communities_list = list(nx.community.label_propagation_communities(graph))
+        communities = {
+            node: i for i, comm in enumerate(communities_list) for node in comm
+        }
+        modularity = nx.community.modularity(graph, communities_list)
+    else:
+        # Default to simple connected components
+        communities = {}
+        for i, component in enumerate(nx.connected_components(graph)):
+            for node in component:
+                communities[node] = i
+        modularity = 0.0
+
+    community_groups = defaultdict(list)
+    for node, community_id in communities.items():
+        community_groups[community_id].append(node)
+
+    return {"communities": dict(community_groups), "modularity": modularity}
+
+
+def central_nodes(compact: CompactGraph, top_k: int) -> Dict[str, List[Hashable]]:
+    """Top ``top_k`` nodes by degree, betweenness, closeness and pagerank"""
+    graph = compact.to_networkx()
+
+    centrality_measures = {
+        "degree": nx.degree_centrality(graph),
+        "betweenness": nx.betweenness_centrality(graph),
+        "closeness": nx.closeness_centrality(graph),
+        "pagerank": nx.pagerank(graph),
+    }
+
+    result = {}
+    for measure_name, centrality_values in centrality_measures.items():
+        sorted_nodes = sorted(
+            centrality_values.items(), key=lambda x: x[1], reverse=True
+        )
+        result[measure_name] = [node for node, score in sorted_nodes[:top_k]]
+    return result
+
+
+LAYOUT_FUNCTIONS = {
+    "spring": nx.spring_layout,
+    "circular": nx.circular_layout,
+    "random": nx.random_layout,
+    "shell": nx.shell_layout,
+    "kamada_kawai": nx.kamada_kawai_layout,
+}
+
+
+def graph_layout(
+    compact: CompactGraph, algorithm: str
+) -> Dict[Hashable, Dict[str, float]]:
+    """Node positions from one of ``LAYOUT_FUNCTIONS``"""
+    pos = LAYOUT_FUNCTIONS[algorithm](compact.to_networkx())
+    return {node: {"x": float(pos[node][0]), "y": float(pos[node][1])} for node in pos}
+
+
+def shortest_path(
+    compact: CompactGraph, source: Hashable, target: Hashable
+) -> Optional[List[Hashable]]:
+    """Weighted shortest path, or None if ``target`` is unreachable"""
+    graph = compact.to_networkx()
+    weight = compact.weight_attr if compact.weights is not None else None
+    try:
+        return nx.shortest_path(graph, source=source, target=target, weight=weight)
+    except (nx.NetworkXNoPath, nx.NodeNotFound):
+        return None
+
+
+def simple_paths(
+    compact: CompactGraph,
+    source: Hashable,
+    target: Hashable,
+    cutoff: int,
+    limit: int,
+) -> List[List[Hashable]]:
+    """The first ``limit`` simple paths of at most ``cutoff`` edges"""
+    graph = compact.to_networkx()
+    if source not in graph or target not in graph:
+        return []
+    paths = nx.all_simple_paths(graph, source=source, target=target, cutoff=cutoff)
+    return list(islice(paths, limit))
+
+
+def component_cycles(
+    component: List[TemporalEdge],
+    max_length: int,
+    max_span: float,
+    min_length: int,
+    limit: int,
+) -> List[List[TemporalEdge]]:
+    """The first ``limit`` temporal cycles of one strongly connected component"""
+    cycles = iter_component_cycles(
+        component, max_length=max_length, max_span=max_span, min_length=min_length
+    )
+    return list(islice(cycles, limit))
@@ -0,0 +1,172 @@
+"""
+Jackdaw Sentry - Temporal Cycle Enumeration
+
+Bounded enumeration of round-trip transfer cycles whose timestamps increase
+around the cycle, one strongly connected component at a time.
+"""
+
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime
+from datetime import timedelta
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Union
+
+import networkx as nx
+
+
+class TemporalEdge(NamedTuple):
+    """A transfer between two nodes; ``payload`` is returned untouched"""
+
+    source: Hashable
+    target: Hashable
+    timestamp: float
+    payload: Any = None
+
+
+def to_epoch(value: Any) -> Optional[float]:
+    """Seconds since the epoch for a datetime, Neo4j DateTime, ISO string or number"""
+    if value is None:
+        return None
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def temporal_components(edges: Iterable[TemporalEdge]) -> List[List[TemporalEdge]]:
+    """Group edges by strongly connected component.
+
+    Only edges inside a component can be part of a cycle, so edges between
+    components are dropped, and so are components without any edge.  Each
+    component can be searched independently, e.g. in parallel.
+    """
+    edges = list(edges)
+    graph = nx.DiGraph()
+    graph.add_edges_from((edge.source, edge.target) for edge in edges)
+
+    component_of: Dict[Hashable, int] = {}
+    for index, nodes in enumerate(nx.strongly_connected_components(graph)):
+        for node in nodes:
+            component_of[node] = index
+
+    grouped: Dict[int, List[TemporalEdge]] = defaultdict(list)
+    for edge in edges:
+        component = component_of[edge.source]
+        if component == component_of[edge.target]:
+            grouped[component].append(edge)
+    return list(grouped.values())
+
+
+def iter_component_cycles(
+    edges: List[TemporalEdge],
+    max_length: int,
+    max_span: Optional[Union[timedelta, float]] = None,
+    min_length: int = 2,
+) -> Iterator[List[TemporalEdge]]:
+    """Lazily yield the temporal cycles of one strongly connected component.
+
+    A cycle is a closed walk through distinct nodes of at most ``max_length``
+    edges whose timestamps never decrease, and whose first and last edges are
+    at most ``max_span`` apart.  Each cycle is reported once, starting at its
+    earliest edge; when several edges share the earliest time, at the first
+    of them in ``edges``.  Both bounds are enforced while searching, so
+    stopping the iteration early stops the work.
+    """
+    if isinstance(max_span, timedelta):
+        max_span = max_span.total_seconds()
+
+    # Outgoing edges per node, sorted by time so valid continuations are a
+    # contiguous slice found by bisection
+    order = {id(edge): i for i, edge in enumerate(edges)}
+    adjacency: Dict[Hashable, List[TemporalEdge]] = defaultdict(list)
+    for edge in edges:
+        adjacency[edge.source].append(edge)
+    for outgoing in adjacency.values():
+        outgoing.sort(key=lambda edge: edge.timestamp)
+    times = {node: [edge.timestamp for edge in out] for node, out in adjacency.items()}
+
+    def is_canonical(cycle: List[TemporalEdge]) -> bool:
+        # Another rotation is time-ordered too only if every edge from its
+        # start to the end of ``cycle`` shares the first edge's timestamp
+        first = cycle[0]
+        for later in reversed(cycle[1:]):
+            if later.timestamp != first.timestamp:
+                return True
+            if order[id(later)] < order[id(first)]:
+                return False
+        return True
+
+    for first in sorted(edges, key=lambda edge: edge.timestamp):
+        start = first.source
+        if first.target == start:
+            if min_length <= 1:
+                yield [first]
+            continue
+        if max_length < 2:
+            continue
+
+        path: List[TemporalEdge] = [first]
+        on_path = {start, first.target}
+        deadline = first.timestamp + max_span if max_span else None
+        # Iterative DFS: a stack of (outgoing edges, next index) per depth
+        stack = [
+            (
+                adjacency.get(first.target, []),
+                bisect_left(times.get(first.target, []), first.timestamp),
+            )
+        ]
+
+        while stack:
+            candidates, index = stack[-1]
+            if index >= len(candidates):
+                stack.pop()
+                on_path.discard(path.pop().target)
+                continue
+            edge = candidates[index]
+            stack[-1] = (candidates, index + 1)
+
+            if deadline is not None and edge.timestamp > deadline:
+                # Candidates are time-sorted: the rest are later still
+                stack[-1] = (candidates, len(candidates))
+                continue
+
+            if edge.target == start:
+                cycle = path + [edge]
+                if len(cycle) >= min_length and is_canonical(cycle):
+                    yield cycle
+                continue
+            if edge.target in on_path or len(path) + 1 >= max_length:
+                continue
+
+            path.append(edge)
+            on_path.add(edge.target)
+            first_index = bisect_left(times.get(edge.target, []), edge.timestamp)
+            stack.append((adjacency.get(edge.target, []), first_index))
+
+
+def iter_temporal_cycles(
+    edges: Iterable[TemporalEdge],
+    max_length: int,
+    max_span: Optional[Union[timedelta, float]] = None,
+    min_length: int = 2,
+) -> Iterator[List[TemporalEdge]]:
+    """``iter_component_cycles`` over every strongly connected component"""
+    for component in temporal_components(edges):
+        yield from iter_component_cycles(component, max_length, max_span, min_length)
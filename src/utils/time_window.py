@@ -0,0 +1,147 @@
+"""
+Jackdaw Sentry - Time-Window Sweep
+
+Groups transfers that happen within a short time window of each other and
+move similar amounts, in one pass over time-ordered input.
+"""
+
+import math
+from collections import deque
+from datetime import timedelta
+from typing import Any
+from typing import Callable
+from typing import Deque
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Union
+
+
+class _Group:
+    __slots__ = ("anchor_time", "anchor_amount", "bucket", "items")
+
+    def __init__(self, anchor_time: float, anchor_amount: float, bucket: Hashable):
+        self.anchor_time = anchor_time
+        self.anchor_amount = anchor_amount
+        self.bucket = bucket
+        self.items: List[Any] = []
+
+
+class TimeWindowSweep:
+    """Incremental grouping of synchronised transfers.
+
+    A group is anchored at its earliest transfer and collects every later
+    transfer at most ``window`` seconds after the anchor whose amount is
+    within ``amount_tolerance`` (relative to the larger amount) of the anchor
+    amount.  A transfer joins the earliest open group it matches, or starts a
+    new one.  With ``amount_tolerance=None`` amounts are ignored.
+
+    Amounts are bucketed on a log scale with buckets as wide as the
+    tolerance, so a transfer only has to be compared with the open groups of
+    its own bucket, which always matches, and the two neighbouring ones.  At
+    most one group per bucket is open at a time, so each ``push`` is O(1)
+    amortised.  Input must arrive in timestamp order; ``push`` returns the
+    groups its timestamp has closed and ``flush`` the ones still open.
+    Groups smaller than ``min_group_size`` are dropped.
+    """
+
+    def __init__(
+        self,
+        window: Union[timedelta, float],
+        amount_tolerance: Optional[float] = 0.1,
+        min_group_size: int = 2,
+    ):
+        if isinstance(window, timedelta):
+            window = window.total_seconds()
+        self.window = float(window)
+        self.amount_tolerance = amount_tolerance
+        self.min_group_size = min_group_size
+
+        if amount_tolerance is None or amount_tolerance >= 1:
+            self._bucket_width = None  # every positive amount matches
+        elif amount_tolerance > 0:
+            self._bucket_width = -math.log1p(-amount_tolerance)
+        else:
+            self._bucket_width = 0.0  # exact amounts only
+
+        self._open: Dict[Hashable, _Group] = {}
+        self._by_time: Deque[_Group] = deque()
+        self._last_time = -math.inf
+
+    def push(self, item: Any, timestamp: float, amount: float = 0.0) -> List[List[Any]]:
+        """Add one transfer; returns the groups closed by its timestamp"""
+        if timestamp < self._last_time:
+            raise ValueError("TimeWindowSweep input must be ordered by timestamp")
+        self._last_time = timestamp
+
+        closed = self._close_before(timestamp - self.window)
+        if self.amount_tolerance is not None and amount <= 0:
+            # Zero or negative amounts can never be similar to anything
+            return closed
+
+        bucket = self._bucket(amount)
+        group = self._match(bucket, amount)
+        if group is None:
+            group = _Group(timestamp, amount, bucket)
+            self._open[bucket] = group
+            self._by_time.append(group)
+        group.items.append(item)
+        return closed
+
+    def flush(self) -> List[List[Any]]:
+        """Close every open group"""
+        return self._close_before(math.inf)
+
+    def _bucket(self, amount: float) -> Hashable:
+        if self._bucket_width is None:
+            return 0
+        if self._bucket_width == 0:
+            return amount
+        return math.floor(math.log(amount) / self._bucket_width)
+
+    def _match(self, bucket: Hashable, amount: float) -> Optional[_Group]:
+        group = self._open.get(bucket)
+        if group is not None or not self._bucket_width:
+            return group
+
+        best = None
+        for neighbour in (bucket - 1, bucket + 1):
+            candidate = self._open.get(neighbour)
+            if (
+                candidate is not None
+                and self._similar(candidate.anchor_amount, amount)
+                and (best is None or candidate.anchor_time < best.anchor_time)
+            ):
+                best = candidate
+        return best
+
+    def _similar(self, a: float, b: float) -> bool:
+        return abs(a - b) / max(a, b) <= self.amount_tolerance
+
+    def _close_before(self, cutoff: float) -> List[List[Any]]:
+        closed = []
+        while self._by_time and self._by_time[0].anchor_time < cutoff:
+            group = self._by_time.popleft()
+            del self._open[group.bucket]
+            if len(group.items) >= self.min_group_size:
+                closed.append(group.items)
+        return closed
+
+
+def sweep_groups(
+    items: Iterable[Any],
+    timestamp: Callable[[Any], float],
+    amount: Callable[[Any], float],
+    window: Union[timedelta, float],
+    amount_tolerance: Optional[float] = 0.1,
+    min_group_size: int = 2,
+) -> List[List[Any]]:
+    """Sort ``items`` by time once and group them with a ``TimeWindowSweep``"""
+    sweep = TimeWindowSweep(window, amount_tolerance, min_group_size)
+    groups = []
+    for item in sorted(items, key=timestamp):
+        groups.extend(sweep.push(item, timestamp(item), amount(item)))
+    groups.extend(sweep.flush())
+    return groups
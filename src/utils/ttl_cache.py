@@ -0,0 +1,66 @@
+"""
+Jackdaw Sentry - TTL Cache
+
+Small in-process cache whose entries expire a fixed time after being set.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Dict
+from typing import Hashable
+from typing import Iterable
+from typing import Tuple
+
+
+class TTLCache:
+    """Bounded mapping with per-entry expiry.
+
+    Entries expire ``ttl_seconds`` after they are set and are dropped lazily
+    on lookup.  When ``max_entries`` is exceeded the oldest entries are
+    evicted first.  ``None`` is a valid cached value, so negative lookups can
+    be cached too; use ``get_many`` or ``in`` to tell hits from misses.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key)[0]
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return False, None
+        return True, value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found, value = self._lookup(key)
+        return value if found else default
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """Return ``{key: value}`` for the keys that are cached and fresh."""
+        hits = {}
+        for key in keys:
+            found, value = self._lookup(key)
+            if found:
+                hits[key] = value
+        return hits
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
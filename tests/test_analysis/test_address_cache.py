@@ -0,0 +1,183 @@
+"""
+Unit tests for the batched Redis address-info cache and balance refresher
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from src.collectors.address_cache import AddressInfoBuffer
+from src.collectors.address_cache import BalanceRefresher
+from src.collectors.base import Transaction
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _tx(from_address, to_address, minutes=0):
+    return Transaction(
+        hash=f"0x{from_address}{to_address}{minutes}",
+        blockchain="ethereum",
+        from_address=from_address,
+        to_address=to_address,
+        value=1.0,
+        timestamp=T0 + timedelta(minutes=minutes),
+    )
+
+
+class _FakeRedis:
+    """Records merge-script calls; ``with_balance`` addresses report a balance"""
+
+    def __init__(self, with_balance=(), fail=False, fail_addresses=()):
+        self.with_balance = set(with_balance)
+        self.fail = fail
+        self.fail_addresses = set(fail_addresses)
+        self.transactions = []
+        self.script_calls = []
+        self.executes = 0
+        self.hashes = {}
+
+    def register_script(self, script):
+        fake = self
+
+        async def call(keys, args, client=None):
+            fake.script_calls.append((keys[0], args))
+            if args[0] in fake.fail_addresses:
+                client.queued.append(RuntimeError("script error"))
+            else:
+                client.queued.append(0 if args[0] in fake.with_balance else 1)
+
+        return call
+
+    def pipeline(self, transaction=True):
+        fake = self
+        fake.transactions.append(transaction)
+
+        class _Pipe:
+            def __init__(self):
+                self.queued = []
+
+            async def execute(self, raise_on_error=True):
+                fake.executes += 1
+                if fake.fail:
+                    raise ConnectionError("redis down")
+                errors = [r for r in self.queued if isinstance(r, Exception)]
+                if errors and raise_on_error:
+                    raise errors[0]
+                return list(self.queued)
+
+        return _Pipe()
+
+    async def exists(self, key):
+        return key in self.hashes
+
+    async def hset(self, key, field, value):
+        self.hashes[key][field] = value
+
+
+def _patch_redis(fake):
+    @asynccontextmanager
+    async def connection():
+        yield fake
+
+    return patch("src.collectors.address_cache.get_redis_connection", connection)
+
+
+class TestAddressInfoBuffer:
+    @pytest.mark.asyncio
+    async def test_one_merge_per_address_per_flush(self):
+        buffer = AddressInfoBuffer("ethereum")
+        buffer.record("a", _tx("a", "b", minutes=5))
+        buffer.record("a", _tx("a", "c", minutes=1))
+        buffer.record("a", _tx("a", "b", minutes=9))
+        buffer.record("b", _tx("a", "b", minutes=5))
+
+        fake = _FakeRedis(with_balance={"b"})
+        with _patch_redis(fake):
+            missing = await buffer.flush()
+
+        assert missing == ["a"]
+        assert fake.executes == 1
+        assert fake.transactions == [True]
+        key, args = fake.script_calls[0]
+        assert key == "address:ethereum:a"
+        assert args[2] == 3
+        assert args[4] == (T0 + timedelta(minutes=1)).isoformat()
+        assert args[6] == (T0 + timedelta(minutes=9)).isoformat()
+        assert len(buffer) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_activity(self):
+        buffer = AddressInfoBuffer("ethereum")
+        buffer.record("a", _tx("a", "b"))
+
+        with _patch_redis(_FakeRedis(fail=True)):
+            with pytest.raises(ConnectionError):
+                await buffer.flush()
+
+        assert len(buffer) == 1
+        assert buffer.metrics["failed_flushes"] == 1
+        assert buffer.discard() == 1
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_keeps_only_failed_entries(self):
+        buffer = AddressInfoBuffer("ethereum")
+        buffer.record("a", _tx("a", "b"))
+        buffer.record("b", _tx("a", "b"))
+
+        with _patch_redis(_FakeRedis(fail_addresses={"b"})):
+            assert await buffer.flush() == ["a"]
+
+        # "a" was applied, so only "b" is retried and "a" is not counted twice
+        fake = _FakeRedis()
+        with _patch_redis(fake):
+            await buffer.flush()
+        assert [(key, args[2]) for key, args in fake.script_calls] == [
+            ("address:ethereum:b", 1)
+        ]
+        assert buffer.metrics["addresses_written"] == 2
+
+
+class TestBalanceRefresher:
+    def test_enqueue_dedupes_and_drops_overflow(self):
+        refresher = BalanceRefresher("ethereum", AsyncMock(), max_queue_size=2)
+        refresher.enqueue(["a", "a", "b", "c"])
+        assert refresher.pending == 2
+        assert refresher.metrics["balances_dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_only_updates_live_hashes(self):
+        fetch = AsyncMock(return_value=1.5)
+        refresher = BalanceRefresher("ethereum", fetch)
+        fake = _FakeRedis()
+        fake.hashes["address:ethereum:a"] = {}
+
+        with _patch_redis(fake):
+            await refresher.refresh("a")
+            await refresher.refresh("gone")
+
+        assert fake.hashes == {"address:ethereum:a": {"balance": "1.5"}}
+        fetch.assert_awaited_once_with("a")
+
+
+class TestCollectorIntegration:
+    @pytest.mark.asyncio
+    async def test_ingestion_defers_balance_lookups(self):
+        from tests.test_analysis.test_collector_pipeline import _FakeCollector
+
+        collector = _FakeCollector()
+        collector.get_address_balance = AsyncMock(return_value=0)
+        collector.graph_writer.add_transaction = AsyncMock()
+
+        for minutes in range(3):
+            await collector.ingest_transaction(_tx("a", "b", minutes))
+
+        with _patch_redis(_FakeRedis()):
+            await collector.flush_address_info()
+
+        collector.get_address_balance.assert_not_awaited()
+        assert collector.balance_refresher.pending == 2
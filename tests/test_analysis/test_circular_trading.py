@@ -0,0 +1,116 @@
+"""
+Unit tests for circular trading detection in MLPatternDetector
+"""
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from unittest.mock import patch
+
+import pytest
+
+from src.analysis.pattern_detection import MLPatternDetector
+from src.analysis.pattern_detection import MLPatternType
+from src.services.transaction_history import TransactionHistory
+
+START = datetime.now(timezone.utc) - timedelta(hours=6)
+
+
+def _tx(i, source, target, value=1000.0):
+    return {
+        "hash": f"0x{i}",
+        "blockchain": "ethereum",
+        "from_address": source,
+        "to_address": target,
+        "value": value,
+        "timestamp": START + timedelta(minutes=10 * i),
+    }
+
+
+class _FakeLoader:
+    """Serves each address the transfers touching it from a fixed edge list"""
+
+    def __init__(self, transactions):
+        self.transactions = transactions
+        self.loaded = []
+
+    def _history(self, address, blockchain, time_range):
+        self.loaded.append(address)
+        return TransactionHistory(
+            address,
+            blockchain,
+            time_range,
+            [
+                tx
+                for tx in self.transactions
+                if address in (tx["from_address"], tx["to_address"])
+            ],
+        )
+
+    async def get_history(self, address, blockchain, time_range_hours=24):
+        return self._history(address, blockchain, time_range_hours)
+
+    async def get_histories(self, addresses, blockchain, time_range_hours=24):
+        return {a: self._history(a, blockchain, time_range_hours) for a in addresses}
+
+
+async def _detect(transactions, address="0xa", detector=None):
+    detector = detector or MLPatternDetector()
+    loader = _FakeLoader(transactions)
+    with patch(
+        "src.analysis.pattern_detection.get_transaction_history_loader",
+        return_value=loader,
+    ):
+        matches = await detector._detect_circular_trading(address, "ethereum", 24)
+    return matches, loader
+
+
+class TestCircularTrading:
+    @pytest.mark.asyncio
+    async def test_detects_round_trip_through_counterparties(self):
+        transactions = [
+            _tx(1, "0xa", "0xb"),
+            _tx(2, "0xb", "0xc", 990.0),
+            _tx(3, "0xc", "0xd", 980.0),
+            _tx(4, "0xd", "0xa", 970.0),
+            _tx(5, "0xa", "0xunrelated", 5.0),
+        ]
+        matches, _ = await _detect(transactions)
+
+        assert len(matches) == 1
+        assert matches[0].pattern_type == MLPatternType.CIRCULAR_TRADING
+        hashes = [tx["hash"] for tx in matches[0].evidence[0]["transactions"]]
+        assert hashes == ["0x1", "0x2", "0x3", "0x4"]
+
+    @pytest.mark.asyncio
+    async def test_six_hop_cycle_needs_two_rings(self):
+        ring = ["0xa", "0xb", "0xc", "0xd", "0xe", "0xf"]
+        transactions = [
+            _tx(i, ring[i], ring[(i + 1) % len(ring)]) for i in range(len(ring))
+        ]
+        matches, loader = await _detect(transactions)
+
+        assert len(matches) == 1
+        assert matches[0].evidence[0]["path_length"] == 6
+        assert "0xd" not in loader.loaded
+
+    @pytest.mark.asyncio
+    async def test_ignores_cycles_not_passing_the_address(self):
+        transactions = [
+            _tx(1, "0xa", "0xb"),
+            _tx(2, "0xb", "0xc"),
+            _tx(3, "0xc", "0xd"),
+            _tx(4, "0xd", "0xb"),
+        ]
+        matches, _ = await _detect(transactions)
+        assert matches == []
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_transfers_are_not_a_cycle(self):
+        transactions = [
+            _tx(1, "0xa", "0xb"),
+            _tx(3, "0xb", "0xc"),
+            _tx(2, "0xc", "0xa"),
+        ]
+        matches, _ = await _detect(transactions)
+        assert matches == []
@@ -0,0 +1,176 @@
+"""
+Unit tests for the pipelined ingestion mode of BaseCollector
+"""
+
+import asyncio
+from datetime import datetime
+from datetime import timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.collectors.base import BaseCollector
+from src.collectors.base import Block
+from src.collectors.base import Transaction
+
+
+class _FakeCollector(BaseCollector):
+    """In-memory collector: block N holds transactions ``N-0`` .. ``N-(k-1)``"""
+
+    def __init__(
+        self, config=None, txs_per_block=3, fail_blocks=(), missing=(), lost_txs=()
+    ):
+        super().__init__("testchain", {"pipeline_enabled": True, **(config or {})})
+        self.txs_per_block = txs_per_block
+        self.fail_blocks = set(fail_blocks)
+        self.missing = set(missing)
+        self.lost_txs = set(lost_txs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.written = []
+
+    async def _rpc(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+
+    async def connect(self):
+        return True
+
+    async def disconnect(self):
+        pass
+
+    async def get_latest_block_number(self):
+        return 0
+
+    async def get_block(self, block_number):
+        await self._rpc()
+        if block_number in self.fail_blocks:
+            raise ConnectionError("node unavailable")
+        if block_number in self.missing:
+            return None
+        return Block(
+            hash=f"0x{block_number:x}",
+            blockchain=self.blockchain,
+            number=block_number,
+            timestamp=datetime.now(timezone.utc),
+            transaction_count=self.txs_per_block,
+        )
+
+    async def get_block_transactions(self, block_number):
+        await self._rpc()
+        return [f"{block_number}-{i}" for i in range(self.txs_per_block)]
+
+    async def get_transaction(self, tx_hash):
+        await self._rpc()
+        if tx_hash in self.lost_txs:
+            return None
+        return Transaction(
+            hash=tx_hash,
+            blockchain=self.blockchain,
+            from_address="a",
+            to_address="b",
+            value=1.0,
+            timestamp=datetime.now(timezone.utc),
+        )
+
+    async def get_address_balance(self, address):
+        return 0
+
+    async def get_address_transactions(self, address, limit=100):
+        return []
+
+    async def write_block(self, fetched):
+        self.written.append((fetched.number, [tx.hash for tx in fetched.transactions]))
+
+
+class TestIngestionPipeline:
+    @pytest.mark.asyncio
+    async def test_writes_blocks_in_order(self):
+        collector = _FakeCollector({"fetch_concurrency": 4})
+        written = await collector.run_ingestion_pipeline(10, 19)
+
+        assert written == 10
+        assert [number for number, _ in collector.written] == list(range(10, 20))
+        assert collector.written[0][1] == ["10-0", "10-1", "10-2"]
+        assert collector.last_block_processed == 19
+
+    @pytest.mark.asyncio
+    async def test_fetch_concurrency_is_bounded(self):
+        collector = _FakeCollector({"fetch_concurrency": 3}, txs_per_block=10)
+        await collector.run_ingestion_pipeline(1, 8)
+        assert 1 < collector.max_in_flight <= 3
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_stops_before_failed_fetch(self):
+        collector = _FakeCollector({"fetch_concurrency": 4}, fail_blocks={5})
+        collector.last_block_processed = 0
+        written = await collector.run_ingestion_pipeline(1, 8)
+
+        assert written == 4
+        assert collector.last_block_processed == 4
+        assert collector.metrics["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_stops_before_missing_block(self):
+        collector = _FakeCollector({"fetch_concurrency": 4}, missing={3})
+        written = await collector.run_ingestion_pipeline(1, 6)
+
+        assert written == 2
+        assert collector.last_block_processed == 2
+        assert collector.metrics["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_stops_before_unresolved_transaction(self):
+        collector = _FakeCollector({"fetch_concurrency": 4}, lost_txs={"4-1"})
+        written = await collector.run_ingestion_pipeline(1, 6)
+
+        assert written == 3
+        assert collector.last_block_processed == 3
+        assert 4 not in [number for number, _ in collector.written]
+        assert collector.metrics["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_persistently_unresolved_transaction_is_skipped(self):
+        collector = _FakeCollector(
+            {"fetch_concurrency": 4, "tx_fetch_attempts": 2}, lost_txs={"4-1"}
+        )
+        collector.last_block_processed = 0
+
+        assert await collector.run_ingestion_pipeline(1, 6) == 3
+        assert await collector.run_ingestion_pipeline(4, 6) == 3
+
+        assert collector.last_block_processed == 6
+        assert collector.written[3] == (4, ["4-0", "4-2"])
+        assert list(collector.skipped_transactions) == [(4, "4-1")]
+        assert collector.metrics["transactions_skipped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_stops_before_failed_write(self):
+        collector = _FakeCollector({"fetch_concurrency": 2})
+        original = collector.write_block
+
+        async def flaky_write(fetched):
+            if fetched.number == 3:
+                raise RuntimeError("neo4j down")
+            await original(fetched)
+
+        collector.write_block = flaky_write
+        written = await collector.run_ingestion_pipeline(1, 6)
+
+        assert written == 2
+        assert collector.last_block_processed == 2
+
+    @pytest.mark.asyncio
+    async def test_collect_new_blocks_uses_pipeline(self):
+        collector = _FakeCollector({"batch_size": 5})
+        collector.get_latest_block_number = AsyncMock(return_value=100)
+        collector.save_last_processed_block = AsyncMock()
+        collector.last_block_processed = 90
+
+        await collector.collect_new_blocks()
+
+        assert collector.last_block_processed == 95
+        assert collector.metrics["blocks_processed"] == 5
+        collector.save_last_processed_block.assert_awaited_once()
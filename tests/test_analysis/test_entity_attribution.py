@@ -9,6 +9,7 @@ Covers:
  - get_entity_details()      — full entity with addresses
  - search_entities()         — name/type search
  - sync_all_labels()         — orchestration + partial failure handling
+ - refresh_protocol_labels() — versioned reload of the protocol labels
  - ingest_etherscan_labels() — HTTP fetch + record ingestion
  - ingest_scam_databases()   — scam DB ingest
  - ingest_community_labels() — community label ingest
@@ -25,6 +26,7 @@ from src.services.entity_attribution import (
     get_entity_details,
     search_entities,
     sync_all_labels,
+    refresh_protocol_labels,
     ingest_etherscan_labels,
     ingest_scam_databases,
 )
@@ -366,6 +368,77 @@ class TestSyncAllLabels:
         assert isinstance(result, dict)
 
 
+# ---------------------------------------------------------------------------
+# refresh_protocol_labels
+# ---------------------------------------------------------------------------
+
+
+class _FakeRedis:
+    """Just the counter commands the label version uses"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+
+class TestRefreshProtocolLabels:
+    @pytest.fixture(autouse=True)
+    def fresh_worker(self):
+        import src.services.entity_attribution as ea
+
+        ea._labels_version, ea._labels_loaded = None, False
+        self.redis = _FakeRedis()
+        self.load = AsyncMock(return_value=3)
+        with patch("src.services.entity_attribution.get_redis_client",
+                   return_value=self.redis), \
+             patch("src.services.entity_attribution.load_protocol_labels",
+                   self.load):
+            yield
+        ea._labels_version, ea._labels_loaded = None, False
+
+    @pytest.mark.asyncio
+    async def test_loads_once_until_the_version_moves(self):
+        assert await refresh_protocol_labels() is True
+        assert await refresh_protocol_labels() is False
+        assert self.load.await_count == 1
+
+        # Another worker finished a label sync
+        await self.redis.incr("jackdaw:entity_labels:version")
+        assert await refresh_protocol_labels() is True
+        assert self.load.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_publishes_a_new_version(self):
+        await refresh_protocol_labels()
+        with patch("src.services.entity_attribution.ingest_etherscan_labels",
+                   new_callable=AsyncMock, return_value=1), \
+             patch("src.services.entity_attribution.ingest_scam_databases",
+                   new_callable=AsyncMock, return_value=0), \
+             patch("src.services.entity_attribution.ingest_community_labels",
+                   new_callable=AsyncMock, return_value=0), \
+             patch("src.services.entity_attribution.get_postgres_pool",
+                   return_value=_make_pg_pool()[0]):
+            await sync_all_labels()
+
+        assert self.redis.values["jackdaw:entity_labels:version"] == 1
+        assert self.load.await_count == 2
+        # The syncing worker already holds the version it published
+        assert await refresh_protocol_labels() is False
+
+    @pytest.mark.asyncio
+    async def test_loads_at_startup_without_redis(self):
+        self.redis.get = AsyncMock(side_effect=ConnectionError("down"))
+        assert await refresh_protocol_labels() is True
+        assert await refresh_protocol_labels() is False
+        assert self.load.await_count == 1
+
+
 # ---------------------------------------------------------------------------
 # ingest_etherscan_labels
 # ---------------------------------------------------------------------------
@@ -0,0 +1,125 @@
+"""
+Unit tests for EthereumCollector transaction parsing and balance lookups
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+
+from src.collectors.ethereum import EthereumCollector
+
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+USDT = "0xdAC17F958D2ee523a2206206994597C13D831ec7"
+SENDER = "0x1111111111111111111111111111111111111111"
+RECIPIENT = "0x2222222222222222222222222222222222222222"
+
+
+def _word(value):
+    return HexBytes(value.to_bytes(32, "big"))
+
+
+def _collector(tx_data, receipt):
+    collector = EthereumCollector("ethereum", {"rpc_url": "http://node"})
+    w3 = MagicMock()
+    w3.eth.get_transaction.return_value = tx_data
+    w3.eth.get_transaction_receipt.return_value = receipt
+    w3.eth.get_block.return_value = AttributeDict({"timestamp": 1700000000})
+    w3.eth.call.return_value = _word(6)
+    collector.w3 = w3
+    return collector
+
+
+def _tx_data(**overrides):
+    return AttributeDict(
+        {
+            "hash": HexBytes("0x" + "ab" * 32),
+            "blockNumber": 100,
+            "blockHash": HexBytes("0x" + "cd" * 32),
+            "from": SENDER,
+            "to": USDT,
+            "value": 10**18,
+            "gasPrice": 2 * 10**9,
+            **overrides,
+        }
+    )
+
+
+def _receipt(**overrides):
+    # Shaped like web3 v6: checksummed str addresses, HexBytes hashes, and no
+    # "confirmations" key
+    return AttributeDict(
+        {
+            "transactionHash": HexBytes("0x" + "ab" * 32),
+            "blockNumber": 100,
+            "status": 1,
+            "gasUsed": 21000,
+            "effectiveGasPrice": 3 * 10**9,
+            "contractAddress": None,
+            "logs": [
+                AttributeDict(
+                    {
+                        "address": USDT,
+                        "topics": [
+                            HexBytes(TRANSFER_TOPIC),
+                            HexBytes("0x" + "00" * 12 + SENDER[2:]),
+                            HexBytes("0x" + "00" * 12 + RECIPIENT[2:]),
+                        ],
+                        "data": _word(5 * 10**6),
+                    }
+                )
+            ],
+            **overrides,
+        }
+    )
+
+
+class TestGetTransaction:
+    @pytest.mark.asyncio
+    async def test_parses_web3_receipt(self):
+        collector = _collector(_tx_data(), _receipt())
+        collector.latest_block_cache = 111
+
+        tx = await collector.get_transaction("0x" + "ab" * 32)
+
+        assert tx is not None
+        assert tx.block_hash == "0x" + "cd" * 32
+        assert tx.status == "confirmed"
+        assert tx.confirmations == 12
+        assert tx.gas_price == 3 * 10**9
+        assert tx.contract_address is None
+        assert tx.token_transfers[0]["symbol"] == "USDT"
+        assert tx.token_transfers[0]["to_address"] == RECIPIENT
+        assert tx.token_transfers[0]["amount"] == 5
+
+    @pytest.mark.asyncio
+    async def test_contract_creation_receipt(self):
+        created = "0x3333333333333333333333333333333333333333"
+        collector = _collector(
+            _tx_data(to=None), _receipt(contractAddress=created, logs=[])
+        )
+
+        tx = await collector.get_transaction("0x" + "ab" * 32)
+
+        assert tx.contract_address == created
+        assert tx.to_address == SENDER
+        assert tx.confirmations == 0
+
+
+class TestGetAddressBalance:
+    @pytest.mark.asyncio
+    async def test_balance_lookup_runs_off_the_event_loop(self):
+        collector = _collector(_tx_data(), _receipt())
+        loop_thread = threading.get_ident()
+        threads = []
+
+        def get_balance(address):
+            threads.append(threading.get_ident())
+            return 2 * 10**18
+
+        collector.w3.eth.get_balance.side_effect = get_balance
+
+        assert await collector.get_address_balance(SENDER) == 2
+        assert threads and threads[0] != loop_thread
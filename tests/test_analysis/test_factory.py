@@ -59,6 +59,24 @@ class TestFactoryEvm:
             client = get_rpc_client("ethereum")
         assert isinstance(client, EvmRpcClient)
 
+    def test_pools_http_endpoints(self):
+        config = {
+            "family": "evm",
+            "rpc_url": "wss://ws.example.com",
+            "fallback_url": "https://a.example.com",
+        }
+        with patch("src.collectors.rpc.factory._clients", {}), \
+             patch("src.collectors.rpc.factory.get_blockchain_config",
+                   return_value=config), \
+             patch.dict("src.collectors.rpc.factory.settings.RPC_ENDPOINTS",
+                        {"ethereum": ["https://b.example.com"]}):
+            client = get_rpc_client("ethereum")
+        assert client.rpc_url == "https://a.example.com"
+        assert [ep.url for ep in client.endpoints.endpoints] == [
+            "https://a.example.com",
+            "https://b.example.com",
+        ]
+
 
 class TestFactoryUnknown:
     def test_returns_none_for_unknown_family(self):
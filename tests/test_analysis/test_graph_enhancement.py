@@ -0,0 +1,124 @@
+"""
+Unit tests for graph analytics offloaded to the compute executor
+"""
+
+import asyncio
+import math
+import time
+from unittest.mock import patch
+
+import networkx as nx
+import pytest
+
+from src.analysis.graph_enhancement import GraphEnhancementTools
+from src.utils import graph_kernels
+from src.utils.compute_executor import ComputeExecutor
+from src.utils.compute_executor import ComputeTimeout
+from src.utils.graph_kernels import CompactGraph
+
+
+@pytest.fixture
+def executor():
+    executor = ComputeExecutor(max_workers=2, default_timeout=30, min_offload_size=0)
+    yield executor
+    executor.shutdown()
+
+
+def _tools(graph):
+    tools = GraphEnhancementTools()
+    tools.graphs["g"] = graph
+    return tools
+
+
+class TestCompactGraph:
+    def test_round_trip_keeps_structure_and_weights(self):
+        graph = nx.DiGraph()
+        graph.add_edge("a", "b", amount=2.0, hash="0x1")
+        graph.add_edge("b", "c", amount=3.0)
+        graph.add_node("lonely")
+
+        rebuilt = CompactGraph.from_networkx(graph, weight="amount").to_networkx()
+
+        assert rebuilt.is_directed()
+        assert set(rebuilt.nodes()) == {"a", "b", "c", "lonely"}
+        assert rebuilt["b"]["c"] == {"amount": 3.0}
+
+    def test_weights_dropped_unless_every_edge_has_one(self):
+        graph = nx.Graph()
+        graph.add_edge(1, 2, weight=1.0)
+        graph.add_edge(2, 3)
+
+        assert CompactGraph.from_networkx(graph).weights is None
+
+    def test_simple_paths_stop_at_limit(self):
+        graph = nx.complete_graph(9, create_using=nx.DiGraph)
+
+        paths = graph_kernels.simple_paths(
+            CompactGraph.from_networkx(graph), 0, 8, cutoff=8, limit=5
+        )
+
+        assert len(paths) == 5
+        assert all(path[0] == 0 and path[-1] == 8 for path in paths)
+
+
+class TestGraphEnhancementOffload:
+    @pytest.mark.asyncio
+    async def test_results_match_inline_networkx(self, executor):
+        graph = nx.karate_club_graph()
+        tools = _tools(graph)
+
+        with patch(
+            "src.analysis.graph_enhancement.get_compute_executor",
+            return_value=executor,
+        ):
+            central = await tools.find_central_nodes("g", top_k=3)
+            communities = await tools.detect_communities("g", algorithm="components")
+            layout = await tools.optimize_graph_layout("g", "circular")
+
+        pagerank = nx.pagerank(graph)
+        assert central["pagerank"] == sorted(pagerank, key=pagerank.get)[::-1][:3]
+        assert communities["community_count"] == 1
+        assert sorted(communities["communities"][0]) == sorted(graph.nodes())
+        assert set(layout["layout"]) == set(graph.nodes())
+        assert executor.metrics["completed"] == 3
+        assert executor.metrics["inline"] == 0
+
+    @pytest.mark.asyncio
+    async def test_small_graphs_run_inline(self):
+        executor = ComputeExecutor(min_offload_size=1000)
+        tools = _tools(nx.path_graph(4))
+
+        with patch(
+            "src.analysis.graph_enhancement.get_compute_executor",
+            return_value=executor,
+        ):
+            central = await tools.find_central_nodes("g", top_k=2)
+
+        assert sorted(central["degree"]) == [1, 2]
+        assert executor.metrics["inline"] == 1
+        assert executor._pool is None
+
+
+class TestComputeExecutor:
+    @pytest.mark.asyncio
+    async def test_timeout_restarts_pool_and_later_jobs_run(self, executor):
+        with pytest.raises(ComputeTimeout):
+            await executor.run(time.sleep, 30, timeout=2)
+
+        assert executor.metrics["timeouts"] == 1
+        assert executor.metrics["pool_restarts"] == 1
+        assert await executor.run(math.factorial, 5) == 120
+
+    @pytest.mark.asyncio
+    async def test_jobs_beyond_worker_count_queue(self, executor):
+        executor.max_workers = 1
+
+        results = await asyncio.gather(
+            *(executor.run(math.factorial, n) for n in range(3))
+        )
+
+        assert results == [1, 1, 2]
+        assert executor.metrics["max_queue_depth"] == 2
+        assert executor.metrics["queued"] == 0
+        assert executor.metrics["running"] == 0
+        assert executor.metrics["completed"] == 3
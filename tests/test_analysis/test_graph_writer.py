@@ -0,0 +1,160 @@
+"""
+Unit tests for the batched Neo4j GraphWriteBuffer used by collectors
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime
+from datetime import timezone
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+from neo4j.exceptions import TransientError
+
+from src.collectors.base import Block
+from src.collectors.base import Transaction
+from src.collectors.graph_writer import SELF_TRANSFERS_QUERY
+from src.collectors.graph_writer import STABLECOIN_TRANSFERS_QUERY
+from src.collectors.graph_writer import TRANSFERS_QUERY
+from src.collectors.graph_writer import GraphWriteBuffer
+
+
+def _tx(tx_hash, to_address="0xto"):
+    return Transaction(
+        hash=tx_hash,
+        blockchain="ethereum",
+        from_address="0xfrom",
+        to_address=to_address,
+        value=1.5,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def _block(number=1):
+    return Block(
+        hash=f"0xblock{number}",
+        blockchain="ethereum",
+        number=number,
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        transaction_count=2,
+    )
+
+
+class _FakeNeo4j:
+    """Records every UNWIND statement and counts committed transactions"""
+
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.statements = []
+        self.commits = 0
+
+    def session_factory(self):
+        fake = self
+
+        @asynccontextmanager
+        async def _session():
+            tx = MagicMock()
+
+            async def run(query, **params):
+                if fake.failures:
+                    raise fake.failures.pop(0)
+                fake.statements.append((query, params["rows"]))
+                return MagicMock(consume=AsyncMock())
+
+            async def commit():
+                fake.commits += 1
+
+            tx.run = run
+            tx.commit = commit
+
+            @asynccontextmanager
+            async def begin_transaction():
+                yield tx
+
+            session = MagicMock()
+            session.begin_transaction = begin_transaction
+            yield session
+
+        return _session
+
+
+class TestGraphWriteBuffer:
+    @pytest.mark.asyncio
+    async def test_flush_writes_one_transaction_with_unwind_batches(self):
+        neo4j = _FakeNeo4j()
+        buffer = GraphWriteBuffer(max_batch_size=100)
+        with patch(
+            "src.collectors.graph_writer.get_neo4j_session", neo4j.session_factory()
+        ):
+            await buffer.add_block(_block())
+            await buffer.add_transaction(_tx("0x1"))
+            await buffer.add_transaction(_tx("0x2"))
+            await buffer.add_transaction(_tx("0x3", to_address=None))
+            await buffer.add_stablecoin_transfer(
+                _tx("0x1"), {"symbol": "USDT", "amount": 10.0}
+            )
+            written = await buffer.flush()
+
+        assert written == 5
+        assert neo4j.commits == 1
+        assert all(query.lstrip().startswith("UNWIND") for query, _ in neo4j.statements)
+        by_query = dict(neo4j.statements)
+        assert [row["hash"] for row in by_query[TRANSFERS_QUERY]] == ["0x1", "0x2"]
+        assert [row["hash"] for row in by_query[SELF_TRANSFERS_QUERY]] == ["0x3"]
+        # Stablecoin relationships MATCH transactions, so they are written last
+        assert neo4j.statements[-1][0] == STABLECOIN_TRANSFERS_QUERY
+        assert buffer.pending_rows == 0
+
+    @pytest.mark.asyncio
+    async def test_size_threshold_triggers_flush(self):
+        neo4j = _FakeNeo4j()
+        buffer = GraphWriteBuffer(max_batch_size=3)
+        with patch(
+            "src.collectors.graph_writer.get_neo4j_session", neo4j.session_factory()
+        ):
+            for i in range(7):
+                await buffer.add_transaction(_tx(f"0x{i}"))
+
+        assert neo4j.commits == 2
+        assert buffer.pending_rows == 1
+        assert buffer.metrics["rows_written"] == 6
+
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self):
+        neo4j = _FakeNeo4j(failures=[TransientError("deadlock")])
+        buffer = GraphWriteBuffer(retry_backoff=0)
+        with patch(
+            "src.collectors.graph_writer.get_neo4j_session", neo4j.session_factory()
+        ):
+            await buffer.add_transaction(_tx("0x1"))
+            await buffer.flush()
+
+        assert neo4j.commits == 1
+        assert buffer.metrics["retries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rows_kept_after_permanent_failure(self):
+        neo4j = _FakeNeo4j(failures=[ValueError("bad cypher")])
+        buffer = GraphWriteBuffer()
+        with patch(
+            "src.collectors.graph_writer.get_neo4j_session", neo4j.session_factory()
+        ):
+            await buffer.add_transaction(_tx("0x1"))
+            with pytest.raises(ValueError):
+                await buffer.flush()
+
+        assert buffer.pending_rows == 1
+        assert buffer.metrics["failed_flushes"] == 1
+        assert buffer.discard() == 1
+        assert buffer.pending_rows == 0
+
+
+@pytest.mark.parametrize("query", [TRANSFERS_QUERY, SELF_TRANSFERS_QUERY])
+def test_address_counters_only_count_new_transactions(query):
+    # A re-ingested block must not count its already-written transactions again
+    assert "OPTIONAL MATCH (seen:Transaction" in query
+    assert "transaction_count + 1" not in query
+    assert query.count("transaction_count + new_tx") == query.count(
+        "transaction_count ="
+    )
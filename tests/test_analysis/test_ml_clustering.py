@@ -0,0 +1,143 @@
+"""
+Unit tests for the vectorised similarity and union-find clustering backend
+"""
+
+import asyncio
+import random
+from datetime import datetime
+from datetime import timezone
+from unittest.mock import patch
+
+import pytest
+
+from src.analysis.ml_clustering import AddressFeatures
+from src.analysis.ml_clustering import MLClusteringEngine
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _features(address, **overrides):
+    values = dict(
+        address=address,
+        blockchain="ethereum",
+        transaction_count=10,
+        total_received=100.0,
+        total_sent=100.0,
+        balance=0.0,
+        avg_transaction_amount=10.0,
+        avg_transaction_frequency=2.0,
+        unique_counterparties=5,
+        first_seen=NOW,
+        last_seen=NOW,
+        active_days=10,
+        mixer_usage=False,
+        privacy_tool_usage=False,
+        bridge_usage=False,
+        dex_usage=False,
+        large_transactions=0,
+        round_amount_transactions=0,
+        off_peak_transactions=0,
+        high_frequency_periods=0,
+        cross_chain_activity=False,
+        cluster_connections=0,
+    )
+    values.update(overrides)
+    return AddressFeatures(**values)
+
+
+def _random_features(rng, i):
+    return _features(
+        f"0x{i}",
+        transaction_count=rng.choice([0, 3, 50]),
+        total_sent=rng.choice([0.0, 10.0, 500.0]),
+        avg_transaction_amount=rng.uniform(0, 200),
+        avg_transaction_frequency=rng.uniform(0, 5),
+        unique_counterparties=rng.choice([0, 1, 8, 40]),
+        active_days=rng.choice([0, 1, 30]),
+        mixer_usage=rng.random() < 0.5,
+        privacy_tool_usage=rng.random() < 0.5,
+        bridge_usage=rng.random() < 0.5,
+        dex_usage=rng.random() < 0.5,
+    )
+
+
+class TestVectorisedSimilarity:
+    @pytest.mark.asyncio
+    async def test_matches_pairwise_similarity(self):
+        engine = MLClusteringEngine()
+        rng = random.Random(3)
+        features = [_random_features(rng, i) for i in range(20)]
+
+        matrix = engine._feature_matrix(features)
+
+        block = engine._similarity_block(matrix, 7, 14)
+        for row in range(7):
+            for col in range(20):
+                expected = await engine._calculate_similarity(
+                    features[7 + row], features[col]
+                )
+                assert block[row, col] == pytest.approx(expected)
+
+
+class TestUnionFindClustering:
+    def test_groups_similar_addresses(self):
+        engine = MLClusteringEngine()
+        mixers = [_features(f"m{i}", mixer_usage=True) for i in range(4)]
+        traders = [
+            _features(f"t{i}", dex_usage=True, avg_transaction_amount=5000.0)
+            for i in range(3)
+        ]
+        loner = [
+            _features(
+                "x",
+                bridge_usage=True,
+                privacy_tool_usage=True,
+                active_days=1,
+                unique_counterparties=200,
+            )
+        ]
+        features = mixers + traders + loner
+
+        clusters = engine._perform_clustering([f.address for f in features], features)
+
+        assert sorted(sorted(c) for c in clusters.values()) == [
+            ["m0", "m1", "m2", "m3"],
+            ["t0", "t1", "t2"],
+        ]
+
+    def test_cluster_size_is_capped(self):
+        engine = MLClusteringEngine()
+        engine.max_cluster_size = 4
+        engine.max_cluster_neighbours = 3
+        features = [_features(f"a{i}") for i in range(10)]
+
+        clusters = engine._perform_clustering([f.address for f in features], features)
+
+        assert clusters
+        assert all(len(members) <= 4 for members in clusters.values())
+
+
+class TestClusterAddresses:
+    @pytest.mark.asyncio
+    async def test_feature_extraction_is_concurrent_and_bounded(self):
+        engine = MLClusteringEngine()
+        engine.feature_extraction_concurrency = 3
+        in_flight = 0
+        peak = 0
+
+        async def extract(address, blockchain, time_range=30):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0)
+            in_flight -= 1
+            return _features(address)
+
+        with patch.object(engine, "extract_address_features", side_effect=extract):
+            clusters = await engine.cluster_addresses(
+                [f"0x{i}" for i in range(8)], "ethereum"
+            )
+
+        assert peak == 3
+        assert len(clusters) == 1
+        assert clusters[0].size == 8
@@ -4,7 +4,9 @@ Unit tests for the M13 protocol registry and DeFi decoder.
 
 import pytest
 
+from src.analysis import protocol_registry
 from src.analysis.protocol_registry import (
+    ProtocolMatch,
     classify_address,
     get_all_protocols,
     get_high_risk_addresses,
@@ -12,6 +14,7 @@ from src.analysis.protocol_registry import (
     get_known_dex_addresses,
     get_known_mixer_addresses,
     get_protocol_by_address,
+    get_protocol_index,
     get_protocols_by_type,
     protocol_count,
 )
@@ -145,6 +148,41 @@ class TestAddressSets:
             assert addr == addr.lower(), f"Mixer address not lowercase: {addr}"
 
 
+class TestProtocolIndex:
+    def test_classify_many_is_per_chain_and_ordered(self):
+        uniswap = "0x7A250D5630B4CF539739DF2C5DACB4C659F2488D"
+        matches = get_protocol_index().classify_many([uniswap, "0xunknown", None])
+        assert matches[0].protocol_type == "dex"
+        assert matches[1:] == [None, None]
+        assert get_protocol_index().classify(uniswap, "ethereum") == matches[0]
+        assert get_protocol_index().classify(uniswap, "solana") is None
+
+    def test_external_labels_rebuild_the_index(self):
+        before = get_protocol_index()
+        protocol_registry.set_external_labels(
+            {("Ethereum", "0xLabelledMixer"): ProtocolMatch("mixer", "high", "Mixer")}
+        )
+        try:
+            index = get_protocol_index()
+            assert index is not before
+            assert index.classify("0xlabelledmixer", "ethereum").protocol == "Mixer"
+            assert "0xlabelledmixer" in get_known_mixer_addresses()
+            assert get_protocol_index() is index
+        finally:
+            protocol_registry.set_external_labels({})
+        assert get_protocol_index().classify("0xlabelledmixer") is None
+
+    def test_registry_entries_win_over_labels(self):
+        tornado = next(iter(get_known_mixer_addresses()))
+        protocol_registry.set_external_labels(
+            {("ethereum", tornado): ProtocolMatch("bridge", "low", "Mislabelled")}
+        )
+        try:
+            assert get_protocol_index().classify(tornado).protocol_type == "mixer"
+        finally:
+            protocol_registry.set_external_labels({})
+
+
 # ---------------------------------------------------------------------------
 # DeFi decoder
 # ---------------------------------------------------------------------------
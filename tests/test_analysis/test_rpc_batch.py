@@ -0,0 +1,272 @@
+"""
+Unit tests for JSON-RPC batch support in BaseRPCClient and its users
+"""
+
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from src.collectors.rpc.base_rpc import BaseRPCClient
+from src.collectors.rpc.base_rpc import RPCError
+from src.collectors.rpc.bitcoin_rpc import BitcoinRpcClient
+from src.collectors.rpc.evm_rpc import EvmRpcClient
+from src.collectors.rpc.solana_rpc import SolanaRpcClient
+from src.collectors.rpc.tron_rpc import TronRpcClient
+from src.collectors.rpc.xrpl_rpc import XrplRpcClient
+
+
+class _FakeResponse:
+    def __init__(self, body, status=200):
+        self.body = body
+        self.status = status
+
+    async def json(self, content_type=None):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeSession:
+    """Answers each batch item via *handler*, in reverse order to exercise id demux"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.payloads = []
+
+    def post(self, url, json=None, **kwargs):
+        self.payloads.append(json)
+        if callable(self.handler):
+            body = [self.handler(item) for item in reversed(json)]
+        else:
+            body = self.handler
+        return _FakeResponse(body)
+
+
+def _echo(item):
+    if item["method"] == "fail":
+        return {
+            "jsonrpc": "2.0",
+            "id": item["id"],
+            "error": {"code": -32000, "message": "boom"},
+        }
+    return {"jsonrpc": "2.0", "id": item["id"], "result": item["params"][0]}
+
+
+@pytest.fixture
+def client():
+    return EvmRpcClient("https://node.example.com", "ethereum", max_batch_size=3)
+
+
+class TestBatchCall:
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self, client):
+        session = _FakeSession(_echo)
+        with patch.object(client, "_ensure_session", AsyncMock(return_value=session)):
+            results = await client.batch_call([("echo", [i]) for i in range(7)])
+
+        assert results == list(range(7))
+        # 7 calls with max_batch_size=3 -> 3 HTTP requests
+        assert [len(p) for p in session.payloads] == [3, 3, 1]
+        assert client.metrics["batch_requests_sent"] == 3
+        assert client.metrics["batch_items_sent"] == 7
+
+    @pytest.mark.asyncio
+    async def test_per_item_errors_do_not_fail_batch(self, client):
+        session = _FakeSession(_echo)
+        with patch.object(client, "_ensure_session", AsyncMock(return_value=session)):
+            results = await client.batch_call(
+                [("echo", ["a"]), ("fail", []), ("echo", ["c"])]
+            )
+
+        assert results[0] == "a"
+        assert isinstance(results[1], RPCError)
+        assert results[1].code == -32000
+        assert results[2] == "c"
+
+    @pytest.mark.asyncio
+    async def test_missing_response_item_is_error(self, client):
+        session = _FakeSession(
+            lambda item: {"id": item["id"], "result": 1} if item["params"][0] else None
+        )
+        with patch.object(client, "_ensure_session", AsyncMock(return_value=session)):
+            results = await client.batch_call([("echo", [1]), ("echo", [0])])
+
+        assert results[0] == 1
+        assert isinstance(results[1], RPCError)
+
+    @pytest.mark.asyncio
+    async def test_whole_batch_rejection_raises(self, client):
+        session = _FakeSession(
+            {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {"code": -32600, "message": "batch too large"},
+            }
+        )
+        with patch.object(client, "_ensure_session", AsyncMock(return_value=session)):
+            with pytest.raises(RPCError, match="batch too large"):
+                await client.batch_call([("echo", [1])])
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_sends_nothing(self, client):
+        with patch.object(client, "_ensure_session", AsyncMock()) as ensure:
+            assert await client.batch_call([]) == []
+        ensure.assert_not_called()
+
+
+class TestEvmBatchedFetches:
+    @pytest.mark.asyncio
+    async def test_get_transactions_uses_two_batches(self, client):
+        block_hash = "0x" + "ab" * 32
+        tx_data = {
+            "hash": "0x1",
+            "from": "0xAAA",
+            "to": "0xBBB",
+            "value": hex(10**18),
+            "blockNumber": hex(100),
+            "blockHash": block_hash,
+            "gasPrice": hex(1),
+        }
+        receipt = {"status": "0x1", "gasUsed": hex(21000), "logs": []}
+
+        batch = AsyncMock(
+            side_effect=[
+                [tx_data, None, receipt, None, hex(110)],
+                [{"timestamp": hex(1700000000)}],
+            ]
+        )
+        with patch.object(client, "batch_call", batch):
+            txs = await client.get_transactions(["0x1", "0x2"])
+
+        assert batch.await_count == 2
+        assert txs[1] is None
+        assert txs[0].value == 1.0
+        assert txs[0].confirmations == 10
+        assert txs[0].status == "confirmed"
+        assert txs[0].timestamp.timestamp() == 1700000000
+
+    @pytest.mark.asyncio
+    async def test_get_block_transactions_batches_receipts(self, client):
+        block = {
+            "timestamp": hex(1700000000),
+            "transactions": [
+                {
+                    "hash": "0x1",
+                    "from": "0xa",
+                    "to": "0xb",
+                    "value": "0x0",
+                    "blockNumber": hex(5),
+                },
+                {
+                    "hash": "0x2",
+                    "from": "0xc",
+                    "to": None,
+                    "value": "0x0",
+                    "blockNumber": hex(5),
+                },
+            ],
+        }
+        receipts = [
+            {"status": "0x1", "logs": []},
+            RPCError("not found"),
+            hex(6),
+        ]
+        with patch.object(
+            client, "_json_rpc", AsyncMock(return_value=block)
+        ), patch.object(
+            client, "batch_call", AsyncMock(return_value=receipts)
+        ) as batch:
+            txs = await client.get_block_transactions(5)
+
+        calls = batch.await_args.args[0]
+        assert [method for method, _ in calls] == [
+            "eth_getTransactionReceipt",
+            "eth_getTransactionReceipt",
+            "eth_blockNumber",
+        ]
+        assert [tx.hash for tx in txs] == ["0x1", "0x2"]
+        assert txs[0].status == "confirmed"
+        assert txs[1].to_address is None
+
+
+@pytest.mark.parametrize(
+    "cls",
+    [EvmRpcClient, SolanaRpcClient, BitcoinRpcClient, TronRpcClient, XrplRpcClient],
+)
+def test_block_transactions_flag_matches_implementation(cls):
+    implemented = cls.get_block_transactions is not BaseRPCClient.get_block_transactions
+    assert cls.supports_block_transactions is implemented
+
+
+class TestSolanaBatchedFetches:
+    @pytest.mark.asyncio
+    async def test_get_transactions_batches_signatures(self):
+        client = SolanaRpcClient("https://api.mainnet-beta.solana.com")
+        result = {
+            "slot": 7,
+            "blockTime": 1700000000,
+            "meta": {
+                "fee": 5000,
+                "err": None,
+                "preBalances": [2, 1],
+                "postBalances": [1, 2],
+            },
+            "transaction": {"message": {"accountKeys": ["a", "b"]}},
+        }
+        with patch.object(
+            client, "batch_call", AsyncMock(return_value=[result, RPCError("x")])
+        ) as batch:
+            txs = await client.get_transactions(["sig1", "sig2"])
+
+        assert len(batch.await_args.args[0]) == 2
+        assert txs[0].hash == "sig1"
+        assert txs[0].block_number == 7
+        assert txs[1] is None
+
+    @pytest.mark.asyncio
+    async def test_skipped_slot_is_an_empty_block(self):
+        client = SolanaRpcClient("https://api.mainnet-beta.solana.com")
+        skipped = RPCError("Slot 7 was skipped", code=-32007)
+        with patch.object(client, "_json_rpc", AsyncMock(side_effect=skipped)):
+            assert await client.get_block_transactions(7) == []
+
+        assert client.metrics["slots_skipped"] == 1
+
+        other = RPCError("Node is unhealthy", code=-32005)
+        with patch.object(client, "_json_rpc", AsyncMock(side_effect=other)):
+            with pytest.raises(RPCError):
+                await client.get_block_transactions(7)
+
+    @pytest.mark.asyncio
+    async def test_unavailable_slot_is_retried_before_skipping(self):
+        client = SolanaRpcClient("https://api.mainnet-beta.solana.com")
+        unavailable = RPCError("Block not available for slot 7", code=-32004)
+        with patch.object(client, "_json_rpc", AsyncMock(side_effect=unavailable)):
+            for _ in range(4):
+                with pytest.raises(RPCError):
+                    await client.get_block_transactions(7)
+            assert client.metrics["slots_skipped"] == 0
+            assert await client.get_block_transactions(7) == []
+
+        assert client.metrics["slots_skipped"] == 1
+        assert client._unavailable_attempts == {}
+
+    @pytest.mark.asyncio
+    async def test_unavailable_slot_that_appears_is_not_skipped(self):
+        client = SolanaRpcClient("https://api.mainnet-beta.solana.com")
+        unavailable = RPCError("Block not available for slot 7", code=-32004)
+        block = {"blockTime": 1700000000, "transactions": []}
+        with patch.object(
+            client, "_json_rpc", AsyncMock(side_effect=[unavailable, block])
+        ):
+            with pytest.raises(RPCError):
+                await client.get_block_transactions(7)
+            assert await client.get_block_transactions(7) == []
+
+        assert client.metrics["slots_skipped"] == 0
+        assert client._unavailable_attempts == {}
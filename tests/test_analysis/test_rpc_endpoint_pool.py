@@ -0,0 +1,125 @@
+"""
+Unit tests for RPC endpoint pooling, circuit breaking and hedged requests
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from src.collectors.rpc.endpoint_pool import EndpointPool
+from src.collectors.rpc.evm_rpc import EvmRpcClient
+
+PRIMARY = "https://primary.example.com"
+BACKUP = "https://backup.example.com"
+
+
+class _FakeResponse:
+    def __init__(self, body, status=200):
+        self.body = body
+        self.status = status
+
+    async def json(self, content_type=None):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _RoutedSession:
+    """Answers per URL: a status code, or a delay before a successful reply"""
+
+    def __init__(self, statuses=None, delays=None):
+        self.statuses = statuses or {}
+        self.delays = delays or {}
+        self.urls = []
+
+    def post(self, url, json=None, **kwargs):
+        self.urls.append(url)
+        session = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                await asyncio.sleep(session.delays.get(url, 0))
+                status = session.statuses.get(url, 200)
+                return _FakeResponse(
+                    {"jsonrpc": "2.0", "id": json["id"], "result": url}, status
+                )
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+
+class TestEndpointPool:
+    def test_prefers_primary_until_measured(self):
+        pool = EndpointPool([PRIMARY, BACKUP, PRIMARY + "/"])
+        assert len(pool) == 2
+        assert pool.select().url == PRIMARY
+
+    def test_routes_to_lowest_latency(self):
+        pool = EndpointPool([PRIMARY, BACKUP])
+        primary, backup = pool.endpoints
+        pool.record_success(primary, 300)
+        pool.record_success(backup, 50)
+        assert pool.select().url == BACKUP
+
+    def test_circuit_opens_and_half_opens(self):
+        pool = EndpointPool([PRIMARY, BACKUP], failure_threshold=2, cooldown_seconds=30)
+        primary = pool.endpoints[0]
+        with patch("src.collectors.rpc.endpoint_pool.time.monotonic", return_value=0):
+            pool.record_failure(primary)
+            pool.record_failure(primary)
+            assert primary.is_open
+            assert [ep.url for ep in pool.candidates()] == [BACKUP]
+
+        with patch("src.collectors.rpc.endpoint_pool.time.monotonic", return_value=31):
+            # One trial request after the cooldown
+            assert pool.select(exclude=[BACKUP]) is primary
+            assert primary not in pool.candidates()
+            pool.record_success(primary, 10)
+
+        assert not primary.is_open
+
+    def test_hedge_delay_is_p95(self):
+        pool = EndpointPool([PRIMARY, BACKUP], hedge=True, min_hedge_samples=20)
+        primary = pool.endpoints[0]
+        for ms in range(1, 20):
+            pool.record_success(primary, ms)
+        assert pool.hedge_delay(primary) is None
+        pool.record_success(primary, 1000)
+        assert pool.hedge_delay(primary) == pytest.approx(0.019)
+
+
+class TestClientRouting:
+    @pytest.mark.asyncio
+    async def test_fails_over_without_backoff(self):
+        client = EvmRpcClient(PRIMARY, "ethereum", fallback_urls=[BACKUP])
+        session = _RoutedSession(statuses={PRIMARY: 503})
+        with patch.object(client, "_ensure_session", AsyncMock(return_value=session)):
+            assert await client._json_rpc("eth_blockNumber") == BACKUP
+
+        assert session.urls == [PRIMARY, BACKUP]
+        # A healthy endpoint was left, so the retry skipped the backoff sleep
+        assert client.metrics["failovers"] == 1
+        assert client.endpoints.endpoints[0].consecutive_failures == 1
+
+    @pytest.mark.asyncio
+    async def test_hedged_request_wins_on_slow_primary(self):
+        client = EvmRpcClient(PRIMARY, "ethereum", fallback_urls=[BACKUP], hedge=True)
+        primary = client.endpoints.endpoints[0]
+        for _ in range(20):
+            client.endpoints.record_success(primary, 10)
+
+        session = _RoutedSession(delays={PRIMARY: 5})
+        with patch.object(client, "_ensure_session", AsyncMock(return_value=session)):
+            assert await client._json_rpc("eth_blockNumber") == BACKUP
+
+        assert session.urls == [PRIMARY, BACKUP]
+        assert client.metrics["hedged_requests"] == 1
+        assert client.metrics["hedge_wins"] == 1
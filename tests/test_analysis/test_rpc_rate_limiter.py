@@ -0,0 +1,146 @@
+"""
+Unit tests for the RPC token-bucket rate limiters
+"""
+
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from src.collectors.rpc.evm_rpc import EvmRpcClient
+from src.collectors.rpc.rate_limiter import RedisTokenBucket
+from src.collectors.rpc.rate_limiter import TokenBucket
+from src.collectors.rpc.rate_limiter import create_rate_limiter
+from src.collectors.rpc.rate_limiter import get_method_weight
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = _Clock()
+    with patch("src.collectors.rpc.rate_limiter.time.monotonic", clock):
+        yield clock
+
+
+class TestTokenBucket:
+    @pytest.mark.asyncio
+    async def test_burst_then_wait(self, clock):
+        bucket = TokenBucket(rate_per_minute=60, capacity=3)
+        sleep = AsyncMock()
+        with patch("src.collectors.rpc.rate_limiter.asyncio.sleep", sleep):
+            waits = [await bucket.acquire() for _ in range(5)]
+
+        assert waits[:3] == [0, 0, 0]
+        # One token per second: callers queue behind each other's reservations
+        assert waits[3:] == pytest.approx([1.0, 2.0])
+        assert sleep.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_refill_is_capped_at_capacity(self, clock):
+        bucket = TokenBucket(rate_per_minute=60, capacity=2)
+        with patch("src.collectors.rpc.rate_limiter.asyncio.sleep", AsyncMock()):
+            await bucket.acquire(2)
+            clock.now += 100
+            assert await bucket.acquire(2) == 0
+            assert await bucket.acquire(1) == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_weighted_acquire(self, clock):
+        bucket = TokenBucket(rate_per_minute=60, capacity=10)
+        with patch("src.collectors.rpc.rate_limiter.asyncio.sleep", AsyncMock()):
+            assert await bucket.acquire(10) == 0
+            assert await bucket.acquire(5) == pytest.approx(5.0)
+
+
+class TestRedisTokenBucket:
+    @pytest.mark.asyncio
+    async def test_falls_back_to_local_bucket(self, clock):
+        bucket = RedisTokenBucket("node.example.com", rate_per_minute=60)
+        with patch(
+            "src.api.database.get_redis_pool", side_effect=RuntimeError("no redis")
+        ):
+            assert await bucket.acquire() == 0
+        assert bucket._degraded
+
+    @pytest.mark.asyncio
+    async def test_uses_shared_script_result(self):
+        bucket = RedisTokenBucket("node.example.com", rate_per_minute=60)
+        bucket._script = AsyncMock(return_value=b"0.25")
+        sleep = AsyncMock()
+        with patch("src.collectors.rpc.rate_limiter.asyncio.sleep", sleep):
+            assert await bucket.acquire(3) == 0.25
+
+        kwargs = bucket._script.await_args.kwargs
+        assert kwargs["keys"] == ["jackdaw:ratelimit:rpc:node.example.com"]
+        assert kwargs["args"] == [1.0, 60, 3]
+        sleep.assert_awaited_once_with(0.25)
+
+
+class TestClientIntegration:
+    def test_factory_selects_backend(self):
+        assert create_rate_limiter("https://a.example.com", 0) is None
+        assert isinstance(create_rate_limiter("https://a", 60), TokenBucket)
+        shared = create_rate_limiter(
+            "https://a.example.com/v1/key", 60, backend="redis"
+        )
+        assert shared.key.endswith(":a.example.com")
+
+    def test_method_weights(self):
+        assert get_method_weight("eth_blockNumber") == 1
+        assert get_method_weight("debug_traceTransaction") > 1
+
+    @pytest.mark.asyncio
+    async def test_batch_charged_like_heaviest_call(self):
+        client = EvmRpcClient("https://node.example.com", "ethereum")
+        payload = [
+            client._build_request("eth_blockNumber", []),
+            client._build_request("debug_traceTransaction", ["0x1"]),
+        ]
+        assert client._payload_weight(payload) == get_method_weight(
+            "debug_traceTransaction"
+        )
+
+        client._rate_limiter = AsyncMock()
+        client._rate_limiter.acquire.return_value = 0
+        await client._wait_for_rate_limit(11)
+        client._rate_limiter.acquire.assert_awaited_once_with(11)
+
+    def test_batch_item_weight_setting(self):
+        client = EvmRpcClient("https://node.example.com", "ethereum")
+        payload = [client._build_request("eth_getBalance", []) for _ in range(11)]
+        with patch(
+            "src.collectors.rpc.base_rpc.settings.RPC_BATCH_ITEM_WEIGHT", 0.1
+        ):
+            assert client._payload_weight(payload) == pytest.approx(2.0)
+
+    @pytest.mark.asyncio
+    async def test_large_batch_waits_no_longer_than_single_call(self, clock):
+        client = EvmRpcClient("https://node.example.com", "ethereum")
+        batch = [
+            client._build_request("eth_getTransactionReceipt", [hex(i)])
+            for i in range(100)
+        ]
+        single = client._build_request("eth_getTransactionReceipt", ["0x0"])
+
+        waits = []
+        with patch("src.collectors.rpc.rate_limiter.asyncio.sleep", AsyncMock()):
+            for payload in (single, batch):
+                bucket = TokenBucket(rate_per_minute=60)
+                await bucket.acquire(bucket.capacity)
+                waits.append(await bucket.acquire(client._payload_weight(payload)))
+
+        assert waits[1] <= waits[0]
+
+    @pytest.mark.asyncio
+    async def test_weight_clamped_to_capacity(self, clock):
+        bucket = TokenBucket(rate_per_minute=60, capacity=5)
+        with patch("src.collectors.rpc.rate_limiter.asyncio.sleep", AsyncMock()):
+            assert await bucket.acquire(500) == 0
+            assert await bucket.acquire(500) == pytest.approx(5.0)
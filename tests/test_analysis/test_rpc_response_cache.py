@@ -0,0 +1,172 @@
+"""
+Unit tests for the read-through RPC response cache and client finality rules
+"""
+
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from src.collectors.rpc.bitcoin_rpc import BitcoinRpcClient
+from src.collectors.rpc.evm_rpc import EvmRpcClient
+from src.collectors.rpc.response_cache import MISS
+from src.collectors.rpc.response_cache import CacheStore
+from src.collectors.rpc.response_cache import DiskCacheStore
+from src.collectors.rpc.response_cache import LRUByteCache
+from src.collectors.rpc.response_cache import ResponseCache
+from src.collectors.rpc.response_cache import cache_key
+from src.collectors.rpc.xrpl_rpc import XrplRpcClient
+
+
+class _DictStore(CacheStore):
+    def __init__(self):
+        self.data = {}
+
+    async def get_many(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, data):
+        self.data[key] = data
+
+
+def _evm_client():
+    client = EvmRpcClient("https://node.example.com", "ethereum")
+    client.cache = ResponseCache(max_bytes=1 << 20)
+    client.finality_depth = 10
+    return client
+
+
+class TestResponseCache:
+    def test_lru_evicts_by_bytes(self):
+        lru = LRUByteCache(max_bytes=10)
+        lru.set("a", b"1234")
+        lru.set("b", b"1234")
+        lru.get("a")
+        lru.set("c", b"1234")
+        assert lru.get("b") is None
+        assert lru.get("a") == b"1234"
+        assert lru.size == 8
+        assert lru.evictions == 1
+
+    @pytest.mark.asyncio
+    async def test_store_hits_are_promoted(self):
+        store = _DictStore()
+        await ResponseCache(1024, store).set("k", {"v": 1})
+        cache = ResponseCache(1024, store)
+
+        assert await cache.get_many(["k", "missing"]) == [{"v": 1}, MISS]
+        assert await cache.get("k") == {"v": 1}
+        metrics = cache.get_metrics()
+        assert metrics["store_hits"] == 1
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_store_errors_degrade_to_miss(self):
+        store = _DictStore()
+        store.get_many = AsyncMock(side_effect=ConnectionError("down"))
+        cache = ResponseCache(1024, store)
+        assert await cache.get("k") is MISS
+        assert cache.metrics["store_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_store_round_trip(self, tmp_path):
+        store = DiskCacheStore(str(tmp_path / "cache" / "rpc.sqlite3"))
+        await store.set("a", b"{}")
+        assert await store.get_many(["a", "b"]) == [b"{}", None]
+
+    @pytest.mark.asyncio
+    async def test_disk_store_evicts_least_recently_used(self, tmp_path):
+        store = DiskCacheStore(str(tmp_path / "rpc.sqlite3"), max_bytes=30)
+        for key in ("a", "b", "c"):
+            await store.set(key, b"x" * 10)
+        await store.get_many(["a"])  # oldest first: b, c, a
+        await store.set("d", b"x" * 10)
+
+        # Over budget: evicts down to 90% (27 bytes), dropping b then c
+        assert await store.get_many(["a", "b", "c", "d"]) == [
+            b"x" * 10,
+            None,
+            None,
+            b"x" * 10,
+        ]
+        assert store.size == 20 and store.evictions == 2
+
+        reopened = DiskCacheStore(store.path)
+        reopened._connection()
+        assert reopened.size == 20
+
+    def test_key_ignores_dict_order(self):
+        assert cache_key("eth", "m", [{"a": 1, "b": 2}]) == cache_key(
+            "eth", "m", [{"b": 2, "a": 1}]
+        )
+
+
+class TestEvmFinality:
+    @pytest.mark.asyncio
+    async def test_caches_only_below_finality_depth(self):
+        client = _evm_client()
+        responses = {
+            "eth_blockNumber": hex(100),
+            "0xold": {"hash": "0xold", "blockNumber": hex(80)},
+            "0xnew": {"hash": "0xnew", "blockNumber": hex(95)},
+            "0xpending": {"hash": "0xpending", "blockNumber": None},
+        }
+
+        async def post(payload, retries=2):
+            params = payload["params"]
+            return responses[params[0] if params else payload["method"]]
+
+        with patch.object(client, "_post", AsyncMock(side_effect=post)) as mock:
+            await client.get_latest_block_number()
+            for _ in range(2):
+                for tx_hash in ("0xold", "0xnew", "0xpending"):
+                    await client._json_rpc("eth_getTransactionByHash", [tx_hash])
+
+        # 1 tip + 3 txs, then only the two non-final txs again
+        assert mock.await_count == 6
+        assert client.cache.metrics["sets"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_skips_cached_items(self):
+        client = _evm_client()
+        session_calls = []
+
+        async def send_batch(calls, retries):
+            session_calls.append([method for method, _ in calls])
+            return [
+                hex(100) if method == "eth_blockNumber" else {"blockNumber": hex(1)}
+                for method, _ in calls
+            ]
+
+        calls = [
+            ("eth_getTransactionReceipt", ["0x1"]),
+            ("eth_blockNumber", []),
+        ]
+        with patch.object(client, "_send_batch", side_effect=send_batch):
+            first = await client.batch_call(calls)
+            second = await client.batch_call(calls)
+
+        assert first == second
+        # The receipt became final thanks to the tip fetched in the same batch
+        assert session_calls == [
+            ["eth_getTransactionReceipt", "eth_blockNumber"],
+            ["eth_blockNumber"],
+        ]
+
+
+class TestOtherChainFinality:
+    def test_bitcoin_requires_confirmations(self):
+        client = BitcoinRpcClient("https://btc.example.com")
+        assert client._is_final("getrawtransaction", [], {"confirmations": 6})
+        assert not client._is_final("getrawtransaction", [], {"confirmations": 2})
+        assert not client._is_final("getrawtransaction", [], {"txid": "unconfirmed"})
+
+    def test_xrpl_requires_validated_ledger(self):
+        client = XrplRpcClient("https://xrpl.example.com")
+        assert client._is_final("tx", [{}], {"validated": True})
+        assert not client._is_final("tx", [{}], {"validated": False})
+        assert client._is_final("ledger", [{"ledger_index": 5}], {"validated": True})
+        assert not client._is_final(
+            "ledger", [{"ledger_index": "validated"}], {"validated": True}
+        )
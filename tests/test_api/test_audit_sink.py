@@ -0,0 +1,80 @@
+"""
+Unit tests for the background audit log sink
+"""
+
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from src.api.audit_sink import AuditSink
+
+
+def _redis(fail=False):
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(
+        side_effect=ConnectionError("redis down") if fail else None
+    )
+    redis = MagicMock()
+    redis.pipeline.return_value = pipe
+
+    @asynccontextmanager
+    async def connection():
+        yield redis
+
+    return connection, pipe
+
+
+class TestAuditSink:
+    @pytest.mark.asyncio
+    async def test_concurrent_records_share_one_pipeline(self):
+        connection, pipe = _redis()
+        sink = AuditSink(batch_size=50, flush_interval=0.05)
+
+        with patch("src.api.audit_sink.get_redis_connection", connection):
+            for i in range(10):
+                assert sink.submit(f"REQ-{i}", {"request": {"n": i}}, ttl=60)
+            await asyncio.sleep(0.2)
+            await sink.close()
+
+        assert pipe.execute.await_count == 1
+        keys = [call.args[0] for call in pipe.setex.call_args_list]
+        assert keys == [f"audit:REQ-{i}" for i in range(10)]
+        assert json.loads(pipe.setex.call_args_list[3].args[2]) == {"request": {"n": 3}}
+        assert sink.metrics["written"] == 10
+        assert sink.metrics["batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_and_counts(self):
+        connection, pipe = _redis()
+        sink = AuditSink(max_queue_size=3, flush_interval=10)
+
+        with patch("src.api.audit_sink.get_redis_connection", connection):
+            accepted = [sink.submit(f"REQ-{i}", {}, ttl=60) for i in range(5)]
+            await sink.close()
+
+        assert accepted == [True, True, True, False, False]
+        assert sink.metrics["dropped"] == 2
+        assert sink.get_metrics()["queue_capacity"] == 3
+        assert sink.metrics["written"] == 3
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_appends_batch_to_file(self, tmp_path):
+        connection, _ = _redis(fail=True)
+        sink = AuditSink(flush_interval=0.01, log_dir=str(tmp_path))
+
+        with patch("src.api.audit_sink.get_redis_connection", connection):
+            for i in range(3):
+                sink.submit(f"REQ-{i}", {"request": {"n": i}}, ttl=60)
+            await asyncio.sleep(0.1)
+            sink.submit("REQ-3", {"request": {"n": 3}}, ttl=60)
+            await sink.close()
+
+        lines = (tmp_path / "audit_fallback.jsonl").read_text().splitlines()
+        assert [json.loads(line)["request"]["n"] for line in lines] == [0, 1, 2, 3]
+        assert sink.metrics["written_to_file"] == 4
+        assert sink.metrics["lost"] == 0
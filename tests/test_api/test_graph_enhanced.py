@@ -13,80 +13,67 @@ from unittest.mock import AsyncMock, MagicMock, patch
 # ---------------------------------------------------------------------------
 
 
+def _index_with(bridges=(), mixers=()):
+    """Protocol index holding only the given test addresses."""
+    from src.analysis.protocol_registry import ProtocolIndex, ProtocolMatch
+    labels = {("ethereum", a): ProtocolMatch("bridge", "low", "TestBridge") for a in bridges}
+    labels.update({("ethereum", a): ProtocolMatch("mixer", "high", "TestMixer") for a in mixers})
+    return ProtocolIndex(0, [], labels)
+
+
 class TestClassifyEdge:
     """Import and test _classify_edge() directly."""
 
-    @pytest.fixture(autouse=True)
-    def reset_address_caches(self):
-        """Reset module-level address caches between tests."""
-        import src.api.routers.graph as gmod
-        gmod._bridge_addresses = None
-        gmod._mixer_addresses = None
-        yield
-        gmod._bridge_addresses = None
-        gmod._mixer_addresses = None
-
     def test_unknown_addresses_return_transfer(self):
         from src.api.routers.graph import _classify_edge
-        with patch("src.api.routers.graph._get_known_bridge_addresses", return_value=set()), \
-             patch("src.api.routers.graph._get_known_mixer_addresses", return_value=set()):
+        with patch("src.api.routers.graph.get_protocol_index", return_value=_index_with()):
             result = _classify_edge("0xsender", "0xreceiver")
         assert result == "transfer"
 
     def test_bridge_source_returns_bridge(self):
         from src.api.routers.graph import _classify_edge
-        with patch("src.api.routers.graph._get_known_bridge_addresses",
-                   return_value={"0xbridgeaddr"}), \
-             patch("src.api.routers.graph._get_known_mixer_addresses", return_value=set()):
+        with patch("src.api.routers.graph.get_protocol_index",
+                   return_value=_index_with(bridges=["0xbridgeaddr"])):
             result = _classify_edge("0xbridgeaddr", "0xreceiver")
         assert result == "bridge"
 
     def test_bridge_target_returns_bridge(self):
         from src.api.routers.graph import _classify_edge
-        with patch("src.api.routers.graph._get_known_bridge_addresses",
-                   return_value={"0xbridgeaddr"}), \
-             patch("src.api.routers.graph._get_known_mixer_addresses", return_value=set()):
+        with patch("src.api.routers.graph.get_protocol_index",
+                   return_value=_index_with(bridges=["0xbridgeaddr"])):
             result = _classify_edge("0xsender", "0xbridgeaddr")
         assert result == "bridge"
 
     def test_mixer_address_returns_mixer(self):
         from src.api.routers.graph import _classify_edge
-        with patch("src.api.routers.graph._get_known_bridge_addresses", return_value=set()), \
-             patch("src.api.routers.graph._get_known_mixer_addresses",
-                   return_value={"0xmixercontract"}):
+        with patch("src.api.routers.graph.get_protocol_index",
+                   return_value=_index_with(mixers=["0xmixercontract"])):
             result = _classify_edge("0xmixercontract", "0xreceiver")
         assert result == "mixer"
 
     def test_dex_registry_address_returns_dex(self):
         # Uniswap V2 router — present in the protocol registry
         from src.api.routers.graph import _classify_edge
-        with patch("src.api.routers.graph._get_known_bridge_addresses", return_value=set()), \
-             patch("src.api.routers.graph._get_known_mixer_addresses", return_value=set()):
-            result = _classify_edge("0xsender", "0x7a250d5630b4cf539739df2c5dacb4c659f2488d")
+        result = _classify_edge("0xsender", "0x7a250d5630b4cf539739df2c5dacb4c659f2488d")
         assert result == "dex"
 
     def test_bridge_takes_priority_over_mixer(self):
         from src.api.routers.graph import _classify_edge
-        addr = "0xambiguous"
-        with patch("src.api.routers.graph._get_known_bridge_addresses", return_value={addr}), \
-             patch("src.api.routers.graph._get_known_mixer_addresses", return_value={addr}):
-            result = _classify_edge(addr, "0xother")
+        with patch("src.api.routers.graph.get_protocol_index",
+                   return_value=_index_with(bridges=["0xbridge"], mixers=["0xmixer"])):
+            result = _classify_edge("0xmixer", "0xbridge")
         assert result == "bridge"
 
     def test_case_insensitive_matching(self):
         from src.api.routers.graph import _classify_edge
-        # _classify_edge lowercases inputs; address sets should contain lowercase values
-        with patch("src.api.routers.graph._get_known_bridge_addresses",
-                   return_value={"0xbridgeaddr"}), \
-             patch("src.api.routers.graph._get_known_mixer_addresses", return_value=set()):
+        with patch("src.api.routers.graph.get_protocol_index",
+                   return_value=_index_with(bridges=["0xBridgeAddr"])):
             result = _classify_edge("0xBRIDGEADDR", "0xreceiver")
         assert result == "bridge"
 
     def test_empty_addresses_return_transfer(self):
         from src.api.routers.graph import _classify_edge
-        with patch("src.api.routers.graph._get_known_bridge_addresses", return_value=set()), \
-             patch("src.api.routers.graph._get_known_mixer_addresses", return_value=set()):
-            result = _classify_edge("", "")
+        result = _classify_edge("", "")
         assert result == "transfer"
 
 
@@ -129,8 +116,7 @@ class TestGraphExpandEdgeType:
         with patch("src.api.routers.graph.get_neo4j_session", return_value=neo4j_ctx), \
              patch("src.api.routers.graph._enrich_sanctions", new_callable=AsyncMock), \
              patch("src.api.routers.graph._enrich_entities", new_callable=AsyncMock), \
-             patch("src.api.routers.graph._get_known_bridge_addresses", return_value=set()), \
-             patch("src.api.routers.graph._get_known_mixer_addresses", return_value=set()):
+             patch("src.api.routers.graph.get_protocol_index", return_value=_index_with()):
 
             resp = client.post("/api/v1/graph/expand", json={
                 "address": "0xseed",
@@ -161,8 +147,7 @@ class TestGraphExpandEdgeType:
         with patch("src.api.routers.graph.get_neo4j_session", return_value=neo4j_ctx), \
              patch("src.api.routers.graph._enrich_sanctions", new_callable=AsyncMock), \
              patch("src.api.routers.graph._enrich_entities", new_callable=AsyncMock), \
-             patch("src.api.routers.graph._get_known_bridge_addresses", return_value=set()), \
-             patch("src.api.routers.graph._get_known_mixer_addresses", return_value=set()):
+             patch("src.api.routers.graph.get_protocol_index", return_value=_index_with()):
 
             resp = client.post("/api/v1/graph/expand", json={
                 "address": "0xseed",
@@ -233,3 +218,97 @@ class TestGraphSearchEndpoint:
     def test_search_requires_auth(self, client):
         resp = client.post("/api/v1/graph/search", json={"query": "0xabc"})
         assert resp.status_code == 403
+
+
+# ---------------------------------------------------------------------------
+# Bulk sanctions / entity enrichment
+# ---------------------------------------------------------------------------
+
+
+class TestEnrichNodes:
+    """_enrich_nodes() screens all nodes with one bulk query per source."""
+
+    @pytest.fixture(autouse=True)
+    def reset_enrichment_caches(self):
+        import src.api.routers.graph as gmod
+        gmod._entity_cache.clear()
+        yield
+        gmod._entity_cache.clear()
+
+    @staticmethod
+    def _nodes(*addresses):
+        return {a: {"id": a, "label": None, "risk": 0} for a in addresses}
+
+    @pytest.mark.asyncio
+    async def test_bulk_queries_and_cache(self):
+        from src.api.routers.graph import _enrich_nodes
+
+        async def screen(addresses, blockchain):
+            return [{"address": a, "matched": a == "0xBad"} for a in addresses]
+
+        screen_mock = AsyncMock(side_effect=screen)
+        entity_mock = AsyncMock(return_value={
+            "0xexchange": {"entity_name": "Exchange", "risk_level": "low"},
+        })
+        with patch("src.api.routers.graph._sanctions_screen_bulk", screen_mock), \
+             patch("src.api.routers.graph._entity_lookup_bulk", entity_mock):
+            nodes = self._nodes("0xBad", "0xExchange", "0xplain")
+            await _enrich_nodes(nodes, "ethereum")
+            # Second expand over overlapping addresses hits the entity cache
+            await _enrich_nodes(self._nodes("0xBad", "0xnew"), "ethereum")
+
+        assert nodes["0xBad"]["sanctioned"] is True
+        assert nodes["0xBad"]["label"] == "sanctioned"
+        assert nodes["0xExchange"]["entity_name"] == "Exchange"
+        assert "sanctioned" not in nodes["0xplain"]
+        assert screen_mock.await_count == 2
+        assert entity_mock.await_args_list[1].args[0] == ["0xnew"]
+
+    @pytest.mark.asyncio
+    async def test_sanctions_are_screened_on_every_expand(self):
+        from src.api.routers.graph import _enrich_nodes
+
+        listed = set()
+
+        async def screen(addresses, blockchain):
+            return [{"address": a, "matched": a in listed} for a in addresses]
+
+        with patch("src.api.routers.graph._sanctions_screen_bulk",
+                   AsyncMock(side_effect=screen)), \
+             patch("src.api.routers.graph._entity_lookup_bulk",
+                   AsyncMock(return_value={})):
+            first = self._nodes("0xa")
+            await _enrich_nodes(first, "ethereum")
+            listed.add("0xa")  # designated between two expands
+            second = self._nodes("0xa")
+            await _enrich_nodes(second, "ethereum")
+
+        assert "sanctioned" not in first["0xa"]
+        assert second["0xa"]["sanctioned"] is True
+
+    @pytest.mark.asyncio
+    async def test_sanctions_label_wins_over_entity_label(self):
+        from src.api.routers.graph import _enrich_nodes
+
+        screen_mock = AsyncMock(return_value=[{"address": "0xa", "matched": True}])
+        entity_mock = AsyncMock(return_value={"0xa": {"entity_name": "Mixer"}})
+        with patch("src.api.routers.graph._sanctions_screen_bulk", screen_mock), \
+             patch("src.api.routers.graph._entity_lookup_bulk", entity_mock):
+            nodes = self._nodes("0xa")
+            await _enrich_nodes(nodes, "ethereum")
+
+        assert nodes["0xa"]["label"] == "sanctioned"
+        assert nodes["0xa"]["entity_name"] == "Mixer"
+
+    @pytest.mark.asyncio
+    async def test_lookup_failures_are_not_cached(self):
+        import src.api.routers.graph as gmod
+
+        failing = AsyncMock(side_effect=RuntimeError("pool not initialised"))
+        with patch("src.api.routers.graph._sanctions_screen_bulk", failing), \
+             patch("src.api.routers.graph._entity_lookup_bulk", failing):
+            nodes = self._nodes("0xa")
+            await gmod._enrich_nodes(nodes, "ethereum")
+
+        assert "sanctioned" not in nodes["0xa"]
+        assert len(gmod._entity_cache) == 0
@@ -0,0 +1,98 @@
+"""
+Unit tests for progress tracking of streamed batch pattern jobs
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from src.api.routers import patterns
+from src.patterns import BatchPatternStreamRequest
+from src.patterns import PatternAnalysisResult
+
+
+class _SlowJobStore:
+    """Records completed indices after a delay, like a slow Redis round trip"""
+
+    def __init__(self):
+        self.completed = []
+        self.writing = asyncio.Event()
+        self.recorded = asyncio.Event()
+
+    async def mark_completed(self, job_id, indices):
+        if not indices:
+            return
+        self.writing.set()
+        await asyncio.sleep(0.05)
+        self.completed.extend(indices)
+        self.recorded.set()
+
+
+class _StalledDetector:
+    """Streams one result, then hangs as if the next analysis never finishes"""
+
+    async def stream_batch_patterns(self, addresses, blockchain, **kwargs):
+        yield 0, addresses[0], PatternAnalysisResult(
+            address=addresses[0], blockchain=blockchain
+        )
+        await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_does_not_lose_delivered_progress():
+    store = _SlowJobStore()
+    request = BatchPatternStreamRequest(addresses=["0xa", "0xb"], blockchain="ethereum")
+    received = asyncio.Event()
+
+    async def consume():
+        async for event in patterns._stream_batch_job("job", request, set(), "ndjson"):
+            if '"result"' in event:
+                received.set()
+
+    with patch.object(patterns, "_batch_jobs", store), patch.object(
+        patterns, "pattern_detector", _StalledDetector()
+    ):
+        task = asyncio.create_task(consume())
+        await received.wait()
+        task.cancel()
+        await store.writing.wait()
+        # Cancelled again mid-write, as anyio does until the task exits
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        await asyncio.wait_for(store.recorded.wait(), timeout=1)
+    assert store.completed == [0]
+
+
+class _FailingJobStore:
+    async def mark_completed(self, job_id, indices):
+        raise ConnectionError("redis unavailable")
+
+
+class _FastDetector:
+    async def stream_batch_patterns(self, addresses, blockchain, **kwargs):
+        for index, address in enumerate(addresses):
+            yield index, address, PatternAnalysisResult(
+                address=address, blockchain=blockchain
+            )
+
+
+@pytest.mark.asyncio
+async def test_progress_write_failure_does_not_truncate_stream():
+    addresses = [f"0x{i}" for i in range(5)]
+    request = BatchPatternStreamRequest(addresses=addresses, blockchain="ethereum")
+
+    with patch.object(patterns, "_batch_jobs", _FailingJobStore()), patch.object(
+        patterns, "pattern_detector", _FastDetector()
+    ), patch.object(patterns, "_BATCH_PROGRESS_EVERY", 2):
+        events = [
+            event
+            async for event in patterns._stream_batch_job(
+                "job", request, set(), "ndjson"
+            )
+        ]
+
+    assert sum('"event": "result"' in event for event in events) == 5
+    assert '"event": "summary"' in events[-1]
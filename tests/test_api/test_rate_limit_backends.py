@@ -0,0 +1,177 @@
+"""
+Unit tests for the API rate limit backends and RateLimitMiddleware
+"""
+
+from datetime import datetime
+from datetime import timezone
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from fastapi import Request
+from fastapi import Response
+
+from src.api.middleware import RateLimitMiddleware
+from src.rate_limiting.backends import Limit
+from src.rate_limiting.backends import LocalRateLimitBackend
+from src.rate_limiting.backends import RedisRateLimitBackend
+from src.rate_limiting.backends import create_rate_limit_backend
+from src.rate_limiting.compliance_rate_limiting import ComplianceRateLimitingEngine
+from src.rate_limiting.compliance_rate_limiting import RateLimitRequest
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    clock = _Clock()
+    with patch("src.rate_limiting.backends.time.time", clock):
+        yield clock
+
+
+class TestLocalRateLimitBackend:
+    @pytest.mark.asyncio
+    async def test_full_allowance_then_one_per_interval(self, clock):
+        backend = LocalRateLimitBackend()
+        limits = [Limit("k", 3, 60)]
+
+        decisions = [await backend.hit(limits) for _ in range(4)]
+
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert [d.remaining[0] for d in decisions[:3]] == [2, 1, 0]
+        assert decisions[3].retry_after == pytest.approx(20)
+
+        clock.now += 20
+        assert (await backend.hit(limits)).allowed
+        assert not (await backend.hit(limits)).allowed
+
+    @pytest.mark.asyncio
+    async def test_denied_request_consumes_no_limit(self, clock):
+        backend = LocalRateLimitBackend()
+        limits = [Limit("minute", 5, 60), Limit("burst", 1, 10)]
+
+        assert (await backend.hit(limits)).allowed
+        denied = await backend.hit(limits)
+        status = await backend.hit(limits, cost=0)
+
+        assert not denied.allowed
+        assert denied.retry_after == pytest.approx(10)
+        assert status.remaining == [4, 0]
+        assert status.reset_after == pytest.approx([12, 10])
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_keys_are_evicted(self, clock):
+        backend = LocalRateLimitBackend(max_keys=2)
+        for key in ("a", "b", "a", "c"):
+            await backend.hit([Limit(key, 1, 60)])
+
+        assert list(backend._tats) == ["a", "c"]
+        assert (await backend.hit([Limit("b", 1, 60)])).allowed
+
+
+class TestRedisRateLimitBackend:
+    @pytest.mark.asyncio
+    async def test_one_script_call_for_all_limits(self):
+        backend = RedisRateLimitBackend()
+        backend._script = AsyncMock(
+            return_value=[b"0", b"2.5", b"4", b"12.0", b"0", b"10.0"]
+        )
+
+        decision = await backend.hit([Limit("m", 5, 60), Limit("b", 1, 10)])
+
+        assert backend._script.await_count == 1
+        kwargs = backend._script.await_args.kwargs
+        assert kwargs["keys"] == ["m", "b"]
+        assert kwargs["args"] == [1, 5, 60, 1, 10]
+        assert not decision.allowed
+        assert decision.retry_after == 2.5
+        assert decision.remaining == [4, 0]
+        assert decision.reset_after == [12.0, 10.0]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_local_limits(self):
+        backend = RedisRateLimitBackend()
+        with patch(
+            "src.api.database.get_redis_pool", side_effect=RuntimeError("no redis")
+        ):
+            first = await backend.hit([Limit("k", 1, 60)])
+            second = await backend.hit([Limit("k", 1, 60)])
+
+        assert first.allowed and not second.allowed
+        assert backend._degraded
+
+    def test_factory_selects_backend(self):
+        assert isinstance(create_rate_limit_backend("redis"), RedisRateLimitBackend)
+        assert isinstance(create_rate_limit_backend("local"), LocalRateLimitBackend)
+
+
+def _request(ip="203.0.113.7"):
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/v1/analysis",
+            "headers": [],
+            "query_string": b"",
+            "client": (ip, 5000),
+        }
+    )
+
+
+class TestRateLimitMiddleware:
+    @pytest.mark.asyncio
+    async def test_headers_and_429(self, monkeypatch):
+        monkeypatch.delenv("TESTING", raising=False)
+        middleware = RateLimitMiddleware(
+            None,
+            requests_per_minute=2,
+            burst_size=10,
+            backend=LocalRateLimitBackend(),
+        )
+
+        async def call_next(request):
+            return Response("ok")
+
+        response = await middleware.dispatch(_request(), call_next)
+        assert response.headers["X-RateLimit-Limit-Minute"] == "2"
+        assert response.headers["X-RateLimit-Remaining-Minute"] == "1"
+        assert response.headers["X-RateLimit-Remaining-Hour"] == "999"
+        assert response.headers["X-RateLimit-Reset-Minute"] == "30"
+
+        await middleware.dispatch(_request(), call_next)
+        with pytest.raises(HTTPException) as exc:
+            await middleware.dispatch(_request(), call_next)
+        assert exc.value.status_code == 429
+        assert int(exc.value.headers["Retry-After"]) > 0
+
+        other = await middleware.dispatch(_request("198.51.100.1"), call_next)
+        assert other.status_code == 200
+
+
+class TestComplianceEngineBackend:
+    @pytest.mark.asyncio
+    async def test_tiered_rule_counts_through_backend(self):
+        engine = ComplianceRateLimitingEngine()
+        request = RateLimitRequest(
+            request_id="r",
+            user_id="analyst",
+            ip_address="203.0.113.7",
+            endpoint="/api/v1/compliance/export",
+            method="GET",
+            timestamp=datetime.now(timezone.utc),
+        )
+
+        results = [await engine.check_rate_limit(request) for _ in range(6)]
+
+        assert all(r.allowed for r in results[:5])
+        assert not results[5].allowed
+        assert results[5].rule_id == "data_export"
+        status = await engine.get_rate_limit_status(user_id="analyst")
+        assert status["user_status"]["data_export"]["current_count"] == 5
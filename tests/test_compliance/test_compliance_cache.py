@@ -0,0 +1,120 @@
+"""
+Compliance cache maintenance tests — SCAN-based cleanup_expired_cache.
+"""
+
+import pytest
+
+from src.cache.compliance_cache import ComplianceCacheManager
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __len__(self):
+        return len(self.commands)
+
+    def ttl(self, key):
+        self.commands.append(("ttl", key))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    async def execute(self):
+        self.redis.pipelines.append(list(self.commands))
+        results = []
+        for command in self.commands:
+            if command[0] == "ttl":
+                results.append(self.redis.ttls.pop(command[1], -2))
+            else:
+                self.redis.expired[command[1]] = command[2]
+                results.append(True)
+        return results
+
+
+class _FakeRedis:
+    """Keyspace of ``{key: ttl}`` served by a SCAN over fixed-size pages"""
+
+    def __init__(self, ttls, page_size=2):
+        self.ttls = dict(ttls)
+        self.pages = [
+            list(self.ttls)[i : i + page_size]
+            for i in range(0, len(self.ttls), page_size)
+        ]
+        self.pipelines = []
+        self.expired = {}
+        self.store = {}
+        self.used_memory = [2048, 1024]
+
+    async def scan(self, cursor=0, match=None, count=None):
+        next_cursor = cursor + 1 if cursor + 1 < len(self.pages) else 0
+        return next_cursor, self.pages[cursor] if self.pages else []
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    async def info(self, section=None):
+        return {"used_memory": self.used_memory.pop(0)}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = str(value)
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+
+class TestCleanupExpiredCache:
+    """Test suite for ComplianceCacheManager.cleanup_expired_cache"""
+
+    @pytest.mark.asyncio
+    async def test_full_pass_applies_ttls_and_counts_expired(self):
+        redis = _FakeRedis(
+            {
+                "compliance:case:1": -1,
+                "compliance:case:2": -2,
+                "compliance:risk_assessment:a": 100,
+                "compliance:custom:x": -1,
+            }
+        )
+        manager = ComplianceCacheManager(redis)
+
+        stats = await manager.cleanup_expired_cache()
+
+        assert stats["complete"] is True
+        assert stats["keys_scanned"] == 4
+        assert stats["batches"] == 2
+        assert stats["cases"] == 1
+        assert stats["total_cleaned"] == 1
+        assert stats["ttl_applied"] == 2
+        assert stats["memory_reclaimed_bytes"] == 1024
+        assert stats["by_category"]["case"] == {
+            "scanned": 2,
+            "expired": 1,
+            "ttl_applied": 1,
+        }
+        assert redis.expired == {
+            "compliance:case:1": manager.ttl_config["case"],
+            "compliance:custom:x": manager.default_ttl,
+        }
+        # One TTL pipeline per batch, plus one EXPIRE pipeline where needed
+        assert [len(p) for p in redis.pipelines] == [2, 1, 2, 1]
+        assert manager.cleanup_cursor_key not in redis.store
+
+    @pytest.mark.asyncio
+    async def test_time_budget_saves_cursor_for_next_run(self):
+        redis = _FakeRedis({f"compliance:case:{i}": 60 for i in range(6)})
+        manager = ComplianceCacheManager(redis)
+
+        first = await manager.cleanup_expired_cache(time_budget=0)
+        assert first["complete"] is False
+        assert first["keys_scanned"] == 2
+        assert redis.store[manager.cleanup_cursor_key] == "1"
+
+        redis.used_memory = [0, 0]
+        second = await manager.cleanup_expired_cache()
+        assert second["complete"] is True
+        assert second["keys_scanned"] == 4
@@ -9,22 +9,34 @@ Covers:
 """
 
 import json
+import random
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from src.monitoring.alert_rules import (
+    CompiledRules,
     _matches,
     _new_rule,
     create_rule,
     delete_rule,
     evaluate_transaction,
+    evaluate_transactions,
     get_recent_alerts,
     get_rule,
+    get_rule_engine,
     list_rules,
     update_rule,
 )
 
 
+@pytest.fixture(autouse=True)
+def fresh_rule_engine():
+    """Each test loads its own rules instead of the previous test's."""
+    get_rule_engine().invalidate()
+    yield
+    get_rule_engine().invalidate()
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -44,6 +56,15 @@ def _pg_pool(fetchrow=None, fetch=None, execute=None):
     return pool, conn
 
 
+def _redis():
+    """Redis client mock whose pipeline records published messages."""
+    redis = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    redis.pipeline = MagicMock(return_value=pipe)
+    return redis, pipe
+
+
 def _sample_tx(
     hash="0xdeadbeef",
     from_addr="0xsender",
@@ -150,9 +171,7 @@ class TestEvaluateTransaction:
             "enabled": True,
         }
         pool, conn = _pg_pool()
-        redis = AsyncMock()
-        redis.publish = AsyncMock(return_value=1)
-        redis.pubsub = MagicMock(return_value=AsyncMock())
+        redis, pipe = _redis()
 
         with patch("src.monitoring.alert_rules.list_rules", new_callable=AsyncMock, return_value=[rule]), \
              patch("src.monitoring.alert_rules.get_postgres_pool", return_value=pool), \
@@ -162,6 +181,11 @@ class TestEvaluateTransaction:
         assert len(fired) == 1
         assert fired[0]["rule_name"] == "Whale alert"
         assert fired[0]["severity"] == "high"
+        conn.executemany.assert_awaited_once()
+        # Alerts of rules deleted since compilation are skipped, not fatal
+        assert "WHERE EXISTS" in conn.executemany.await_args.args[0]
+        pipe.publish.assert_called_once()
+        pipe.execute.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_does_not_fire_non_matching_rule(self):
@@ -193,8 +217,8 @@ class TestEvaluateTransaction:
             "enabled": True,
         }
         pool, _ = _pg_pool()
-        redis = AsyncMock()
-        redis.publish = AsyncMock(side_effect=Exception("Redis down"))
+        redis, pipe = _redis()
+        pipe.execute = AsyncMock(side_effect=Exception("Redis down"))
 
         with patch("src.monitoring.alert_rules.list_rules", new_callable=AsyncMock, return_value=[rule]), \
              patch("src.monitoring.alert_rules.get_postgres_pool", return_value=pool), \
@@ -213,8 +237,7 @@ class TestEvaluateTransaction:
         rules[0]["id"] = "dddddddd-dddd-dddd-dddd-dddddddddddd"
         rules[1]["id"] = "eeeeeeee-eeee-eeee-eeee-eeeeeeeeeeee"
         pool, _ = _pg_pool()
-        redis = AsyncMock()
-        redis.publish = AsyncMock(return_value=1)
+        redis, _ = _redis()
 
         with patch("src.monitoring.alert_rules.list_rules", new_callable=AsyncMock, return_value=rules), \
              patch("src.monitoring.alert_rules.get_postgres_pool", return_value=pool), \
@@ -224,6 +247,81 @@ class TestEvaluateTransaction:
         assert len(fired) == 2
 
 
+class TestCompiledRules:
+    def test_index_matches_linear_scan(self):
+        rng = random.Random(7)
+        addresses = ["0xa", "0xb", "0xc", "0xd"]
+        rules = []
+        for i in range(300):
+            conditions = {}
+            if rng.random() < 0.5:
+                conditions["address_match"] = rng.choice(addresses).upper()
+            if rng.random() < 0.5:
+                conditions["chain"] = rng.choice(["ethereum", "BSC"])
+            if rng.random() < 0.6:
+                conditions["value_gte"] = rng.choice([0, 1, 5, 10, "bad"])
+            if rng.random() < 0.2:
+                conditions["pattern_type"] = "layering"
+            rule = _new_rule(f"rule {i}", conditions)
+            rules.append(rule)
+        compiled = CompiledRules(rules)
+
+        for _ in range(200):
+            tx = _sample_tx(
+                from_addr=rng.choice(addresses + ["0xe"]),
+                to_addr=rng.choice(addresses + ["0xe"]),
+                value=rng.choice([0, 0.5, 1, 7, 20, None, "junk"]),
+                blockchain=rng.choice(["ethereum", "bsc", "bitcoin"]),
+            )
+            patterns = rng.choice([None, ["layering"]])
+            expected = [rule for rule in rules if _matches(rule, tx, patterns)]
+            assert compiled.match(tx, patterns) == expected
+
+    @pytest.mark.asyncio
+    async def test_batch_writes_once_and_rules_load_once(self):
+        rules = [
+            _new_rule("watch", {"address_match": "0xsender"}),
+            _new_rule("whale", {"value_gte": 10}),
+        ]
+        pool, conn = _pg_pool()
+        redis, pipe = _redis()
+        load = AsyncMock(return_value=rules)
+
+        with patch("src.monitoring.alert_rules.list_rules", load), \
+             patch("src.monitoring.alert_rules.get_postgres_pool", return_value=pool), \
+             patch("src.monitoring.alert_rules.get_redis_client", return_value=redis):
+            fired = await evaluate_transactions(
+                [_sample_tx(hash=f"0x{i}", value=i * 5) for i in range(4)]
+            )
+            await evaluate_transaction(_sample_tx())
+
+        assert len(fired) == 6  # every tx is watched, two are whales
+        assert load.await_count == 1
+        assert conn.executemany.await_count == 2
+        rows = conn.executemany.await_args_list[0].args[1]
+        assert len(rows) == 6
+        rule_ids, counts = conn.execute.await_args_list[0].args[1:]
+        assert sorted(counts) == [2, 4]
+        assert pipe.publish.call_count == 7
+        assert pipe.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_rule_changes_invalidate_compiled_rules(self):
+        pool, _ = _pg_pool()
+        redis, _ = _redis()
+        load = AsyncMock(return_value=[])
+
+        with patch("src.monitoring.alert_rules.list_rules", load), \
+             patch("src.monitoring.alert_rules.get_postgres_pool", return_value=pool), \
+             patch("src.monitoring.alert_rules.get_redis_client", return_value=redis):
+            await evaluate_transaction(_sample_tx())
+            await create_rule("new", {})
+            await evaluate_transaction(_sample_tx())
+
+        assert load.await_count == 2
+        redis.publish.assert_awaited_once()
+
+
 # ---------------------------------------------------------------------------
 # CRUD API tests
 # ---------------------------------------------------------------------------
@@ -197,3 +197,16 @@ class TestRecentAlerts:
     def test_limit_param_validated(self, client, auth_headers):
         resp = client.get("/api/v1/alerts/recent?limit=0", headers=auth_headers)
         assert resp.status_code == 422
+
+
+class TestMonitorStatus:
+    def test_requires_auth(self, client):
+        resp = client.get("/api/v1/alerts/monitor")
+        assert resp.status_code == 403
+
+    def test_returns_per_chain_lag(self, client, auth_headers):
+        status = {"ethereum": {"tip": 110, "cursor": 100, "lag": 10}}
+        with patch("src.api.routers.alerts.get_monitor_status", return_value=status):
+            resp = client.get("/api/v1/alerts/monitor", headers=auth_headers)
+        assert resp.status_code == 200
+        assert resp.json()["chains"]["ethereum"]["lag"] == 10
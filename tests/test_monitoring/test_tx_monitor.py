@@ -0,0 +1,226 @@
+"""
+Unit tests for the M12 transaction monitor.
+
+Covers:
+  - ChainMonitor.poll() — cursor resume, catch-up, retry after failures
+  - ChainMonitor lease — one worker per chain, cursor never lowered
+  - ChainMonitor._observe_tip() — block time and poll interval adaptation
+"""
+
+from unittest.mock import AsyncMock
+from unittest.mock import patch
+
+import pytest
+
+from src.monitoring.tx_monitor import _ACQUIRE_LEASE_SCRIPT
+from src.monitoring.tx_monitor import ChainMonitor
+
+
+class FakeClient:
+    supports_block_transactions = True
+
+    def __init__(self, tip, txs_per_block=3, failing=()):
+        self.tip = tip
+        self.txs_per_block = txs_per_block
+        self.failing = set(failing)
+        self.fetched = []
+
+    async def get_latest_block_number(self):
+        return self.tip
+
+    async def get_block_transactions(self, number):
+        self.fetched.append(number)
+        if number in self.failing:
+            raise ConnectionError("rpc timeout")
+        return [
+            {"hash": f"0x{number}-{i}", "from": "0xa", "to": "0xb", "value": 1.0}
+            for i in range(self.txs_per_block)
+        ]
+
+
+class FakeRedis:
+    """Dict-backed stand-in running the monitor's lease and cursor scripts."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def eval(self, script, numkeys, *args):
+        keys, argv = args[:numkeys], args[numkeys:]
+        if script == _ACQUIRE_LEASE_SCRIPT:
+            owner = self.store.get(keys[0])
+            if owner == argv[0]:
+                return 1
+            if owner is None:
+                self.store[keys[0]] = argv[0]
+                return 2
+            return 0
+        # Advance cursor
+        if self.store.get(keys[1]) != argv[0]:
+            return -1
+        current = self.store.get(keys[0])
+        if current is not None and int(current) >= argv[1]:
+            return int(current)
+        self.store[keys[0]] = argv[1]
+        return argv[1]
+
+
+@pytest.fixture
+def redis_store():
+    redis = FakeRedis()
+    with patch("src.monitoring.tx_monitor.get_redis_client", return_value=redis):
+        yield redis.store
+
+
+@pytest.fixture
+def evaluated():
+    batches = []
+
+    async def fake_evaluate(txs):
+        batches.append(list(txs))
+        return []
+
+    with patch(
+        "src.monitoring.tx_monitor.evaluate_transactions", side_effect=fake_evaluate
+    ):
+        yield batches
+
+
+KEY = "jackdaw:monitor:last_block:ethereum"
+LEASE = "jackdaw:monitor:lease:ethereum"
+
+
+class TestChainMonitorPoll:
+    @pytest.mark.asyncio
+    async def test_first_start_begins_at_tip(self, redis_store, evaluated):
+        monitor = ChainMonitor("ethereum", FakeClient(tip=500))
+
+        assert await monitor.poll() == 1
+        assert monitor.cursor == 500
+        assert redis_store[KEY] == 500
+        assert [tx["hash"] for tx in evaluated[0]] == ["0x500-0", "0x500-1", "0x500-2"]
+
+    @pytest.mark.asyncio
+    async def test_catches_up_every_block_and_transaction(self, redis_store, evaluated):
+        redis_store[KEY] = b"100"
+        client = FakeClient(tip=110, txs_per_block=120)
+        monitor = ChainMonitor("ethereum", client, concurrency=4)
+
+        assert await monitor.poll() == 10
+        assert sorted(client.fetched) == list(range(101, 111))
+        assert len(evaluated) == 10
+        assert all(len(batch) == 120 for batch in evaluated)
+        assert evaluated[0][0]["hash"] == "0x101-0"
+        assert evaluated[-1][0]["blockchain"] == "ethereum"
+        assert monitor.status()["lag"] == 0
+        assert monitor.metrics["transactions_evaluated"] == 1200
+        assert redis_store[KEY] == 110
+
+    @pytest.mark.asyncio
+    async def test_failed_block_is_retried_next_poll(self, redis_store, evaluated):
+        redis_store[KEY] = 100
+        client = FakeClient(tip=106, failing={103})
+        monitor = ChainMonitor("ethereum", client, concurrency=4)
+
+        with pytest.raises(RuntimeError, match="block 103"):
+            await monitor.poll()
+        assert monitor.cursor == 102
+        assert redis_store[KEY] == 102
+        assert monitor.lag == 4
+
+        client.failing.clear()
+        assert await monitor.poll() == 4
+        assert [batch[0]["hash"] for batch in evaluated] == [
+            f"0x{n}-0" for n in range(101, 107)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_evaluation_failure_does_not_advance_cursor(self, redis_store):
+        redis_store[KEY] = 100
+        monitor = ChainMonitor("ethereum", FakeClient(tip=102))
+
+        with patch(
+            "src.monitoring.tx_monitor.evaluate_transactions",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("postgres down"),
+        ):
+            with pytest.raises(RuntimeError):
+                await monitor.poll()
+        assert monitor.cursor == 100
+        assert redis_store[KEY] == 100
+
+    @pytest.mark.asyncio
+    async def test_backlog_beyond_limit_is_skipped(self, redis_store, evaluated):
+        redis_store[KEY] = 0
+        monitor = ChainMonitor("ethereum", FakeClient(tip=1000), max_backlog=5)
+
+        assert await monitor.poll() == 5
+        assert monitor.metrics["blocks_skipped"] == 995
+        assert evaluated[0][0]["hash"] == "0x996-0"
+
+
+class TestLease:
+    @pytest.mark.asyncio
+    async def test_only_lease_holder_follows_the_chain(self, redis_store, evaluated):
+        redis_store[KEY] = 100
+        client = FakeClient(tip=105)
+        leader = ChainMonitor("ethereum", client)
+        standby = ChainMonitor("ethereum", client)
+
+        assert await leader.poll() == 5
+        assert await standby.poll() == 0
+        assert len(evaluated) == 5
+        assert leader.status()["leader"] is True
+        assert standby.status()["leader"] is False
+
+        # The standby takes over from the shared cursor once the lease expires
+        del redis_store[LEASE]
+        client.tip = 107
+        assert await standby.poll() == 2
+        assert [batch[0]["hash"] for batch in evaluated[5:]] == ["0x106-0", "0x107-0"]
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_stops_poll_without_lowering_cursor(self, redis_store):
+        redis_store[KEY] = 100
+        monitor = ChainMonitor("ethereum", FakeClient(tip=106), concurrency=2)
+
+        async def lease_expires_mid_poll(txs):
+            # Another worker takes over and gets ahead
+            redis_store[LEASE] = "other"
+            redis_store[KEY] = 110
+            return []
+
+        with patch(
+            "src.monitoring.tx_monitor.evaluate_transactions",
+            side_effect=lease_expires_mid_poll,
+        ):
+            assert await monitor.poll() == 2
+
+        assert redis_store[KEY] == 110
+        assert monitor.cursor is None
+        assert monitor.metrics["lease_lost"] == 1
+        assert await monitor.poll() == 0
+
+
+class TestPollInterval:
+    def test_interval_follows_observed_block_time(self):
+        monitor = ChainMonitor("ethereum", FakeClient(tip=0))
+        assert monitor.poll_interval() == 12
+
+        with patch("src.monitoring.tx_monitor.time.monotonic") as clock:
+            for tick in range(20):
+                clock.return_value = tick * 4.0
+                monitor._observe_tip(100 + 2 * tick)
+
+        assert monitor.block_time == pytest.approx(2.0, abs=0.2)
+        assert monitor.poll_interval() == pytest.approx(2.0, abs=0.2)
+        assert monitor.tip == 138
+
+    def test_interval_is_clamped(self):
+        monitor = ChainMonitor("bitcoin", FakeClient(tip=0))
+        monitor.block_time = 600.0
+        assert monitor.poll_interval() == 120.0
+        monitor.block_time = 0.4
+        assert monitor.poll_interval() == 1.0
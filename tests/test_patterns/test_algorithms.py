@@ -4,15 +4,19 @@ Tests for pattern detection algorithms
 
 import pytest
 import asyncio
-from unittest.mock import AsyncMock, MagicMock
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone, timedelta
 
+from src.patterns.algorithms.layering import LayeringDetector
+from src.patterns.algorithms.layering import Transaction as LayeringTransaction
 from src.patterns.algorithms.peeling_chain import PeelingChainDetector, Transaction
 from src.patterns.algorithms.remaining_patterns import (
     CustodyChangeDetector, SynchronizedTransferDetector, 
     OffPeakActivityDetector, RoundAmountDetector
 )
 from src.patterns.models import PatternResult, PatternSeverity
+from src.utils.time_window import TimeWindowSweep
 
 
 class TestPeelingChainDetector:
@@ -184,6 +188,152 @@ class TestPeelingChainDetector:
         
         assert detector._is_peeling_step(prev_tx, curr_tx_same_recipient) is False
 
+    @staticmethod
+    def _peel(hash, sender, recipient, amount, hours):
+        base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        return Transaction(
+            hash=hash,
+            address=sender,
+            amount=amount,
+            timestamp=base_time + timedelta(hours=hours),
+            recipient=recipient,
+            sender=sender,
+            blockchain="bitcoin"
+        )
+    
+    def test_find_peeling_runs_emits_maximal_runs(self, detector):
+        """Test each maximal run is reported once, scored like a full rescan"""
+        amounts = [8.0, 4.0, 2.0, 1.0, 5.0, 9.0, 4.0, 2.0]
+        transactions = [
+            self._peel(f"0x{i}", "0xs", f"0xr{i}", amount, i)
+            for i, amount in enumerate(amounts)
+        ]
+        
+        runs = detector._find_peeling_runs(transactions)
+        
+        assert [[tx.hash for tx in run] for run, _ in runs] == [
+            ["0x0", "0x1", "0x2", "0x3"],
+            ["0x5", "0x6", "0x7"],
+        ]
+        for run, confidence in runs:
+            assert confidence == pytest.approx(detector._calculate_sequence_confidence(run))
+    
+    @pytest.mark.asyncio
+    async def test_follow_peeling_chain_walks_change_outputs(self, detector):
+        """Test the walk follows the largest output from address to address"""
+        outgoing = {
+            "a": [self._peel("t1", "a", "peel1", 1.0, 0), self._peel("t2", "a", "b", 9.0, 0)],
+            "b": [self._peel("t3", "b", "c", 4.0, 1), self._peel("t4", "b", "peel2", 0.5, 1)],
+            # Going back to an address already on the chain is not followed
+            "c": [self._peel("t5", "c", "d", 2.0, 2), self._peel("t6", "c", "a", 3.5, 2)],
+            "d": [],
+        }
+        
+        async def get_outgoing(address, blockchain, since):
+            return outgoing[address]
+        
+        detector._get_outgoing_transfers = get_outgoing
+        
+        chain = await detector.follow_peeling_chain("a", "bitcoin")
+        assert [tx.hash for tx in chain] == ["t2", "t3", "t5"]
+        
+        result = await detector.detect_peeling_chain_walk("a", "bitcoin")
+        assert result.detected is True
+        assert result.metadata["chain_addresses"] == ["a", "b", "c", "d"]
+    
+    @pytest.mark.asyncio
+    async def test_first_hop_considers_newest_transfers(self, detector):
+        """Test only the first hop of a walk takes the newest transfers"""
+        queries = []
+        
+        class _Session:
+            async def run(self, query, **params):
+                queries.append(query)
+                
+                async def rows():
+                    return
+                    yield
+                
+                return rows()
+        
+        @asynccontextmanager
+        async def session():
+            yield _Session()
+        
+        with patch("src.patterns.algorithms.peeling_chain.get_neo4j_session", session):
+            await detector._get_outgoing_transfers("a", "bitcoin", None)
+            await detector._get_outgoing_transfers("a", "bitcoin", datetime.now(timezone.utc))
+        
+        assert "ORDER BY t.timestamp DESC" in queries[0]
+        assert "ORDER BY t.timestamp ASC" in queries[1]
+
+
+class TestLayeringDetector:
+    """Test cases for LayeringDetector path search"""
+    
+    @pytest.fixture
+    def detector(self):
+        """Create layering detector instance"""
+        return LayeringDetector()
+    
+    @staticmethod
+    def _hop(sender, recipient, hours, amount=1.0):
+        base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        return LayeringTransaction(
+            hash=f"{sender}-{recipient}-{hours}",
+            address=sender,
+            amount=amount,
+            timestamp=base_time + timedelta(hours=hours),
+            recipient=recipient,
+            sender=sender,
+            blockchain="ethereum"
+        )
+    
+    def test_paths_follow_time_order_and_window(self, detector):
+        """Test hops must not go back in time or leave the time window"""
+        detector.min_hops = 3
+        transactions = [
+            self._hop("s", "a", 0),
+            self._hop("a", "b", 1),
+            self._hop("b", "c", 2),
+            self._hop("c", "d", 3),
+            self._hop("b", "x", 0.5),  # earlier than the hop into b
+            self._hop("x", "y", 4),
+            self._hop("d", "e", 100),  # outside the 72 hour window
+        ]
+        graph = detector._build_transaction_graph(transactions, "s")
+        
+        paths = detector._find_layering_paths(graph, "s")
+        
+        assert sorted([tx.recipient for tx in path] for path in paths) == [
+            ["a", "b", "c"],
+            ["a", "b", "c", "d"],
+        ]
+        assert detector._calculate_path_confidence(paths[0]) >= detector._calculate_path_confidence(paths[1])
+    
+    def test_path_count_and_search_are_bounded(self, detector):
+        """Test a dense hub keeps only the best paths within its budget"""
+        detector.min_hops = 2
+        detector.max_hops = 4
+        detector.max_layering_paths = 5
+        nodes = [f"n{i}" for i in range(12)]
+        transactions = [
+            self._hop(sender, recipient, hours=i)
+            for i, (sender, recipient) in enumerate(
+                (sender, recipient)
+                for sender in ["s"] + nodes
+                for recipient in nodes
+                if sender != recipient
+            )
+        ]
+        graph = detector._build_transaction_graph(transactions, "s")
+        
+        paths = detector._find_layering_paths(graph, "s")
+        assert len(paths) == 5
+        
+        detector.max_path_expansions = 10
+        assert len(detector._find_layering_paths(graph, "s")) <= 5
+
 
 class TestCustodyChangeDetector:
     """Test cases for CustodyChangeDetector"""
@@ -232,6 +382,64 @@ class TestSynchronizedTransferDetector:
         assert result.confidence_score == 0.0
         assert "Insufficient transactions" in result.metadata.get("detection_reason", "")
 
+    @staticmethod
+    def _transfer(hash, sender, amount, seconds):
+        base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        return Transaction(
+            hash=hash,
+            address="0xhub",
+            amount=amount,
+            timestamp=base_time + timedelta(seconds=seconds),
+            recipient="0xhub",
+            sender=sender,
+            blockchain="ethereum"
+        )
+
+    def test_find_synchronized_groups_sweeps_time_and_amount(self, detector):
+        """Test groups need both close timestamps and similar amounts"""
+        transactions = [
+            self._transfer("late", "0xd", 1.0, 2000),
+            self._transfer("a", "0xa", 1.0, 0),
+            self._transfer("big", "0xe", 50.0, 60),
+            self._transfer("b", "0xb", 1.05, 120),
+            self._transfer("c", "0xc", 0.95, 300),
+            self._transfer("too_late", "0xf", 1.0, 301),
+        ]
+
+        groups = detector._find_synchronized_groups(transactions)
+
+        assert [[tx.hash for tx in group] for group in groups] == [["a", "b", "c"]]
+
+    @pytest.mark.asyncio
+    async def test_detect_synchronized_transfers_detects_group(self, detector):
+        """Test a coordinated burst from several senders is detected"""
+        transactions = [
+            self._transfer(f"0x{i}", f"0xsender{i}", 10.0 + i * 0.1, i * 30)
+            for i in range(4)
+        ]
+
+        result = await detector.detect_synchronized_transfers(
+            transactions=transactions,
+            address="0xhub"
+        )
+
+        assert result.detected is True
+        assert result.transaction_count == 4
+        assert result.metadata["unique_addresses"] == 4
+
+    def test_time_window_sweep_is_incremental(self):
+        """Test groups are emitted once the stream moves past their window"""
+        sweep = TimeWindowSweep(window=60, amount_tolerance=0.1)
+
+        assert sweep.push("a", 0, 100.0) == []
+        assert sweep.push("b", 30, 95.0) == []
+        assert sweep.push("x", 40, 0.0) == []
+        assert sweep.push("c", 61, 100.0) == [["a", "b"]]
+        assert sweep.push("d", 62, 300.0) == []
+        assert sweep.flush() == []
+        with pytest.raises(ValueError):
+            sweep.push("e", 0, 100.0)
+
 
 class TestOffPeakActivityDetector:
     """Test cases for OffPeakActivityDetector"""
@@ -9,7 +9,7 @@ from datetime import datetime, timezone, timedelta
 
 from src.patterns.detection_engine import AdvancedPatternDetector, get_pattern_detector
 from src.patterns.models import (
-    PatternRequest, PatternAnalysisResult, PatternResult,
+    BatchPatternRequest, PatternRequest, PatternAnalysisResult, PatternResult,
     PatternType, PatternSeverity, PatternEvidence
 )
 
@@ -116,6 +116,35 @@ class TestAdvancedPatternDetector:
                 assert result.overall_risk_score > 0.0
                 assert result.total_transactions_analyzed == len(sample_transactions)
     
+    @pytest.mark.asyncio
+    async def test_follow_peeling_chains_reports_stronger_walk(self, sample_transactions):
+        """Test the cross-address walk runs only when enabled and wins if stronger"""
+        
+        pattern_detector = AdvancedPatternDetector()
+        peeling = pattern_detector.detectors[PatternType.PEELING_CHAIN]
+        walk_result = PatternResult(
+            pattern_id="peeling_chain",
+            pattern_name="Peeling Chain Detection",
+            detected=True,
+            confidence_score=0.9,
+            severity=PatternSeverity.HIGH,
+            metadata={"chain_addresses": ["0xa", "0xb", "0xc", "0xd"]},
+        )
+        
+        with patch.object(peeling, 'detect_peeling_chain_walk', AsyncMock(return_value=walk_result)) as walk:
+            result = await pattern_detector._run_detector(
+                PatternType.PEELING_CHAIN, sample_transactions, "0xa", 0.5, "ethereum"
+            )
+            walk.assert_not_awaited()
+            assert result is not walk_result
+            
+            pattern_detector.follow_peeling_chains = True
+            result = await pattern_detector._run_detector(
+                PatternType.PEELING_CHAIN, sample_transactions, "0xa", 0.5, "ethereum"
+            )
+            walk.assert_awaited_once_with("0xa", "ethereum", min_confidence=0.5)
+            assert result is walk_result
+    
     @pytest.mark.asyncio
     async def test_analyze_address_patterns_cache_hit(self, pattern_detector):
         """Test pattern analysis cache functionality"""
@@ -274,3 +303,77 @@ async def test_pattern_detector_integration():
         assert isinstance(result, PatternAnalysisResult)
         assert result.address == "0x1234567890123456789012345678901234567890"
         assert result.blockchain == "ethereum"
+
+
+class TestStreamBatchPatterns:
+    """Test cases for the bounded, streaming batch analysis"""
+    
+    @pytest.fixture
+    def detector(self):
+        """Create a detector whose analyses and history prefetches are faked"""
+        detector = AdvancedPatternDetector()
+        detector.batch_chunk_size = 3
+        detector.in_flight = 0
+        detector.peak = 0
+        detector.started = 0
+        
+        async def analyze(address, blockchain, **kwargs):
+            detector.started += 1
+            detector.in_flight += 1
+            detector.peak = max(detector.peak, detector.in_flight)
+            try:
+                await asyncio.sleep(0)
+            finally:
+                detector.in_flight -= 1
+            if address == "bad":
+                raise RuntimeError("boom")
+            return PatternAnalysisResult(address=address, blockchain=blockchain)
+        
+        detector.analyze_address_patterns = analyze
+        return detector
+    
+    @pytest.fixture
+    def loader(self):
+        loader = MagicMock()
+        loader.get_histories = AsyncMock()
+        with patch("src.patterns.detection_engine.get_transaction_history_loader", return_value=loader):
+            yield loader
+    
+    @pytest.mark.asyncio
+    async def test_streams_every_address_with_bounded_concurrency(self, detector, loader):
+        """Test results stream back per address with at most max_concurrent in flight"""
+        addresses = [f"0x{i}" for i in range(10)] + ["bad"]
+        
+        streamed = [
+            item async for item in detector.stream_batch_patterns(
+                addresses, "ethereum", max_concurrent=2, skip={0, 1}
+            )
+        ]
+        
+        assert sorted(index for index, _, _ in streamed) == list(range(2, 11))
+        assert [address for _, address, result in streamed if result is None] == ["bad"]
+        assert detector.peak == 2
+        # Histories are prefetched one chunk of addresses at a time
+        assert loader.get_histories.await_count == 3
+        assert loader.get_histories.await_args_list[0].args[0] == ["0x2", "0x3", "0x4"]
+    
+    @pytest.mark.asyncio
+    async def test_stopping_early_cancels_workers(self, detector, loader):
+        """Test closing the stream stops the remaining analyses"""
+        stream = detector.stream_batch_patterns([f"0x{i}" for i in range(100)], "ethereum", max_concurrent=4)
+        
+        first = await stream.__anext__()
+        await stream.aclose()
+        
+        assert first[2] is not None
+        assert detector.in_flight == 0
+        assert detector.started < 100
+    
+    @pytest.mark.asyncio
+    async def test_batch_analyze_patterns_collects_stream(self, detector, loader):
+        """Test the non-streaming batch API still returns a dict of results"""
+        request = BatchPatternRequest(addresses=["0xa", "bad", "0xb"], blockchain="ethereum")
+        
+        results = await detector.batch_analyze_patterns(request)
+        
+        assert sorted(results) == ["0xa", "0xb"]
@@ -0,0 +1,258 @@
+"""
+Unit tests for the in-memory sanctions screening index
+"""
+
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from datetime import timezone
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from src.services import sanctions
+from src.services.sanctions import SanctionsIndex
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class _FakeDB:
+    """sanctioned_addresses rows as (address, change_seq, removed_at)"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def pool(self):
+        db = self
+        conn = MagicMock()
+
+        async def fetchval(query):
+            return max((r[1] for r in db.rows), default=0)
+
+        async def fetch(query, *args):
+            db.queries.append(query)
+            if "removed_at IS NULL" in query and "ANY" not in query:
+                return [
+                    {"address": a, "removed_at": None} for a, _, rm in db.rows if not rm
+                ]
+            if "change_seq > $1" in query:
+                return [
+                    {"address": a, "removed_at": rm}
+                    for a, seq, rm in db.rows
+                    if seq > args[0]
+                ]
+            # Screening query: address = ANY($1)
+            return [
+                {"address": a, "blockchain": "ethereum"}
+                for a, _, rm in db.rows
+                if a in args[0] and not rm
+            ]
+
+        conn.fetchval = fetchval
+        conn.fetch = fetch
+        conn.execute = AsyncMock()
+
+        @asynccontextmanager
+        async def acquire():
+            yield conn
+
+        pool = MagicMock()
+        pool.acquire = acquire
+        return pool
+
+
+class _FakeRedis:
+    """The version and sync-in-progress keys shared by all workers"""
+
+    def __init__(self):
+        self.store = {}
+
+    def client(self):
+        redis = MagicMock()
+
+        async def mget(*keys):
+            return [self.store.get(key) for key in keys]
+
+        async def eval(script, numkeys, key, version):
+            if int(self.store.get(key, -1)) < version:
+                self.store[key] = version
+
+        redis.mget = mget
+        redis.eval = eval
+        return redis
+
+
+@pytest.fixture
+def shared():
+    redis = _FakeRedis()
+    with patch("src.services.sanctions.get_redis_client", redis.client):
+        yield redis
+
+
+class TestSanctionsIndex:
+    @pytest.mark.asyncio
+    async def test_not_ready_index_defers_to_database(self):
+        index = SanctionsIndex()
+        assert index.might_contain("0xanything")
+
+    @pytest.mark.asyncio
+    async def test_full_load_then_incremental(self, shared):
+        db = _FakeDB([("0xbad", 1, None)])
+        index = SanctionsIndex()
+        with patch("src.services.sanctions.get_postgres_pool", db.pool):
+            assert await index.refresh()
+            assert index.might_contain("0xbad")
+            assert not index.might_contain("0xgood")
+            assert shared.store["jackdaw:sanctions:version"] == 1
+
+            # Unchanged version: no row reload
+            db.queries.clear()
+            assert not await index.refresh()
+            assert db.queries == []
+
+            db.rows.append(("0xnew", 2, None))
+            assert await index.refresh()
+
+        assert index.might_contain("0xnew")
+        assert index.metrics["full_reloads"] == 1
+        assert len(index) == 2
+
+    @pytest.mark.asyncio
+    async def test_removal_forces_full_reload(self, shared):
+        db = _FakeDB([("0xa", 1, None), ("0xb", 2, None)])
+        index = SanctionsIndex()
+        with patch("src.services.sanctions.get_postgres_pool", db.pool):
+            await index.refresh()
+            db.rows[0] = ("0xa", 3, T0)
+            await index.refresh()
+
+        assert not index.might_contain("0xa")
+        assert index.might_contain("0xb")
+        assert index.metrics["full_reloads"] == 2
+
+    @pytest.mark.asyncio
+    async def test_late_commit_with_lower_timestamp_is_loaded(self, shared):
+        # A row committed after the last refresh still has a higher change_seq
+        # even if its last_seen_at is older than rows already loaded
+        db = _FakeDB([("0xa", 5, None)])
+        index = SanctionsIndex()
+        with patch("src.services.sanctions.get_postgres_pool", db.pool):
+            await index.refresh()
+            db.rows.append(("0xlate", 6, None))
+            await index.refresh()
+
+        assert index.might_contain("0xlate")
+
+
+class TestScreeningUsesIndex:
+    @pytest.mark.asyncio
+    async def test_bulk_screen_only_queries_candidates(self, shared):
+        db = _FakeDB([("0xbad", 1, None)])
+        index = SanctionsIndex()
+        with patch("src.services.sanctions.get_postgres_pool", db.pool), patch.object(
+            sanctions, "_sanctions_index", index
+        ):
+            await index.refresh()
+            db.queries.clear()
+            results = await sanctions.screen_addresses_bulk(
+                ["0xgood", " 0xbad", "0xother"], "ethereum"
+            )
+            assert [r["matched"] for r in results] == [False, True, False]
+            assert len(db.queries) == 1
+
+            db.queries.clear()
+            clean = await sanctions.screen_addresses_bulk(["0xgood"], "ethereum")
+            single = await sanctions.screen_address("0xgood", "ethereum")
+
+        assert clean[0]["matched"] is False
+        assert single["matched"] is False
+        assert db.queries == []
+
+    @pytest.mark.asyncio
+    async def test_stale_index_screens_against_database(self, shared):
+        db = _FakeDB([("0xold", 1, None)])
+        index = SanctionsIndex()
+        with patch("src.services.sanctions.get_postgres_pool", db.pool), patch.object(
+            sanctions, "_sanctions_index", index
+        ):
+            await index.refresh()
+
+            # Another worker's sync adds an address and publishes its version
+            db.rows.append(("0xnew", 2, None))
+            shared.store["jackdaw:sanctions:version"] = 2
+            result = await sanctions.screen_address("0xnew", "ethereum")
+            assert result["matched"] is True
+
+            await index._refresh_task
+            assert index.version == 2
+            assert await index.is_current()
+
+            # A sync in progress also disables the index, once the last
+            # successful check has expired
+            shared.store["jackdaw:sanctions:writers"] = b"1"
+            assert await index.is_current()
+            with patch(
+                "src.services.sanctions.time.monotonic",
+                return_value=time.monotonic() + 2,
+            ):
+                assert not await index.is_current()
+
+    @pytest.mark.asyncio
+    async def test_version_check_is_cached_briefly(self, shared):
+        db = _FakeDB([("0xbad", 1, None)])
+        index = SanctionsIndex()
+        with patch("src.services.sanctions.get_postgres_pool", db.pool):
+            await index.refresh()
+
+        calls = []
+        client = shared.client
+
+        def counting_client():
+            calls.append(1)
+            return client()
+
+        with patch("src.services.sanctions.get_redis_client", counting_client):
+            for _ in range(5):
+                assert await index.is_current()
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_no_redis_screens_against_database(self):
+        db = _FakeDB([("0xbad", 1, None)])
+        index = SanctionsIndex()
+        with patch("src.services.sanctions.get_postgres_pool", db.pool), patch(
+            "src.services.sanctions.get_redis_client",
+            side_effect=RuntimeError("Redis pool not initialised"),
+        ):
+            await index.refresh()
+            assert index.ready
+            assert not await index.is_current()
+
+    @pytest.mark.asyncio
+    async def test_sync_all_marks_sync_and_refreshes_index(self):
+        redis = MagicMock()
+        redis.pipeline.return_value.execute = AsyncMock()
+        redis.eval = AsyncMock()
+        redis.decr = AsyncMock()
+        with patch(
+            "src.services.sanctions.get_postgres_pool", _FakeDB([("0xa", 7, None)]).pool
+        ), patch(
+            "src.services.sanctions.get_redis_client", return_value=redis
+        ), patch.object(
+            sanctions, "_sync_ofac", AsyncMock(return_value=0)
+        ), patch.object(
+            sanctions, "_sync_eu", AsyncMock(return_value=0)
+        ), patch.object(
+            sanctions, "refresh_sanctions_index", AsyncMock()
+        ) as refresh:
+            await sanctions.sync_all()
+
+        refresh.assert_awaited_once()
+        redis.pipeline.return_value.incr.assert_called_once_with(
+            "jackdaw:sanctions:writers"
+        )
+        assert redis.eval.await_args.args[-1] == 7
+        redis.decr.assert_awaited_once_with("jackdaw:sanctions:writers")
@@ -0,0 +1,146 @@
+"""
+Unit tests for the shared transaction history loader
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from unittest.mock import patch
+
+import pytest
+
+from src.services.transaction_history import TransactionHistory
+from src.services.transaction_history import TransactionHistoryLoader
+
+NOW = datetime.now(timezone.utc)
+
+
+def _tx(i, hours_ago, outgoing=True):
+    return {
+        "hash": f"0x{i}",
+        "blockchain": "ethereum",
+        "from_address": "0xa" if outgoing else f"0xc{i}",
+        "to_address": f"0xc{i}" if outgoing else "0xa",
+        "value": float(i),
+        "timestamp": NOW - timedelta(hours=hours_ago),
+    }
+
+
+class _FakeNeo4j:
+    """Serves the history newest first, like the real query"""
+
+    def __init__(self, transactions):
+        self.transactions = transactions
+        self.runs = []
+
+    def session(self):
+        fake = self
+
+        class _Result:
+            def __init__(self, rows):
+                self.rows = rows
+
+            def __aiter__(self):
+                return self._iterate()
+
+            async def _iterate(self):
+                for row in self.rows:
+                    yield {"tx_data": row}
+
+        class _Session:
+            async def run(self, query, **params):
+                fake.runs.append(params)
+                await asyncio.sleep(0)
+                rows = sorted(
+                    fake.transactions, key=lambda tx: tx["timestamp"], reverse=True
+                )
+                return _Result(rows[: params["limit"]])
+
+        @asynccontextmanager
+        async def session():
+            yield _Session()
+
+        return session
+
+
+def _patch_neo4j(fake):
+    return patch("src.services.transaction_history.get_neo4j_session", fake.session())
+
+
+class TestTransactionHistoryLoader:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_load(self):
+        fake = _FakeNeo4j([_tx(1, 30), _tx(2, 5), _tx(3, 1, outgoing=False)])
+        loader = TransactionHistoryLoader()
+
+        with _patch_neo4j(fake):
+            histories = await asyncio.gather(
+                loader.get_history("0xa", "ethereum", 48),
+                loader.get_history("0xa", "ethereum", 48),
+                loader.get_history("0xa", "ethereum", 24),
+            )
+            again = await loader.get_history("0xa", "ethereum", 12)
+
+        assert len(fake.runs) == 1
+        assert [tx["hash"] for tx in histories[0].all()] == ["0x1", "0x2", "0x3"]
+        assert [tx["hash"] for tx in histories[0].sent()] == ["0x1", "0x2"]
+        assert [tx["hash"] for tx in histories[2].all()] == ["0x2", "0x3"]
+        assert [tx["hash"] for tx in again.all()] == ["0x2", "0x3"]
+        assert loader.metrics == {"cache_hits": 1, "shared_loads": 2, "loads": 1}
+
+    @pytest.mark.asyncio
+    async def test_longer_range_reloads_and_truncation_keeps_newest(self):
+        fake = _FakeNeo4j([_tx(i, hours_ago=i) for i in range(1, 6)])
+        loader = TransactionHistoryLoader(max_transactions=3)
+
+        with _patch_neo4j(fake):
+            await loader.get_history("0xa", "ethereum", 2)
+            history = await loader.get_history("0xa", "ethereum", 24)
+
+        assert len(fake.runs) == 2
+        assert [tx["hash"] for tx in history.all()] == ["0x3", "0x2", "0x1"]
+
+    def test_columns(self):
+        history = TransactionHistory(
+            "0xa", "ethereum", 24, [_tx(1, 2), _tx(2, 1, outgoing=False)]
+        )
+
+        columns = history.columns
+        assert columns.amounts.tolist() == [1.0, 2.0]
+        assert columns.outgoing.tolist() == [True, False]
+        assert columns.counterparties == ["0xc1", "0xc2"]
+        assert columns.timestamps[1] - columns.timestamps[0] == pytest.approx(3600)
+
+    @pytest.mark.asyncio
+    async def test_get_histories_loads_uncached_addresses_in_one_query(self):
+        loader = TransactionHistoryLoader()
+        loader.cache.set(
+            ("ethereum", "0xa"), TransactionHistory("0xa", "ethereum", 24, [_tx(1, 1)])
+        )
+        runs = []
+
+        class _Session:
+            async def run(self, query, **params):
+                runs.append(params["addresses"])
+
+                async def rows():
+                    yield {"address": "0xb", "transactions": [_tx(3, 1), _tx(2, 2)]}
+
+                return rows()
+
+        @asynccontextmanager
+        async def session():
+            yield _Session()
+
+        with patch("src.services.transaction_history.get_neo4j_session", session):
+            histories = await loader.get_histories(
+                ["0xa", "0xb", "0xc", "0xb"], "ethereum", 24
+            )
+
+        assert runs == [["0xb", "0xc"]]
+        assert [tx["hash"] for tx in histories["0xb"].all()] == ["0x2", "0x3"]
+        assert len(histories["0xa"]) == 1
+        assert len(histories["0xc"]) == 0
+        assert len(loader.cache.get(("ethereum", "0xc"))) == 0